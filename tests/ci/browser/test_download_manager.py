@@ -0,0 +1,158 @@
+"""Tests for DownloadManager against a tiny local HTTP server: concurrency limit, Range resume and content dedup."""
+
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from web_agent.browser.download_manager import DownloadManager, unique_filename
+
+BODY = os.urandom(300_000)
+
+
+class StubServer:
+	"""Serves BODY at any path; /flaky drops the connection halfway through the first response.
+
+	Responses carry etag (if set) and honour If-Range; change_etag switches it to a new version after the drop.
+	"""
+
+	def __init__(self, delay: float = 0.0, etag: str | None = '"v1"', change_etag: bool = False):
+		self.delay = delay
+		self.etag = etag
+		self.change_etag = change_etag
+		self.active = 0
+		self.max_active = 0
+		self.requests: list[dict[str, str]] = []
+		self.dropped = False
+		self.server: asyncio.Server | None = None
+
+	async def __aenter__(self) -> str:
+		self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+		port = self.server.sockets[0].getsockname()[1]
+		return f'http://127.0.0.1:{port}'
+
+	async def __aexit__(self, *args) -> None:
+		assert self.server is not None
+		self.server.close()
+		await self.server.wait_closed()
+
+	async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		request_line = (await reader.readline()).decode()
+		headers = {}
+		while (line := (await reader.readline()).decode().strip()) != '':
+			name, _, value = line.partition(':')
+			headers[name.lower()] = value.strip()
+		path = request_line.split()[1]
+		headers['path'] = path
+		self.requests.append(headers)
+
+		self.active += 1
+		self.max_active = max(self.max_active, self.active)
+		try:
+			await asyncio.sleep(self.delay)
+			start = int(headers['range'].removeprefix('bytes=').rstrip('-')) if 'range' in headers else 0
+			if 'if-range' in headers and headers['if-range'] != self.etag:
+				start = 0
+			status = '206 Partial Content' if start else '200 OK'
+			body = BODY[start:]
+			etag = f'ETag: {self.etag}\r\n' if self.etag else ''
+			writer.write(
+				f'HTTP/1.1 {status}\r\nContent-Length: {len(body)}\r\nContent-Type: application/pdf\r\n'
+				f'{etag}Accept-Ranges: bytes\r\nConnection: close\r\n\r\n'.encode()
+			)
+			if path == '/flaky' and not self.dropped:
+				self.dropped = True
+				if self.change_etag:
+					self.etag = '"v2"'
+				writer.write(body[: len(body) // 2])
+			else:
+				writer.write(body)
+			await writer.drain()
+		finally:
+			self.active -= 1
+			writer.close()
+
+
+async def test_identical_downloads_are_deduplicated(tmp_path):
+	async with StubServer(delay=0.1) as stub:
+		manager = DownloadManager(tmp_path, max_concurrent=2)
+		try:
+			results = await asyncio.gather(*(manager.download(f'{stub}/file{i}.pdf', 'report.pdf') for i in range(5)))
+		finally:
+			await manager.aclose()
+
+	# Same content from different URLs: one file is kept and the other downloads point at it
+	assert len({result.path for result in results}) == 1
+	assert sum(result.deduplicated for result in results) == 4
+	assert os.listdir(tmp_path) == [results[0].file_name]
+	assert hashlib.sha256((tmp_path / results[0].file_name).read_bytes()).hexdigest() == results[0].sha256
+
+
+async def test_concurrency_limit_and_streaming_progress(tmp_path):
+	server = StubServer(delay=0.1)
+	async with server as stub:
+		manager = DownloadManager(tmp_path, max_concurrent=2, progress_interval=0)
+		progress: list[tuple[int, int, str]] = []
+		try:
+			await asyncio.gather(
+				*(
+					manager.download(f'{stub}/{i}.bin', f'{i}.bin', on_progress=lambda *args: progress.append(args))
+					for i in range(6)
+				)
+			)
+		finally:
+			await manager.aclose()
+
+	assert server.max_active == 2
+	assert ('completed' in {state for _, _, state in progress}) and len(progress) > 6
+	assert all(total == len(BODY) for _, total, _ in progress)
+
+
+async def test_interrupted_download_resumes_with_range(tmp_path):
+	server = StubServer()
+	async with server as stub:
+		manager = DownloadManager(tmp_path)
+		seen_headers: list[str] = []
+
+		async def get_headers(url: str) -> dict[str, str]:
+			seen_headers.append(url)
+			return {'Cookie': 'session=abc'}
+
+		try:
+			result = await manager.download(f'{stub}/flaky', 'flaky.pdf', get_headers=get_headers)
+		finally:
+			await manager.aclose()
+
+	assert result.resumed == 1
+	assert (tmp_path / 'flaky.pdf').read_bytes() == BODY
+	assert server.requests[1]['range'] == f'bytes={len(BODY) // 2}-'
+	assert server.requests[1]['if-range'] == '"v1"'
+	assert all(request['cookie'] == 'session=abc' for request in server.requests)
+	assert len(seen_headers) == 2
+	assert not list(tmp_path.glob('*.part'))
+
+
+@pytest.mark.parametrize('etag, change_etag', [(None, False), ('"v1"', True)], ids=['no-validator', 'changed'])
+async def test_interrupted_download_restarts_without_matching_validator(tmp_path, etag, change_etag):
+	server = StubServer(etag=etag, change_etag=change_etag)
+	async with server as stub:
+		manager = DownloadManager(tmp_path)
+		try:
+			result = await manager.download(f'{stub}/flaky', 'flaky.pdf')
+		finally:
+			await manager.aclose()
+
+	# No validator: not resumed blind; changed file: If-Range makes the server send it whole
+	assert result.resumed == 1
+	assert (tmp_path / 'flaky.pdf').read_bytes() == BODY
+	assert ('range' in server.requests[1]) is change_etag
+
+
+@pytest.mark.parametrize('existing', [[], ['a.pdf'], ['a.pdf', 'a (1).pdf']])
+def test_unique_filename(tmp_path, existing):
+	for name in existing:
+		(tmp_path / name).touch()
+	expected = ['a.pdf', 'a (1).pdf', 'a (2).pdf'][len(existing)]
+	assert unique_filename(tmp_path, 'a.pdf') == expected
+	assert unique_filename(tmp_path, 'a.pdf', reserved={expected}) != expected
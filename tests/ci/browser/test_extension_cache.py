@@ -0,0 +1,86 @@
+"""Tests for the shared, content-versioned default extension cache (downloads are faked)."""
+
+import io
+import threading
+import urllib.request
+import zipfile
+from pathlib import Path
+
+from web_agent.browser import BrowserProfile
+
+COOKIE_EXTENSION_ID = 'edibdbjcniadpccecjdfdjjppcpchdlm'
+BACKGROUND_JS = """async function initialize(checkInitialized, magic) {
+  if (checkInitialized && initialized) {
+    return;
+  }
+  loadCachedRules();
+  await updateSettings();
+  await recreateTabList(magic);
+  initialized = true;
+}"""
+
+
+class FakeResponse(io.BytesIO):
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+
+def _fake_crx() -> bytes:
+	buffer = io.BytesIO()
+	with zipfile.ZipFile(buffer, 'w') as zf:
+		zf.writestr('manifest.json', '{"manifest_version": 3, "version": "1.0"}')
+		zf.writestr('data/background.js', BACKGROUND_JS)
+	return buffer.getvalue()
+
+
+def test_extensions_are_prepared_once_and_reused(tmp_path, monkeypatch):
+	monkeypatch.setenv('web_agent_CONFIG_DIR', str(tmp_path))
+	downloads: list[str] = []
+	extractions: list[Path] = []
+
+	def fake_urlopen(url):
+		downloads.append(url)
+		return FakeResponse(_fake_crx())
+
+	original_extract = BrowserProfile._extract_extension
+
+	def counting_extract(self, crx_path, extract_dir):
+		extractions.append(crx_path)
+		original_extract(self, crx_path, extract_dir)
+
+	monkeypatch.setattr(urllib.request, 'urlopen', fake_urlopen)
+	monkeypatch.setattr(BrowserProfile, '_extract_extension', counting_extract)
+
+	# Parallel launches race on the same cache: only one downloads and extracts each extension
+	results: list[list[str]] = []
+	profiles = [BrowserProfile(user_data_dir=None, headless=True) for _ in range(4)]
+	threads = [
+		threading.Thread(target=lambda p=profile: results.append(p._ensure_default_extensions_downloaded())) for profile in profiles
+	]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	assert len(downloads) == 4
+	assert len(extractions) == 4
+	paths = results[0]
+	assert len(paths) == 4 and all(result == paths for result in results)
+	assert all((Path(path) / '.ready').exists() for path in paths)
+	cookie_dir = next(Path(path) for path in paths if COOKIE_EXTENSION_ID in path)
+	assert 'ensureWhitelistStorage' in (cookie_dir / 'data' / 'background.js').read_text()
+
+	# Later launches just reference the ready directories
+	assert BrowserProfile(user_data_dir=None, headless=True)._ensure_default_extensions_downloaded() == paths
+	assert len(extractions) == 4
+
+	# A different cookie whitelist gets its own patched copy; other extensions are shared
+	other = BrowserProfile(user_data_dir=None, headless=True, cookie_whitelist_domains=['example.com'])
+	other_paths = other._ensure_default_extensions_downloaded()
+	assert len(extractions) == 5
+	assert set(other_paths) - set(paths) == {next(path for path in other_paths if COOKIE_EXTENSION_ID in path)}
+	assert '"example.com": true' in (Path(other_paths[1]) / 'data' / 'background.js').read_text()
+	assert len(downloads) == 4
@@ -0,0 +1,67 @@
+"""Tests for cloning Chrome profiles into a temp user_data_dir without caches and without copying every byte."""
+
+from pathlib import Path
+
+from web_agent.browser import BrowserProfile
+from web_agent.browser.profile import BrowserChannel
+from web_agent.browser.profile_clone import clone_profile_dir
+
+
+def _make_profile(profile_dir: Path) -> dict[str, bytes]:
+	files = {
+		'Cookies': b'sqlite cookies',
+		'Preferences': b'{"profile": {}}',
+		'Local Storage/leveldb/000005.ldb': b'table' * 100,
+		'Local Storage/leveldb/000006.log': b'log',
+		'Extensions/abcdef/1.0/manifest.json': b'{}',
+		'Service Worker/Database/000001.log': b'sw db',
+		'Cache/Cache_Data/data_0': b'cached' * 1000,
+		'Code Cache/js/index': b'code',
+		'GPUCache/data_1': b'gpu',
+		'Service Worker/CacheStorage/abc/index': b'cachestorage',
+	}
+	for rel, content in files.items():
+		path = profile_dir / rel
+		path.parent.mkdir(parents=True, exist_ok=True)
+		path.write_bytes(content)
+	return files
+
+
+def test_clone_skips_caches_and_links_only_immutable_files(tmp_path):
+	src = tmp_path / 'src'
+	files = _make_profile(src)
+	dst = tmp_path / 'dst'
+
+	stats = clone_profile_dir(src, dst, max_workers=4)
+
+	cache_dirs = ['Cache', 'Code Cache', 'GPUCache', 'Service Worker/CacheStorage']
+	for rel in cache_dirs:
+		assert not (dst / rel).exists()
+	assert (dst / 'Service Worker/Database/000001.log').read_bytes() == b'sw db'
+	assert (dst / 'Local Storage/leveldb/000005.ldb').read_bytes() == b'table' * 100
+	assert stats.files == 6
+	assert stats.skipped_dirs == 4
+	assert stats.bytes == sum(len(content) for rel, content in files.items() if not rel.startswith(tuple(cache_dirs)))
+	assert stats.files == stats.reflinked + stats.hardlinked + stats.copied
+
+	# Files Chrome writes in place must never share an inode with the source profile
+	(dst / 'Cookies').write_bytes(b'changed')
+	assert (src / 'Cookies').read_bytes() == b'sqlite cookies'
+	if not stats.reflinked:
+		assert (dst / 'Cookies').stat().st_ino != (src / 'Cookies').stat().st_ino
+		assert stats.hardlinked == 2
+		assert (dst / 'Local Storage/leveldb/000005.ldb').stat().st_ino == (src / 'Local Storage/leveldb/000005.ldb').stat().st_ino
+
+
+def test_chrome_profile_is_cloned_to_temp_dir(tmp_path):
+	user_data_dir = tmp_path / 'chrome-user-data'
+	_make_profile(user_data_dir / 'Default')
+	(user_data_dir / 'Local State').write_text('{}')
+
+	profile = BrowserProfile(user_data_dir=user_data_dir, channel=BrowserChannel.CHROME, headless=True)
+
+	temp_dir = Path(profile.user_data_dir)
+	assert 'web-agent-user-data-dir-' in temp_dir.name
+	assert (temp_dir / 'Local State').read_text() == '{}'
+	assert (temp_dir / 'Default' / 'Cookies').read_bytes() == b'sqlite cookies'
+	assert not (temp_dir / 'Default' / 'Cache').exists()
@@ -80,10 +80,10 @@ async def test_cdp_proxy_auth_handler_registers_and_responds():
 
 	# Attach stubs to session
 	session._cdp_client_root = root  # type: ignore[attr-defined]
-	# No need to attach a real CDPSession; _setup_proxy_auth works with root client
+	# No need to attach a real CDPSession; _setup_fetch_interception works with root client
 
 	# Should register Fetch handler and enable auth handling without raising
-	await session._setup_proxy_auth()
+	await session._setup_fetch_interception()
 
 	assert root.enabled is True
 	assert callable(root.auth_callback)
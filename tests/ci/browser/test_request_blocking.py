@@ -0,0 +1,149 @@
+"""Tests for EasyList-style request blocking and its CDP Fetch.requestPaused wiring (CDP client is stubbed)."""
+
+import asyncio
+import hashlib
+import os
+import time
+from typing import Any
+
+from web_agent.browser import BrowserProfile, BrowserSession
+from web_agent.browser.request_blocking import (
+	BUNDLED_FILTER_LIST,
+	RequestBlocker,
+	RequestFilter,
+	build_request_blocker,
+	load_filter_list,
+)
+
+RULES = [
+	'! comment',
+	'example.com##.ad-banner',
+	'||tracker.net^$third-party',
+	'||cdn.example.com/ads/*$image',
+	'/adbanner/*$image,~third-party',
+	'/analytics.js$script,domain=news.com|~sports.news.com',
+	'@@||tracker.net/allowed.js',
+	'||bad.com^$redirect=noop.js',
+]
+
+
+def test_filter_rules_options_and_exceptions():
+	request_filter = RequestFilter(RULES)
+	assert request_filter.rule_count == 5  # comment, cosmetic and unsupported-option rules are skipped
+
+	def blocked(url: str, resource_type: str = 'Script', page: str | None = 'https://news.com/') -> bool:
+		return request_filter.match(url, resource_type, page) is not None
+
+	assert blocked('https://a.tracker.net/t.js')
+	assert not blocked('https://tracker.net/t.js', page='https://www.tracker.net/')  # first-party
+	assert not blocked('https://tracker.net/allowed.js')  # @@ exception
+	assert not blocked('https://bad.com/x.js')
+
+	assert blocked('https://cdn.example.com/ads/1.png', 'Image')
+	assert not blocked('https://cdn.example.com/ads/1.js', 'Script')
+	assert blocked('https://news.com/adbanner/1.png', 'Image')
+	assert not blocked('https://news.com/adbanners/1.png', 'Image')  # token must match a whole path segment
+
+	assert blocked('https://cdn.io/analytics.js')
+	assert not blocked('https://cdn.io/analytics.js', page='https://sports.news.com/')
+	assert not blocked('https://cdn.io/analytics.js', page='https://other.com/')
+
+
+def test_blocker_tracks_stats_per_page_and_never_blocks_documents():
+	blocker = RequestBlocker(RequestFilter(RULES), blocked_resource_types=['Font'])
+
+	assert not blocker.on_request('tab1', 'https://news.com/', 'Document', is_main_frame_document=True)
+	assert blocker.on_request('tab1', 'https://x.tracker.net/p.gif', 'Image')
+	assert blocker.on_request('tab1', 'https://fonts.io/a.woff2', 'Font')
+	assert not blocker.on_request('tab1', 'https://news.com/app.js', 'Script')
+	assert not blocker.on_request('tab1', 'https://x.tracker.net/frame', 'Document')
+
+	stats = blocker.stats('tab1')
+	assert stats.page_url == 'https://news.com/' and stats.blocked == 2
+	assert stats.by_type == {'Image': 1, 'Font': 1} and stats.bytes_saved > 0
+
+	# A new main-frame navigation starts fresh stats
+	blocker.on_request('tab1', 'https://other.com/', 'Document', is_main_frame_document=True)
+	assert blocker.stats('tab1').blocked == 0
+
+
+async def test_bundled_list_and_cached_remote_list_work_offline(tmp_path):
+	bundled = await load_filter_list(str(BUNDLED_FILTER_LIST), tmp_path)
+	assert any(line.startswith('||doubleclick.net^') for line in bundled)
+
+	# An unreachable URL without a cached copy contributes no rules
+	url = 'http://127.0.0.1:9/list.txt'
+	blocker = await build_request_blocker(False, [url], [], tmp_path)
+	assert blocker.filter is not None and blocker.filter.rule_count == 0
+
+	# With a stale cached copy, the failed refresh falls back to the cache
+	cache_path = tmp_path / f'{hashlib.sha256(url.encode()).hexdigest()[:16]}.txt'
+	cache_path.write_text('||offline-tracker.com^\n')
+	stale = time.time() - 30 * 24 * 3600
+	os.utime(cache_path, (stale, stale))
+	blocker = await build_request_blocker(True, [url], [], tmp_path)
+	assert blocker.should_block('https://offline-tracker.com/a.js', 'Script')
+	assert blocker.should_block('https://stats.g.doubleclick.net/x', 'Image', 'https://news.com/')
+
+
+async def test_paused_requests_are_failed_or_continued():
+	profile = BrowserProfile(headless=True, user_data_dir=None, block_requests=True, block_resource_types=['Media'])
+	session = BrowserSession(browser_profile=profile)
+
+	class StubFetch:
+		def __init__(self) -> None:
+			self.enable_params: list[dict] = []
+			self.failed: list[dict] = []
+			self.continued: list[dict] = []
+
+		async def enable(self, params: dict, session_id: str | None = None) -> None:
+			self.enable_params.append(params)
+
+		async def failRequest(self, params: dict, session_id: str | None = None) -> None:
+			self.failed.append(params)
+
+		async def continueRequest(self, params: dict, session_id: str | None = None) -> None:
+			self.continued.append(params)
+
+	class StubCDP:
+		def __init__(self) -> None:
+			fetch = StubFetch()
+			self.fetch = fetch
+			self.callbacks: dict[str, Any] = {}
+			callbacks = self.callbacks
+
+			class _Register:
+				class Fetch:
+					@staticmethod
+					def authRequired(callback) -> None:
+						callbacks['authRequired'] = callback
+
+					@staticmethod
+					def requestPaused(callback) -> None:
+						callbacks['requestPaused'] = callback
+
+			class _Send:
+				Fetch = fetch
+
+			self.send = _Send()
+			self.register = _Register()
+
+	root = StubCDP()
+	session._cdp_client_root = root  # type: ignore[assignment]
+	await session._setup_fetch_interception()
+
+	assert root.fetch.enable_params[0]['patterns'] == [{'urlPattern': '*', 'requestStage': 'Request'}]
+	assert root.fetch.enable_params[0]['handleAuthRequests'] is False
+
+	on_paused = root.callbacks['requestPaused']
+	on_paused({'requestId': 'r1', 'request': {'url': 'https://www.google-analytics.com/g/collect'}, 'resourceType': 'Ping'})
+	on_paused({'requestId': 'r2', 'request': {'url': 'https://example.com/app.js'}, 'resourceType': 'Script'})
+	on_paused({'requestId': 'r3', 'request': {'url': 'https://example.com/intro.mp4'}, 'resourceType': 'Media'})
+	await asyncio.sleep(0.05)
+
+	assert [params['requestId'] for params in root.fetch.failed] == ['r1', 'r3']
+	assert root.fetch.failed[0]['errorReason'] == 'BlockedByClient'
+	assert [params['requestId'] for params in root.fetch.continued] == ['r2']
+
+	stats = session.get_request_blocking_stats()
+	assert stats is not None and stats.blocked == 2 and stats.by_type == {'Ping': 1, 'Media': 1}
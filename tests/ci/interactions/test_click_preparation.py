@@ -0,0 +1,200 @@
+"""Test the single round-trip click preparation path and benchmark it against the step-by-step path.
+
+Tests cover:
+- Off-screen element: both paths scroll it into view and agree on the click point
+- Occluded element: both paths report occlusion
+- Element inside a same-origin iframe: click point includes the frame offset
+- Clicking through the fast path still fires the page's click handler
+- Preparation latency of both paths (printed with -s)
+"""
+
+import asyncio
+import statistics
+import time
+
+import pytest
+from pytest_httpserver import HTTPServer
+
+from web_agent.browser import BrowserSession
+from web_agent.browser.profile import BrowserProfile
+from web_agent.tools.service import Tools
+
+TALL_PAGE = """
+<!DOCTYPE html>
+<html>
+<head><title>Tall Page</title></head>
+<body style="margin: 0">
+	<div style="height: 3000px">spacer</div>
+	<button id="far" onclick="window.clicks = (window.clicks || 0) + 1" style="width: 120px; height: 40px">Far button</button>
+	<div style="height: 3000px">spacer</div>
+</body>
+</html>
+"""
+
+OVERLAY_PAGE = """
+<!DOCTYPE html>
+<html>
+<head><title>Overlay Page</title></head>
+<body style="margin: 0">
+	<button id="covered" style="position: absolute; top: 100px; left: 100px; width: 120px; height: 40px">Covered</button>
+	<div id="overlay" style="position: fixed; inset: 0; background: rgba(0, 0, 0, 0.3); z-index: 10"></div>
+</body>
+</html>
+"""
+
+IFRAME_PAGE = """
+<!DOCTYPE html>
+<html>
+<head><title>Iframe Page</title></head>
+<body style="margin: 0">
+	<div style="height: 200px"></div>
+	<iframe id="frame" style="margin-left: 50px; border: 5px solid black; width: 400px; height: 200px"
+		srcdoc="<body style='margin:0'><button id='inner' style='margin: 20px; width: 100px; height: 30px'>Inner</button></body>"></iframe>
+</body>
+</html>
+"""
+
+
+@pytest.fixture(scope='session')
+def http_server():
+	"""Create and provide a test HTTP server with click test pages."""
+	server = HTTPServer()
+	server.start()
+	server.expect_request('/tall').respond_with_data(TALL_PAGE, content_type='text/html')
+	server.expect_request('/overlay').respond_with_data(OVERLAY_PAGE, content_type='text/html')
+	server.expect_request('/iframe').respond_with_data(IFRAME_PAGE, content_type='text/html')
+	yield server
+	server.stop()
+
+
+@pytest.fixture(scope='session')
+def base_url(http_server):
+	"""Return the base URL for the test HTTP server."""
+	return f'http://{http_server.host}:{http_server.port}'
+
+
+@pytest.fixture(scope='module')
+async def browser_session():
+	"""Create and provide a Browser instance for testing."""
+	browser_session = BrowserSession(
+		browser_profile=BrowserProfile(
+			headless=True,
+			user_data_dir=None,
+			keep_alive=True,
+			chromium_sandbox=False,
+		)
+	)
+	await browser_session.start()
+	yield browser_session
+	await browser_session.kill()
+
+
+async def _load(browser_session: BrowserSession, url: str) -> None:
+	await Tools().navigate(url=url, new_tab=False, browser_session=browser_session)
+	await asyncio.sleep(0.3)
+	await browser_session.get_browser_state_summary()
+
+
+async def _node(browser_session: BrowserSession, element_id: str):
+	index = await browser_session.get_index_by_id(element_id)
+	assert index is not None, f'Could not find #{element_id}'
+	node = await browser_session.get_element_by_index(index)
+	assert node is not None
+	return index, node
+
+
+async def _scroll_to_top(browser_session: BrowserSession) -> None:
+	cdp_session = await browser_session.get_or_create_cdp_session()
+	await cdp_session.cdp_client.send.Runtime.evaluate(
+		params={'expression': 'window.scrollTo(0, 0)'}, session_id=cdp_session.session_id
+	)
+
+
+async def _prepare_both(browser_session: BrowserSession, element_id: str):
+	watchdog = browser_session._default_action_watchdog
+	assert watchdog is not None
+	_, node = await _node(browser_session, element_id)
+	cdp_session = await browser_session.cdp_client_for_node(node)
+
+	await _scroll_to_top(browser_session)
+	fast = await watchdog._prepare_click_point(node.backend_node_id, cdp_session)
+	await _scroll_to_top(browser_session)
+	legacy = await watchdog._prepare_click_point_legacy(node.backend_node_id, cdp_session)
+	return fast, legacy
+
+
+class TestClickPreparation:
+	"""Single-call click preparation vs the step-by-step path."""
+
+	async def test_offscreen_element_matches_legacy(self, browser_session: BrowserSession, base_url: str):
+		await _load(browser_session, f'{base_url}/tall')
+		fast, legacy = await _prepare_both(browser_session, 'far')
+
+		assert fast is not None and legacy is not None
+		assert fast[2] is False and legacy[2] is False
+		assert abs(fast[0] - legacy[0]) <= 2
+		assert 0 <= fast[1] < 2000, 'element should have been scrolled into the viewport'
+
+	async def test_occluded_element_is_reported(self, browser_session: BrowserSession, base_url: str):
+		await _load(browser_session, f'{base_url}/overlay')
+		# The overlay covers the button, so look it up by backend node through the DOM instead of the selector map
+		watchdog = browser_session._default_action_watchdog
+		cdp_session = await browser_session.get_or_create_cdp_session()
+		doc = await cdp_session.cdp_client.send.DOM.getDocument(params={'depth': -1}, session_id=cdp_session.session_id)
+		found = await cdp_session.cdp_client.send.DOM.querySelector(
+			params={'nodeId': doc['root']['nodeId'], 'selector': '#covered'}, session_id=cdp_session.session_id
+		)
+		described = await cdp_session.cdp_client.send.DOM.describeNode(
+			params={'nodeId': found['nodeId']}, session_id=cdp_session.session_id
+		)
+		backend_node_id = described['node']['backendNodeId']
+
+		fast = await watchdog._prepare_click_point(backend_node_id, cdp_session)
+		legacy = await watchdog._prepare_click_point_legacy(backend_node_id, cdp_session)
+
+		assert fast is not None and fast[2] is True
+		assert legacy is not None and legacy[2] is True
+
+	async def test_same_origin_iframe_offset(self, browser_session: BrowserSession, base_url: str):
+		await _load(browser_session, f'{base_url}/iframe')
+		fast, legacy = await _prepare_both(browser_session, 'inner')
+
+		assert fast is not None and legacy is not None
+		# 50px margin + 5px border + 20px button margin + half of the 100px button width
+		assert fast[0] == pytest.approx(125, abs=2)
+		assert abs(fast[0] - legacy[0]) <= 2 and abs(fast[1] - legacy[1]) <= 2
+
+	async def test_click_uses_fast_path(self, browser_session: BrowserSession, base_url: str):
+		await _load(browser_session, f'{base_url}/tall')
+		index, _ = await _node(browser_session, 'far')
+		await Tools().click(index=index, browser_session=browser_session)
+
+		cdp_session = await browser_session.get_or_create_cdp_session()
+		result = await cdp_session.cdp_client.send.Runtime.evaluate(
+			params={'expression': 'window.clicks || 0', 'returnByValue': True}, session_id=cdp_session.session_id
+		)
+		assert result['result']['value'] == 1
+
+	async def test_preparation_latency_benchmark(self, browser_session: BrowserSession, base_url: str):
+		await _load(browser_session, f'{base_url}/tall')
+		watchdog = browser_session._default_action_watchdog
+		_, node = await _node(browser_session, 'far')
+		cdp_session = await browser_session.cdp_client_for_node(node)
+
+		timings: dict[str, list[float]] = {'single-call': [], 'step-by-step': []}
+		for _ in range(5):
+			for label, prepare in (
+				('single-call', watchdog._prepare_click_point),
+				('step-by-step', watchdog._prepare_click_point_legacy),
+			):
+				await _scroll_to_top(browser_session)
+				started = time.perf_counter()
+				assert await prepare(node.backend_node_id, cdp_session) is not None
+				timings[label].append(time.perf_counter() - started)
+
+		medians = {label: statistics.median(values) for label, values in timings.items()}
+		print(
+			f'\nclick preparation median: single-call {medians["single-call"] * 1000:.1f}ms, '
+			f'step-by-step {medians["step-by-step"] * 1000:.1f}ms'
+		)
+		assert medians['single-call'] < medians['step-by-step']
@@ -0,0 +1,207 @@
+"""Test the typing engine modes ('human', 'fast-keys', 'bulk') and benchmark long-form fills.
+
+Tests cover:
+- Key event sequence generation and in-order pipelined dispatch
+- Bulk insert verification and value restore on rejection (fake CDP client)
+- Long textarea fills in every mode produce the exact text
+- Bulk mode falls back to human typing on a keydown-driven field
+- Timing of a long fill per mode (printed with -s)
+"""
+
+import asyncio
+import time
+
+import pytest
+from pytest_httpserver import HTTPServer
+
+from web_agent.actor.text_input import dispatch_key_events_pipelined, insert_text_bulk, key_events_for_text
+from web_agent.browser import BrowserSession
+from web_agent.browser.profile import BrowserProfile
+from web_agent.tools.service import Tools
+
+LONG_TEXT = ('The quick brown fox jumps over the lazy dog. ' * 45)[:2000]
+
+
+def _simple_key_info(char: str) -> tuple[int, int, str, str]:
+	return (8 if char.isupper() else 0), ord(char.upper()), char, f'Key{char.upper()}'
+
+
+class FakeCDPClient:
+	"""Records Input/Runtime calls and simulates a text field"""
+
+	def __init__(self, accept_insert: bool = True, value: str = ''):
+		self.value = value
+		self.accept_insert = accept_insert
+		self.calls: list[tuple[str, dict]] = []
+		self.send = self
+
+	@property
+	def Input(self):
+		return self
+
+	@property
+	def Runtime(self):
+		return self
+
+	async def dispatchKeyEvent(self, params, session_id=None):
+		self.calls.append(('dispatchKeyEvent', params))
+		await asyncio.sleep(0)
+		return {}
+
+	async def insertText(self, params, session_id=None):
+		self.calls.append(('insertText', params))
+		if self.accept_insert:
+			self.value += params['text']
+		return {}
+
+	async def callFunctionOn(self, params, session_id=None):
+		self.calls.append(('callFunctionOn', params))
+		if params.get('arguments'):
+			self.value = params['arguments'][0]['value']
+		return {'result': {'value': self.value}}
+
+
+def test_key_events_for_text_matches_human_sequence():
+	events = key_events_for_text('aB\n', _simple_key_info)
+
+	assert [e['type'] for e in events] == ['keyDown', 'char', 'keyUp'] * 3
+	assert events[1]['text'] == 'a'
+	assert events[3]['modifiers'] == 8 and events[4]['text'] == 'B'
+	assert events[6]['key'] == 'Enter' and events[7]['text'] == '\r'
+
+
+async def test_pipelined_dispatch_preserves_order():
+	client = FakeCDPClient()
+	events = key_events_for_text('pipelined typing', _simple_key_info)
+
+	await dispatch_key_events_pipelined(client, 'session', events, window=10)  # type: ignore[arg-type]
+
+	sent = [params for name, params in client.calls if name == 'dispatchKeyEvent']
+	assert sent == events
+	assert ''.join(e['text'] for e in sent if e['type'] == 'char') == 'pipelined typing'
+
+
+async def test_bulk_insert_accepted_and_rejected():
+	client = FakeCDPClient(value='start ')
+	assert await insert_text_bulk(client, 'session', 'obj', 'multi\nline')  # type: ignore[arg-type]
+	assert client.value == 'start multi\nline'
+
+	rejecting = FakeCDPClient(accept_insert=False, value='keep me')
+	assert not await insert_text_bulk(rejecting, 'session', 'obj', 'ignored')  # type: ignore[arg-type]
+	assert rejecting.value == 'keep me'
+
+
+@pytest.fixture(scope='session')
+def http_server():
+	"""Create and provide a test HTTP server with typing test pages."""
+	server = HTTPServer()
+	server.start()
+
+	server.expect_request('/long-form').respond_with_data(
+		"""
+		<!DOCTYPE html>
+		<html>
+		<head><title>Long Form</title></head>
+		<body>
+			<textarea id="notes" rows="10" cols="80"></textarea>
+		</body>
+		</html>
+		""",
+		content_type='text/html',
+	)
+
+	# Field that only trusts keydown events and rewrites its value from them (rejects insertText)
+	server.expect_request('/keydown-field').respond_with_data(
+		"""
+		<!DOCTYPE html>
+		<html>
+		<head><title>Keydown Field</title></head>
+		<body>
+			<input id="masked" type="text" />
+			<script>
+				var el = document.getElementById('masked');
+				var typed = '';
+				el.addEventListener('keydown', function(e) {
+					if (e.key === 'Backspace') { typed = typed.slice(0, -1); }
+					else if (e.key.length === 1) { typed += e.key; }
+				});
+				el.addEventListener('input', function() { el.value = typed; });
+			</script>
+		</body>
+		</html>
+		""",
+		content_type='text/html',
+	)
+
+	yield server
+	server.stop()
+
+
+@pytest.fixture(scope='session')
+def base_url(http_server):
+	"""Return the base URL for the test HTTP server."""
+	return f'http://{http_server.host}:{http_server.port}'
+
+
+@pytest.fixture(scope='module')
+async def browser_session():
+	"""Create and provide a Browser instance for testing."""
+	browser_session = BrowserSession(
+		browser_profile=BrowserProfile(
+			headless=True,
+			user_data_dir=None,
+			keep_alive=True,
+			chromium_sandbox=False,
+		)
+	)
+	await browser_session.start()
+	yield browser_session
+	await browser_session.kill()
+
+
+async def _field_value(browser_session: BrowserSession, element_id: str) -> str:
+	cdp_session = await browser_session.get_or_create_cdp_session()
+	result = await cdp_session.cdp_client.send.Runtime.evaluate(
+		params={'expression': f'document.getElementById("{element_id}").value', 'returnByValue': True},
+		session_id=cdp_session.session_id,
+	)
+	return result.get('result', {}).get('value', '')
+
+
+async def _fill(browser_session: BrowserSession, base_url: str, path: str, element_id: str, text: str, mode: str) -> float:
+	tools = Tools()
+	browser_session.browser_profile.typing_mode = mode  # type: ignore[assignment]
+	await tools.navigate(url=f'{base_url}{path}', new_tab=False, browser_session=browser_session)
+	await asyncio.sleep(0.3)
+	await browser_session.get_browser_state_summary()
+	index = await browser_session.get_index_by_id(element_id)
+	assert index is not None, f'Could not find #{element_id}'
+
+	started = time.perf_counter()
+	await tools.input(index=index, text=text, browser_session=browser_session)
+	return time.perf_counter() - started
+
+
+class TestTypingModes:
+	"""Long-form fills in each typing mode."""
+
+	async def test_long_fill_benchmark(self, browser_session: BrowserSession, base_url: str):
+		"""Fill a 2,000 character textarea with bulk and fast-keys, and a shorter prefix with human typing."""
+		timings: dict[str, float] = {}
+		for mode, text in (('bulk', LONG_TEXT), ('fast-keys', LONG_TEXT), ('human', LONG_TEXT[:200])):
+			timings[mode] = await _fill(browser_session, base_url, '/long-form', 'notes', text, mode)
+			assert await _field_value(browser_session, 'notes') == text, f'{mode} mode produced the wrong text'
+
+		human_per_char = timings['human'] / 200
+		print(
+			f'\n2000 chars: bulk {timings["bulk"]:.2f}s, fast-keys {timings["fast-keys"]:.2f}s, '
+			f'human (extrapolated) {human_per_char * 2000:.2f}s'
+		)
+		assert timings['bulk'] < human_per_char * 2000
+		assert timings['fast-keys'] < human_per_char * 2000
+
+	async def test_bulk_falls_back_when_field_rejects_insert(self, browser_session: BrowserSession, base_url: str):
+		"""A field that rebuilds its value from keydown events rejects insertText, so bulk must fall back to keys."""
+		await _fill(browser_session, base_url, '/keydown-field', 'masked', 'hello world', 'bulk')
+		assert await _field_value(browser_session, 'masked') == 'hello world'
+		browser_session.browser_profile.typing_mode = 'human'
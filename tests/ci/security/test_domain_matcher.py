@@ -0,0 +1,110 @@
+"""Tests that the compiled domain matchers give the same answers as the per-pattern rules they replace."""
+
+import random
+from urllib.parse import urlparse
+
+from bubus import EventBus
+
+from web_agent.browser import BrowserProfile, BrowserSession
+from web_agent.browser.watchdogs.security_watchdog import SecurityWatchdog
+from web_agent.domain_matcher import (
+	DomainPatternList,
+	DomainPatternSet,
+	DomainSuffixTrie,
+	UrlPolicyMatcher,
+	get_url_policy_matcher,
+)
+from web_agent.utils import match_url_with_domain_pattern
+
+LABELS = ['example', 'com', 'google', 'co', 'uk', 'www', 'sub', 'Evil', 'org', '']
+
+
+def _random_host(rng: random.Random) -> str:
+	return '.'.join(rng.choice(LABELS) for _ in range(rng.randint(1, 4)))
+
+
+def _random_pattern(rng: random.Random) -> str:
+	pattern = rng.choice(['*.{}', '*', '{}*', '*.*.{}', '{}.*', '*.{}?', '{}', '{}']).format(_random_host(rng))
+	if rng.random() < 0.3:
+		pattern = f'{rng.choice(["https", "http", "http*", "chrome", "HTTPS"])}://{pattern}'
+	if rng.random() < 0.1:
+		pattern += ':8080'
+	if rng.random() < 0.05:
+		pattern += '/*'
+	return pattern
+
+
+def _random_url(rng: random.Random) -> str:
+	return (
+		f'{rng.choice(["https", "http", "chrome"])}://{rng.choice(["", "user:pw@"])}{_random_host(rng)}'
+		f'{rng.choice(["", "/", "/path", ":443/x"])}'
+	)
+
+
+def test_suffix_trie_matches_host_and_subdomains():
+	trie = DomainSuffixTrie()
+	trie.add('example.com', 'a')
+	trie.add('sub.example.com', 'b')
+	assert trie.matches('example.com') == ['a']
+	assert trie.matches('deep.sub.example.com') == ['a', 'b']
+	assert trie.matches('notexample.com') == []
+	assert trie.matches('com') == []
+
+
+def test_compiled_matchers_agree_with_per_pattern_rules():
+	rng = random.Random(1234)
+	session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None))
+	watchdog = SecurityWatchdog(browser_session=session, event_bus=EventBus())
+
+	for _ in range(400):
+		patterns = [_random_pattern(rng) for _ in range(rng.randint(1, 8))]
+		domain_patterns = DomainPatternSet(patterns)
+		policy = UrlPolicyMatcher(patterns)
+		for _ in range(10):
+			url = _random_url(rng)
+			expected = {pattern for pattern in patterns if match_url_with_domain_pattern(url, pattern)}
+			assert domain_patterns.matching_patterns(url) == expected, (patterns, url)
+
+			parsed = urlparse(url)
+			if parsed.hostname:
+				expected_policy = any(
+					watchdog._is_url_match(url, parsed.hostname, parsed.scheme, pattern) for pattern in patterns
+				)
+				assert policy.matches(url, parsed.hostname, parsed.scheme) == expected_policy, (patterns, url)
+
+
+def test_large_pattern_list_keeps_wildcards():
+	allowed = [f'site{i}.com' for i in range(5000)] + ['*.example.org', 'https://docs.python.org']
+	browser_profile = BrowserProfile(allowed_domains=allowed, headless=True, user_data_dir=None)
+	browser_session = BrowserSession(browser_profile=browser_profile)
+	watchdog = SecurityWatchdog(browser_session=browser_session, event_bus=EventBus())
+
+	# Patterns stay a list (and keep working) instead of being flattened into a set
+	assert isinstance(browser_session.browser_profile.allowed_domains, list)
+	assert watchdog._is_url_allowed('https://site4999.com') is True
+	assert watchdog._is_url_allowed('https://www.site42.com') is True
+	assert watchdog._is_url_allowed('https://deep.sub.example.org') is True
+	assert watchdog._is_url_allowed('https://docs.python.org/3/') is True
+	assert watchdog._is_url_allowed('https://site5000.com') is False
+	assert watchdog._is_url_allowed('https://example.org.evil.com') is False
+
+	# The list carries its compiled matcher: checks neither copy nor rehash it
+	profile_domains = browser_session.browser_profile.allowed_domains
+	assert isinstance(profile_domains, DomainPatternList)
+	matcher = get_url_policy_matcher(profile_domains)
+	assert watchdog._is_url_allowed('https://site7.com') is True
+	assert get_url_policy_matcher(profile_domains) is matcher
+
+	# Same-length edits in place are picked up
+	profile_domains[0] = 'replaced.com'
+	assert watchdog._is_url_allowed('https://replaced.com') is True
+	assert watchdog._is_url_allowed('https://site0.com') is False
+	assert get_url_policy_matcher(profile_domains) is not matcher
+
+	# So are assignments, and copies of the profile keep matching
+	browser_session.browser_profile.allowed_domains = ['*.example.com']
+	assert watchdog._is_url_allowed('https://www.example.com') is True
+	assert watchdog._is_url_allowed('https://replaced.com') is False
+	profile_copy = browser_session.browser_profile.model_copy(deep=True)
+	assert profile_copy.allowed_domains == ['*.example.com']
+	assert get_url_policy_matcher(profile_copy.allowed_domains).matches('https://a.example.com', 'a.example.com', 'https')  # type: ignore[arg-type]
@@ -0,0 +1,111 @@
+"""Tests for pipelined CDP command batching in the actor layer."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from web_agent.actor.batch import CDPBatch
+from web_agent.actor.mouse import Mouse
+from web_agent.actor.page import Page
+
+
+class FakeCDPClient:
+	"""Records when each command is written and answers after a fixed latency"""
+
+	def __init__(self, latency: float = 0.05, fail: str | None = None):
+		self.latency = latency
+		self.fail = fail
+		self.written: list[tuple[str, dict | None]] = []
+		self.in_flight = 0
+		self.max_in_flight = 0
+		self.send = SimpleNamespace(Input=self._domain('Input'), DOM=self._domain('DOM'))
+
+	def _domain(self, domain: str):
+		client = self
+
+		class Domain:
+			def __getattr__(self, command):
+				async def send(params=None, session_id=None):
+					return await client.send_raw(f'{domain}.{command}', params, session_id)
+
+				return send
+
+		return Domain()
+
+	async def send_raw(self, method, params=None, session_id=None):
+		self.written.append((method, params))
+		self.in_flight += 1
+		self.max_in_flight = max(self.max_in_flight, self.in_flight)
+		try:
+			await asyncio.sleep(self.latency)
+			if method == self.fail:
+				raise RuntimeError(f'{method} failed')
+			return {'method': method}
+		finally:
+			self.in_flight -= 1
+
+
+def _page(client: FakeCDPClient) -> Page:
+	browser_session = SimpleNamespace(cdp_client=client)
+	return Page(browser_session, target_id='target-1', session_id='session-1')  # type: ignore[arg-type]
+
+
+async def test_mouse_steps_are_pipelined_in_order():
+	client = FakeCDPClient()
+	page = _page(client)
+	mouse = await page.mouse
+
+	started = time.perf_counter()
+	async with page.batch() as batch:
+		await mouse.move(100, 50, steps=10)
+		await mouse.down()
+		await mouse.up()
+	# 12 commands at 50ms each, confirmed together in roughly one round trip
+	assert time.perf_counter() - started < client.latency * 4
+
+	assert batch.commands_sent == 12
+	moves = [params for method, params in client.written if params and params['type'] == 'mouseMoved']
+	assert [(m['x'], m['y']) for m in moves] == [(10 * i, 5 * i) for i in range(1, 11)]
+	assert [params['type'] for _, params in client.written[-2:]] == ['mousePressed', 'mouseReleased']
+	assert client.written[-1][1]['x'] == 100 and client.written[-1][1]['y'] == 50
+	assert client.max_in_flight == 12
+
+
+async def test_results_still_returned_and_reads_overlap():
+	client = FakeCDPClient()
+	page = _page(client)
+
+	async with page.batch():
+		results = await asyncio.gather(*(page._client.send.DOM.describeNode(params={'nodeId': i}) for i in range(5)))
+
+	assert [r['method'] for r in results] == ['DOM.describeNode'] * 5
+	assert client.max_in_flight == 5
+
+
+async def test_fire_and_forget_errors_raise_on_exit():
+	client = FakeCDPClient(fail='Input.dispatchMouseEvent')
+	page = _page(client)
+	mouse = await page.mouse
+
+	with pytest.raises(RuntimeError, match='dispatchMouseEvent failed'):
+		async with page.batch():
+			await mouse.move(10, 10)
+
+
+async def test_outside_batch_uses_raw_client():
+	client = FakeCDPClient(latency=0)
+	page = _page(client)
+	mouse = Mouse(page._browser_session, 'session-1')
+
+	assert page._client is client
+	await mouse.move(20, 20, steps=2)
+	assert [params['x'] for _, params in client.written] == [10, 20]
+
+	async with CDPBatch(client):  # type: ignore[arg-type]
+		assert page._client is not client
+		with pytest.raises(RuntimeError):
+			async with page.batch():
+				pass
+	assert page._client is client
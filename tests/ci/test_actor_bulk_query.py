@@ -0,0 +1,78 @@
+"""Tests for bulk CSS selector resolution in the actor Page."""
+
+from types import SimpleNamespace
+
+from web_agent.actor.element import Element
+from web_agent.actor.page import Page
+
+
+class FakeDOM:
+	"""DOM domain over a document with one table of N rows"""
+
+	def __init__(self, rows: int):
+		self.calls: list[str] = []
+		row_nodes = [{'nodeId': 100 + i, 'backendNodeId': 5000 + i, 'nodeName': 'TR'} for i in range(rows)]
+		template = {'nodeId': 90, 'backendNodeId': 4090, 'nodeName': 'TEMPLATE', 'templateContent': {'nodeId': 91, 'backendNodeId': 4091}}
+		table = {'nodeId': 3, 'backendNodeId': 4003, 'nodeName': 'TABLE', 'children': row_nodes}
+		body = {'nodeId': 2, 'backendNodeId': 4002, 'nodeName': 'BODY', 'children': [table, template]}
+		self.document = {'nodeId': 1, 'backendNodeId': 4001, 'nodeName': '#document', 'children': [body]}
+		self.matches = [node['nodeId'] for node in row_nodes]
+
+	async def getDocument(self, params=None, session_id=None):
+		depth = (params or {}).get('depth', 1)
+		self.calls.append(f'getDocument(depth={depth})')
+		return {'root': self.document if depth == -1 else {**self.document, 'children': []}}
+
+	async def querySelectorAll(self, params, session_id=None):
+		self.calls.append('querySelectorAll')
+		return {'nodeIds': [*self.matches, 999]}  # 999: node created after the tree snapshot
+
+	async def describeNode(self, params, session_id=None):
+		self.calls.append('describeNode')
+		backend_node_id = 5000 + params['nodeId'] - 100 if params['nodeId'] in self.matches else 9999
+		return {'node': {'backendNodeId': backend_node_id}}
+
+
+def _page(dom: FakeDOM) -> Page:
+	client = SimpleNamespace(send=SimpleNamespace(DOM=dom))
+	browser_session = SimpleNamespace(cdp_client=client)
+	return Page(browser_session, target_id='target-1', session_id='session-1')  # type: ignore[arg-type]
+
+
+async def test_query_uses_constant_number_of_cdp_calls():
+	dom = FakeDOM(rows=500)
+	page = _page(dom)
+
+	backend_node_ids = await page.query_backend_node_ids('tr')
+
+	assert backend_node_ids[:500] == [5000 + i for i in range(500)]
+	assert backend_node_ids[-1] == 9999
+	# The full tree is fetched once and only the node missing from the snapshot is described individually
+	assert dom.calls == [
+		'getDocument(depth=1)',
+		'querySelectorAll',
+		'getDocument(depth=-1)',
+		'querySelectorAll',
+		'describeNode',
+	]
+
+
+async def test_few_matches_skip_the_full_document():
+	dom = FakeDOM(rows=500)
+	dom.matches = dom.matches[:1]
+	page = _page(dom)
+
+	assert await page.query_backend_node_ids('tr:first-child') == [5000, 9999]
+	assert dom.calls == ['getDocument(depth=1)', 'querySelectorAll', 'describeNode', 'describeNode']
+
+
+async def test_get_elements_by_css_selector_builds_elements():
+	dom = FakeDOM(rows=3)
+	dom.matches = dom.matches[:2]
+	page = _page(dom)
+
+	elements = await page.get_elements_by_css_selector('tr')
+
+	assert all(isinstance(element, Element) for element in elements)
+	assert [element._backend_node_id for element in elements] == [5000, 5001, 9999]
+	assert all(element._session_id == 'session-1' for element in elements)
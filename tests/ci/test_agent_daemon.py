@@ -0,0 +1,184 @@
+"""Tests for the warm agent daemon and its newline-JSON client (agent, LLM and browser are faked)."""
+
+import asyncio
+import os
+import time
+from typing import Any
+
+import pytest
+
+import web_agent.agent.service
+import web_agent.skill_cli.commands.agent
+from web_agent.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from web_agent.skill_cli import daemon
+from web_agent.skill_cli.utils import cleanup_session_files, get_socket_path
+
+
+class FakeHistory:
+	def __init__(self, task: str):
+		self.task = task
+
+	def final_result(self) -> str:
+		return f'did {self.task}'
+
+	def is_done(self) -> bool:
+		return True
+
+	def is_successful(self) -> bool:
+		return True
+
+	def number_of_steps(self) -> int:
+		return 1
+
+	def errors(self) -> list[str | None]:
+		return [None]
+
+
+class FakeLLM:
+	model = 'fake-model'
+	provider = 'fake'
+	name = 'fake-model'
+	model_name = 'fake-model'
+	_verified_api_keys = True
+
+	def __init__(self):
+		self.calls = 0
+
+	async def ainvoke(self, messages: list[Any], output_format: Any = None, **kwargs: Any) -> ChatInvokeCompletion:
+		self.calls += 1
+		usage = ChatInvokeUsage(
+			prompt_tokens=10,
+			prompt_cached_tokens=None,
+			prompt_cache_creation_tokens=None,
+			prompt_image_tokens=None,
+			completion_tokens=1,
+			total_tokens=11,
+		)
+		return ChatInvokeCompletion(completion='ok', usage=usage)
+
+
+class FakeAgent:
+	instances: list['FakeAgent'] = []
+
+	def __init__(self, task: str, llm: Any, browser_session: Any, **kwargs):
+		self.task = task
+		self.llm = llm
+		self.browser_session = browser_session
+		FakeAgent.instances.append(self)
+
+	async def run(self, max_steps: int = 100) -> FakeHistory:
+		return FakeHistory(self.task)
+
+
+@pytest.fixture
+async def running_daemon(monkeypatch):
+	session = f'test-daemon-{os.getpid()}-{time.time_ns()}'
+	monkeypatch.setattr(daemon, 'DAEMON_SESSION', session)
+	llm_calls: list[str | None] = []
+
+	def fake_get_llm(model: str | None = None) -> Any:
+		llm_calls.append(model)
+		return object()
+
+	monkeypatch.setattr(web_agent.skill_cli.commands.agent, 'get_llm', fake_get_llm)
+	monkeypatch.setattr(web_agent.agent.service, 'Agent', FakeAgent)
+	FakeAgent.instances = []
+
+	agent_daemon = daemon.AgentDaemon(idle_timeout=60)
+	browser_session = object()
+	browser_settings: list[dict[str, Any] | None] = []
+
+	async def warm_up() -> None:
+		agent_daemon._warm.set()
+
+	async def get_browser_session(settings: dict[str, Any] | None = None) -> Any:
+		browser_settings.append(settings)
+		return browser_session
+
+	monkeypatch.setattr(agent_daemon, 'warm_up', warm_up)
+	monkeypatch.setattr(agent_daemon, '_get_browser_session', get_browser_session)
+
+	server_task = asyncio.create_task(agent_daemon.run())
+	for _ in range(100):
+		if os.path.exists(get_socket_path(session)):
+			break
+		await asyncio.sleep(0.01)
+	yield agent_daemon, llm_calls, browser_session, browser_settings
+	agent_daemon.request_shutdown()
+	await asyncio.wait_for(server_task, timeout=5)
+	cleanup_session_files(session)
+
+
+async def test_tasks_reuse_warm_llm_and_browser(running_daemon):
+	agent_daemon, llm_calls, browser_session, _ = running_daemon
+
+	ping = await asyncio.to_thread(daemon.send_request, 'ping', timeout=5)
+	assert ping.success and ping.data['warm'] and ping.data['pid'] == os.getpid()
+
+	first = await asyncio.to_thread(daemon.send_request, 'run', {'task': 'open example.com'})
+	second = await asyncio.to_thread(daemon.send_request, 'run', {'task': 'read the title'})
+	assert first.success and first.data['result'] == 'did open example.com'
+	assert second.data['errors'] == [] and second.data['done']
+
+	assert llm_calls == [None]  # LLM created once and reused
+	assert FakeAgent.instances[0].llm is FakeAgent.instances[1].llm
+	assert all(agent.browser_session is browser_session for agent in FakeAgent.instances)
+	assert agent_daemon.tasks_run == 2
+
+
+async def test_errors_are_returned_in_response(running_daemon):
+	missing_task = await asyncio.to_thread(daemon.send_request, 'run', {}, 5)
+	assert not missing_task.success and 'No task provided' in (missing_task.error or '')
+
+	unknown = await asyncio.to_thread(daemon.send_request, 'click', {}, 5)
+	assert not unknown.success and 'Unknown action' in (unknown.error or '')
+
+
+async def test_shutdown_stops_daemon(running_daemon):
+	response = await asyncio.to_thread(daemon.send_request, 'shutdown', None, 5)
+	assert response.success
+	for _ in range(100):
+		if not daemon.is_daemon_running():
+			break
+		await asyncio.sleep(0.02)
+	assert not daemon.is_daemon_running()
+
+
+async def test_browser_options_are_sent_with_the_task(running_daemon):
+	_, _, _, browser_settings = running_daemon
+	browser = daemon.browser_settings_from_cli({'headless': True, 'window_width': 800, 'proxy_url': 'http://proxy:8080'})
+
+	response = await asyncio.to_thread(daemon.send_request, 'run', {'task': 'open example.com', 'browser': browser})
+	assert response.success
+	assert browser_settings == [{'headless': True, 'window_width': 800, 'proxy': {'server': 'http://proxy:8080'}}]
+
+
+def test_cli_arguments_are_parsed_with_click(monkeypatch):
+	calls: list[tuple[str, dict[str, Any]]] = []
+	monkeypatch.setattr(daemon, 'run_task_via_daemon', lambda task, **kwargs: calls.append((task, kwargs)) or 0)
+
+	assert daemon.run_cli(['--debug', '--prompt=-find the cheapest flight', '--daemon', '--max-steps', '7']) == 0
+	assert daemon.run_cli(['-p', '--compare prices', '--daemon', '--headless', '--cdp-url', 'http://localhost:9222']) == 0
+	assert daemon.run_cli(['-p', 'task', '--model', 'gpt-5-mini']) is None  # no --daemon: the normal CLI runs it
+
+	assert calls == [
+		('-find the cheapest flight', {'model': None, 'max_steps': 7, 'browser': {}}),
+		('--compare prices', {'model': None, 'max_steps': None, 'browser': {'headless': True, 'cdp_url': 'http://localhost:9222'}}),
+	]
+	assert daemon.run_cli(['--daemon']) == 1
+
+
+async def test_agents_reusing_an_llm_count_only_their_own_calls():
+	# The daemon hands its cached LLM to a new Agent for every task
+	llm = FakeLLM()
+	original_ainvoke = llm.ainvoke
+	agents = []
+	for task_index in range(5):
+		agents.append(web_agent.agent.service.Agent(task=f'task {task_index}', llm=llm))  # type: ignore[arg-type]
+		for _ in range(task_index + 1):
+			await llm.ainvoke([])
+
+	assert llm.calls == 15
+	assert [len(agent.token_cost_service.usage_history) for agent in agents] == [1, 2, 3, 4, 5]
+	# ainvoke is wrapped once, not once more per agent
+	assert llm.ainvoke.original_ainvoke == original_ainvoke  # type: ignore[attr-defined]
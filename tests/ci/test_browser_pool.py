@@ -0,0 +1,196 @@
+"""Tests for BrowserPool context scheduling, health checks and recycling (browser launches are faked)."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from web_agent.agent.service import Agent
+from web_agent.browser.pool import BrowserPool, _PooledBrowser
+from web_agent.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+
+
+class FakeCrashWatchdog:
+	def __init__(self):
+		self.healthy = True
+
+	async def check_health(self, timeout: float = 2.0) -> bool:
+		return self.healthy
+
+
+class FakeOwner:
+	def __init__(self, index: int):
+		self.index = index
+		self._cdp_client_root = object()
+		self.killed = False
+
+
+class FakeSession:
+	def __init__(self, session_id: str, browser: _PooledBrowser):
+		self.id = session_id
+		self.browser = browser
+		self.killed = False
+
+	async def kill(self) -> None:
+		self.killed = True
+
+
+class FakePool(BrowserPool):
+	def __init__(self, **kwargs):
+		super().__init__(**kwargs)
+		self.launched: list[_PooledBrowser] = []
+		self.disposed: list[str] = []
+
+	async def _launch(self) -> _PooledBrowser:
+		await asyncio.sleep(0)
+		browser = _PooledBrowser(
+			owner=FakeOwner(len(self.launched)),  # type: ignore[arg-type]
+			cdp_url=f'ws://fake/{len(self.launched)}',
+			crash_watchdog=FakeCrashWatchdog(),  # type: ignore[arg-type]
+		)
+		self.launched.append(browser)
+		self.stats.browsers_launched += 1
+		return browser
+
+	async def _open_context(self, browser: _PooledBrowser) -> Any:
+		self.stats.contexts_created += 1
+		session = FakeSession(f'session-{self.stats.contexts_created}', browser)
+		self._leases[session.id] = (browser, f'context-{self.stats.contexts_created}')
+		return session
+
+	async def _dispose_context(self, browser: _PooledBrowser, browser_context_id: str) -> None:
+		self.disposed.append(browser_context_id)
+
+	async def _kill(self, browser: _PooledBrowser) -> None:
+		browser.owner.killed = True  # type: ignore[attr-defined]
+
+
+async def test_contexts_spread_across_browsers_and_wait_for_capacity():
+	pool = FakePool(size=2, max_contexts_per_browser=1)
+	first = await pool.acquire()
+	second = await pool.acquire()
+	assert first.browser is not second.browser
+	assert len(pool.launched) == 2
+
+	waiting = asyncio.create_task(pool.acquire())
+	await asyncio.sleep(0.05)
+	assert not waiting.done()
+
+	await pool.release(first)
+	third = await asyncio.wait_for(waiting, timeout=1)
+	assert third.browser is first.browser
+	assert first.killed and pool.disposed == ['context-1']
+	assert len(pool.launched) == 2
+
+	await pool.close()
+	assert all(browser.owner.killed for browser in pool.launched)
+	with pytest.raises(RuntimeError):
+		await pool.acquire()
+
+
+async def test_browser_is_recycled_after_max_tasks():
+	pool = FakePool(size=1, max_tasks_per_browser=2)
+	for _ in range(2):
+		async with pool.session() as session:
+			pass
+	assert session.browser is pool.launched[0]
+	assert pool.launched[0].owner.killed
+	assert pool.stats.browsers_recycled == 1
+
+	async with pool.session() as session:
+		assert session.browser is pool.launched[1]
+	assert len(pool.launched) == 2
+	await pool.close()
+
+
+async def test_retiring_browser_stays_alive_until_drained():
+	pool = FakePool(size=1, max_tasks_per_browser=1, max_contexts_per_browser=2)
+	first = await pool.acquire()
+	second = await pool.acquire()
+	assert first.browser is not second.browser
+	assert not first.browser.owner.killed
+	await pool.release(first)
+	assert first.browser.owner.killed
+	await pool.close()
+
+
+async def test_unhealthy_browser_is_replaced():
+	pool = FakePool(size=1)
+	await pool.start()
+	pool.launched[0].crash_watchdog.healthy = False  # type: ignore[attr-defined]
+
+	session = await pool.acquire()
+	assert session.browser is pool.launched[1]
+	assert pool.launched[0].owner.killed
+	assert pool.stats.browsers_unhealthy == 1
+	await pool.close()
+
+
+async def test_run_many_returns_histories_in_task_order():
+	running = 0
+	peak = 0
+
+	class FakeAgent(Agent):
+		def __init__(self, task: str, browser_session: Any, **kwargs):
+			self.task = task
+			self.browser_session = browser_session
+
+		async def run(self, max_steps: int = 500, on_step_start=None, on_step_end=None) -> Any:
+			nonlocal running, peak
+			running += 1
+			peak = max(peak, running)
+			await asyncio.sleep(0.01 * (5 - int(self.task)))
+			running -= 1
+			if self.task == '1':
+				raise RuntimeError('task 1 failed')
+			return f'history {self.task} in {self.browser_session.browser.cdp_url}'
+
+	pool = FakePool(size=1, max_contexts_per_browser=4)
+	histories = await FakeAgent.run_many([str(i) for i in range(5)], concurrency=2, browser_pool=pool)
+	# The failure is reported in place and the other tasks still run to completion
+	assert isinstance(histories[1], RuntimeError)
+	assert [histories[i] for i in (0, 2, 3, 4)] == [f'history {i} in ws://fake/0' for i in (0, 2, 3, 4)]
+	assert peak == 2
+	assert sorted(pool.disposed) == [f'context-{i}' for i in range(1, 6)]
+
+	with pytest.raises(ValueError):
+		await Agent.run_many(['task'], browser_session=object())
+	await pool.close()
+
+
+async def test_run_many_keeps_usage_separate_for_a_shared_llm():
+	class FakeLLM:
+		model = 'fake-model'
+		provider = 'fake'
+		name = 'fake-model'
+		model_name = 'fake-model'
+		_verified_api_keys = True
+
+		async def ainvoke(self, messages: list[Any], output_format: Any = None, **kwargs: Any) -> ChatInvokeCompletion:
+			await asyncio.sleep(0.001)
+			usage = ChatInvokeUsage(
+				prompt_tokens=10,
+				prompt_cached_tokens=None,
+				prompt_cache_creation_tokens=None,
+				prompt_image_tokens=None,
+				completion_tokens=1,
+				total_tokens=11,
+			)
+			return ChatInvokeCompletion(completion='ok', usage=usage)
+
+	class FakeAgent(Agent):
+		def __init__(self, task: str, browser_session: Any, **kwargs):
+			# The real constructor registers the LLM for token tracking, the pooled session is attached afterwards
+			super().__init__(task=task, **kwargs)
+			self.browser_session = browser_session
+
+		async def run(self, max_steps: int = 500, on_step_start=None, on_step_end=None) -> Any:
+			# The agents' calls interleave on the shared LLM
+			for _ in range(int(self.task)):
+				await self.llm.ainvoke([])
+			return [entry.usage.total_tokens for entry in self.token_cost_service.usage_history]
+
+	pool = FakePool(size=1, max_contexts_per_browser=4)
+	usages = await FakeAgent.run_many(['1', '2', '3', '4'], concurrency=4, browser_pool=pool, llm=FakeLLM())
+	assert usages == [[11] * count for count in (1, 2, 3, 4)]
+	await pool.close()
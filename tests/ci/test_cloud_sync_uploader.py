@@ -0,0 +1,149 @@
+"""Tests for the background cloud sync uploader: batching, gzip payloads, and spooling while the endpoint is down."""
+
+import gzip
+import json
+import os
+import socket
+import threading
+import time
+
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from web_agent.agent.cloud_events import CreateAgentTaskEvent
+from web_agent.sync.service import CloudSync
+from web_agent.sync.uploader import EventUploader
+
+
+def _received_batches(httpserver: HTTPServer) -> list[list[dict]]:
+	batches = []
+	for request, _ in httpserver.log:
+		assert request.headers['Content-Encoding'] == 'gzip'
+		batches.append(json.loads(gzip.decompress(request.get_data()))['events'])
+	return batches
+
+
+def _unused_port() -> int:
+	with socket.socket() as sock:
+		sock.bind(('127.0.0.1', 0))
+		return sock.getsockname()[1]
+
+
+async def test_events_are_batched_and_gzipped(httpserver: HTTPServer):
+	httpserver.expect_request('/api/v1/events', method='POST').respond_with_json({'ok': True})
+	uploader = EventUploader(
+		endpoint=httpserver.url_for('/api/v1/events'),
+		get_headers=lambda: {'Authorization': 'Bearer token'},
+		max_batch_events=3,
+		flush_interval=5.0,
+	)
+
+	for i in range(7):
+		uploader.submit({'event_type': 'Test', 'index': i})
+	await uploader.flush()
+
+	batches = _received_batches(httpserver)
+	assert [len(batch) for batch in batches] == [3, 3, 1]
+	assert [event['index'] for batch in batches for event in batch] == list(range(7))
+	assert httpserver.log[0][0].headers['Authorization'] == 'Bearer token'
+	assert uploader.events_sent == 7
+
+	# The byte limit splits batches too
+	httpserver.clear_log()
+	uploader.max_batch_events = 50
+	uploader.max_batch_bytes = 300
+	for i in range(4):
+		uploader.submit({'event_type': 'Test', 'payload': 'x' * 100, 'index': i})
+	await uploader.flush()
+	assert [len(batch) for batch in _received_batches(httpserver)] == [2, 2]
+	await uploader.close()
+
+
+async def test_events_are_spooled_while_endpoint_is_down_and_resent(httpserver: HTTPServer, tmp_path):
+	spool_path = tmp_path / 'events' / 'spool.jsonl'
+	down = EventUploader(endpoint=f'http://127.0.0.1:{_unused_port()}/api/v1/events', spool_path=spool_path, timeout=2.0)
+	for i in range(3):
+		down.submit({'event_type': 'Test', 'index': i})
+	await down.flush()
+	await down.close()
+
+	assert down.events_spooled == 3
+	own_spool = spool_path.with_name(f'spool.{os.getpid()}.jsonl')
+	assert [json.loads(line)['index'] for line in own_spool.read_text().splitlines()] == [0, 1, 2]
+
+	# A later uploader re-sends the spool once the endpoint is reachable
+	httpserver.expect_request('/api/v1/events', method='POST').respond_with_json({'ok': True})
+	up = EventUploader(endpoint=httpserver.url_for('/api/v1/events'), spool_path=spool_path)
+	up.submit({'event_type': 'Test', 'index': 3})
+	await up.flush()
+	await up.close()
+
+	assert sorted(event['index'] for batch in _received_batches(httpserver) for event in batch) == [0, 1, 2, 3]
+	assert list(spool_path.parent.iterdir()) == []
+
+
+async def test_replay_skips_spools_of_running_processes(httpserver: HTTPServer, tmp_path):
+	spool_path = tmp_path / 'spool.jsonl'
+	dead_pid = 2**22 + 12345  # Above the default pid_max, so no such process
+	(tmp_path / f'spool.{dead_pid}.jsonl').write_text('{"index":0}\n')
+	(tmp_path / f'spool.{os.getppid()}.jsonl').write_text('{"index":1}\n')  # Still being appended to
+	spool_path.write_text('{"index":2}\n')  # Written by an older version
+
+	httpserver.expect_request('/api/v1/events', method='POST').respond_with_json({'ok': True})
+	uploader = EventUploader(endpoint=httpserver.url_for('/api/v1/events'), spool_path=spool_path)
+	uploader.submit({'index': 3})
+	await uploader.flush()
+	await uploader.close()
+
+	assert sorted(event['index'] for batch in _received_batches(httpserver) for event in batch) == [0, 2, 3]
+	assert [path.name for path in tmp_path.iterdir()] == [f'spool.{os.getppid()}.jsonl']
+
+
+async def test_full_queue_spools_off_the_event_loop(tmp_path, monkeypatch):
+	spool_path = tmp_path / 'spool.jsonl'
+	uploader = EventUploader(endpoint=f'http://127.0.0.1:{_unused_port()}/api/v1/events', spool_path=spool_path, max_queue_size=1)
+	threads: list[str] = []
+	append = uploader._append_to_spool
+
+	def recording_append(batch: list[bytes], check_size: bool = True) -> bool:
+		threads.append(threading.current_thread().name)
+		return append(batch, check_size)
+
+	monkeypatch.setattr(uploader, '_append_to_spool', recording_append)
+	for i in range(5):
+		uploader.submit({'index': i})
+	await uploader.flush()
+	await uploader.close()
+
+	assert uploader.events_spooled == 5
+	assert threads and threading.main_thread().name not in threads
+
+
+async def test_handle_event_does_not_wait_for_upload(httpserver: HTTPServer, tmp_path, monkeypatch):
+	monkeypatch.setenv('web_agent_CLOUD_SYNC', 'true')
+	monkeypatch.setenv('web_agent_CONFIG_DIR', str(tmp_path))
+
+	def slow_handler(request: Request) -> Response:
+		time.sleep(0.5)
+		return Response('{}', content_type='application/json')
+
+	httpserver.expect_request('/api/v1/events', method='POST').respond_with_handler(slow_handler)
+	cloud_sync = CloudSync(base_url=httpserver.url_for(''), allow_session_events_for_auth=True)
+	event = CreateAgentTaskEvent(
+		user_id='',
+		agent_session_id='session',
+		llm_model='test',
+		task='test',
+		done_output=None,
+		user_feedback_type=None,
+		user_comment=None,
+		gif_url=None,
+	)
+
+	start = time.perf_counter()
+	await cloud_sync.handle_event(event)
+	assert time.perf_counter() - start < 0.2
+
+	await cloud_sync.close()
+	(sent_event,) = _received_batches(httpserver)[0]
+	assert sent_event['task'] == 'test'
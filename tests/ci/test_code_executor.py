@@ -0,0 +1,67 @@
+"""Tests for the code-use cell executor: compile cache, top-level await and per-cell stdout capture."""
+
+import asyncio
+
+import pytest
+
+from web_agent.code_use import executor
+from web_agent.code_use.executor import capture_cell_output, clear_compile_cache, compile_cell, run_cell
+
+
+async def test_top_level_await_persists_variables():
+	namespace: dict = {'asyncio': asyncio}
+
+	await run_cell('x = 10\nawait asyncio.sleep(0)\ny = x + 1', namespace)
+	await run_cell('x = x + 5\nasync with asyncio.timeout(1):\n    z = await asyncio.sleep(0, result=y)', namespace)
+	await run_cell('def total():\n    return x + y + z', namespace)
+
+	assert namespace['x'] == 15
+	assert namespace['total']() == 15 + 11 + 11
+
+
+async def test_compiled_code_is_cached_by_source():
+	clear_compile_cache()
+	first = compile_cell('a = 1')
+	assert compile_cell('a = 1') is first
+	assert compile_cell('a = 2') is not first
+
+	with pytest.raises(SyntaxError):
+		compile_cell('a = (')
+	assert len(executor._compiled_cells) == 2
+
+
+async def test_error_frames_point_at_cell():
+	namespace: dict = {}
+	with pytest.raises(ZeroDivisionError) as exc_info:
+		await run_cell('a = 1\nb = a / 0', namespace)
+
+	frames = [tb for tb in _walk(exc_info.value.__traceback__) if tb.tb_frame.f_code.co_filename == executor.CELL_FILENAME]
+	assert frames and frames[0].tb_lineno == 2
+
+
+def _walk(tb):
+	while tb is not None:
+		yield tb
+		tb = tb.tb_next
+
+
+async def test_concurrent_cells_capture_their_own_output():
+	async def agent(name: str) -> str:
+		namespace: dict = {'asyncio': asyncio, 'name': name}
+		with capture_cell_output() as captured:
+			await run_cell('for i in range(5):\n    print(name, i)\n    await asyncio.sleep(0)', namespace)
+		return captured.getvalue()
+
+	outputs = await asyncio.gather(*(agent(f'agent-{n}') for n in range(3)))
+
+	for n, output in enumerate(outputs):
+		assert output.splitlines() == [f'agent-{n} {i}' for i in range(5)]
+
+
+def test_prints_outside_cells_reach_real_stdout(capsys):
+	with capture_cell_output() as captured:
+		print('inside')
+	print('outside')
+
+	assert captured.getvalue() == 'inside\n'
+	assert capsys.readouterr().out == 'outside\n'
@@ -0,0 +1,163 @@
+"""Tests for the process-isolated code-use execution backend."""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from web_agent.code_use import isolation
+from web_agent.code_use.executor import capture_cell_output
+from web_agent.code_use.isolation import CellCPULimitExceeded, IsolatedWorkerError, IsolatedWorkerPool, RemoteValue
+
+
+class FakePage:
+	"""Unpicklable object that should come back to the worker as a handle"""
+
+	def __init__(self, url: str):
+		self.url = url
+		self._lock = threading.Lock()
+
+	async def title(self) -> str:
+		return f'Title of {self.url}'
+
+
+def _namespace(calls: list) -> dict:
+	async def navigate(url: str) -> str:
+		calls.append(('navigate', url, os.getpid()))
+		print(f'navigated to {url}')
+		return f'Navigated to {url}'
+
+	async def get_page(url: str) -> FakePage:
+		return FakePage(url)
+
+	async def fail() -> None:
+		raise ValueError('helper failed')
+
+	return {'navigate': navigate, 'get_page': get_page, 'fail': fail, '_code_block_vars': set()}
+
+
+@pytest.fixture
+async def pool():
+	pool = IsolatedWorkerPool(size=1, cpu_limit_seconds=2)
+	yield pool
+	await pool.close()
+
+
+async def test_cells_run_in_worker_with_proxied_helpers(pool: IsolatedWorkerPool):
+	calls: list = []
+	namespace = _namespace(calls)
+	executor = await pool.acquire()
+	try:
+		with capture_cell_output() as captured:
+			await executor.run_cell("import os\nresult = await navigate('https://example.com')\nworker_pid = os.getpid()", namespace)
+
+		assert namespace['result'] == 'Navigated to https://example.com'
+		assert namespace['worker_pid'] != os.getpid()
+		assert calls == [('navigate', 'https://example.com', os.getpid())]
+		assert captured.getvalue() == 'navigated to https://example.com\n'
+
+		# Variables persist in the worker between cells; unpicklable results come back as handles
+		await executor.run_cell("page = await get_page(result)\ntitle = await page.title()\ncount = len(result)", namespace)
+		assert namespace['title'] == 'Title of Navigated to https://example.com'
+		assert namespace['count'] == len(namespace['result'])
+		assert isinstance(namespace['page'], FakePage)
+
+		await executor.run_cell('funcs = [lambda: 1]', namespace)
+		assert isinstance(namespace['funcs'], RemoteValue)
+
+		with pytest.raises(ValueError, match='helper failed'):
+			await executor.run_cell('await fail()', namespace)
+
+		await executor.run_cell('del count', namespace)
+		assert 'count' not in namespace
+	finally:
+		await executor.close()
+
+
+async def test_cpu_heavy_cell_does_not_block_event_loop(pool: IsolatedWorkerPool):
+	executor = await pool.acquire()
+	ticks = 0
+
+	async def ticker():
+		nonlocal ticks
+		while True:
+			await asyncio.sleep(0.01)
+			ticks += 1
+
+	ticker_task = asyncio.create_task(ticker())
+	try:
+		await executor.run_cell('total = sum(i * i for i in range(3_000_000))', {})
+	finally:
+		ticker_task.cancel()
+		await executor.close()
+	assert ticks > 5
+
+
+async def test_cpu_limit_interrupts_cell(pool: IsolatedWorkerPool):
+	namespace: dict = {}
+	executor = await pool.acquire()
+	try:
+		with pytest.raises(CellCPULimitExceeded):
+			await executor.run_cell('while True:\n    pass', namespace)
+		# The worker survives and keeps its namespace
+		await executor.run_cell('x = 1', namespace)
+		assert namespace['x'] == 1
+	finally:
+		await executor.close()
+
+
+async def test_crashed_worker_is_replaced(pool: IsolatedWorkerPool):
+	namespace: dict = {}
+	executor = await pool.acquire()
+	try:
+		await executor.run_cell('x = 1', namespace)
+		with pytest.raises(IsolatedWorkerError):
+			await executor.run_cell('import os\nos._exit(3)', namespace)
+		assert 'x' not in namespace
+
+		await executor.run_cell('y = 2', namespace)
+		assert namespace['y'] == 2
+	finally:
+		await executor.close()
+
+
+async def test_warm_pool_reduces_startup(pool: IsolatedWorkerPool):
+	cold_started = time.perf_counter()
+	cold = await pool.acquire()
+	await cold.run_cell('x = 1', {})
+	cold_time = time.perf_counter() - cold_started
+	await cold.close()
+
+	await pool.start()
+	await asyncio.sleep(cold_time * 1.5)  # Let the warm worker finish importing
+	warm_started = time.perf_counter()
+	warm = await pool.acquire()
+	await warm.run_cell('x = 1', {})
+	warm_time = time.perf_counter() - warm_started
+	await warm.close()
+
+	assert warm_time < cold_time
+
+
+def test_oversized_variables_are_summarized_without_pickling():
+	class FakeArray:
+		"""Reports its buffer size like a numpy array, pickling it would be the expensive part"""
+
+		nbytes = property(lambda self: 50_000_000)
+
+		def __reduce__(self):
+			raise AssertionError('oversized value was pickled')
+
+	worker = isolation._Worker(None, None, max_sync_bytes=1000)  # type: ignore[arg-type]
+	worker.namespace.update(
+		{'array': FakeArray(), 'rows': [{'id': i} for i in range(5000)], 'text': 'x' * 5000, 'small': {'a': [1, 2]}}
+	)
+
+	updated, removed = worker._sync_variables()
+
+	assert {name for name, value in updated.items() if isinstance(value, RemoteValue)} == {'array', 'rows', 'text'}
+	assert updated['rows'].length == 5000 and len(updated['rows'].preview) <= 100
+	assert isinstance(updated['small'], bytes)
+	assert removed == []
@@ -0,0 +1,78 @@
+"""Tests for Config's cached lookups: env changes are seen, config.json is re-read only when it changes."""
+
+import json
+import os
+
+from web_agent import config as config_module
+from web_agent.config import Config
+
+
+def test_env_changes_are_picked_up(monkeypatch):
+	config = Config()
+	monkeypatch.setenv('web_agent_LOGGING_LEVEL', 'warning')
+	assert config.web_agent_LOGGING_LEVEL == 'warning'
+	monkeypatch.setenv('web_agent_LOGGING_LEVEL', 'DEBUG')
+	assert config.web_agent_LOGGING_LEVEL == 'debug'
+
+	# Derived values follow the env vars they depend on
+	monkeypatch.delenv('web_agent_CLOUD_SYNC', raising=False)
+	monkeypatch.setenv('ANONYMIZED_TELEMETRY', 'false')
+	assert config.web_agent_CLOUD_SYNC is False
+	monkeypatch.setenv('ANONYMIZED_TELEMETRY', 'true')
+	assert config.web_agent_CLOUD_SYNC is True
+
+	monkeypatch.setenv('web_agent_HEADLESS', 'false')
+	assert config.load_config()['browser_profile']['headless'] is False
+	monkeypatch.setenv('web_agent_HEADLESS', 'true')
+	assert config.load_config()['browser_profile']['headless'] is True
+
+
+def test_config_json_reloaded_only_when_changed(monkeypatch, tmp_path):
+	config_path = tmp_path / 'config.json'
+	monkeypatch.setenv('web_agent_CONFIG_PATH', str(config_path))
+	config = Config()
+
+	db_config = config._get_db_config()
+	assert config._get_db_config() is db_config
+
+	data = json.loads(config_path.read_text())
+	profile_id = next(iter(data['browser_profile']))
+	data['browser_profile'][profile_id]['headless'] = False
+	config_path.write_text(json.dumps(data, indent=2))
+	stat = config_path.stat()
+	os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+	reloaded = config._get_db_config()
+	assert reloaded is not db_config
+	assert config.load_config()['browser_profile']['headless'] is False
+
+	config.invalidate()
+	assert config._get_db_config() is not reloaded
+
+
+def test_dotenv_is_stat_ed_once_per_interval(monkeypatch, tmp_path):
+	monkeypatch.chdir(tmp_path)
+	monkeypatch.delenv('web_agent_CONFIG_PATH', raising=False)
+	(tmp_path / '.env').write_text('web_agent_CONFIG_PATH=first.json\n')
+	config = Config()
+	assert config.web_agent_CONFIG_PATH == 'first.json'
+
+	stats: list[str] = []
+	original_file_stamp = config_module._file_stamp
+
+	def counting_file_stamp(path):
+		if str(path) == '.env':
+			stats.append(str(path))
+		return original_file_stamp(path)
+
+	monkeypatch.setattr(config_module, '_file_stamp', counting_file_stamp)
+	for _ in range(100):
+		assert config.web_agent_CONFIG_PATH == 'first.json'
+		config.load_config()
+	assert stats == []
+
+	# Edits show up after invalidate() (or once the check interval has passed)
+	(tmp_path / '.env').write_text('web_agent_CONFIG_PATH=second.json\n')
+	config.invalidate()
+	assert config.web_agent_CONFIG_PATH == 'second.json'
+	assert stats == ['.env']
@@ -0,0 +1,81 @@
+"""Tests for the cached, page-by-page document reader used for external PDF and DOCX files."""
+
+import shutil
+from pathlib import Path
+
+import pypdf
+import pytest
+from docx import Document
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from web_agent.filesystem import document_reader
+from web_agent.filesystem.document_reader import DocumentReader
+from web_agent.filesystem.file_system import FileSystem
+
+
+def _make_pdf(path: Path, pages: list[str]) -> None:
+	pdf = canvas.Canvas(str(path), pagesize=letter)
+	for text in pages:
+		pdf.drawString(72, 720, text)
+		pdf.showPage()
+	pdf.save()
+
+
+async def test_pdf_pages_are_cached_by_content_hash(tmp_path: Path, monkeypatch):
+	pages = [f'Page {i} talks about topic{i}' for i in range(1, 6)]
+	pdf_path = tmp_path / 'report.pdf'
+	_make_pdf(pdf_path, pages)
+	reader = DocumentReader(cache_dir=tmp_path / 'cache')
+
+	document = await reader.open(pdf_path)
+	assert document.kind == 'pages'
+	assert document.num_segments == 5
+	assert 'topic3' in document.segment(2)
+	full_text = ''.join(document.iter_segments())
+	assert document.total_chars == len(full_text)
+	assert document.read(10, 50) == full_text[10:60]
+	with pytest.raises(IndexError):
+		document.segment(5)
+
+	# A copy under another name, read by a fresh reader, comes straight from the cache
+	def fail_parse(*args, **kwargs):
+		raise AssertionError('PDF parsed again')
+
+	monkeypatch.setattr(pypdf, 'PdfReader', fail_parse)
+	copy_path = tmp_path / 'copy.pdf'
+	shutil.copy(pdf_path, copy_path)
+	cached = await DocumentReader(cache_dir=tmp_path / 'cache').open(copy_path)
+	assert cached.sha256 == document.sha256
+	assert cached.read() == full_text
+
+
+async def test_docx_random_access_across_segments(tmp_path: Path, monkeypatch):
+	monkeypatch.setattr(document_reader, 'DOCX_SEGMENT_CHARS', 100)
+	paragraphs = [f'Paragraph {i}: ' + 'lorem ipsum ' * (i % 4) + 'é' for i in range(40)]
+	docx_path = tmp_path / 'notes.docx'
+	doc = Document()
+	for text in paragraphs:
+		doc.add_paragraph(text)
+	doc.save(str(docx_path))
+
+	document = DocumentReader(cache_dir=tmp_path / 'cache').open_sync(docx_path)
+
+	expected = '\n'.join(para.text for para in Document(str(docx_path)).paragraphs)
+	assert document.num_segments > 5
+	assert document.read() == expected
+	for offset, length in [(0, 10), (95, 30), (len(expected) - 20, 100), (250, 400)]:
+		assert document.read(offset, length) == expected[offset : offset + length]
+
+
+async def test_read_file_structured_uses_cache(tmp_path: Path, monkeypatch):
+	monkeypatch.setenv('web_agent_CONFIG_DIR', str(tmp_path / 'config'))
+	pdf_path = tmp_path / 'external.pdf'
+	_make_pdf(pdf_path, ['First page', 'Second page'])
+	fs = FileSystem(tmp_path / 'fs')
+
+	result = await fs.read_file_structured(str(pdf_path), external_file=True)
+
+	assert '(2 pages' in result['message']
+	assert '--- Page 2 ---\nSecond page' in result['message']
+	assert len(list((tmp_path / 'config' / 'document_cache').glob('*.json'))) == 1
@@ -0,0 +1,114 @@
+"""Tests for incremental FileSystem persistence: append-mode writes, throttled PDF/DOCX renders and on-disk state."""
+
+from pathlib import Path
+
+import pytest
+
+from web_agent.filesystem.file_system import FileSystem, FileSystemError, PdfFile
+
+
+async def test_append_writes_only_new_content(tmp_path: Path, monkeypatch):
+	fs = FileSystem(base_dir=tmp_path, create_default_files=False)
+	await fs.write_file('results.jsonl', '{"row": 0}\n')
+
+	full_writes: list[str] = []
+	original_write_text = Path.write_text
+
+	def counting_write_text(self, data, *args, **kwargs):
+		full_writes.append(self.name)
+		return original_write_text(self, data, *args, **kwargs)
+
+	monkeypatch.setattr(Path, 'write_text', counting_write_text)
+
+	for i in range(1, 200):
+		assert 'successfully' in await fs.append_file('results.jsonl', f'{{"row": {i}}}\n')
+
+	assert full_writes == []
+	expected = ''.join(f'{{"row": {i}}}\n' for i in range(200))
+	assert fs.get_file('results.jsonl').content == expected
+	assert (fs.get_dir() / 'results.jsonl').read_text() == expected
+
+
+async def test_pdf_renders_are_throttled_and_flushed(tmp_path: Path, monkeypatch):
+	rendered: list[str] = []
+
+	def fake_render(self, path: Path) -> None:
+		rendered.append(self.content)
+		(path / self.full_name).write_text(self.content)
+
+	monkeypatch.setattr(PdfFile, 'sync_to_disk_sync', fake_render)
+	monkeypatch.setattr(PdfFile, 'render_interval', 0.2)
+	fs = FileSystem(base_dir=tmp_path, create_default_files=False)
+
+	await fs.write_file('report.pdf', '# Report\n')
+	for i in range(20):
+		await fs.append_file('report.pdf', f'line {i}\n')
+
+	# The first write rendered right away, the appends are coalesced into one trailing render
+	assert rendered == ['# Report\n']
+	await fs.flush()
+	expected = '# Report\n' + ''.join(f'line {i}\n' for i in range(20))
+	assert rendered == ['# Report\n', expected]
+	assert (fs.get_dir() / 'report.pdf').read_text() == expected
+
+
+async def test_pdf_render_error_is_reported(tmp_path: Path, monkeypatch):
+	def failing_render(self, path: Path) -> None:
+		raise FileSystemError(f"Error: Could not write to file '{self.full_name}'. boom")
+
+	monkeypatch.setattr(PdfFile, 'sync_to_disk_sync', failing_render)
+	fs = FileSystem(base_dir=tmp_path, create_default_files=False)
+
+	assert 'boom' in await fs.write_file('report.pdf', '# Report')
+
+
+async def test_large_files_are_referenced_from_state(tmp_path: Path):
+	fs = FileSystem(base_dir=tmp_path, create_default_files=False, max_inline_state_chars=100)
+	await fs.write_file('small.md', 'short')
+	await fs.write_file('rows.csv', 'a,b\n')
+	for i in range(50):
+		await fs.append_file('rows.csv', f'{i},{i * 2}\n')
+
+	state = fs.get_state()
+	assert state.files['small.md']['data']['content'] == 'short'
+	assert state.files['rows.csv']['on_disk'] is True
+	assert 'content' not in state.files['rows.csv']['data']
+
+	restored = FileSystem.from_state(state)
+	assert restored.get_file('rows.csv').content == fs.get_file('rows.csv').content
+	assert restored.get_file('small.md').content == 'short'
+
+	# A file that no longer matches the state is not silently restored
+	(restored.get_dir() / 'rows.csv').write_text('a,b\n')
+	with pytest.raises(FileSystemError):
+		FileSystem.from_state(state)
+
+
+async def test_crlf_files_restore_from_disk(tmp_path: Path):
+	fs = FileSystem(base_dir=tmp_path, create_default_files=False, max_inline_state_chars=5)
+	await fs.write_file('data.csv', 'a,b\r\n1,2\r\n')
+	await fs.append_file('data.csv', '3,4\r\n')
+
+	state = fs.get_state()
+	assert state.files['data.csv']['on_disk'] is True
+	assert (fs.get_dir() / 'data.csv').read_bytes() == b'a,b\r\n1,2\r\n3,4\r\n'
+
+	restored = FileSystem.from_state(state)
+	assert restored.get_file('data.csv').content == 'a,b\r\n1,2\r\n3,4\r\n'
+
+
+async def test_older_snapshot_restores_after_appends(tmp_path: Path):
+	fs = FileSystem(base_dir=tmp_path, create_default_files=False, max_inline_state_chars=10)
+	await fs.write_file('log.txt', 'first line of the log\n')
+	snapshot = fs.get_state()
+	assert snapshot.files['log.txt']['on_disk'] is True
+	await fs.append_file('log.txt', 'second line\n')
+
+	restored = FileSystem.from_state(snapshot)
+	assert restored.get_file('log.txt').content == 'first line of the log\n'
+	assert (restored.get_dir() / 'log.txt').read_text() == 'first line of the log\n'
+
+	# Offloading is opt-in: by default every file is embedded in the state
+	default_fs = FileSystem(base_dir=tmp_path / 'default', create_default_files=False)
+	await default_fs.write_file('big.txt', 'x' * 100_000)
+	assert 'on_disk' not in default_fs.get_state().files['big.txt']
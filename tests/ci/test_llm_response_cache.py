@@ -0,0 +1,135 @@
+"""Tests for the content-addressed LLM response cache used for extraction and judge calls."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel
+
+from web_agent.llm.cache import CachedChatModel, LLMResponseCache
+from web_agent.llm.messages import SystemMessage, UserMessage
+from web_agent.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+
+
+class Extracted(BaseModel):
+	title: str
+	price: float
+
+
+class FakeLLM:
+	model = 'fake-model'
+	_verified_api_keys = True
+
+	def __init__(self, temperature: float | None = 0.0, delay: float = 0.0):
+		self.temperature = temperature
+		self.delay = delay
+		self.calls = 0
+
+	@property
+	def provider(self) -> str:
+		return 'fake'
+
+	@property
+	def name(self) -> str:
+		return self.model
+
+	async def ainvoke(self, messages, output_format=None, **kwargs):
+		self.calls += 1
+		await asyncio.sleep(self.delay)
+		usage = ChatInvokeUsage(
+			prompt_tokens=10,
+			prompt_cached_tokens=None,
+			prompt_cache_creation_tokens=None,
+			prompt_image_tokens=None,
+			completion_tokens=5,
+			total_tokens=15,
+		)
+		if output_format is not None:
+			return ChatInvokeCompletion(completion=output_format(title='Widget', price=9.5), usage=usage)
+		return ChatInvokeCompletion(completion=f'answer {self.calls}', usage=usage)
+
+
+def _messages(page: str = 'page content'):
+	return [SystemMessage(content='extract'), UserMessage(content=page)]
+
+
+async def test_repeated_request_is_served_from_cache():
+	inner = FakeLLM()
+	llm = CachedChatModel(inner)
+
+	first = await llm.ainvoke(_messages())
+	second = await llm.ainvoke(_messages())
+	other = await llm.ainvoke(_messages('other page'))
+
+	assert inner.calls == 2
+	assert first.completion == second.completion == 'answer 1'
+	assert first.usage is not None and second.usage is None
+	assert other.completion == 'answer 2'
+	assert llm.cache.stats.hits == 1
+
+
+async def test_structured_output_round_trips_and_schema_is_part_of_key():
+	inner = FakeLLM()
+	llm = CachedChatModel(inner)
+
+	first = await llm.ainvoke(_messages(), output_format=Extracted)
+	second = await llm.ainvoke(_messages(), output_format=Extracted)
+	text = await llm.ainvoke(_messages())
+
+	assert isinstance(second.completion, Extracted)
+	assert second.completion == first.completion
+	assert text.completion == 'answer 2'
+	assert inner.calls == 2
+
+
+async def test_identical_in_flight_requests_are_coalesced():
+	inner = FakeLLM(delay=0.05)
+	llm = CachedChatModel(inner)
+
+	results = await asyncio.gather(*(llm.ainvoke(_messages()) for _ in range(5)))
+
+	assert inner.calls == 1
+	assert {r.completion for r in results} == {'answer 1'}
+	assert llm.cache.stats.coalesced == 4
+
+
+async def test_non_deterministic_temperature_bypasses_cache():
+	for temperature in (0.7, None):
+		inner = FakeLLM(temperature=temperature)
+		llm = CachedChatModel(inner)
+		await llm.ainvoke(_messages())
+		await llm.ainvoke(_messages())
+		assert inner.calls == 2
+
+
+async def test_disk_tier_survives_new_cache_and_expires(tmp_path: Path):
+	inner = FakeLLM()
+	await CachedChatModel(inner, LLMResponseCache.with_disk(tmp_path)).ainvoke(_messages())
+
+	fresh = CachedChatModel(inner, LLMResponseCache.with_disk(tmp_path))
+	response = await fresh.ainvoke(_messages())
+	assert inner.calls == 1 and response.completion == 'answer 1'
+	assert fresh.cache.stats.disk_hits == 1
+
+	expired = CachedChatModel(inner, LLMResponseCache.with_disk(tmp_path, ttl_seconds=0))
+	await expired.ainvoke(_messages())
+	assert inner.calls == 2
+
+
+async def test_failed_request_is_not_cached():
+	inner = FakeLLM()
+	llm = CachedChatModel(inner)
+	original = inner.ainvoke
+
+	async def failing(*args, **kwargs):
+		inner.calls += 1
+		raise RuntimeError('provider down')
+
+	inner.ainvoke = failing
+	with pytest.raises(RuntimeError):
+		await llm.ainvoke(_messages())
+	inner.ainvoke = original
+
+	response = await llm.ainvoke(_messages())
+	assert response.usage is not None
+	assert inner.calls == 2
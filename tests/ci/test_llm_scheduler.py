@@ -0,0 +1,170 @@
+"""Tests for the rate-limit-aware LLM scheduler."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from web_agent.llm.exceptions import ModelRateLimitError
+from web_agent.llm.scheduler import LLMPriority, LLMScheduler, ScheduledChatModel, _parse_reset
+
+
+class FakeLLM:
+	model = 'fake-model'
+
+	@property
+	def provider(self) -> str:
+		return 'fake'
+
+	@property
+	def name(self) -> str:
+		return self.model
+
+
+def _sdk_rate_limit_error(headers: dict[str, str]) -> ModelRateLimitError:
+	"""ModelRateLimitError chained to an SDK-like error that carries response headers"""
+	sdk_error = Exception('429')
+	sdk_error.response = SimpleNamespace(headers=headers)  # type: ignore[attr-defined]
+	try:
+		raise ModelRateLimitError(message='rate limited', model='fake-model') from sdk_error
+	except ModelRateLimitError as e:
+		return e
+
+
+async def test_concurrency_is_limited_per_model():
+	scheduler = LLMScheduler(initial_concurrency=2, max_concurrency=2)
+	llm = FakeLLM()
+	running = 0
+	peak = 0
+
+	async def call():
+		nonlocal running, peak
+		running += 1
+		peak = max(peak, running)
+		await asyncio.sleep(0.01)
+		running -= 1
+		return 'ok'
+
+	results = await asyncio.gather(*(scheduler.submit(llm, call) for _ in range(6)))
+
+	assert results == ['ok'] * 6
+	assert peak == 2
+	stats = scheduler.summary()['fake/fake-model']
+	assert stats['requests'] == 6
+	assert stats['queued'] == 4
+	assert stats['max_wait_seconds'] > 0
+
+
+async def test_waiters_are_dispatched_by_priority():
+	scheduler = LLMScheduler(initial_concurrency=1, max_concurrency=1)
+	llm = FakeLLM()
+	order: list[str] = []
+	release = asyncio.Event()
+
+	async def blocker():
+		await release.wait()
+
+	def make_call(label: str):
+		async def call():
+			order.append(label)
+
+		return call
+
+	first = asyncio.create_task(scheduler.submit(llm, blocker))
+	await asyncio.sleep(0)
+	tasks = [
+		asyncio.create_task(scheduler.submit(llm, make_call('judge'), LLMPriority.JUDGE)),
+		asyncio.create_task(scheduler.submit(llm, make_call('extraction'), LLMPriority.EXTRACTION)),
+		asyncio.create_task(scheduler.submit(llm, make_call('step'), LLMPriority.AGENT_STEP)),
+	]
+	await asyncio.sleep(0)
+	release.set()
+	await asyncio.gather(first, *tasks)
+
+	assert order == ['step', 'extraction', 'judge']
+
+
+async def test_aimd_decreases_on_rate_limit_and_recovers():
+	scheduler = LLMScheduler(initial_concurrency=8, default_backoff=0.0, decrease_cooldown=0.0)
+	llm = FakeLLM()
+
+	async def rate_limited():
+		raise ModelRateLimitError(message='slow down', model='fake-model')
+
+	async def ok():
+		return 'ok'
+
+	with pytest.raises(ModelRateLimitError):
+		await scheduler.submit(llm, rate_limited)
+	assert scheduler.summary()['fake/fake-model']['concurrency_limit'] == 4
+
+	for _ in range(8):
+		await scheduler.submit(llm, ok)
+	stats = scheduler.summary()['fake/fake-model']
+	assert stats['concurrency_limit'] > 4
+	assert stats['rate_limited'] == 1
+
+
+async def test_retry_after_header_pauses_dispatch_and_learns_budget():
+	scheduler = LLMScheduler()
+	llm = FakeLLM()
+	error = _sdk_rate_limit_error({'retry-after-ms': '100', 'x-ratelimit-limit-tokens': '30000'})
+
+	async def rate_limited():
+		raise error
+
+	async def ok():
+		return 'ok'
+
+	with pytest.raises(ModelRateLimitError):
+		await scheduler.submit(llm, rate_limited)
+
+	loop = asyncio.get_running_loop()
+	started = loop.time()
+	await scheduler.submit(llm, ok)
+	assert loop.time() - started >= 0.09
+	assert scheduler.summary()['fake/fake-model']['tokens_per_minute'] == 30000
+
+
+async def test_token_budget_delays_calls_until_window_frees(monkeypatch):
+	monkeypatch.setattr('web_agent.llm.scheduler.TOKEN_WINDOW_SECONDS', 0.1)
+	scheduler = LLMScheduler(tokens_per_minute={'fake-model': 1000})
+	llm = FakeLLM()
+
+	async def ok():
+		return 'ok'
+
+	loop = asyncio.get_running_loop()
+	started = loop.time()
+	await scheduler.submit(llm, ok, estimated_tokens=800)
+	await scheduler.submit(llm, ok, estimated_tokens=800)
+	assert loop.time() - started >= 0.09
+
+
+async def test_scheduled_chat_model_forwards_calls():
+	scheduler = LLMScheduler()
+	inner = FakeLLM()
+	inner.temperature = 0.0  # type: ignore[attr-defined]
+	calls = []
+
+	async def ainvoke(messages, output_format=None, **kwargs):
+		calls.append((messages, output_format, kwargs))
+		return SimpleNamespace(completion='done', usage=None)
+
+	inner.ainvoke = ainvoke  # type: ignore[attr-defined]
+	llm = ScheduledChatModel(inner, scheduler, LLMPriority.JUDGE)
+
+	response = await llm.ainvoke([], None, session_id='abc')
+
+	assert response.completion == 'done'
+	assert calls == [([], None, {'session_id': 'abc'})]
+	assert llm.provider == 'fake' and llm.model == 'fake-model' and llm.temperature == 0.0
+	assert scheduler.summary()['fake/fake-model']['requests'] == 1
+
+
+def test_parse_reset_formats():
+	assert _parse_reset('6m0s') == 360
+	assert _parse_reset('20ms') == pytest.approx(0.02)
+	assert _parse_reset('1.5') == 1.5
+	assert _parse_reset('2000-01-01T00:00:00Z') == 0.0
+	assert _parse_reset('garbage') is None
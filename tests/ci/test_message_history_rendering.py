@@ -0,0 +1,98 @@
+"""Tests for the incremental rendered history buffer in MessageManager."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+from web_agent.agent.message_manager.service import MessageManager
+from web_agent.agent.message_manager.views import HistoryItem
+from web_agent.agent.views import AgentStepInfo, MessageCompactionSettings, MessageManagerState
+from web_agent.filesystem.file_system import FileSystem
+from web_agent.llm.base import BaseChatModel
+from web_agent.llm.messages import SystemMessage
+from web_agent.llm.views import ChatInvokeCompletion
+
+
+def _make_manager(tmp_path: Path, max_history_items: int | None = None) -> MessageManager:
+	return MessageManager(
+		task='test',
+		system_message=SystemMessage(content='system'),
+		file_system=FileSystem(tmp_path),
+		state=MessageManagerState(),
+		max_history_items=max_history_items,
+	)
+
+
+def _expected_description(items: list[HistoryItem]) -> str:
+	return '\n'.join(item.to_string() for item in items)
+
+
+def test_history_description_matches_full_render(tmp_path: Path):
+	mm = _make_manager(tmp_path)
+	for i in range(1, 20):
+		mm.state.agent_history_items.append(HistoryItem(step_number=i, memory=f'memory {i}', next_goal=f'goal {i}'))
+		assert mm.agent_history_description == _expected_description(mm.state.agent_history_items)
+
+	rendered = mm.rendered_history
+	assert rendered.char_count == len(_expected_description(mm.state.agent_history_items))
+	assert rendered.token_count() == rendered.char_count // 4
+
+
+def test_history_items_are_rendered_once(tmp_path: Path, monkeypatch):
+	mm = _make_manager(tmp_path)
+	calls = 0
+	original = HistoryItem.to_string
+
+	def counting_to_string(self):
+		nonlocal calls
+		calls += 1
+		return original(self)
+
+	monkeypatch.setattr(HistoryItem, 'to_string', counting_to_string)
+
+	for i in range(1, 11):
+		mm.state.agent_history_items.append(HistoryItem(step_number=i, memory=f'memory {i}'))
+		_ = mm.agent_history_description
+		_ = mm.agent_history_description
+
+	# 10 appended items + the initial item, each rendered exactly once
+	assert calls == 11
+
+
+def test_history_description_with_max_items(tmp_path: Path):
+	mm = _make_manager(tmp_path, max_history_items=6)
+	for i in range(1, 12):
+		mm.state.agent_history_items.append(HistoryItem(step_number=i, memory=f'memory {i}'))
+
+	description = mm.agent_history_description
+	items = mm.state.agent_history_items
+	assert description.startswith(items[0].to_string())
+	assert '[... 6 previous steps omitted...]' in description
+	assert description.endswith(_expected_description(items[-5:]))
+
+
+def test_replaced_history_list_is_rerendered(tmp_path: Path):
+	mm = _make_manager(tmp_path)
+	for i in range(1, 5):
+		mm.state.agent_history_items.append(HistoryItem(step_number=i, memory=f'memory {i}'))
+	_ = mm.agent_history_description
+
+	mm.state.agent_history_items = [HistoryItem(step_number=0, system_message='restored')]
+	assert mm.agent_history_description == 'restored'
+	assert mm.rendered_history.char_count == len('restored')
+
+
+async def test_compaction_keeps_buffer_in_sync(tmp_path: Path):
+	mm = _make_manager(tmp_path)
+	for i in range(1, 21):
+		mm.state.agent_history_items.append(HistoryItem(step_number=i, memory='x' * 100))
+
+	settings = MessageCompactionSettings(compact_every_n_steps=1, trigger_char_count=500, keep_last_items=3)
+	llm = AsyncMock(spec=BaseChatModel)
+	llm.ainvoke.return_value = ChatInvokeCompletion(completion='summary of earlier steps', usage=None)
+	compacted = await mm.maybe_compact_messages(llm, settings, AgentStepInfo(step_number=20, max_steps=100))
+
+	assert compacted
+	items = mm.state.agent_history_items
+	assert len(items) == 4
+	assert mm.rendered_history.char_count == len(_expected_description(items))
+	assert mm.agent_history_description.endswith(_expected_description(items))
@@ -0,0 +1,149 @@
+"""Tests for the prompt-cache-aware message layout in MessageManager."""
+
+from pathlib import Path
+
+from web_agent.agent.message_manager.service import MessageManager
+from web_agent.agent.message_manager.views import HistoryItem
+from web_agent.agent.views import AgentStepInfo, MessageManagerState
+from web_agent.browser.views import BrowserStateSummary, TabInfo
+from web_agent.dom.views import SerializedDOMState
+from web_agent.filesystem.file_system import FileSystem
+from web_agent.llm.anthropic.serializer import AnthropicMessageSerializer
+from web_agent.llm.messages import SystemMessage, UserMessage
+from web_agent.llm.views import ChatInvokeUsage
+
+
+def _browser_state(url: str) -> BrowserStateSummary:
+	return BrowserStateSummary(
+		url=url,
+		title='Test',
+		tabs=[TabInfo(target_id='test-0', url=url, title='Test')],
+		screenshot=None,
+		dom_state=SerializedDOMState(_root=None, selector_map={}),
+	)
+
+
+def _make_manager(tmp_path: Path, prompt_cache_layout: bool = True) -> MessageManager:
+	return MessageManager(
+		task='find the cheapest flight',
+		system_message=SystemMessage(content='system prompt', cache=True),
+		file_system=FileSystem(tmp_path),
+		state=MessageManagerState(),
+		prompt_cache_layout=prompt_cache_layout,
+	)
+
+
+def _run_step(mm: MessageManager, step_number: int, url: str) -> None:
+	mm.state.agent_history_items.append(HistoryItem(step_number=step_number, memory=f'memory {step_number}'))
+	mm.create_state_messages(
+		browser_state_summary=_browser_state(url),
+		step_info=AgentStepInfo(step_number=step_number, max_steps=10),
+		use_vision=False,
+		skip_state_update=True,
+	)
+
+
+def test_layout_orders_stable_prefix_before_state(tmp_path: Path):
+	mm = _make_manager(tmp_path)
+	_run_step(mm, 1, 'https://example.com')
+
+	messages = mm.get_messages()
+	assert len(messages) == 3
+	prefix, state = messages[1], messages[2]
+	assert isinstance(prefix, UserMessage) and prefix.cache
+	assert isinstance(state, UserMessage) and not state.cache
+	assert '<user_request>' in prefix.text and 'memory 1' in prefix.text
+	assert '<agent_history>' not in state.text and '<user_request>' not in state.text
+	assert '<browser_state>' in state.text
+
+
+def test_prefix_parts_are_byte_stable_across_steps(tmp_path: Path):
+	mm = _make_manager(tmp_path)
+	_run_step(mm, 1, 'https://example.com/a')
+	first_prefix = mm.state.history.prefix_message
+	assert first_prefix is not None and isinstance(first_prefix.content, list)
+	first_parts = [part.text for part in first_prefix.content][:-1]  # everything but the closing tag
+
+	_run_step(mm, 2, 'https://example.com/b')
+	second_prefix = mm.state.history.prefix_message
+	assert second_prefix is not None and isinstance(second_prefix.content, list)
+	second_parts = [part.text for part in second_prefix.content]
+
+	assert second_parts[: len(first_parts)] == first_parts
+
+	steps = mm.prompt_cache_stats.steps
+	assert len(steps) == 2
+	assert steps[0].reused_prefix_chars == 0
+	assert steps[1].reused_prefix_chars > 0
+	assert steps[0].prefix_hash != steps[1].prefix_hash
+
+
+def test_prompt_cache_usage_is_reported(tmp_path: Path):
+	mm = _make_manager(tmp_path)
+	_run_step(mm, 1, 'https://example.com')
+	_run_step(mm, 2, 'https://example.com')
+	mm.record_prompt_cache_usage(
+		ChatInvokeUsage(
+			prompt_tokens=1000,
+			prompt_cached_tokens=600,
+			prompt_cache_creation_tokens=None,
+			prompt_image_tokens=None,
+			completion_tokens=10,
+			total_tokens=1010,
+		)
+	)
+
+	summary = mm.prompt_cache_stats.summary()
+	assert summary['steps'] == 2
+	assert summary['actual_hit_rate'] == 0.6
+	assert summary['expected_hit_rate'] is not None and 0 < summary['expected_hit_rate'] < 1
+
+
+def test_anthropic_caches_prefix_instead_of_state(tmp_path: Path):
+	mm = _make_manager(tmp_path)
+	_run_step(mm, 1, 'https://example.com')
+
+	serialized, _ = AnthropicMessageSerializer.serialize_messages(mm.get_messages())
+	prefix_blocks, state_blocks = serialized[0]['content'], serialized[1]['content']
+	assert isinstance(prefix_blocks, list) and prefix_blocks[-1].get('cache_control')
+	if isinstance(state_blocks, list):
+		assert not any(block.get('cache_control') for block in state_blocks)
+
+
+def test_default_layout_is_unchanged(tmp_path: Path):
+	mm = _make_manager(tmp_path, prompt_cache_layout=False)
+	_run_step(mm, 1, 'https://example.com')
+
+	messages = mm.get_messages()
+	assert len(messages) == 2
+	assert '<agent_history>' in messages[1].text and '<user_request>' in messages[1].text
+	assert not mm.prompt_cache_stats.steps
+
+
+def test_sliding_window_stays_out_of_the_cached_prefix(tmp_path: Path):
+	mm = MessageManager(
+		task='find the cheapest flight',
+		system_message=SystemMessage(content='system prompt', cache=True),
+		file_system=FileSystem(tmp_path),
+		state=MessageManagerState(),
+		prompt_cache_layout=True,
+		max_history_items=6,
+	)
+	previous_prefix = None
+	for step_number in range(1, 10):
+		_run_step(mm, step_number, f'https://example.com/{step_number}')
+		if step_number == 8:
+			previous_prefix = mm.state.history.prefix_message
+	prefix = mm.state.history.prefix_message
+	state = mm.state.history.state_message
+	assert prefix is not None and previous_prefix is not None and state is not None
+
+	# Task and first item only: the prefix stays byte-identical while the window slides
+	assert prefix.text == previous_prefix.text
+	assert 'Agent initialized' in prefix.text and 'memory' not in prefix.text and 'omitted' not in prefix.text
+	assert '<sys>[... 4 previous steps omitted...]</sys>' in state.text
+	assert all(f'memory {step}' in state.text for step in range(5, 10))
+	assert 'memory 4' not in state.text
+	assert state.text.index('<agent_history>') < state.text.index('<browser_state>')
+	steps = mm.prompt_cache_stats.steps
+	assert steps[-1].prefix_hash == steps[-2].prefix_hash
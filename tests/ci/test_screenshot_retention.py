@@ -0,0 +1,68 @@
+"""Tests for the screenshot retention policy: last K screenshots in memory, older ones loaded lazily from disk."""
+
+import base64
+import os
+from collections import deque
+from types import SimpleNamespace
+
+from web_agent.agent.judge import construct_judge_messages
+from web_agent.agent.service import Agent
+from web_agent.agent.views import ActionResult, AgentHistory, AgentHistoryList
+from web_agent.browser.views import BrowserStateHistory
+from web_agent.screenshots.service import ScreenshotService, load_screenshot
+
+
+def _screenshot(step: int) -> str:
+	return base64.b64encode(b'\x89PNG fake screenshot ' + str(step).encode() * 100).decode()
+
+
+async def test_only_recent_screenshots_stay_in_memory(tmp_path):
+	service = ScreenshotService(tmp_path, keep_in_memory=2)
+	paths = [await service.store_screenshot(_screenshot(step), step) for step in range(6)]
+
+	assert service.stats.stored == 6
+	assert service.stats.resident == 2
+	assert service.stats.resident_bytes == len(_screenshot(4)) + len(_screenshot(5))
+
+	history = AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=None,
+				result=[ActionResult()],
+				state=BrowserStateHistory(url='https://example.com', title='Test', tabs=[], interacted_element=[], screenshot_path=path),
+			)
+			for path in paths
+		]
+	)
+
+	# The last two come from memory, an older one is read back from disk
+	assert history.screenshots(n_last=2) == [_screenshot(4), _screenshot(5)]
+	assert (service.stats.memory_hits, service.stats.disk_loads) == (2, 0)
+	assert history.history[1].state.get_screenshot() == _screenshot(1)
+	assert service.stats.disk_loads == 1
+	assert service.stats.resident == 2
+
+	# The judge reads screenshots through the same cache
+	construct_judge_messages(task='t', final_result='', agent_steps=[], screenshot_paths=paths, max_images=1)
+	assert service.stats.memory_hits == 3
+
+	# Without a live service, paths still resolve from disk
+	service.clear_memory()
+	del service
+	assert load_screenshot(paths[0]) == _screenshot(0)
+	assert load_screenshot(os.path.join(tmp_path, 'missing.png')) is None
+
+
+def test_step_events_release_screenshots_once_handled():
+	agent = SimpleNamespace(_step_events_with_screenshots=deque(), screenshot_service=SimpleNamespace(keep_in_memory=2))
+	events = [SimpleNamespace(screenshot_url=f'data:image/png;base64,{step}', event_completed_at=None) for step in range(4)]
+
+	for event in events[:3]:
+		Agent._release_step_event_screenshots(agent, event)  # type: ignore[arg-type]
+	# Not handled yet: nothing is released
+	assert all(event.screenshot_url for event in events[:3])
+
+	for event in events:
+		event.event_completed_at = 'done'
+	Agent._release_step_event_screenshots(agent, events[3])  # type: ignore[arg-type]
+	assert [bool(event.screenshot_url) for event in events] == [False, False, True, True]
@@ -0,0 +1,114 @@
+"""Tests for pipelined requests and per-session locking in the CLI session server (browser is faked)."""
+
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import web_agent.skill_cli.commands.browser
+from web_agent.skill_cli import sessions
+from web_agent.skill_cli.protocol import decode_message, encode_message
+from web_agent.skill_cli.server import SessionServer
+from web_agent.skill_cli.sessions import SessionInfo, SessionRegistry
+
+
+class FakeBrowserSession:
+	def __init__(self):
+		self.started = 0
+
+	async def start(self) -> None:
+		self.started += 1
+		await asyncio.sleep(0.05)
+
+	async def kill(self) -> None:
+		pass
+
+
+@pytest.fixture
+def fake_browser(monkeypatch):
+	created: list[FakeBrowserSession] = []
+
+	async def create_browser_session(mode: str, headed: bool, profile: str | None) -> Any:
+		created.append(FakeBrowserSession())
+		return created[-1]
+
+	monkeypatch.setattr(sessions, 'create_browser_session', create_browser_session)
+	return created
+
+
+@pytest.fixture
+async def server_socket(fake_browser, monkeypatch):
+	"""A SessionServer listening on a temporary unix socket, with browser commands faked"""
+	release_click = asyncio.Event()
+	calls: list[str] = []
+
+	async def handle(action: str, session: SessionInfo, params: dict[str, Any]) -> Any:
+		calls.append(action)
+		if action == 'click':
+			await release_click.wait()
+			return {'clicked': params['index']}
+		return {'action': action}
+
+	monkeypatch.setattr(web_agent.skill_cli.commands.browser, 'handle', handle)
+
+	server = SessionServer(session_name='default', browser_mode='chromium', headed=False, profile=None)
+	sock_path = Path(tempfile.gettempdir()) / f'wa-pipe-{os.getpid()}-{time.time_ns()}.sock'
+	unix_server = await asyncio.start_unix_server(server.handle_connection, str(sock_path))
+	yield str(sock_path), release_click, calls
+	release_click.set()
+	unix_server.close()
+	sock_path.unlink(missing_ok=True)
+
+
+async def _send(writer: asyncio.StreamWriter, req_id: str, action: str, params: dict | None = None) -> None:
+	writer.write(encode_message({'id': req_id, 'action': action, 'session': 'default', 'params': params or {}}))
+	await writer.drain()
+
+
+async def test_read_only_query_answers_while_action_holds_session(server_socket):
+	sock_path, release_click, calls = server_socket
+	reader, writer = await asyncio.open_unix_connection(sock_path)
+
+	# Pipeline a slow click, a second click queued behind it, and a state query on one connection
+	await _send(writer, 'c1', 'click', {'index': 1})
+	await _send(writer, 'c2', 'click', {'index': 2})
+	await _send(writer, 's1', 'state')
+
+	first = decode_message(await asyncio.wait_for(reader.readline(), timeout=5))
+	assert first['id'] == 's1' and first['success']
+	assert calls.count('click') == 1  # second click waits for the session lock
+
+	release_click.set()
+	rest = [decode_message(await asyncio.wait_for(reader.readline(), timeout=5)) for _ in range(2)]
+	assert [(r['id'], r['data']['clicked']) for r in rest] == [('c1', 1), ('c2', 2)]
+
+	writer.close()
+	await writer.wait_closed()
+
+
+async def test_inflight_requests_finish_after_client_stops_sending(server_socket):
+	sock_path, release_click, _ = server_socket
+	reader, writer = await asyncio.open_unix_connection(sock_path)
+
+	await _send(writer, 'c1', 'click', {'index': 7})
+	writer.write(b'not json\n')
+	writer.write_eof()
+
+	bad = decode_message(await asyncio.wait_for(reader.readline(), timeout=5))
+	assert not bad['success'] and 'Invalid JSON' in bad['error']
+
+	release_click.set()
+	done = decode_message(await asyncio.wait_for(reader.readline(), timeout=5))
+	assert done['id'] == 'c1' and done['data'] == {'clicked': 7}
+	writer.close()
+
+
+async def test_concurrent_get_or_create_starts_one_browser(fake_browser):
+	registry = SessionRegistry()
+	infos = await asyncio.gather(*(registry.get_or_create('default', 'chromium', False, None) for _ in range(5)))
+	assert len(fake_browser) == 1 and fake_browser[0].started == 1
+	assert all(info is infos[0] for info in infos)
@@ -0,0 +1,51 @@
+"""Tests for cold-start phase timing and deferred imports of optional subsystems."""
+
+import os
+import subprocess
+import sys
+
+from web_agent.startup_profiler import StartupProfiler
+
+
+def test_phases_are_recorded_only_when_enabled():
+	disabled = StartupProfiler()
+	with disabled.phase('load config'):
+		pass
+	disabled.mark('first step')
+	assert disabled.phases == []
+
+	profiler = StartupProfiler(enabled=True)
+	with profiler.phase('load config'):
+		with profiler.phase('llm setup'):
+			pass
+	profiler.mark('first step')
+	assert [phase.name for phase in profiler.phases] == ['llm setup', 'load config', 'first step']
+	assert profiler.phases[1].duration >= profiler.phases[0].duration
+	assert profiler.phases[2].duration == 0
+
+	report = profiler.report()
+	assert report.index('load config') < report.index('llm setup') < report.index('first step')
+
+	profiler.log_report()
+	with profiler.phase('second run'):
+		pass
+	assert 'second run' not in profiler.report()
+
+
+def test_agent_import_does_not_load_optional_subsystems():
+	code = (
+		'import sys\n'
+		'import web_agent.agent.service, web_agent.browser.session, web_agent.sync, web_agent.mcp\n'
+		"heavy = ['posthog', 'mcp', 'web_agent.sync.service', 'web_agent.browser.video_recorder', 'web_agent.agent.gif',\n"
+		"         'web_agent.llm.openai.chat', 'web_agent.llm.anthropic.chat', 'web_agent.llm.google.chat']\n"
+		'print(",".join(name for name in heavy if name in sys.modules))\n'
+	)
+	result = subprocess.run(
+		[sys.executable, '-c', code],
+		capture_output=True,
+		text=True,
+		timeout=120,
+		env={**os.environ, 'ANONYMIZED_TELEMETRY': 'false'},
+	)
+	assert result.returncode == 0, result.stderr
+	assert result.stdout.strip() == ''
@@ -0,0 +1,88 @@
+"""Tests for running per-model aggregates and the pricing index in TokenCost."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from web_agent.llm.views import ChatInvokeUsage
+from web_agent.tokens.service import TokenCost
+
+PRICING_DATA = {
+	'gpt-4o': {'input_cost_per_token': 2.5e-6, 'output_cost_per_token': 1e-5, 'cache_read_input_token_cost': 1.25e-6},
+	'anthropic/claude-sonnet-4': {'input_cost_per_token': 3e-6, 'output_cost_per_token': 1.5e-5},
+}
+
+
+def _usage(prompt: int, completion: int, cached: int | None = None) -> ChatInvokeUsage:
+	return ChatInvokeUsage(
+		prompt_tokens=prompt,
+		prompt_cached_tokens=cached,
+		prompt_cache_creation_tokens=None,
+		prompt_image_tokens=None,
+		completion_tokens=completion,
+		total_tokens=prompt + completion,
+	)
+
+
+def _loaded_token_cost(**kwargs) -> TokenCost:
+	tc = TokenCost(include_cost=True, **kwargs)
+	tc._set_pricing_data(PRICING_DATA)
+	tc._initialized = True
+	return tc
+
+
+async def test_summary_matches_per_entry_costs():
+	tc = _loaded_token_cost()
+	tc.add_usage('gpt-4o', _usage(1000, 100, cached=400))
+	tc.add_usage('gpt-4o', _usage(2000, 50))
+	tc.add_usage('claude-sonnet-4', _usage(500, 10))
+
+	summary = await tc.get_usage_summary()
+	window_summary = await tc.get_usage_summary(since=datetime.now() - timedelta(hours=1))
+
+	assert summary.entry_count == 3
+	assert summary.total_prompt_tokens == 3500
+	assert summary.total_completion_tokens == 160
+	assert summary.total_prompt_cached_tokens == 400
+	assert summary.total_cost == pytest.approx(window_summary.total_cost)
+	assert summary.by_model['gpt-4o'].cost == pytest.approx(window_summary.by_model['gpt-4o'].cost)
+	assert summary.by_model['gpt-4o'].invocations == 2
+
+	tokens = tc.get_usage_tokens_for_model('gpt-4o')
+	assert tokens.prompt_tokens == 3000
+	assert tokens.prompt_cached_tokens == 400
+
+
+async def test_usage_history_is_bounded_but_totals_are_not():
+	tc = TokenCost(max_usage_history=5)
+	for _ in range(20):
+		tc.add_usage('gpt-4o', _usage(10, 1))
+
+	assert len(tc.usage_history) == 5
+	summary = await tc.get_usage_summary()
+	assert summary.entry_count == 20
+	assert summary.total_tokens == 220
+
+	tc.clear_history()
+	assert (await tc.get_usage_summary()).entry_count == 0
+
+
+async def test_entries_before_pricing_load_are_costed_later():
+	tc = TokenCost(include_cost=True)
+	tc.add_usage('gpt-4o', _usage(1000, 100))
+
+	tc._set_pricing_data(PRICING_DATA)
+	tc._initialized = True
+	summary = await tc.get_usage_summary()
+
+	assert summary.total_cost == pytest.approx(1000 * 2.5e-6 + 100 * 1e-5)
+
+
+async def test_pricing_index_normalizes_model_names():
+	tc = _loaded_token_cost()
+
+	assert (await tc.get_model_pricing('gpt-4o')) is not None
+	assert (await tc.get_model_pricing('GPT-4o')) is not None
+	pricing = await tc.get_model_pricing('claude-sonnet-4')
+	assert pricing is not None and pricing.input_cost_per_token == 3e-6
+	assert (await tc.get_model_pricing('unknown-model')) is None
@@ -0,0 +1,118 @@
+"""Pipelined CDP command batching for the actor layer.
+
+Inside ``async with page.batch():`` every CDP command sent by Page, Element or Mouse
+objects is written to the websocket right away without waiting for the previous
+response. Commands whose result is not used (input events, scrolling, focus) resolve
+immediately and are confirmed together when the batch exits. Commands that return
+data still return their result when awaited, so independent reads can be gathered:
+
+	async with page.batch():
+		await mouse.move(400, 300, steps=20)  # 20 events, no per-event round trip
+		hrefs = await asyncio.gather(*(row.get_attribute('href') for row in rows))
+"""
+
+import asyncio
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+	from cdp_use.client import CDPClient
+
+# Commands with no meaningful result, which don't need to be awaited inside a batch
+FIRE_AND_FORGET_DOMAINS = frozenset({'Input'})
+FIRE_AND_FORGET_METHODS = frozenset({'DOM.scrollIntoViewIfNeeded', 'DOM.focus', 'Page.bringToFront'})
+
+_active_batch: ContextVar['CDPBatch | None'] = ContextVar('web_agent_cdp_batch', default=None)
+
+
+class CDPBatch:
+	"""Async context manager that pipelines CDP commands and confirms them all on exit."""
+
+	def __init__(self, client: 'CDPClient'):
+		self._raw_client = client
+		self.client = _BatchedClient(self)
+		self._pending: list[asyncio.Future[Any]] = []
+		self._token = None
+		self.commands_sent = 0
+
+	def _send(self, method: str, params: Any = None, session_id: str | None = None) -> asyncio.Future[Any]:
+		# Tasks start in creation order, so commands hit the websocket in the order they were issued
+		task = asyncio.ensure_future(self._raw_client.send_raw(method, params, session_id))
+		self._pending.append(task)
+		self.commands_sent += 1
+		return task
+
+	async def flush(self) -> list[Any]:
+		"""Wait for every command sent so far; raises the first error after all of them settle"""
+		pending, self._pending = self._pending, []
+		if not pending:
+			return []
+		results = await asyncio.gather(*pending, return_exceptions=True)
+		for result in results:
+			if isinstance(result, BaseException):
+				raise result
+		return results
+
+	async def __aenter__(self) -> 'CDPBatch':
+		if _active_batch.get() is not None:
+			raise RuntimeError('CDP batches cannot be nested')
+		self._token = _active_batch.set(self)
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb) -> None:
+		assert self._token is not None
+		_active_batch.reset(self._token)
+		self._token = None
+		if exc_type is None:
+			await self.flush()
+			return
+		# Already failing: still drain the queue, but don't mask the original error
+		pending, self._pending = self._pending, []
+		await asyncio.gather(*pending, return_exceptions=True)
+
+
+def batched_client(client: 'CDPClient') -> 'CDPClient':
+	"""The client actor objects should use: the active batch's pipelining client, or the raw one"""
+	batch = _active_batch.get()
+	if batch is None or batch._raw_client is not client:
+		return client
+	return batch.client  # type: ignore[return-value]
+
+
+def _completed(value: Any) -> asyncio.Future[Any]:
+	future = asyncio.get_running_loop().create_future()
+	future.set_result(value)
+	return future
+
+
+class _BatchedClient:
+	def __init__(self, batch: CDPBatch):
+		self._batch = batch
+		self.send = _BatchedSend(batch)
+
+	def __getattr__(self, name: str) -> Any:
+		return getattr(self._batch._raw_client, name)
+
+
+class _BatchedSend:
+	def __init__(self, batch: CDPBatch):
+		self._batch = batch
+
+	def __getattr__(self, domain: str) -> '_BatchedDomain':
+		return _BatchedDomain(self._batch, domain)
+
+
+class _BatchedDomain:
+	def __init__(self, batch: CDPBatch, domain: str):
+		self._batch = batch
+		self._domain = domain
+
+	def __getattr__(self, command: str):
+		method = f'{self._domain}.{command}'
+		fire_and_forget = self._domain in FIRE_AND_FORGET_DOMAINS or method in FIRE_AND_FORGET_METHODS
+
+		def send(params: Any = None, session_id: str | None = None) -> asyncio.Future[Any]:
+			task = self._batch._send(method, params, session_id)
+			return _completed({}) if fire_and_forget else task
+
+		return send
@@ -6,6 +6,9 @@ from typing import TYPE_CHECKING, Literal, Union
 from cdp_use.client import logger
 from typing_extensions import TypedDict
 
+from web_agent.actor.batch import batched_client
+from web_agent.actor.text_input import TypingMode, dispatch_key_events_pipelined, insert_text_bulk, key_events_for_text
+
 if TYPE_CHECKING:
 	from cdp_use.cdp.dom.commands import (
 		DescribeNodeParameters,
@@ -23,6 +26,7 @@ if TYPE_CHECKING:
 	from cdp_use.cdp.page.commands import CaptureScreenshotParameters
 	from cdp_use.cdp.page.types import Viewport
 	from cdp_use.cdp.runtime.commands import CallFunctionOnParameters
+	from cdp_use.client import CDPClient
 
 	from web_agent.browser.session import BrowserSession
 
@@ -69,10 +73,13 @@ class Element:
 		session_id: str | None = None,
 	):
 		self._browser_session = browser_session
-		self._client = browser_session.cdp_client
 		self._backend_node_id = backend_node_id
 		self._session_id = session_id
 
+	@property
+	def _client(self) -> 'CDPClient':
+		return batched_client(self._browser_session.cdp_client)
+
 	async def _get_node_id(self) -> int:
 		"""Get DOM node ID from backend node ID."""
 		params: 'PushNodesByBackendIdsToFrontendParameters' = {'backendNodeIds': [self._backend_node_id]}
@@ -350,8 +357,12 @@ class Element:
 			# Extract key element info for error message
 			raise RuntimeError(f'Failed to click element: {e}')
 
-	async def fill(self, value: str, clear: bool = True) -> None:
-		"""Fill the input element using proper CDP methods with improved focus handling."""
+	async def fill(self, value: str, clear: bool = True, mode: TypingMode = 'human') -> None:
+		"""Fill the input element using proper CDP methods with improved focus handling.
+
+		mode: 'human' types each key with delays, 'fast-keys' pipelines the key events,
+		'bulk' inserts the whole value at once and falls back to 'human' if the field rejects it.
+		"""
 		try:
 			# Use the existing CDP client and session
 			cdp_client = self._client
@@ -417,6 +428,14 @@ class Element:
 				if not cleared_successfully:
 					logger.warning('Text field clearing failed, typing may append to existing text')
 
+			if mode == 'bulk' and value:
+				if await insert_text_bulk(cdp_client, session_id, object_id, value):
+					return
+				logger.debug('Bulk insert rejected by the field, falling back to human typing')
+			elif mode == 'fast-keys':
+				await dispatch_key_events_pipelined(cdp_client, session_id, key_events_for_text(value, self._char_key_info))
+				return
+
 			# Step 3: Type the text character by character using proper human-like key events
 			logger.debug(f'Typing text character by character: "{value}"')
 
@@ -829,6 +848,11 @@ class Element:
 				return str(value)
 
 	# Helpers for modifiers etc
+	def _char_key_info(self, char: str) -> tuple[int, int, str, str]:
+		"""(modifiers, windowsVirtualKeyCode, base_key, code) for a character"""
+		modifiers, vk_code, base_key = self._get_char_modifiers_and_vk(char)
+		return modifiers, vk_code, base_key, self._get_key_code_for_char(base_key)
+
 	def _get_char_modifiers_and_vk(self, char: str) -> tuple[int, int, str]:
 		"""Get modifiers, virtual key code, and base key for a character.
 
@@ -2,9 +2,12 @@
 
 from typing import TYPE_CHECKING
 
+from web_agent.actor.batch import batched_client
+
 if TYPE_CHECKING:
 	from cdp_use.cdp.input.commands import DispatchMouseEventParameters, SynthesizeScrollGestureParameters
 	from cdp_use.cdp.input.types import MouseButton
+	from cdp_use.client import CDPClient
 
 	from web_agent.browser.session import BrowserSession
 
@@ -14,12 +17,19 @@ class Mouse:
 
 	def __init__(self, browser_session: 'BrowserSession', session_id: str | None = None, target_id: str | None = None):
 		self._browser_session = browser_session
-		self._client = browser_session.cdp_client
 		self._session_id = session_id
 		self._target_id = target_id
+		# Last position the mouse was sent to, used by down/up and as the start of multi-step moves
+		self._x: float = 0
+		self._y: float = 0
+
+	@property
+	def _client(self) -> 'CDPClient':
+		return batched_client(self._browser_session.cdp_client)
 
 	async def click(self, x: int, y: int, button: 'MouseButton' = 'left', click_count: int = 1) -> None:
 		"""Click at the specified coordinates."""
+		self._x, self._y = x, y
 		# Mouse press
 		press_params: 'DispatchMouseEventParameters' = {
 			'type': 'mousePressed',
@@ -50,8 +60,8 @@ class Mouse:
 		"""Press mouse button down."""
 		params: 'DispatchMouseEventParameters' = {
 			'type': 'mousePressed',
-			'x': 0,  # Will use last mouse position
-			'y': 0,
+			'x': self._x,
+			'y': self._y,
 			'button': button,
 			'clickCount': click_count,
 		}
@@ -64,8 +74,8 @@ class Mouse:
 		"""Release mouse button."""
 		params: 'DispatchMouseEventParameters' = {
 			'type': 'mouseReleased',
-			'x': 0,  # Will use last mouse position
-			'y': 0,
+			'x': self._x,
+			'y': self._y,
 			'button': button,
 			'clickCount': click_count,
 		}
@@ -75,12 +85,17 @@ class Mouse:
 		)
 
 	async def move(self, x: int, y: int, steps: int = 1) -> None:
-		"""Move mouse to the specified coordinates."""
-		# TODO: Implement smooth movement with multiple steps if needed
-		_ = steps  # Acknowledge parameter for future use
-
-		params: 'DispatchMouseEventParameters' = {'type': 'mouseMoved', 'x': x, 'y': y}
-		await self._client.send.Input.dispatchMouseEvent(params, session_id=self._session_id)
+		"""Move mouse to the specified coordinates, in evenly spaced steps from the last position."""
+		start_x, start_y = self._x, self._y
+		steps = max(1, steps)
+		for step in range(1, steps + 1):
+			params: 'DispatchMouseEventParameters' = {
+				'type': 'mouseMoved',
+				'x': start_x + (x - start_x) * step / steps,
+				'y': start_y + (y - start_y) * step / steps,
+			}
+			await self._client.send.Input.dispatchMouseEvent(params, session_id=self._session_id)
+		self._x, self._y = x, y
 
 	async def scroll(self, x: int = 0, y: int = 0, delta_x: int | None = None, delta_y: int | None = None) -> None:
 		"""Scroll the page using robust CDP methods."""
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, TypeVar
 from pydantic import BaseModel
 
 from web_agent import logger
+from web_agent.actor.batch import CDPBatch, batched_client
 from web_agent.actor.utils import get_key_info
 from web_agent.dom.serializer.serializer import DOMTreeSerializer
 from web_agent.dom.service import DomService
@@ -12,6 +13,9 @@ from web_agent.llm.messages import SystemMessage, UserMessage
 
 T = TypeVar('T', bound=BaseModel)
 
+# Selector matches up to this many are described one by one, more are resolved from one full-document snapshot
+_DESCRIBE_NODE_LIMIT = 8
+
 if TYPE_CHECKING:
 	from cdp_use.cdp.dom.commands import (
 		DescribeNodeParameters,
@@ -28,6 +32,7 @@ if TYPE_CHECKING:
 		GetTargetInfoParameters,
 	)
 	from cdp_use.cdp.target.types import TargetInfo
+	from cdp_use.client import CDPClient
 
 	from web_agent.browser.session import BrowserSession
 	from web_agent.llm.base import BaseChatModel
@@ -43,13 +48,24 @@ class Page:
 		self, browser_session: 'BrowserSession', target_id: str, session_id: str | None = None, llm: 'BaseChatModel | None' = None
 	):
 		self._browser_session = browser_session
-		self._client = browser_session.cdp_client
 		self._target_id = target_id
 		self._session_id: str | None = session_id
 		self._mouse: 'Mouse | None' = None
 
 		self._llm = llm
 
+	@property
+	def _client(self) -> 'CDPClient':
+		return batched_client(self._browser_session.cdp_client)
+
+	def batch(self) -> CDPBatch:
+		"""Pipeline CDP commands sent inside ``async with page.batch():`` instead of waiting for each response.
+
+		Input events, scrolling and focus resolve immediately and are confirmed when the block
+		exits; their errors are raised there. Commands that return data still return it when awaited.
+		"""
+		return CDPBatch(self._browser_session.cdp_client)
+
 	async def _ensure_session(self) -> str:
 		"""Ensure we have a session ID for this target."""
 		if not self._session_id:
@@ -367,27 +383,60 @@ class Page:
 	async def get_elements_by_css_selector(self, selector: str) -> list['Element']:
 		"""Get elements by CSS selector."""
 		session_id = await self._ensure_session()
+		backend_node_ids = await self.query_backend_node_ids(selector)
 
-		# Get document first
-		doc_result = await self._client.send.DOM.getDocument(session_id=session_id)
-		document_node_id = doc_result['root']['nodeId']
+		from .element import Element as Element_
 
-		# Query selector all
-		query_params: 'QuerySelectorAllParameters' = {'nodeId': document_node_id, 'selector': selector}
-		result = await self._client.send.DOM.querySelectorAll(query_params, session_id=session_id)
+		return [Element_(self._browser_session, backend_node_id, session_id) for backend_node_id in backend_node_ids]
 
-		elements = []
-		from .element import Element as Element_
+	async def query_backend_node_ids(self, selector: str) -> list[int]:
+		"""Backend node IDs of all elements matching a CSS selector, in document order.
 
-		# Convert node IDs to backend node IDs
-		for node_id in result['nodeIds']:
-			# Get backend node ID
-			describe_params: 'DescribeNodeParameters' = {'nodeId': node_id}
-			node_result = await self._client.send.DOM.describeNode(describe_params, session_id=session_id)
-			backend_node_id = node_result['node']['backendNodeId']
-			elements.append(Element_(self._browser_session, backend_node_id, session_id))
+		Few matches are resolved with one DOM.describeNode each on top of a shallow getDocument. Bulk matches
+		(more than _DESCRIBE_NODE_LIMIT, e.g. get_elements over table rows) use a constant number of CDP calls:
+		the full document tree is fetched once (it carries nodeId -> backendNodeId for every node) instead.
+		"""
+		session_id = await self._ensure_session()
 
-		return elements
+		doc_result = await self._client.send.DOM.getDocument(session_id=session_id)
+		query_params: 'QuerySelectorAllParameters' = {'nodeId': doc_result['root']['nodeId'], 'selector': selector}
+		result = await self._client.send.DOM.querySelectorAll(query_params, session_id=session_id)
+		if len(result['nodeIds']) <= _DESCRIBE_NODE_LIMIT:
+			return [await self._describe_backend_node_id(node_id, session_id) for node_id in result['nodeIds']]
+
+		# getDocument hands out new node IDs, so the selector is matched again against the full tree's root
+		doc_result = await self._client.send.DOM.getDocument(params={'depth': -1}, session_id=session_id)
+		root = doc_result['root']
+		backend_ids_by_node_id: dict[int, int] = {}
+		stack = [root]
+		while stack:
+			node = stack.pop()
+			backend_ids_by_node_id[node['nodeId']] = node['backendNodeId']
+			stack.extend(node.get('children', ()))
+			stack.extend(node.get('shadowRoots', ()))
+			stack.extend(node.get('pseudoElements', ()))
+			if 'templateContent' in node:
+				stack.append(node['templateContent'])
+			if 'contentDocument' in node:
+				stack.append(node['contentDocument'])
+
+		query_params = {'nodeId': root['nodeId'], 'selector': selector}
+		result = await self._client.send.DOM.querySelectorAll(query_params, session_id=session_id)
+
+		backend_node_ids = []
+		for node_id in result['nodeIds']:
+			backend_node_id = backend_ids_by_node_id.get(node_id)
+			if backend_node_id is None:
+				# Node appeared after the tree snapshot, resolve it individually
+				backend_node_id = await self._describe_backend_node_id(node_id, session_id)
+			backend_node_ids.append(backend_node_id)
+
+		return backend_node_ids
+
+	async def _describe_backend_node_id(self, node_id: int, session_id: str) -> int:
+		describe_params: 'DescribeNodeParameters' = {'nodeId': node_id}
+		node_result = await self._client.send.DOM.describeNode(describe_params, session_id=session_id)
+		return node_result['node']['backendNodeId']
 
 	# AI METHODS
 
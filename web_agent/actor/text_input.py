@@ -0,0 +1,124 @@
+"""Typing engine modes shared by Element.fill and the DefaultActionWatchdog.
+
+- 'human': one awaited keyDown/char/keyUp round trip per character with small delays (default)
+- 'fast-keys': the same key event sequence, pipelined over the CDP socket without per-event waits
+- 'bulk': a single Input.insertText call followed by a change event; verified and reported
+  back so callers can fall back to 'human' when the field's framework rejects it
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+	from cdp_use.client import CDPClient
+	from cdp_use.cdp.input.commands import DispatchKeyEventParameters
+
+logger = logging.getLogger(__name__)
+
+TypingMode = Literal['human', 'fast-keys', 'bulk']
+
+# Max key events in flight at once in 'fast-keys' mode
+KEY_EVENT_WINDOW = 96
+
+# Dispatch change, then report the field's value (textContent for contenteditable)
+_FINISH_BULK_INSERT_JS = """
+function() {
+	this.dispatchEvent(new Event('change', { bubbles: true }));
+	return this.value !== undefined ? this.value : this.textContent;
+}
+"""
+
+# Put the pre-insert value back through the native setter so frameworks see the reset
+_RESTORE_VALUE_JS = """
+function(previous) {
+	if (this.value !== undefined) {
+		var proto = this instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+		var desc = Object.getOwnPropertyDescriptor(proto, 'value');
+		if (desc && desc.set) { desc.set.call(this, previous); } else { this.value = previous; }
+	} else if (this.isContentEditable) {
+		this.textContent = previous;
+	}
+	this.dispatchEvent(new Event('input', { bubbles: true }));
+}
+"""
+
+_READ_VALUE_JS = 'function() { return this.value !== undefined ? this.value : this.textContent; }'
+
+
+def _squash_whitespace(value: str) -> str:
+	return ''.join(value.split())
+
+
+def key_events_for_text(
+	text: str, char_key_info: Callable[[str], tuple[int, int, str, str]]
+) -> list['DispatchKeyEventParameters']:
+	"""keyDown/char/keyUp params for every character, the same sequence 'human' mode sends.
+
+	char_key_info maps a character to (modifiers, windowsVirtualKeyCode, base_key, code).
+	"""
+	events: list['DispatchKeyEventParameters'] = []
+	for char in text:
+		if char == '\n':
+			events.append({'type': 'keyDown', 'key': 'Enter', 'code': 'Enter', 'windowsVirtualKeyCode': 13})
+			events.append({'type': 'char', 'text': '\r', 'key': 'Enter'})
+			events.append({'type': 'keyUp', 'key': 'Enter', 'code': 'Enter', 'windowsVirtualKeyCode': 13})
+			continue
+		modifiers, vk_code, base_key, key_code = char_key_info(char)
+		key_params: 'DispatchKeyEventParameters' = {
+			'type': 'keyDown',
+			'key': base_key,
+			'code': key_code,
+			'modifiers': modifiers,
+			'windowsVirtualKeyCode': vk_code,
+		}
+		events.append(key_params)
+		events.append({'type': 'char', 'text': char, 'key': char})
+		events.append({**key_params, 'type': 'keyUp'})
+	return events
+
+
+async def dispatch_key_events_pipelined(
+	cdp_client: 'CDPClient',
+	session_id: str | None,
+	events: list['DispatchKeyEventParameters'],
+	window: int = KEY_EVENT_WINDOW,
+) -> None:
+	"""Send key events without awaiting each response; CDP applies them in the order they were written"""
+	for start in range(0, len(events), window):
+		await asyncio.gather(
+			*(cdp_client.send.Input.dispatchKeyEvent(params=params, session_id=session_id) for params in events[start : start + window])
+		)
+
+
+async def insert_text_bulk(cdp_client: 'CDPClient', session_id: str | None, object_id: str, text: str) -> bool:
+	"""Insert text into the focused element in one round trip; False (with the old value restored) if it did not stick"""
+	before_result = await cdp_client.send.Runtime.callFunctionOn(
+		params={'objectId': object_id, 'functionDeclaration': _READ_VALUE_JS, 'returnByValue': True},
+		session_id=session_id,
+	)
+	before = before_result.get('result', {}).get('value')
+	if not isinstance(before, str):
+		return False
+
+	await cdp_client.send.Input.insertText(params={'text': text}, session_id=session_id)
+	after_result = await cdp_client.send.Runtime.callFunctionOn(
+		params={'objectId': object_id, 'functionDeclaration': _FINISH_BULK_INSERT_JS, 'returnByValue': True},
+		session_id=session_id,
+	)
+	after = after_result.get('result', {}).get('value')
+
+	# Single-line inputs drop newlines and contenteditable may reflow whitespace, so compare without it
+	if isinstance(after, str) and _squash_whitespace(text) in _squash_whitespace(after[len(before) :] if after.startswith(before) else after):
+		return True
+
+	logger.debug('Bulk text insert was rejected by the field, restoring previous value')
+	try:
+		await cdp_client.send.Runtime.callFunctionOn(
+			params={'objectId': object_id, 'functionDeclaration': _RESTORE_VALUE_JS, 'arguments': [{'value': before}]},
+			session_id=session_id,
+		)
+	except Exception as e:
+		logger.debug(f'Failed to restore value after rejected bulk insert: {type(e).__name__}: {e}')
+	return False
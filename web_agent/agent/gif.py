@@ -61,10 +61,8 @@ def create_history_gif(
 		logger.warning('No history to create GIF from')
 		return
 
-	# Get all screenshots from history (including None placeholders)
-	screenshots = history.screenshots(return_none_if_not_screenshot=True)
-
-	if not screenshots:
+	# Screenshots are loaded one at a time while building frames, not all up front
+	if not history.screenshot_paths(return_none_if_not_screenshot=False):
 		logger.warning('No screenshots found in history')
 		return
 
@@ -73,7 +71,8 @@ def create_history_gif(
 	# 1. It's the exact 4px placeholder for about:blank pages, OR
 	# 2. It comes from a new tab page (chrome://newtab/, about:blank, etc.)
 	first_real_screenshot = None
-	for screenshot in screenshots:
+	for item in history.history:
+		screenshot = item.state.get_screenshot()
 		if screenshot and screenshot != PLACEHOLDER_4PX_SCREENSHOT:
 			first_real_screenshot = screenshot
 			break
@@ -138,29 +137,19 @@ def create_history_gif(
 
 	# Create task frame if requested
 	if show_task and task:
-		# Find the first non-placeholder screenshot for the task frame
-		first_real_screenshot = None
-		for item in history.history:
-			screenshot_b64 = item.state.get_screenshot()
-			if screenshot_b64 and screenshot_b64 != PLACEHOLDER_4PX_SCREENSHOT:
-				first_real_screenshot = screenshot_b64
-				break
-
-		if first_real_screenshot:
-			task_frame = _create_task_frame(
-				task,
-				first_real_screenshot,
-				title_font,  # type: ignore
-				regular_font,  # type: ignore
-				logo,
-				line_spacing,
-			)
-			images.append(task_frame)
-		else:
-			logger.warning('No real screenshots found for task frame, skipping task frame')
+		task_frame = _create_task_frame(
+			task,
+			first_real_screenshot,
+			title_font,  # type: ignore
+			regular_font,  # type: ignore
+			logo,
+			line_spacing,
+		)
+		images.append(task_frame)
 
 	# Process each history item with its corresponding screenshot
-	for i, (item, screenshot) in enumerate(zip(history.history, screenshots), 1):
+	for i, item in enumerate(history.history, 1):
+		screenshot = item.state.get_screenshot()
 		if not screenshot:
 			continue
 
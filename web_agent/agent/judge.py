@@ -1,9 +1,7 @@
 """Judge system for evaluating web-agent agent execution traces."""
 
-import base64
 import logging
 from datetime import datetime, timezone
-from pathlib import Path
 from typing import Literal
 
 from web_agent.llm.messages import (
@@ -14,21 +12,14 @@ from web_agent.llm.messages import (
 	SystemMessage,
 	UserMessage,
 )
+from web_agent.screenshots.service import load_screenshot
 
 logger = logging.getLogger(__name__)
 
 
 def _encode_image(image_path: str) -> str | None:
-	"""Encode image to base64 string."""
-	try:
-		path = Path(image_path)
-		if not path.exists():
-			return None
-		with open(path, 'rb') as f:
-			return base64.b64encode(f.read()).decode('utf-8')
-	except Exception as e:
-		logger.warning(f'Failed to encode image {image_path}: {e}')
-		return None
+	"""Encode image to base64 string (recent screenshots come from the screenshot service's memory)."""
+	return load_screenshot(image_path)
 
 
 def _truncate_text(text: str, max_length: int, from_beginning: bool = False) -> str:
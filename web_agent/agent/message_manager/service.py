@@ -5,8 +5,10 @@ from typing import Literal
 
 from web_agent.agent.message_manager.views import (
 	HistoryItem,
+	PromptCacheStats,
+	RenderedHistory,
 )
-from web_agent.agent.prompts import AgentMessagePrompt
+from web_agent.agent.prompts import AgentMessagePrompt, get_stable_prefix_message
 from web_agent.agent.views import (
 	ActionResult,
 	AgentOutput,
@@ -15,6 +17,7 @@ from web_agent.agent.views import (
 	MessageManagerState,
 )
 from web_agent.browser.views import BrowserStateSummary
+from web_agent.domain_matcher import compile_domain_patterns
 from web_agent.filesystem.file_system import FileSystem
 from web_agent.llm.base import BaseChatModel
 from web_agent.llm.messages import (
@@ -24,8 +27,9 @@ from web_agent.llm.messages import (
 	SystemMessage,
 	UserMessage,
 )
+from web_agent.llm.views import ChatInvokeUsage
 from web_agent.observability import observe_debug
-from web_agent.utils import match_url_with_domain_pattern, time_execution_sync
+from web_agent.utils import time_execution_sync
 
 logger = logging.getLogger(__name__)
 
@@ -114,6 +118,7 @@ class MessageManager:
 		include_recent_events: bool = False,
 		sample_images: list[ContentPartTextParam | ContentPartImageParam] | None = None,
 		llm_screenshot_size: tuple[int, int] | None = None,
+		prompt_cache_layout: bool = False,
 	):
 		self.task = task
 		self.state = state
@@ -127,6 +132,8 @@ class MessageManager:
 		self.include_recent_events = include_recent_events
 		self.sample_images = sample_images
 		self.llm_screenshot_size = llm_screenshot_size
+		self.prompt_cache_layout = prompt_cache_layout
+		self.prompt_cache_stats = PromptCacheStats()
 
 		assert max_history_items is None or max_history_items > 5, 'max_history_items must be None or greater than 5'
 
@@ -135,26 +142,36 @@ class MessageManager:
 		self.sensitive_data = sensitive_data
 		self.last_input_messages = []
 		self.last_state_message_text: str | None = None
+		# Rendered history items, kept in sync with state.agent_history_items
+		self._rendered_history = RenderedHistory()
 		# Only initialize messages if state is empty
 		if len(self.state.history.get_messages()) == 0:
 			self._set_message_with_type(self.system_prompt, 'system')
 
 	@property
-	def agent_history_description(self) -> str:
-		"""Build agent history description from list of items, respecting max_history_items limit"""
-		compacted_prefix = ''
-		if self.state.compacted_memory:
-			compacted_prefix = f'<compacted_memory>\n{self.state.compacted_memory}\n</compacted_memory>\n'
-
-		if self.max_history_items is None:
-			# Include all items
-			return compacted_prefix + '\n'.join(item.to_string() for item in self.state.agent_history_items)
-
-		total_items = len(self.state.agent_history_items)
+	def rendered_history(self) -> RenderedHistory:
+		"""Rendered history buffer, synced with any items appended since the last access"""
+		self._rendered_history.sync(self.state.agent_history_items)
+		return self._rendered_history
+
+	def _history_texts(self) -> list[str]:
+		"""Rendered history items to show the model, respecting max_history_items limit"""
+		stable_texts, window_texts = self._split_history_texts()
+		return [*stable_texts, *window_texts]
+
+	def _split_history_texts(self) -> tuple[list[str], list[str]]:
+		"""History items split into a part that only grows by appending and a sliding window.
+
+		Without a max_history_items limit (or below it) every item is stable. Above it only the first item is: the
+		omitted-steps marker and the most recent items change every step, so the prompt cache layout puts them after
+		the cache breakpoint.
+		"""
+		texts = self.rendered_history.texts
+		total_items = len(texts)
 
-		# If we have fewer items than the limit, just return all items
-		if total_items <= self.max_history_items:
-			return compacted_prefix + '\n'.join(item.to_string() for item in self.state.agent_history_items)
+		# If there is no limit or we have fewer items than the limit, just return all items
+		if self.max_history_items is None or total_items <= self.max_history_items:
+			return texts, []
 
 		# We have more items than the limit, so we need to omit some
 		omitted_count = total_items - self.max_history_items
@@ -163,14 +180,26 @@ class MessageManager:
 		# The omitted message doesn't count against the limit, only real history items do
 		recent_items_count = self.max_history_items - 1  # -1 for first item
 
-		items_to_include = [
-			self.state.agent_history_items[0].to_string(),  # Keep first item (initialization)
-			f'<sys>[... {omitted_count} previous steps omitted...]</sys>',
-		]
-		# Add most recent items
-		items_to_include.extend([item.to_string() for item in self.state.agent_history_items[-recent_items_count:]])
+		return (
+			[texts[0]],  # Keep first item (initialization)
+			[
+				f'<sys>[... {omitted_count} previous steps omitted...]</sys>',
+				*texts[-recent_items_count:],  # Add most recent items
+			],
+		)
+
+	@property
+	def agent_history_description(self) -> str:
+		"""Build agent history description from list of items, respecting max_history_items limit"""
+		compacted_prefix = ''
+		if self.state.compacted_memory:
+			compacted_prefix = f'<compacted_memory>\n{self.state.compacted_memory}\n</compacted_memory>\n'
+
+		rendered = self.rendered_history
+		if self.max_history_items is None or len(rendered) <= self.max_history_items:
+			return compacted_prefix + rendered.text()
 
-		return compacted_prefix + '\n'.join(items_to_include)
+		return compacted_prefix + '\n'.join(self._history_texts())
 
 	def add_new_task(self, new_task: str) -> None:
 		new_task = '<follow_up_user_request> ' + new_task.strip() + ' </follow_up_user_request>'
@@ -219,13 +248,14 @@ class MessageManager:
 		if steps_since < settings.compact_every_n_steps:
 			return False
 
-		# Char floor gate
+		# Char floor gate (running count, no re-rendering)
 		history_items = self.state.agent_history_items
-		full_history_text = '\n'.join(item.to_string() for item in history_items).strip()
+		rendered = self.rendered_history
 		trigger_char_count = settings.trigger_char_count or 40000
-		if len(full_history_text) < trigger_char_count:
+		if rendered.char_count < trigger_char_count:
 			return False
 
+		full_history_text = rendered.text().strip()
 		logger.debug(f'Compacting message history (items={len(history_items)}, chars={len(full_history_text)})')
 
 		# Build compaction input
@@ -273,10 +303,8 @@ class MessageManager:
 		# Keep first item + most recent items
 		keep_last = max(0, settings.keep_last_items)
 		if len(history_items) > keep_last + 1:
-			if keep_last == 0:
-				self.state.agent_history_items = [history_items[0]]
-			else:
-				self.state.agent_history_items = [history_items[0]] + history_items[-keep_last:]
+			rendered.retain(keep_first=1, keep_last=keep_last)
+			self.state.agent_history_items = list(rendered.items)
 
 		logger.debug(f'Compaction complete (summary_chars={len(summary)}, history_items={len(self.state.agent_history_items)})')
 
@@ -378,10 +406,15 @@ class MessageManager:
 		# Collect placeholders for sensitive data
 		placeholders: set[str] = set()
 
+		matching_domains: set[str] = set()
+		if current_page_url:
+			domain_keys = tuple(key for key, value in sensitive_data.items() if isinstance(value, dict))
+			matching_domains = compile_domain_patterns(domain_keys, log_warnings=True).matching_patterns(current_page_url)
+
 		for key, value in sensitive_data.items():
 			if isinstance(value, dict):
 				# New format: {domain: {key: value}}
-				if current_page_url and match_url_with_domain_pattern(current_page_url, key, True):
+				if key in matching_domains:
 					placeholders.update(value.keys())
 			else:
 				# Old format: {key: value}
@@ -459,12 +492,26 @@ class MessageManager:
 		# Use vision in the user message if screenshots are included
 		effective_use_vision = len(screenshots) > 0
 
+		agent_history_description: str | None = None
+		if self.prompt_cache_layout:
+			# Stable task + history prefix goes in its own message ahead of the volatile browser state,
+			# a max_history_items sliding window goes after the cache breakpoint at the start of the state message
+			stable_texts, window_texts = self._split_history_texts()
+			prefix_message = get_stable_prefix_message(self.task, stable_texts, self.state.compacted_memory)
+			if self.sensitive_data:
+				prefix_message = self._filter_sensitive_data(prefix_message)
+			self.state.history.prefix_message = prefix_message
+			agent_history_description = '\n'.join(window_texts) or None
+		else:
+			self.state.history.prefix_message = None
+			agent_history_description = self.agent_history_description
+
 		# Create single state message with all content
 		assert browser_state_summary
 		state_message = AgentMessagePrompt(
 			browser_state_summary=browser_state_summary,
 			file_system=self.file_system,
-			agent_history_description=self.agent_history_description,
+			agent_history_description=agent_history_description,
 			read_state_description=self.state.read_state_description,
 			task=self.task,
 			include_attributes=self.include_attributes,
@@ -480,14 +527,45 @@ class MessageManager:
 			llm_screenshot_size=self.llm_screenshot_size,
 			unavailable_skills_info=unavailable_skills_info,
 			plan_description=plan_description,
+			prompt_cache_layout=self.prompt_cache_layout,
 		).get_user_message(effective_use_vision)
 
 		# Store state message text for history
 		self.last_state_message_text = state_message.text
+		if self.state.history.prefix_message:
+			self.last_state_message_text = self.state.history.prefix_message.text + '\n' + state_message.text
 
 		# Set the state message with caching enabled
 		self._set_message_with_type(state_message, 'state')
 
+		if self.prompt_cache_layout:
+			self._record_prompt_prefix(step_info)
+
+	def _record_prompt_prefix(self, step_info: AgentStepInfo | None = None) -> None:
+		"""Hash the stable prefix (system prompt + task/history parts) for cache hit reporting"""
+		history = self.state.history
+		segments: list[str] = []
+		if history.system_message:
+			segments.append(history.system_message.text)
+		if history.prefix_message and isinstance(history.prefix_message.content, list):
+			segments.extend(part.text for part in history.prefix_message.content if isinstance(part, ContentPartTextParam))
+		volatile_chars = len(history.state_message.text) if history.state_message else 0
+		step = self.prompt_cache_stats.record_prefix(
+			segments,
+			total_chars=sum(len(segment) for segment in segments) + volatile_chars,
+			step_number=step_info.step_number if step_info else None,
+		)
+		logger.debug(
+			f'Prompt prefix {step.prefix_hash[:12]}: {step.reused_prefix_chars}/{step.total_chars} chars reusable '
+			f'({step.expected_hit_rate:.0%} expected cache hit)'
+		)
+
+	def record_prompt_cache_usage(self, usage: ChatInvokeUsage | None) -> None:
+		"""Attach the provider-reported cached prompt tokens to the latest recorded prefix"""
+		if not self.prompt_cache_layout or usage is None:
+			return
+		self.prompt_cache_stats.record_usage(usage.prompt_tokens, usage.prompt_cached_tokens)
+
 	def _log_history_lines(self) -> str:
 		"""Generate a formatted log string of message history for debugging / printing to terminal"""
 		# TODO: fix logging
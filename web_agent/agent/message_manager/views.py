@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 from typing import TYPE_CHECKING, Any
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from web_agent.llm.messages import (
 	BaseMessage,
@@ -63,19 +64,80 @@ class HistoryItem(BaseModel):
 {content}"""
 
 
+class RenderedHistory:
+	"""Append-only buffer of rendered history items with running size counters.
+
+	Mirrors MessageManagerState.agent_history_items so that each step only renders
+	the items appended since the previous sync instead of the whole history.
+	"""
+
+	def __init__(self) -> None:
+		self.items: list[HistoryItem] = []
+		self.texts: list[str] = []
+		self.char_count = 0  # length of '\n'.join(self.texts)
+		self._joined: str | None = None
+
+	def __len__(self) -> int:
+		return len(self.items)
+
+	def sync(self, items: list[HistoryItem]) -> None:
+		"""Render any items appended since the last sync, rebuilding only if the list was replaced"""
+		rendered = len(self.items)
+		if rendered > len(items) or (rendered and (items[0] is not self.items[0] or items[rendered - 1] is not self.items[-1])):
+			self.clear()
+			rendered = 0
+
+		for item in items[rendered:]:
+			text = item.to_string()
+			self.char_count += len(text) + (1 if self.texts else 0)
+			self.items.append(item)
+			self.texts.append(text)
+			self._joined = None
+
+	def retain(self, keep_first: int, keep_last: int) -> None:
+		"""Drop everything between the first `keep_first` and the last `keep_last` items"""
+		if len(self.items) <= keep_first + keep_last:
+			return
+		tail = slice(len(self.items) - keep_last, None) if keep_last > 0 else slice(0, 0)
+		self.items = self.items[:keep_first] + self.items[tail]
+		self.texts = self.texts[:keep_first] + self.texts[tail]
+		self.char_count = sum(len(text) for text in self.texts) + max(0, len(self.texts) - 1)
+		self._joined = None
+
+	def clear(self) -> None:
+		self.items = []
+		self.texts = []
+		self.char_count = 0
+		self._joined = None
+
+	def token_count(self, chars_per_token: float = 4.0) -> int:
+		"""Approximate token count of the rendered history"""
+		return int(self.char_count / chars_per_token)
+
+	def text(self) -> str:
+		"""Full rendered history, joined once and reused until the buffer changes"""
+		if self._joined is None:
+			self._joined = '\n'.join(self.texts)
+		return self._joined
+
+
 class MessageHistory(BaseModel):
 	"""History of messages"""
 
 	system_message: BaseMessage | None = None
+	# Byte-stable task + history prefix, only set when the prompt cache layout is enabled
+	prefix_message: BaseMessage | None = None
 	state_message: BaseMessage | None = None
 	context_messages: list[BaseMessage] = Field(default_factory=list)
 	model_config = ConfigDict(arbitrary_types_allowed=True)
 
 	def get_messages(self) -> list[BaseMessage]:
-		"""Get all messages in the correct order: system -> state -> contextual"""
+		"""Get all messages in the correct order: system -> prefix -> state -> contextual"""
 		messages = []
 		if self.system_message:
 			messages.append(self.system_message)
+		if self.prefix_message:
+			messages.append(self.prefix_message)
 		if self.state_message:
 			messages.append(self.state_message)
 		messages.extend(self.context_messages)
@@ -83,6 +145,88 @@ class MessageHistory(BaseModel):
 		return messages
 
 
+class PromptCacheStep(BaseModel):
+	"""Prompt prefix stats for a single LLM call"""
+
+	step_number: int | None = None
+	prefix_hash: str
+	prefix_chars: int
+	reused_prefix_chars: int  # chars of the stable prefix identical to the previous step
+	total_chars: int
+	prompt_tokens: int | None = None
+	cached_tokens: int | None = None
+
+	@property
+	def expected_hit_rate(self) -> float:
+		return self.reused_prefix_chars / self.total_chars if self.total_chars else 0.0
+
+	@property
+	def actual_hit_rate(self) -> float | None:
+		if not self.prompt_tokens or self.cached_tokens is None:
+			return None
+		return self.cached_tokens / self.prompt_tokens
+
+
+class PromptCacheStats(BaseModel):
+	"""Tracks stable prefix hashes per step to compare expected and actual prompt cache hits"""
+
+	steps: list[PromptCacheStep] = Field(default_factory=list)
+	max_steps: int = 500
+	_last_segment_hashes: list[str] = PrivateAttr(default_factory=list)
+
+	def record_prefix(self, segments: list[str], total_chars: int, step_number: int | None = None) -> PromptCacheStep:
+		"""Hash the stable prefix segment by segment and measure how much of it matches the previous step"""
+		digest = hashlib.sha256()
+		segment_hashes: list[str] = []
+		segment_chars: list[int] = []
+		for segment in segments:
+			digest.update(segment.encode('utf-8', errors='replace'))
+			segment_hashes.append(digest.hexdigest())
+			segment_chars.append((segment_chars[-1] if segment_chars else 0) + len(segment))
+
+		reused_chars = 0
+		for i, (segment_hash, previous_hash) in enumerate(zip(segment_hashes, self._last_segment_hashes)):
+			if segment_hash != previous_hash:
+				break
+			reused_chars = segment_chars[i]
+
+		self._last_segment_hashes = segment_hashes
+
+		step = PromptCacheStep(
+			step_number=step_number,
+			prefix_hash=segment_hashes[-1] if segment_hashes else digest.hexdigest(),
+			prefix_chars=segment_chars[-1] if segment_chars else 0,
+			reused_prefix_chars=reused_chars,
+			total_chars=total_chars,
+		)
+		self.steps.append(step)
+		if len(self.steps) > self.max_steps:
+			del self.steps[: len(self.steps) - self.max_steps]
+		return step
+
+	def record_usage(self, prompt_tokens: int, cached_tokens: int | None) -> None:
+		"""Attach provider-reported usage (ChatInvokeUsage.prompt_cached_tokens) to the latest step"""
+		if not self.steps:
+			return
+		self.steps[-1].prompt_tokens = prompt_tokens
+		self.steps[-1].cached_tokens = cached_tokens
+
+	def summary(self) -> dict[str, float | int | None]:
+		"""Aggregate expected (char based) and actual (token based) cache hit rates"""
+		total_chars = sum(step.total_chars for step in self.steps)
+		reused_chars = sum(step.reused_prefix_chars for step in self.steps)
+		measured = [step for step in self.steps if step.actual_hit_rate is not None]
+		prompt_tokens = sum(step.prompt_tokens or 0 for step in measured)
+		cached_tokens = sum(step.cached_tokens or 0 for step in measured)
+		return {
+			'steps': len(self.steps),
+			'expected_hit_rate': reused_chars / total_chars if total_chars else None,
+			'actual_hit_rate': cached_tokens / prompt_tokens if prompt_tokens else None,
+			'prompt_tokens': prompt_tokens,
+			'cached_tokens': cached_tokens,
+		}
+
+
 class MessageManagerState(BaseModel):
 	"""Holds the state for MessageManager"""
 
@@ -124,6 +124,7 @@ class AgentMessagePrompt:
 		llm_screenshot_size: tuple[int, int] | None = None,
 		unavailable_skills_info: str | None = None,
 		plan_description: str | None = None,
+		prompt_cache_layout: bool = False,
 	):
 		self.browser_state: 'BrowserStateSummary' = browser_state_summary
 		self.file_system: 'FileSystem | None' = file_system
@@ -144,6 +145,9 @@ class AgentMessagePrompt:
 		self.unavailable_skills_info: str | None = unavailable_skills_info
 		self.plan_description: str | None = plan_description
 		self.llm_screenshot_size = llm_screenshot_size
+		# Task and history live in the stable prefix message instead (see get_stable_prefix_message), only a
+		# max_history_items sliding window is passed as agent_history_description
+		self.prompt_cache_layout = prompt_cache_layout
 		assert self.browser_state
 
 	def _extract_page_statistics(self) -> dict[str, int]:
@@ -330,10 +334,13 @@ Available tabs:
 		if not len(_todo_contents):
 			_todo_contents = '[empty todo.md, fill it when applicable]'
 
-		agent_state = f"""
+		agent_state = ''
+		if not self.prompt_cache_layout:
+			agent_state += f"""
 <user_request>
 {self.task}
-</user_request>
+</user_request>"""
+		agent_state += f"""
 <file_system>
 {self.file_system.describe() if self.file_system else 'No file system available'}
 </file_system>
@@ -394,11 +401,14 @@ Available tabs:
 			use_vision = False
 
 		# Build complete state description
-		state_description = (
-			'<agent_history>\n'
-			+ (self.agent_history_description.strip('\n') if self.agent_history_description else '')
-			+ '\n</agent_history>\n\n'
-		)
+		state_description = ''
+		# With the prompt cache layout, history is in the prefix message and only a sliding window (if any) is here
+		if not self.prompt_cache_layout or self.agent_history_description:
+			state_description += (
+				'<agent_history>\n'
+				+ (self.agent_history_description.strip('\n') if self.agent_history_description else '')
+				+ '\n</agent_history>\n\n'
+			)
 		state_description += '<agent_state>\n' + self._get_agent_state_description().strip('\n') + '\n</agent_state>\n'
 		state_description += '<browser_state>\n' + self._get_browser_state_description().strip('\n') + '\n</browser_state>\n'
 		# Only add read_state if it has content
@@ -481,9 +491,40 @@ Available tabs:
 					)
 				)
 
-			return UserMessage(content=content_parts, cache=True)
+			return UserMessage(content=content_parts, cache=not self.prompt_cache_layout)
+
+		return UserMessage(content=state_description, cache=not self.prompt_cache_layout)
+
+
+def get_stable_prefix_message(task: str, history_texts: list[str], compacted_memory: str | None = None) -> UserMessage:
+	"""
+	Build the byte-stable part of the agent context for prompt caching.
+
+	Task, compacted memory and each history item become separate text parts, so the
+	rendering of earlier steps never changes when new steps are appended. Providers with
+	automatic prefix caching (OpenAI, Gemini) match on the shared prefix; for Anthropic
+	every part is a content block boundary the cache lookup can fall back to.
 
-		return UserMessage(content=state_description, cache=True)
+	Only pass history that is append-only: with max_history_items the omitted-steps marker and
+	the sliding window change every step and belong in the state message after this one.
+
+	Args:
+		task: The (possibly follow-up extended) user request
+		history_texts: Rendered append-only history items in order
+		compacted_memory: Summary of compacted older history, if any
+
+	Returns:
+		Cached UserMessage with one text part per stable segment
+	"""
+	parts = [ContentPartTextParam(text=f'<user_request>\n{sanitize_surrogates(task)}\n</user_request>\n')]
+	if compacted_memory:
+		parts.append(
+			ContentPartTextParam(text=f'<compacted_memory>\n{sanitize_surrogates(compacted_memory)}\n</compacted_memory>\n')
+		)
+	parts.append(ContentPartTextParam(text='<agent_history>\n'))
+	parts.extend(ContentPartTextParam(text=sanitize_surrogates(text) + '\n') for text in history_texts)
+	parts.append(ContentPartTextParam(text='</agent_history>'))
+	return UserMessage(content=parts, cache=True)
 
 
 def get_rerun_summary_prompt(original_task: str, total_steps: int, success_count: int, error_count: int) -> str:
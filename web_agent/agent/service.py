@@ -6,12 +6,14 @@ import logging
 import re
 import tempfile
 import time
+from collections import deque
 from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar, cast
 from urllib.parse import urlparse
 
 if TYPE_CHECKING:
+	from web_agent.browser.pool import BrowserPool
 	from web_agent.skills.views import Skill
 
 from dotenv import load_dotenv
@@ -25,8 +27,10 @@ from web_agent.agent.cloud_events import (
 )
 from web_agent.agent.message_manager.utils import save_conversation
 from web_agent.llm.base import BaseChatModel
+from web_agent.llm.cache import CachedChatModel, LLMResponseCache
 from web_agent.llm.exceptions import ModelProviderError, ModelRateLimitError
 from web_agent.llm.messages import BaseMessage, ContentPartImageParam, ContentPartTextParam, UserMessage
+from web_agent.llm.scheduler import LLMPriority, LLMScheduler, ScheduledChatModel, estimate_tokens, get_shared_scheduler
 from web_agent.tokens.service import TokenCost
 
 load_dotenv()
@@ -69,6 +73,7 @@ from web_agent.config import CONFIG
 from web_agent.dom.views import DOMInteractedElement, MatchLevel
 from web_agent.filesystem.file_system import FileSystem
 from web_agent.observability import observe, observe_debug
+from web_agent.startup_profiler import startup_profiler
 from web_agent.telemetry.service import ProductTelemetry
 from web_agent.telemetry.views import AgentTelemetryEvent
 from web_agent.tools.registry.views import ActionModel
@@ -204,6 +209,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		loop_detection_enabled: bool = True,
 		llm_screenshot_size: tuple[int, int] | None = None,
 		message_compaction: MessageCompactionSettings | bool | None = True,
+		prompt_cache_layout: bool = False,
+		llm_response_cache: LLMResponseCache | bool = False,
+		llm_scheduler: LLMScheduler | bool = False,
 		_url_shortening_limit: int = 25,
 		**kwargs,
 	):
@@ -409,6 +417,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			loop_detection_window=loop_detection_window,
 			loop_detection_enabled=loop_detection_enabled,
 			message_compaction=message_compaction,
+			prompt_cache_layout=prompt_cache_layout,
 		)
 
 		# Token cost service
@@ -419,6 +428,22 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		if self.settings.message_compaction and self.settings.message_compaction.compaction_llm:
 			self.token_cost_service.register_llm(self.settings.message_compaction.compaction_llm)
 
+		# Shared scheduler: priority queueing + AIMD concurrency per provider/model across all agents using it
+		self._llm_scheduler: LLMScheduler | None = None
+		if llm_scheduler:
+			self._llm_scheduler = llm_scheduler if isinstance(llm_scheduler, LLMScheduler) else get_shared_scheduler()
+			page_extraction_llm = ScheduledChatModel(page_extraction_llm, self._llm_scheduler, LLMPriority.EXTRACTION)
+			judge_llm = ScheduledChatModel(judge_llm, self._llm_scheduler, LLMPriority.JUDGE)
+
+		# Response cache for extraction / judge calls; wrapped after registration so cache hits are not billed
+		if llm_response_cache:
+			response_cache = llm_response_cache if isinstance(llm_response_cache, LLMResponseCache) else LLMResponseCache()
+			page_extraction_llm = CachedChatModel(page_extraction_llm, response_cache)
+			judge_llm = CachedChatModel(judge_llm, response_cache)
+
+		self.settings.page_extraction_llm = page_extraction_llm
+		self.judge_llm = judge_llm
+
 		# Initialize state
 		self.state = injected_agent_state or AgentState()
 
@@ -514,6 +539,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			include_recent_events=self.include_recent_events,
 			sample_images=self.sample_images,
 			llm_screenshot_size=llm_screenshot_size,
+			prompt_cache_layout=self.settings.prompt_cache_layout,
 		)
 
 		if self.sensitive_data:
@@ -722,6 +748,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			from web_agent.screenshots.service import ScreenshotService
 
 			self.screenshot_service = ScreenshotService(self.agent_directory)
+			# Step events dispatched with a screenshot attached, oldest first (see _release_step_event_screenshots)
+			self._step_events_with_screenshots: deque[CreateAgentStepEvent] = deque()
 			self.logger.debug(f'📸 Screenshot service initialized in: {self.agent_directory}/screenshots')
 		except Exception as e:
 			self.logger.error(f'📸 Failed to initialize screenshot service: {e}.')
@@ -1325,10 +1353,23 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				browser_state_summary,
 			)
 			self.eventbus.dispatch(step_event)
+			if step_event.screenshot_url:
+				self._release_step_event_screenshots(step_event)
 
 		# Increment step counter after step is fully completed
 		self.state.n_steps += 1
 
+	def _release_step_event_screenshots(self, step_event: CreateAgentStepEvent) -> None:
+		"""Keep screenshots on the last few step events only: the event bus retains handled events in its history,
+		and once handled (uploaded) an event's screenshot is still available on disk via the history item"""
+		self._step_events_with_screenshots.append(step_event)
+		while len(self._step_events_with_screenshots) > self.screenshot_service.keep_in_memory:
+			oldest = self._step_events_with_screenshots[0]
+			if oldest.event_completed_at is None:
+				break  # Still being handled
+			oldest.screenshot_url = None
+			self._step_events_with_screenshots.popleft()
+
 	def _update_plan_from_model_output(self, model_output: AgentOutput) -> None:
 		"""Update the plan state from model output fields (current_plan_item, plan_update)."""
 		if not self.settings.enable_planning:
@@ -1904,8 +1945,18 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		kwargs: dict = {'output_format': self.AgentOutput, 'session_id': self.session_id}
 
 		try:
-			response = await self.llm.ainvoke(input_messages, **kwargs)
+			if self._llm_scheduler is not None:
+				llm = self.llm
+				response = await self._llm_scheduler.submit(
+					llm,
+					lambda: llm.ainvoke(input_messages, **kwargs),
+					priority=LLMPriority.AGENT_STEP,
+					estimated_tokens=estimate_tokens(input_messages),
+				)
+			else:
+				response = await self.llm.ainvoke(input_messages, **kwargs)
 			parsed: AgentOutput = response.completion  # type: ignore[assignment]
+			self._message_manager.record_prompt_cache_usage(response.usage)
 
 			# Replace any shortened URLs in the LLM response back to original URLs
 			if urls_replaced:
@@ -2009,6 +2060,35 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				f'Starting a web-agent agent with version {self.version}, with provider={self.llm.provider} and model={self.llm.model}'
 			)
 
+	def _log_prompt_cache_summary(self) -> None:
+		"""Log expected vs provider-reported prompt cache hit rates when the cache layout is enabled"""
+		if not self.settings.prompt_cache_layout:
+			return
+		summary = self._message_manager.prompt_cache_stats.summary()
+		if not summary['steps']:
+			return
+		expected = summary['expected_hit_rate']
+		actual = summary['actual_hit_rate']
+		self.logger.info(
+			f'🗄️ Prompt cache: {summary["steps"]} calls, expected hit rate '
+			f'{f"{expected:.0%}" if expected is not None else "n/a"}, actual '
+			f'{f"{actual:.0%}" if actual is not None else "n/a"} '
+			f'({summary["cached_tokens"]}/{summary["prompt_tokens"]} prompt tokens cached)'
+		)
+
+	def _log_llm_scheduler_summary(self) -> None:
+		"""Log queue-wait metrics per provider/model when the LLM scheduler is enabled"""
+		if self._llm_scheduler is None:
+			return
+		for key, stats in self._llm_scheduler.summary().items():
+			if not stats['requests']:
+				continue
+			self.logger.info(
+				f'🚦 LLM scheduler {key}: {stats["requests"]} calls, {stats["queued"]} queued, '
+				f'avg wait {stats["avg_wait_seconds"]:.2f}s, max wait {stats["max_wait_seconds"]:.2f}s, '
+				f'{stats["rate_limited"]} rate limited, concurrency {stats["concurrency_limit"]}'
+			)
+
 	def _log_step_context(self, browser_state_summary: BrowserStateSummary) -> None:
 		"""Log step context information"""
 		url = browser_state_summary.url if browser_state_summary else ''
@@ -2483,6 +2563,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		)
 		signal_handler.register()
 
+		# Usage of LLMs shared with other agents is recorded in this agent's TokenCost for calls made by this run
+		self.token_cost_service.activate()
+
 		try:
 			await self._log_agent_run()
 
@@ -2509,7 +2592,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			# Log startup message on first step (only if we haven't already done steps)
 			self._log_first_step_startup()
 			# Start browser session and attach watchdogs
-			await self.browser_session.start()
+			with startup_profiler.phase('browser session start'):
+				await self.browser_session.start()
 			if self._demo_mode_enabled:
 				await self._demo_mode_log(f'Started task: {self.task}', 'info', {'tag': 'task'})
 				await self._demo_mode_log(
@@ -2523,12 +2607,16 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 			# Normally there was no try catch here but the callback can raise an InterruptedError
 			try:
-				await self._execute_initial_actions()
+				with startup_profiler.phase('initial actions'):
+					await self._execute_initial_actions()
 			except InterruptedError:
 				pass
 			except Exception as e:
 				raise e
 
+			startup_profiler.mark('first step')
+			startup_profiler.log_report()
+
 			self.logger.debug(
 				f'🔄 Starting main execution loop with max {max_steps} steps (currently at step {self.state.n_steps})...'
 			)
@@ -2615,6 +2703,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				await self._demo_mode_log(f'Agent stopped: {agent_run_error}', 'error', {'tag': 'run'})
 			# Log token usage summary
 			await self.token_cost_service.log_usage_summary()
+			self._log_prompt_cache_summary()
+			self._log_llm_scheduler_summary()
 
 			# Unregister signal handlers before cleanup
 			signal_handler.unregister()
@@ -2653,6 +2743,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 			# Log final messages to user based on outcome
 			self._log_final_outcome_messages()
+			if self.screenshot_service.stats.stored:
+				self.logger.info(f'📸 {self.screenshot_service.stats.summary()}')
 
 			# Stop the event bus gracefully, waiting for all events to be processed
 			# Configurable via TIMEOUT_AgentEventBusStop env var (default: 3.0s)
@@ -3916,6 +4008,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			if self.skill_service is not None:
 				await self.skill_service.close()
 
+			# Finish deferred PDF/DOCX renders so the files on disk are complete
+			if self.file_system is not None:
+				await self.file_system.flush()
+
+			# Screenshots stay on disk, drop the in-memory copies
+			self.screenshot_service.clear_memory()
+			self._step_events_with_screenshots.clear()
+
 			# Force garbage collection
 			gc.collect()
 
@@ -3985,6 +4085,53 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		return asyncio.run(self.run(max_steps=max_steps, on_step_start=on_step_start, on_step_end=on_step_end))
 
+	@classmethod
+	async def run_many(
+		cls,
+		tasks: list[str],
+		concurrency: int = 4,
+		browser_pool: 'BrowserPool | None' = None,
+		max_steps: int = 500,
+		**agent_kwargs: Any,
+	) -> list[AgentHistoryList[AgentStructuredOutput] | Exception]:
+		"""Run one agent per task, at most ``concurrency`` at a time, each in its own browser context of a shared BrowserPool.
+
+		Extra keyword arguments are passed to every Agent (llm, tools, use_vision, ...). Without ``browser_pool`` a pool
+		is created from ``browser_profile`` and closed afterwards. Results are returned in task order: the history of
+		each task, or the exception it failed with (a failing task does not cancel the others).
+		"""
+		from web_agent.browser.pool import BrowserPool
+
+		if agent_kwargs.get('browser') or agent_kwargs.get('browser_session'):
+			raise ValueError('run_many() gives every agent its own pooled browser session, pass browser_pool instead of browser/browser_session')
+
+		browser_profile = agent_kwargs.pop('browser_profile', None)
+		own_pool = browser_pool is None
+		if browser_pool is None:
+			max_contexts_per_browser = 4
+			browser_pool = BrowserPool(
+				size=max(1, -(-concurrency // max_contexts_per_browser)),
+				browser_profile=browser_profile,
+				max_contexts_per_browser=max_contexts_per_browser,
+			)
+
+		semaphore = asyncio.Semaphore(max(1, concurrency))
+
+		async def run_one(index: int, task: str) -> AgentHistoryList[AgentStructuredOutput] | Exception:
+			try:
+				async with semaphore, browser_pool.session() as browser_session:
+					agent = cls(task=task, browser_session=browser_session, **agent_kwargs)
+					return await agent.run(max_steps=max_steps)
+			except Exception as e:
+				logger.error(f'❌ run_many task {index + 1}/{len(tasks)} failed: {type(e).__name__}: {e}')
+				return e
+
+		try:
+			return await asyncio.gather(*(run_one(index, task) for index, task in enumerate(tasks)))
+		finally:
+			if own_pool:
+				await browser_pool.close()
+
 	def detect_variables(self) -> dict[str, DetectedVariable]:
 		"""Detect reusable variables in agent history"""
 		from web_agent.agent.variable_detector import detect_variables_in_history
@@ -74,6 +74,7 @@ class AgentSettings(BaseModel):
 	ground_truth: str | None = None  # Ground truth answer or criteria for judge validation
 	max_history_items: int | None = None
 	message_compaction: MessageCompactionSettings | None = None
+	prompt_cache_layout: bool = False  # Put task + history in a byte-stable prefix message ahead of the browser state
 	enable_planning: bool = True
 	planning_replan_on_stall: int = 3  # consecutive failures before replan nudge; 0 = disabled
 	planning_exploration_limit: int = 5  # steps without a plan before nudge; 0 = disabled
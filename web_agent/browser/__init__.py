@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING
 
 # Type stubs for lazy imports
 if TYPE_CHECKING:
+	from .pool import BrowserPool
 	from .profile import BrowserProfile, ProxySettings
 	from .session import BrowserSession
 
@@ -11,6 +12,7 @@ _LAZY_IMPORTS = {
 	'ProxySettings': ('.profile', 'ProxySettings'),
 	'BrowserProfile': ('.profile', 'BrowserProfile'),
 	'BrowserSession': ('.session', 'BrowserSession'),
+	'BrowserPool': ('.pool', 'BrowserPool'),
 }
 
 
@@ -38,4 +40,5 @@ __all__ = [
 	'BrowserSession',
 	'BrowserProfile',
 	'ProxySettings',
+	'BrowserPool',
 ]
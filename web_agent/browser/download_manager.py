@@ -0,0 +1,337 @@
+"""Bounded-concurrency file downloader used by DownloadsWatchdog for automatic downloads.
+
+- at most `max_concurrent` downloads run at once, identical URLs in flight share one download
+- bodies are streamed to a `.part` file in chunks, never buffered whole in memory
+- interrupted transfers resume with `Range` + `If-Range` requests, so a file that changed on the server is
+  downloaded again instead of being spliced (they restart if the server ignores them or sent no validator)
+- finished files are content-hashed and a byte-identical file already in the downloads dir is reused
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urljoin
+
+import anyio
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# (received_bytes, total_bytes or 0 if unknown, state) with state 'inProgress', 'completed' or 'canceled'
+ProgressCallback = Callable[[int, int, str], None]
+# Request headers for a URL (called for every request, including redirects and resumes)
+HeadersProvider = Callable[[str], Awaitable[dict[str, str]]]
+
+_MAX_REDIRECTS = 10
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class DownloadError(Exception):
+	"""A download failed; status_code is set for HTTP error responses"""
+
+	def __init__(self, message: str, status_code: int | None = None):
+		super().__init__(message)
+		self.status_code = status_code
+
+
+@dataclass
+class DownloadResult:
+	url: str
+	path: str
+	file_name: str
+	file_size: int
+	sha256: str
+	mime_type: str | None = None
+	deduplicated: bool = False  # An identical file already existed and was reused
+	resumed: int = 0  # Number of times the transfer was resumed after an interruption
+
+
+def unique_filename(directory: str | Path, filename: str, reserved: set[str] | frozenset[str] = frozenset()) -> str:
+	"""filename, or `name (1).ext`, `name (2).ext`, ... if taken in directory (one listdir, no probing loop)"""
+	try:
+		taken = set(os.listdir(directory))
+	except FileNotFoundError:
+		taken = set()
+	taken |= reserved
+	if filename not in taken:
+		return filename
+	base, ext = os.path.splitext(filename)
+	counter = 1
+	while f'{base} ({counter}){ext}' in taken:
+		counter += 1
+	return f'{base} ({counter}){ext}'
+
+
+def _range_validator(response: httpx.Response) -> str | None:
+	"""Value for If-Range when resuming this response's body: its strong ETag, else its Last-Modified"""
+	etag = response.headers.get('etag')
+	if etag and not etag.startswith('W/'):  # Weak ETags are not allowed in If-Range
+		return etag
+	return response.headers.get('last-modified')
+
+
+def _sha256_file(path: str) -> str:
+	hasher = hashlib.sha256()
+	with open(path, 'rb') as f:
+		while chunk := f.read(_HASH_CHUNK_SIZE):
+			hasher.update(chunk)
+	return hasher.hexdigest()
+
+
+class DownloadManager:
+	"""Downloads files into downloads_dir with a concurrency limit, streaming writes, resume and content dedup."""
+
+	def __init__(
+		self,
+		downloads_dir: str | Path,
+		max_concurrent: int = 4,
+		max_resume_attempts: int = 3,
+		timeout: float = 60.0,
+		proxy: str | None = None,
+		progress_interval: float = 0.25,
+	):
+		self.downloads_dir = Path(downloads_dir)
+		self.max_resume_attempts = max_resume_attempts
+		self.progress_interval = progress_interval
+		self._semaphore = asyncio.Semaphore(max_concurrent)
+		self._client = httpx.AsyncClient(
+			timeout=httpx.Timeout(timeout, connect=15.0),
+			proxy=proxy,
+			follow_redirects=False,  # Followed by hand so each hop gets its own cookies
+			limits=httpx.Limits(max_connections=max_concurrent * 2, max_keepalive_connections=max_concurrent),
+		)
+		self._inflight: dict[str, asyncio.Task[DownloadResult]] = {}
+		self._reserved: set[str] = set()  # Final names claimed by downloads still in progress
+		self._hashes: dict[str, tuple[int, int, str]] = {}  # path -> (size, mtime_ns, sha256) of files in downloads_dir
+		self._finish_lock = asyncio.Lock()  # Dedup check and move happen one download at a time
+
+	async def aclose(self) -> None:
+		for task in list(self._inflight.values()):
+			task.cancel()
+		await self._client.aclose()
+
+	async def download(
+		self,
+		url: str,
+		filename: str,
+		get_headers: HeadersProvider | None = None,
+		on_progress: ProgressCallback | None = None,
+	) -> DownloadResult:
+		"""Download url into downloads_dir as filename (made unique); concurrent calls for the same url share one transfer"""
+		task = self._inflight.get(url)
+		if task is None:
+			task = asyncio.create_task(self._download(url, filename, get_headers, on_progress), name=f'download {url[:60]}')
+			self._inflight[url] = task
+			task.add_done_callback(lambda _: self._inflight.pop(url, None))
+		return await asyncio.shield(task)
+
+	async def save_bytes(self, data: bytes, filename: str, url: str = '', mime_type: str | None = None) -> DownloadResult:
+		"""Store an already-fetched body with the same naming and dedup rules as download()"""
+		self.downloads_dir.mkdir(parents=True, exist_ok=True)
+		final_name = self._reserve(filename)
+		part_path = self.downloads_dir / f'{final_name}.part'
+		try:
+			async with await anyio.open_file(part_path, 'wb') as f:
+				await f.write(data)
+			return await self._finish(url, part_path, final_name, hashlib.sha256(data).hexdigest(), len(data), mime_type, 0)
+		finally:
+			self._reserved.discard(final_name)
+
+	async def _download(
+		self,
+		url: str,
+		filename: str,
+		get_headers: HeadersProvider | None,
+		on_progress: ProgressCallback | None,
+	) -> DownloadResult:
+		async with self._semaphore:
+			self.downloads_dir.mkdir(parents=True, exist_ok=True)
+			final_name = self._reserve(filename)
+			part_path = self.downloads_dir / f'{final_name}.part'
+			try:
+				sha256, size, mime_type, resumed = await self._stream_to_file(url, part_path, get_headers, on_progress)
+				return await self._finish(url, part_path, final_name, sha256, size, mime_type, resumed)
+			except BaseException:
+				part_path.unlink(missing_ok=True)
+				if on_progress:
+					on_progress(0, 0, 'canceled')
+				raise
+			finally:
+				self._reserved.discard(final_name)
+
+	def _reserve(self, filename: str) -> str:
+		name = unique_filename(self.downloads_dir, filename, self._reserved | {f'{n}.part' for n in self._reserved})
+		self._reserved.add(name)
+		return name
+
+	async def _open_stream(
+		self, url: str, get_headers: HeadersProvider | None, offset: int, validator: str | None = None
+	) -> httpx.Response:
+		"""Send a GET (following redirects by hand) and return the streaming response"""
+		for _ in range(_MAX_REDIRECTS + 1):
+			headers = dict(await get_headers(url)) if get_headers else {}
+			headers['Accept-Encoding'] = 'identity'  # Range offsets must refer to the bytes we write
+			if offset:
+				headers['Range'] = f'bytes={offset}-'
+				if validator:
+					headers['If-Range'] = validator  # Full body instead of a range if the file changed since
+			response = await self._client.send(self._client.build_request('GET', url, headers=headers), stream=True)
+			if response.is_redirect and 'location' in response.headers:
+				await response.aclose()
+				url = urljoin(url, response.headers['location'])
+				continue
+			return response
+		raise DownloadError(f'Too many redirects for {url}')
+
+	async def _stream_to_file(
+		self,
+		url: str,
+		part_path: Path,
+		get_headers: HeadersProvider | None,
+		on_progress: ProgressCallback | None,
+	) -> tuple[str, int, str | None, int]:
+		"""Stream url into part_path, resuming on interruptions; returns (sha256, size, mime type, resume count)"""
+		hasher = hashlib.sha256()
+		received = 0
+		total = 0
+		mime_type = None
+		resumed = 0
+		resumable = True
+		validator: str | None = None  # ETag / Last-Modified of the response the bytes so far came from
+		last_progress = 0.0
+
+		async with await anyio.open_file(part_path, 'wb') as f:
+			while True:
+				try:
+					# Without a validator the server can't tell us whether the file changed, so never resume blind
+					offset = received if resumable and validator else 0
+					response = await self._open_stream(url, get_headers, offset, validator)
+					try:
+						if response.status_code >= 400:
+							raise DownloadError(f'HTTP {response.status_code} for {url}', status_code=response.status_code)
+						if offset and response.status_code == 206 and _range_validator(response) not in (None, validator):
+							# Range of a different version of the file (server ignored If-Range): fetch it whole
+							validator = None
+							continue
+						if received and (not offset or response.status_code != 206):
+							# File changed, server ignored the Range header, or we couldn't ask for one: start over
+							await f.seek(0)
+							await f.truncate()
+							hasher = hashlib.sha256()
+							received = 0
+						if response.status_code != 206:
+							validator = _range_validator(response)
+						# Servers that compress anyway get decoded (the length then refers to the encoded body)
+						encoded = response.headers.get('content-encoding', 'identity').lower() != 'identity'
+						resumable = not encoded
+						content_length = 0 if encoded else int(response.headers.get('content-length') or 0)
+						total = received + content_length if content_length else 0
+						mime_type = mime_type or response.headers.get('content-type', '').split(';')[0].strip() or None
+
+						# Written as they arrive (not re-chunked) so an interruption loses nothing already received
+						chunks = response.aiter_bytes() if encoded else response.aiter_raw()
+						async for chunk in chunks:
+							await f.write(chunk)
+							hasher.update(chunk)
+							received += len(chunk)
+							now = time.monotonic()
+							if on_progress and now - last_progress >= self.progress_interval:
+								last_progress = now
+								on_progress(received, total, 'inProgress')
+					finally:
+						await response.aclose()
+
+					if total and received < total:
+						raise httpx.ReadError(f'Connection closed after {received} of {total} bytes')
+					break
+				except httpx.TransportError as e:
+					if resumed >= self.max_resume_attempts:
+						raise DownloadError(f'Download of {url} failed after {resumed} resumes: {type(e).__name__}: {e}') from e
+					resumed += 1
+					logger.debug(f'Download of {url[:80]} interrupted at {received} bytes, resuming ({resumed}): {e}')
+					await asyncio.sleep(min(2.0, 0.25 * 2**resumed))
+
+		if on_progress:
+			on_progress(received, total or received, 'completed')
+		return hasher.hexdigest(), received, mime_type, resumed
+
+	async def _finish(
+		self,
+		url: str,
+		part_path: Path,
+		final_name: str,
+		sha256: str,
+		size: int,
+		mime_type: str | None,
+		resumed: int,
+	) -> DownloadResult:
+		"""Move the finished .part file into place, or drop it in favour of an identical existing file"""
+		async with self._finish_lock:
+			return await self._finish_locked(url, part_path, final_name, sha256, size, mime_type, resumed)
+
+	async def _finish_locked(
+		self,
+		url: str,
+		part_path: Path,
+		final_name: str,
+		sha256: str,
+		size: int,
+		mime_type: str | None,
+		resumed: int,
+	) -> DownloadResult:
+		duplicate = await anyio.to_thread.run_sync(self._find_duplicate, size, sha256)
+		if duplicate is not None:
+			part_path.unlink(missing_ok=True)
+			logger.debug(f'Download of {url[:80]} is identical to {duplicate}, reusing it')
+			return DownloadResult(
+				url=url,
+				path=duplicate,
+				file_name=os.path.basename(duplicate),
+				file_size=size,
+				sha256=sha256,
+				mime_type=mime_type,
+				deduplicated=True,
+				resumed=resumed,
+			)
+
+		final_path = self.downloads_dir / final_name
+		os.replace(part_path, final_path)
+		stat = final_path.stat()
+		self._hashes[str(final_path)] = (stat.st_size, stat.st_mtime_ns, sha256)
+		return DownloadResult(
+			url=url,
+			path=str(final_path),
+			file_name=final_name,
+			file_size=size,
+			sha256=sha256,
+			mime_type=mime_type,
+			resumed=resumed,
+		)
+
+	def _find_duplicate(self, size: int, sha256: str) -> str | None:
+		"""Path of a file in downloads_dir with the same content (only same-size files are hashed, once each)"""
+		try:
+			entries = list(os.scandir(self.downloads_dir))
+		except FileNotFoundError:
+			return None
+		for entry in entries:
+			if entry.name.endswith('.part') or not entry.is_file():
+				continue
+			stat = entry.stat()
+			if stat.st_size != size:
+				continue
+			cached = self._hashes.get(entry.path)
+			if cached is None or cached[:2] != (stat.st_size, stat.st_mtime_ns):
+				try:
+					cached = (stat.st_size, stat.st_mtime_ns, _sha256_file(entry.path))
+				except OSError:
+					continue
+				self._hashes[entry.path] = cached
+			if cached[2] == sha256:
+				return entry.path
+		return None
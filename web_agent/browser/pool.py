@@ -0,0 +1,252 @@
+"""Pool of warm Chromium processes that hands out isolated browser contexts.
+
+Launching Chromium dominates the latency of short tasks. A BrowserPool keeps ``size`` browsers
+running and gives each agent its own CDP browser context (``Target.createBrowserContext``):
+separate cookies, storage, cache and tabs, created in milliseconds. Contexts are disposed when
+the agent is done, so every task starts from a clean state. Browsers are health-checked with
+CrashWatchdog.check_health() before handing out a context and recycled after
+``max_tasks_per_browser`` tasks.
+
+	pool = BrowserPool(size=2, browser_profile=BrowserProfile(headless=True))
+	async with pool.session() as browser_session:
+		agent = Agent(task=..., llm=llm, browser_session=browser_session)
+		await agent.run()
+	await pool.close()
+
+See also ``Agent.run_many(tasks, concurrency=...)``.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from web_agent.browser.profile import BrowserProfile
+from web_agent.browser.session import BrowserSession
+from web_agent.browser.watchdogs.crash_watchdog import CrashWatchdog
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PooledBrowser:
+	owner: BrowserSession  # Session that launched the browser process
+	cdp_url: str
+	crash_watchdog: CrashWatchdog
+	tasks_started: int = 0
+	active: int = 0
+
+
+@dataclass
+class BrowserPoolStats:
+	browsers_launched: int = 0
+	browsers_recycled: int = 0
+	browsers_unhealthy: int = 0
+	contexts_created: int = 0
+
+
+class BrowserPool:
+	"""Keeps warm browsers and hands out one isolated browser context per agent.
+
+	Args:
+		size: Number of browser processes kept running
+		browser_profile: Profile used to launch the browsers and configure each context's session
+		max_contexts_per_browser: Concurrent contexts per browser before acquire() waits
+		max_tasks_per_browser: Contexts handed out by a browser before it is replaced by a fresh one
+		health_check_timeout: Seconds a browser has to answer the health probe before it is replaced
+	"""
+
+	def __init__(
+		self,
+		size: int = 1,
+		browser_profile: BrowserProfile | None = None,
+		max_contexts_per_browser: int = 4,
+		max_tasks_per_browser: int = 50,
+		health_check_timeout: float = 2.0,
+	):
+		self.size = max(1, size)
+		self.browser_profile = browser_profile or BrowserProfile()
+		self.max_contexts_per_browser = max(1, max_contexts_per_browser)
+		self.max_tasks_per_browser = max(1, max_tasks_per_browser)
+		self.health_check_timeout = health_check_timeout
+		self.stats = BrowserPoolStats()
+
+		self._browsers: list[_PooledBrowser] = []
+		self._retiring: list[_PooledBrowser] = []
+		self._launching = 0
+		self._leases: dict[str, tuple[_PooledBrowser, str]] = {}
+		self._condition = asyncio.Condition()
+		self._closed = False
+
+	@property
+	def capacity(self) -> int:
+		"""How many contexts can be in use at once"""
+		return self.size * self.max_contexts_per_browser
+
+	async def start(self) -> None:
+		"""Launch browsers up to the pool size ahead of the first acquire()"""
+		async with self._condition:
+			missing = self.size - len(self._browsers) - self._launching
+			self._launching += max(0, missing)
+		await asyncio.gather(*(self._launch_into_pool() for _ in range(max(0, missing))))
+
+	async def _launch(self) -> _PooledBrowser:
+		# Every browser needs its own user_data_dir; None gets a fresh temp dir
+		profile = BrowserProfile(**{**self.browser_profile.model_dump(exclude_unset=True), 'user_data_dir': None, 'keep_alive': True})
+		owner = BrowserSession(browser_profile=profile)
+		await owner.start()
+		assert owner.cdp_url, 'Browser launched without a CDP URL'
+		self.stats.browsers_launched += 1
+		logger.debug(f'🏊 BrowserPool launched browser {len(self._browsers) + 1}/{self.size} at {owner.cdp_url}')
+		# Only used for one-shot health probes, so it is not attached to the owner's event bus handlers
+		CrashWatchdog.model_rebuild()
+		crash_watchdog = CrashWatchdog(event_bus=owner.event_bus, browser_session=owner)
+		return _PooledBrowser(owner=owner, cdp_url=owner.cdp_url, crash_watchdog=crash_watchdog)
+
+	async def _launch_into_pool(self) -> None:
+		browser: _PooledBrowser | None = None
+		try:
+			browser = await self._launch()
+		finally:
+			async with self._condition:
+				self._launching -= 1
+				if browser is not None:
+					self._browsers.append(browser)
+				self._condition.notify_all()
+
+	def _pick(self) -> _PooledBrowser | None:
+		candidates = [browser for browser in self._browsers if browser.active < self.max_contexts_per_browser]
+		return min(candidates, key=lambda browser: browser.active, default=None)
+
+	async def _is_healthy(self, browser: _PooledBrowser) -> bool:
+		if browser.owner._cdp_client_root is None:
+			return False
+		return await browser.crash_watchdog.check_health(timeout=self.health_check_timeout)
+
+	async def acquire(self) -> BrowserSession:
+		"""Get a started BrowserSession confined to a fresh browser context; give it back with release()"""
+		while True:
+			launch = False
+			async with self._condition:
+				if self._closed:
+					raise RuntimeError('BrowserPool is closed')
+				browser = self._pick()
+				if browser is None:
+					if len(self._browsers) + self._launching < self.size:
+						self._launching += 1
+						launch = True
+					else:
+						await self._condition.wait()
+						continue
+				else:
+					browser.active += 1
+					browser.tasks_started += 1
+					if browser.tasks_started >= self.max_tasks_per_browser:
+						# Stop handing out contexts from this browser; it is killed once its last context is released
+						self._retire(browser)
+						self.stats.browsers_recycled += 1
+
+			if launch:
+				await self._launch_into_pool()
+				continue
+
+			assert browser is not None
+			if not await self._is_healthy(browser):
+				logger.warning('🏊 BrowserPool browser failed its health check, replacing it')
+				self.stats.browsers_unhealthy += 1
+				async with self._condition:
+					self._retire(browser)
+				await self._give_back(browser)
+				continue
+
+			try:
+				return await self._open_context(browser)
+			except Exception:
+				await self._give_back(browser)
+				raise
+
+	def _retire(self, browser: _PooledBrowser) -> None:
+		if browser in self._browsers:
+			self._browsers.remove(browser)
+			self._retiring.append(browser)
+			self._condition.notify_all()  # A replacement can be launched now
+
+	async def _open_context(self, browser: _PooledBrowser) -> BrowserSession:
+		result = await browser.owner.cdp_client.send.Target.createBrowserContext(params={'disposeOnDetach': False})
+		browser_context_id = result['browserContextId']
+		self.stats.contexts_created += 1
+
+		# keep_alive so Agent.close() leaves cleanup to release(); reuse the owner's data dir instead of creating new temp dirs
+		profile = BrowserProfile(
+			**{
+				**self.browser_profile.model_dump(exclude_unset=True),
+				'user_data_dir': browser.owner.browser_profile.user_data_dir,
+				'keep_alive': True,
+			}
+		)
+		session = BrowserSession(browser_profile=profile, cdp_url=browser.cdp_url, is_local=False)
+		session.browser_context_id = browser_context_id
+		try:
+			await session.start()
+		except Exception:
+			await self._dispose_context(browser, browser_context_id)
+			raise
+		self._leases[session.id] = (browser, browser_context_id)
+		return session
+
+	async def _dispose_context(self, browser: _PooledBrowser, browser_context_id: str) -> None:
+		try:
+			await browser.owner.cdp_client.send.Target.disposeBrowserContext(params={'browserContextId': browser_context_id})
+		except Exception as e:
+			logger.debug(f'🏊 BrowserPool failed to dispose browser context {browser_context_id}: {type(e).__name__}: {e}')
+
+	async def release(self, session: BrowserSession) -> None:
+		"""Disconnect the session and dispose its browser context, wiping its cookies, storage and tabs"""
+		lease = self._leases.pop(session.id, None)
+		if lease is None:
+			return
+		browser, browser_context_id = lease
+		try:
+			await session.kill()
+		except Exception as e:
+			logger.debug(f'🏊 BrowserPool error while disconnecting session: {type(e).__name__}: {e}')
+		await self._dispose_context(browser, browser_context_id)
+		await self._give_back(browser)
+
+	async def _give_back(self, browser: _PooledBrowser) -> None:
+		async with self._condition:
+			browser.active -= 1
+			drained = browser in self._retiring and browser.active == 0
+			if drained:
+				self._retiring.remove(browser)
+			self._condition.notify_all()
+		if drained:
+			await self._kill(browser)
+
+	async def _kill(self, browser: _PooledBrowser) -> None:
+		try:
+			await browser.owner.kill()
+		except Exception as e:
+			logger.debug(f'🏊 BrowserPool error while killing browser: {type(e).__name__}: {e}')
+
+	@asynccontextmanager
+	async def session(self) -> AsyncIterator[BrowserSession]:
+		"""``async with pool.session() as browser_session:`` acquire and always release"""
+		browser_session = await self.acquire()
+		try:
+			yield browser_session
+		finally:
+			await self.release(browser_session)
+
+	async def close(self) -> None:
+		"""Release every outstanding context and kill all browsers"""
+		async with self._condition:
+			self._closed = True
+			self._condition.notify_all()
+		for browser, browser_context_id in list(self._leases.values()):
+			await self._dispose_context(browser, browser_context_id)
+		self._leases.clear()
+		browsers, self._browsers = self._browsers + self._retiring, []
+		self._retiring = []
+		await asyncio.gather(*(self._kill(browser) for browser in browsers))
@@ -1,4 +1,7 @@
+import hashlib
+import json
 import os
+import shutil
 import sys
 import tempfile
 from collections.abc import Iterable
@@ -12,6 +15,7 @@ from pydantic import AfterValidator, AliasChoices, BaseModel, ConfigDict, Field,
 
 from web_agent.browser.cloud.views import CloudBrowserParams
 from web_agent.config import CONFIG
+from web_agent.domain_matcher import DomainPatternList
 from web_agent.utils import _log_pretty_path, logger
 
 
@@ -25,7 +29,7 @@ def _get_enable_default_extensions_default() -> bool:
 
 
 CHROME_DEBUG_PORT = 9242  # use a non-default port to avoid conflicts with other tools / devs using 9222
-DOMAIN_OPTIMIZATION_THRESHOLD = 100  # Convert domain lists to sets for O(1) lookup when >= this size
+DOMAIN_OPTIMIZATION_THRESHOLD = 100  # Convert plain-domain lists to sets for O(1) lookup when >= this size
 CHROME_DISABLED_COMPONENTS = [
 	# Playwright defaults: https://github.com/microsoft/playwright/blob/41008eeddd020e2dee1c540f7c0cdfa337e99637/packages/playwright-core/src/server/chromium/chromiumSwitches.ts#L76
 	# AcceptCHFrame,AutoExpandDetailsElement,AvoidUnnecessaryBeforeUnloadCheckSync,CertificateTransparencyComponentUpdater,DeferRendererTasksAfterInput,DestroyProfileOnBrowserClose,DialMediaRouteProvider,ExtensionManifestV2Disabled,GlobalMediaControls,HttpsUpgrades,ImprovedCookieControls,LazyFrameLoading,LensOverlay,MediaRouter,PaintHolding,ThirdPartyStoragePartitioning,Translate
@@ -580,16 +584,28 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	deterministic_rendering: bool = Field(default=False, description='Enable deterministic rendering flags.')
 	allowed_domains: list[str] | set[str] | None = Field(
 		default=None,
-		description='List of allowed domains for navigation e.g. ["*.google.com", "https://example.com", "chrome-extension://*"]. Lists with 100+ items are auto-optimized to sets (no pattern matching).',
+		description='List of allowed domains for navigation e.g. ["*.google.com", "https://example.com", "chrome-extension://*"]. Lists of 100+ plain domains are auto-optimized to sets; lists with patterns are compiled for fast matching at any size.',
 	)
 	prohibited_domains: list[str] | set[str] | None = Field(
 		default=None,
-		description='List of prohibited domains for navigation e.g. ["*.google.com", "https://example.com", "chrome-extension://*"]. Allowed domains take precedence over prohibited domains. Lists with 100+ items are auto-optimized to sets (no pattern matching).',
+		description='List of prohibited domains for navigation e.g. ["*.google.com", "https://example.com", "chrome-extension://*"]. Allowed domains take precedence over prohibited domains. Lists of 100+ plain domains are auto-optimized to sets; lists with patterns are compiled for fast matching at any size.',
 	)
 	block_ip_addresses: bool = Field(
 		default=False,
 		description='Block navigation to URLs containing IP addresses (both IPv4 and IPv6). When True, blocks all IP-based URLs including localhost and private networks.',
 	)
+	block_requests: bool = Field(
+		default=False,
+		description='Fail requests to ad, tracker and analytics hosts using the bundled EasyList-style filter list (works offline). Intercepts requests via CDP Fetch.',
+	)
+	request_filter_lists: list[str] = Field(
+		default_factory=list,
+		description='Extra EasyList-style filter lists (local paths or URLs) to block requests with. URLs are cached on disk and reused when offline.',
+	)
+	block_resource_types: list[str] = Field(
+		default_factory=list,
+		description='CDP resource types to block on every page, e.g. ["Font", "Media"]. Documents are never blocked.',
+	)
 	keep_alive: bool | None = Field(default=None, description='Keep browser alive after agent run.')
 
 	# --- Proxy settings ---
@@ -641,6 +657,10 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	wait_for_network_idle_page_load_time: float = Field(default=0.5, description='Time to wait for network idle.')
 
 	wait_between_actions: float = Field(default=0.1, description='Time to wait between actions.')
+	typing_mode: Literal['human', 'fast-keys', 'bulk'] = Field(
+		default='human',
+		description="How text is typed into fields: 'human' sends awaited key events per character with small delays, 'fast-keys' pipelines the same key events, 'bulk' inserts the whole text with Input.insertText and falls back to 'human' if the field rejects it.",
+	)
 
 	# --- UI/viewport/DOM ---
 	highlight_elements: bool = Field(default=True, description='Highlight interactive elements on the page.')
@@ -698,19 +718,23 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	@field_validator('allowed_domains', 'prohibited_domains', mode='after')
 	@classmethod
 	def optimize_large_domain_lists(cls, v: list[str] | set[str] | None) -> list[str] | set[str] | None:
-		"""Convert large domain lists (>=100 items) to sets for O(1) lookup performance."""
+		"""Convert large lists of plain domains (>=100 items) to sets for O(1) lookup performance.
+
+		Lists containing patterns (*.domain.com, https://...) stay lists at any size: they are matched by a compiled
+		UrlPolicyMatcher (suffix trie + precompiled globs), so converting them would only drop pattern support.
+		Lists are stored as a DomainPatternList, which keeps that matcher until the list is edited.
+		"""
 		if v is None or isinstance(v, set):
 			return v
 
 		if len(v) >= DOMAIN_OPTIMIZATION_THRESHOLD:
-			logger.warning(
-				f'🔧 Optimizing domain list with {len(v)} items to set for O(1) lookup. '
-				f'Note: Pattern matching (*.domain.com, etc.) is not supported for lists >= {DOMAIN_OPTIMIZATION_THRESHOLD} items. '
-				f'Use exact domains only or keep list size < {DOMAIN_OPTIMIZATION_THRESHOLD} for pattern support.'
-			)
+			if any('*' in domain or '://' in domain for domain in v):
+				logger.debug(f'🔧 Keeping domain list with {len(v)} items as patterns (compiled matcher)')
+				return DomainPatternList(v)
+			logger.debug(f'🔧 Optimizing domain list with {len(v)} items to set for O(1) lookup')
 			return set(v)
 
-		return v
+		return DomainPatternList(v)
 
 	@model_validator(mode='after')
 	def copy_old_config_names_to_new(self) -> Self:
@@ -821,14 +845,17 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		path_temp_profile = Path(temp_dir) / self.profile_directory
 
 		if path_original_profile.exists():
-			import shutil
+			from web_agent.browser.profile_clone import clone_profile_dir
 
-			shutil.copytree(path_original_profile, path_temp_profile)
+			# Skips regenerable caches and reflinks/hardlinks where safe instead of copying every byte
+			clone_stats = clone_profile_dir(path_original_profile, path_temp_profile)
 			local_state_src = path_original_user_data / 'Local State'
 			local_state_dst = Path(temp_dir) / 'Local State'
 			if local_state_src.exists():
 				shutil.copy(local_state_src, local_state_dst)
-			logger.info(f'Copied profile ({self.profile_directory}) and Local State to temp directory: {temp_dir}')
+			logger.info(
+				f'Copied profile ({self.profile_directory}) and Local State to temp directory: {temp_dir} ({clone_stats})'
+			)
 
 		else:
 			Path(temp_dir).mkdir(parents=True, exist_ok=True)
@@ -980,48 +1007,67 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 			# },
 		]
 
-		# Create extensions cache directory
 		cache_dir = CONFIG.web_agent_EXTENSIONS_DIR
+		whitelist_hash = hashlib.sha256(json.dumps(self.cookie_whitelist_domains).encode()).hexdigest()[:8]
+
+		# Fast path: every extension already has a ready directory for its current .crx (and our whitelist)
+		ready_dirs = [self._ready_extension_dir(cache_dir, ext, whitelist_hash) for ext in extensions]
+		if all(ready_dir is not None and (ready_dir / '.ready').exists() for ready_dir in ready_dirs):
+			extension_paths = [str(ready_dir) for ready_dir in ready_dirs]
+			logger.debug(f'[BrowserProfile] 🧩 Extensions loaded from cache ({len(extension_paths)})')
+			return extension_paths
+
+		# Create extensions cache directory
 		cache_dir.mkdir(parents=True, exist_ok=True)
 		# logger.debug(f'📁 Extensions cache directory: {_log_pretty_path(cache_dir)}')
 
 		extension_paths = []
 		loaded_extension_names = []
 
-		for ext in extensions:
-			ext_dir = cache_dir / ext['id']
-			crx_file = cache_dir / f'{ext["id"]}.crx'
-
-			# Check if extension is already extracted
-			if ext_dir.exists() and (ext_dir / 'manifest.json').exists():
-				# logger.debug(f'✅ Using cached {ext["name"]} extension from {_log_pretty_path(ext_dir)}')
-				extension_paths.append(str(ext_dir))
-				loaded_extension_names.append(ext['name'])
-				continue
-
-			try:
-				# Download extension if not cached
-				if not crx_file.exists():
-					logger.info(f'📦 Downloading {ext["name"]} extension...')
-					self._download_extension(ext['url'], crx_file)
-				else:
-					logger.debug(f'📦 Found cached {ext["name"]} .crx file')
-
-				# Extract extension
-				logger.info(f'📂 Extracting {ext["name"]} extension...')
-				self._extract_extension(crx_file, ext_dir)
-
-				extension_paths.append(str(ext_dir))
-				loaded_extension_names.append(ext['name'])
-
-			except Exception as e:
-				logger.warning(f'⚠️ Failed to setup {ext["name"]} extension: {e}')
-				continue
-
-		# Apply minimal patch to cookie extension with configurable whitelist
-		for i, path in enumerate(extension_paths):
-			if loaded_extension_names[i] == "I still don't care about cookies":
-				self._apply_minimal_extension_patch(Path(path), self.cookie_whitelist_domains)
+		# Parallel launches share the cache: one process downloads/extracts/patches while the others wait, then reuse it
+		import portalocker
+
+		with portalocker.Lock(str(cache_dir / '.lock'), mode='a', timeout=300):
+			for ext in extensions:
+				crx_file = cache_dir / f'{ext["id"]}.crx'
+
+				try:
+					# Download extension if not cached
+					if not crx_file.exists():
+						logger.info(f'📦 Downloading {ext["name"]} extension...')
+						self._download_extension(ext['url'], crx_file)
+					else:
+						logger.debug(f'📦 Found cached {ext["name"]} .crx file')
+
+					ext_dir = self._ready_extension_dir(cache_dir, ext, whitelist_hash)
+					if ext_dir is None:
+						# .crx cached by an older version without a content hash
+						(cache_dir / f'{ext["id"]}.crx.sha256').write_text(hashlib.sha256(crx_file.read_bytes()).hexdigest())
+						ext_dir = self._ready_extension_dir(cache_dir, ext, whitelist_hash)
+						assert ext_dir is not None
+
+					# Extract (and patch) once per .crx content and whitelist, then publish with an atomic rename
+					if not (ext_dir / '.ready').exists():
+						logger.info(f'📂 Extracting {ext["name"]} extension...')
+						tmp_dir = Path(tempfile.mkdtemp(prefix=f'.tmp-{ext["id"]}-', dir=cache_dir))
+						try:
+							self._extract_extension(crx_file, tmp_dir)
+							# Apply minimal patch to cookie extension with configurable whitelist
+							if ext['name'] == "I still don't care about cookies":
+								self._apply_minimal_extension_patch(tmp_dir, self.cookie_whitelist_domains)
+							(tmp_dir / '.ready').touch()
+							if ext_dir.exists():
+								shutil.rmtree(ext_dir)  # Left over from an interrupted extraction
+							tmp_dir.rename(ext_dir)
+						finally:
+							shutil.rmtree(tmp_dir, ignore_errors=True)
+
+					extension_paths.append(str(ext_dir))
+					loaded_extension_names.append(ext['name'])
+
+				except Exception as e:
+					logger.warning(f'⚠️ Failed to setup {ext["name"]} extension: {e}')
+					continue
 
 		if extension_paths:
 			logger.debug(f'[BrowserProfile] 🧩 Extensions loaded ({len(extension_paths)}): [{", ".join(loaded_extension_names)}]')
@@ -1030,6 +1076,18 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 
 		return extension_paths
 
+	@staticmethod
+	def _ready_extension_dir(cache_dir: Path, ext: dict[str, str], whitelist_hash: str) -> Path | None:
+		"""Directory for an extension's extracted .crx, versioned by the .crx content hash (None if it isn't hashed yet)"""
+		try:
+			crx_hash = (cache_dir / f'{ext["id"]}.crx.sha256').read_text().strip()[:12]
+		except OSError:
+			return None
+		if ext['name'] == "I still don't care about cookies":
+			# Patched per whitelist, so each whitelist gets its own copy
+			return cache_dir / f'{ext["id"]}-{crx_hash}-{whitelist_hash}'
+		return cache_dir / f'{ext["id"]}-{crx_hash}'
+
 	def _apply_minimal_extension_patch(self, ext_dir: Path, whitelist_domains: list[str]) -> None:
 		"""Minimal patch: pre-populate chrome.storage.local with configurable domain whitelist."""
 		try:
@@ -1095,16 +1153,21 @@ async function initialize(checkInitialized, magic) {{
 			logger.debug(f'[BrowserProfile] Could not patch extension storage: {e}')
 
 	def _download_extension(self, url: str, output_path: Path) -> None:
-		"""Download extension .crx file."""
+		"""Download extension .crx file (and record its content hash next to it)."""
 		import urllib.request
 
 		try:
 			with urllib.request.urlopen(url) as response:
-				with open(output_path, 'wb') as f:
-					f.write(response.read())
+				data = response.read()
 		except Exception as e:
 			raise Exception(f'Failed to download extension: {e}')
 
+		# Write under a temp name so a partial download is never mistaken for a cached .crx
+		tmp_path = output_path.with_name(f'{output_path.name}.part')
+		tmp_path.write_bytes(data)
+		tmp_path.replace(output_path)
+		output_path.with_name(f'{output_path.name}.sha256').write_text(hashlib.sha256(data).hexdigest())
+
 	def _extract_extension(self, crx_path: Path, extract_dir: Path) -> None:
 		"""Extract .crx file to directory."""
 		import os
@@ -1112,8 +1175,6 @@ async function initialize(checkInitialized, magic) {{
 
 		# Remove existing directory
 		if extract_dir.exists():
-			import shutil
-
 			shutil.rmtree(extract_dir)
 
 		extract_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,378 @@
+"""Request blocking for ads, trackers and heavy resources, applied through CDP `Fetch.requestPaused`.
+
+Filter lists use the network-rule subset of EasyList / Adblock Plus syntax:
+
+- `||host^` blocks a host and its subdomains (indexed in a reversed-label suffix trie)
+- `|`, `^` and `*` anchors/separators/wildcards, compiled to regexes and indexed by a literal token
+- `@@` exception rules
+- `$` options: resource types (`script`, `image`, `font`, `~media`, ...), `third-party` / `~third-party`,
+  `domain=a.com|~b.com`, `match-case`
+
+Rules with other options, cosmetic rules (`##`) and comments are skipped. A list is bundled with the package and
+remote lists are cached on disk, so blocking works offline.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from urllib.parse import urlparse
+
+from web_agent.domain_matcher import DomainSuffixTrie
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_FILTER_LIST = Path(__file__).parent / 'filter_lists' / 'default.txt'
+FILTER_LIST_MAX_AGE = 4 * 24 * 3600  # Refresh cached remote lists after 4 days (EasyList's own expiry)
+
+# $option name -> CDP Network.ResourceType values
+RESOURCE_TYPE_OPTIONS: dict[str, frozenset[str]] = {
+	'script': frozenset({'Script'}),
+	'image': frozenset({'Image'}),
+	'stylesheet': frozenset({'Stylesheet'}),
+	'font': frozenset({'Font'}),
+	'media': frozenset({'Media'}),
+	'xmlhttprequest': frozenset({'XHR', 'Fetch'}),
+	'subdocument': frozenset({'Document'}),
+	'websocket': frozenset({'WebSocket'}),
+	'ping': frozenset({'Ping', 'CSPViolationReport'}),
+	'other': frozenset({'Other', 'TextTrack', 'EventSource', 'Manifest', 'Prefetch', 'SignedExchange', 'Preflight'}),
+}
+
+# Rough median transfer sizes per resource type (HTTP Archive), used to estimate bytes saved by blocked requests
+ESTIMATED_RESOURCE_BYTES: dict[str, int] = {
+	'Script': 22_000,
+	'Image': 15_000,
+	'Stylesheet': 8_000,
+	'Font': 24_000,
+	'Media': 400_000,
+	'Document': 30_000,
+	'XHR': 2_000,
+	'Fetch': 2_000,
+}
+DEFAULT_RESOURCE_BYTES = 1_000
+
+_IGNORED_OPTIONS = {'popup', 'document', 'generichide', 'elemhide', 'genericblock', 'important'}
+_TOKEN_RE = re.compile(r'[a-z0-9%]{3,}')
+_SEPARATOR = r'(?:[^\w\-.%]|$)'
+_TWO_PART_SUFFIXES = {'co', 'com', 'net', 'org', 'gov', 'edu', 'ac', 'ne', 'or', 'go'}
+
+
+def site_of(host: str) -> str:
+	"""Registrable-domain approximation (no public suffix list): last two labels, three for e.g. co.uk"""
+	labels = host.lower().rstrip('.').split('.')
+	if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in _TWO_PART_SUFFIXES:
+		return '.'.join(labels[-3:])
+	return '.'.join(labels[-2:])
+
+
+@dataclass
+class FilterRule:
+	"""One compiled network rule"""
+
+	raw: str
+	is_exception: bool = False
+	host: str | None = None  # Set for pure `||host^` rules (matched via the suffix trie)
+	pattern: str | None = None  # Set for all other rules; compiled to a regex on first use (big lists have ~50k)
+	match_case: bool = False
+	token: str = ''  # Literal substring every matching URL contains ('' = check against every request)
+	resource_types: frozenset[str] | None = None  # None = any type
+	excluded_types: frozenset[str] = frozenset()
+	third_party: bool | None = None
+	include_domains: tuple[str, ...] = ()
+	exclude_domains: tuple[str, ...] = ()
+
+	def applies_to(self, url: str, resource_type: str, request_host: str, page_host: str | None) -> bool:
+		"""Option checks plus the regex (host rules are pre-matched by the trie)"""
+		if self.resource_types is not None and resource_type not in self.resource_types:
+			return False
+		if resource_type in self.excluded_types:
+			return False
+		if self.third_party is not None and page_host:
+			if (site_of(request_host) != site_of(page_host)) != self.third_party:
+				return False
+		if self.include_domains or self.exclude_domains:
+			if not page_host:
+				return False
+			if self.include_domains and not _host_in(page_host, self.include_domains):
+				return False
+			if _host_in(page_host, self.exclude_domains):
+				return False
+		return self.regex is None or self.regex.search(url) is not None
+
+	@cached_property
+	def regex(self) -> re.Pattern[str] | None:
+		if self.pattern is None:
+			return None
+		try:
+			return _pattern_to_regex(self.pattern, self.match_case)
+		except re.error:
+			logger.debug(f'Ignoring filter rule with invalid regex: {self.raw}')
+			return re.compile(r'(?!)')  # Never matches
+
+
+def _host_in(host: str, domains: Iterable[str]) -> bool:
+	return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+
+def _pattern_to_regex(pattern: str, match_case: bool) -> re.Pattern[str]:
+	if len(pattern) > 1 and pattern.startswith('/') and pattern.endswith('/'):
+		return re.compile(pattern[1:-1], 0 if match_case else re.IGNORECASE)
+
+	prefix = suffix = ''
+	if pattern.startswith('||'):
+		prefix = r'^[a-z][a-z0-9+.\-]*://(?:[^/?#]*\.)?'
+		pattern = pattern[2:]
+	elif pattern.startswith('|'):
+		prefix = '^'
+		pattern = pattern[1:]
+	if pattern.endswith('|'):
+		suffix = '$'
+		pattern = pattern[:-1]
+
+	body = ''.join(
+		'.*' if char == '*' else _SEPARATOR if char == '^' else re.escape(char) for char in pattern.strip('*')
+	)
+	return re.compile(prefix + body + suffix, 0 if match_case else re.IGNORECASE)
+
+
+def parse_filter_rule(line: str) -> FilterRule | None:
+	"""Compile one EasyList line; None for comments, cosmetic rules and unsupported options"""
+	line = line.strip()
+	if not line or line.startswith(('!', '[')) or '##' in line or '#@#' in line or '#?#' in line or '#$#' in line:
+		return None
+
+	rule = FilterRule(raw=line)
+	if line.startswith('@@'):
+		rule.is_exception = True
+		line = line[2:]
+
+	pattern, options = line, ''
+	dollar = line.rfind('$')
+	if dollar > 0 and not (line.startswith('/') and line.endswith('/')):
+		pattern, options = line[:dollar], line[dollar + 1 :]
+
+	if options:
+		included: set[str] = set()
+		excluded: set[str] = set()
+		for option in options.split(','):
+			option = option.strip().lower()
+			negated = option.startswith('~')
+			name = option.lstrip('~')
+			if name in RESOURCE_TYPE_OPTIONS:
+				(excluded if negated else included).update(RESOURCE_TYPE_OPTIONS[name])
+			elif name == 'third-party':
+				rule.third_party = not negated
+			elif name == 'first-party':
+				rule.third_party = negated
+			elif name.startswith('domain='):
+				domains = name.split('=', 1)[1].split('|')
+				rule.include_domains = tuple(domain for domain in domains if domain and not domain.startswith('~'))
+				rule.exclude_domains = tuple(domain[1:] for domain in domains if domain.startswith('~'))
+			elif name == 'match-case':
+				rule.match_case = True
+			elif name in _IGNORED_OPTIONS:
+				continue
+			else:
+				return None  # Unsupported option (redirect=, csp=, removeparam=, ...): skip rather than over-block
+		rule.resource_types = frozenset(included) if included else None
+		rule.excluded_types = frozenset(excluded)
+
+	if not pattern or pattern in ('*', '|', '||'):
+		return None
+
+	host_only = re.fullmatch(r'\|\|([a-z0-9.\-]+)\^?\|?', pattern.lower())
+	if host_only and not rule.match_case:
+		rule.host = host_only.group(1).strip('.')
+		return rule
+
+	rule.pattern = pattern
+	rule.token = _rule_token(pattern)
+	return rule
+
+
+def _rule_token(pattern: str) -> str:
+	"""Longest literal run that must appear as a whole URL token, used to index the rule ('' if there is none).
+
+	A run only qualifies if it is bounded on both sides by a literal separator or an anchor; `/banner` can't be
+	indexed under 'banner' because it also matches '/banners'.
+	"""
+	if pattern.startswith('/') and pattern.endswith('/'):
+		return ''
+	pattern = pattern.lower()
+	best = ''
+	for match in re.finditer(r'[a-z0-9%]+', pattern):
+		start, end = match.span()
+		left = pattern[start - 1] if start else ''
+		right = pattern[end] if end < len(pattern) else ''
+		if left in ('', '*') or right in ('', '*') or len(match.group()) < 3:
+			continue
+		if len(match.group()) > len(best):
+			best = match.group()
+	return best
+
+
+class RequestFilter:
+	"""Compiled filter list: host rules in a suffix trie, other rules bucketed by a literal token"""
+
+	def __init__(self, lines: Iterable[str] = ()):
+		self.rule_count = 0
+		self._hosts: DomainSuffixTrie[FilterRule] = DomainSuffixTrie()
+		self._exception_hosts: DomainSuffixTrie[FilterRule] = DomainSuffixTrie()
+		self._by_token: dict[str, list[FilterRule]] = {}
+		self._exceptions_by_token: dict[str, list[FilterRule]] = {}
+		self.add_rules(lines)
+
+	def add_rules(self, lines: Iterable[str]) -> None:
+		for line in lines:
+			rule = parse_filter_rule(line)
+			if rule is None:
+				continue
+			self.rule_count += 1
+			if rule.host is not None:
+				(self._exception_hosts if rule.is_exception else self._hosts).add(rule.host, rule)
+				continue
+			buckets = self._exceptions_by_token if rule.is_exception else self._by_token
+			buckets.setdefault(rule.token, []).append(rule)
+
+	def _candidates(self, url: str, host: str, hosts: DomainSuffixTrie[FilterRule], buckets: dict[str, list[FilterRule]]):
+		yield from hosts.matches(host)
+		yield from buckets.get('', ())
+		for token in set(_TOKEN_RE.findall(url.lower())):
+			yield from buckets.get(token, ())
+
+	def match(self, url: str, resource_type: str, page_url: str | None = None) -> FilterRule | None:
+		"""The blocking rule for a request, or None if it should proceed"""
+		try:
+			host = (urlparse(url).hostname or '').lower()
+		except ValueError:
+			return None
+		if not host:
+			return None
+		page_host = (urlparse(page_url).hostname or '').lower() if page_url else None
+
+		blocking = next(
+			(
+				rule
+				for rule in self._candidates(url, host, self._hosts, self._by_token)
+				if rule.applies_to(url, resource_type, host, page_host)
+			),
+			None,
+		)
+		if blocking is None:
+			return None
+		for rule in self._candidates(url, host, self._exception_hosts, self._exceptions_by_token):
+			if rule.applies_to(url, resource_type, host, page_host):
+				return None
+		return blocking
+
+
+@dataclass
+class RequestBlockingStats:
+	"""Blocked requests for one page (reset on each main-frame navigation)"""
+
+	page_url: str = ''
+	blocked: int = 0
+	bytes_saved: int = 0  # Estimated from typical sizes per resource type, blocked bodies are never downloaded
+	by_type: dict[str, int] = field(default_factory=dict)
+
+	def record(self, resource_type: str) -> None:
+		self.blocked += 1
+		self.bytes_saved += ESTIMATED_RESOURCE_BYTES.get(resource_type, DEFAULT_RESOURCE_BYTES)
+		self.by_type[resource_type] = self.by_type.get(resource_type, 0) + 1
+
+
+class RequestBlocker:
+	"""Decides which paused requests to fail and keeps per-page statistics"""
+
+	def __init__(self, request_filter: RequestFilter | None = None, blocked_resource_types: Iterable[str] = ()):
+		self.filter = request_filter
+		self.blocked_resource_types = frozenset(blocked_resource_types)
+		self.pages: dict[str, RequestBlockingStats] = {}
+
+	def should_block(self, url: str, resource_type: str, page_url: str | None = None) -> bool:
+		# Never block documents: the agent navigated there on purpose (and ad iframes are caught by their resources)
+		if resource_type == 'Document' or not url.startswith(('http://', 'https://', 'ws://', 'wss://')):
+			return False
+		if resource_type in self.blocked_resource_types:
+			return True
+		return self.filter is not None and self.filter.match(url, resource_type, page_url) is not None
+
+	def on_request(
+		self,
+		page_id: str,
+		url: str,
+		resource_type: str,
+		is_main_frame_document: bool = False,
+		page_url: str | None = None,
+	) -> bool:
+		"""Handle one paused request; returns True if it should be failed.
+
+		A main-frame document starts a new page (fresh stats); page_url is the fallback page for requests seen
+		before that (e.g. when interception was enabled after the page loaded).
+		"""
+		if is_main_frame_document:
+			self.pages[page_id] = RequestBlockingStats(page_url=url)
+			return False
+		stats = self.pages.setdefault(page_id, RequestBlockingStats(page_url=page_url or ''))
+		if not self.should_block(url, resource_type, stats.page_url or None):
+			return False
+		stats.record(resource_type)
+		return True
+
+	def stats(self, page_id: str) -> RequestBlockingStats:
+		return self.pages.get(page_id) or RequestBlockingStats()
+
+
+async def _read_list(path: Path) -> list[str]:
+	text = await asyncio.to_thread(path.read_text, encoding='utf-8', errors='replace')
+	return text.splitlines()
+
+
+async def load_filter_list(source: str, cache_dir: Path) -> list[str]:
+	"""Lines of a filter list from a local path or URL; URLs are cached on disk and used as-is when offline"""
+	if not source.startswith(('http://', 'https://')):
+		return await _read_list(Path(source).expanduser())
+
+	cache_path = cache_dir / f'{hashlib.sha256(source.encode()).hexdigest()[:16]}.txt'
+	if cache_path.exists() and time.time() - cache_path.stat().st_mtime < FILTER_LIST_MAX_AGE:
+		return await _read_list(cache_path)
+
+	try:
+		import httpx
+
+		async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
+			response = await client.get(source)
+			response.raise_for_status()
+		cache_dir.mkdir(parents=True, exist_ok=True)
+		tmp_path = cache_path.with_suffix('.tmp')
+		await asyncio.to_thread(tmp_path.write_text, response.text, encoding='utf-8')
+		tmp_path.replace(cache_path)
+		return response.text.splitlines()
+	except Exception as e:
+		if cache_path.exists():
+			logger.debug(f'Using cached filter list for {source} (refresh failed: {type(e).__name__}: {e})')
+			return await _read_list(cache_path)
+		logger.warning(f'⚠️ Could not load filter list {source} and no cached copy exists: {type(e).__name__}: {e}')
+		return []
+
+
+async def build_request_blocker(
+	use_bundled_list: bool,
+	filter_lists: Iterable[str],
+	blocked_resource_types: Iterable[str],
+	cache_dir: Path,
+) -> RequestBlocker:
+	request_filter = None
+	sources = ([str(BUNDLED_FILTER_LIST)] if use_bundled_list else []) + list(filter_lists)
+	if sources:
+		request_filter = RequestFilter()
+		for source in sources:
+			request_filter.add_rules(await load_filter_list(source, cache_dir))
+		logger.debug(f'🛡️ Request blocking: {request_filter.rule_count} rules from {len(sources)} list(s)')
+	return RequestBlocker(request_filter, blocked_resource_types)
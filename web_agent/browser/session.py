@@ -4,7 +4,7 @@ import asyncio
 import logging
 from functools import cached_property
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Literal, Self, Union, cast, overload
+from typing import TYPE_CHECKING, Any, Literal, Self, TypeVar, Union, cast, overload
 from urllib.parse import urlparse, urlunparse
 from uuid import UUID
 
@@ -45,11 +45,13 @@ from web_agent.browser.profile import BrowserProfile, ProxySettings
 from web_agent.browser.views import BrowserStateSummary, TabInfo
 from web_agent.dom.views import DOMRect, EnhancedDOMTreeNode, TargetInfo
 from web_agent.observability import observe_debug
+from web_agent.startup_profiler import startup_profiler
 from web_agent.utils import _log_pretty_url, create_task_with_error_handling, is_new_tab_page
 
 if TYPE_CHECKING:
 	from web_agent.actor.page import Page
 	from web_agent.browser.demo_mode import DemoMode
+	from web_agent.browser.request_blocking import RequestBlocker, RequestBlockingStats
 
 DEFAULT_BROWSER_PROFILE = BrowserProfile()
 
@@ -58,6 +60,9 @@ red = '\033[91m'
 reset = '\033[0m'
 
 
+_ParamsT = TypeVar('_ParamsT')
+
+
 class Target(BaseModel):
 	"""Browser target (page, iframe, worker) - the actual entity being controlled.
 
@@ -376,6 +381,12 @@ class BrowserSession(BaseModel):
 		description='Target size (width, height) to resize screenshots before sending to LLM. Coordinates from LLM will be scaled back to original viewport size.',
 	)
 
+	# CDP browser context this session is confined to (set by BrowserPool when sharing one browser between agents)
+	browser_context_id: str | None = Field(
+		default=None,
+		description='Only attach to and create targets inside this CDP browser context (None = the whole browser)',
+	)
+
 	# Cache of original viewport size for coordinate conversion (set when browser state is captured)
 	_original_viewport_size: tuple[int, int] | None = PrivateAttr(default=None)
 
@@ -437,6 +448,8 @@ class BrowserSession(BaseModel):
 	_permissions_watchdog: Any | None = PrivateAttr(default=None)
 	_recording_watchdog: Any | None = PrivateAttr(default=None)
 
+	_request_blocker: 'RequestBlocker | None' = PrivateAttr(default=None)
+
 	_cloud_browser_client: CloudBrowserClient = PrivateAttr(default_factory=lambda: CloudBrowserClient())
 	_demo_mode: 'DemoMode | None' = PrivateAttr(default=None)
 
@@ -613,7 +626,8 @@ class BrowserSession(BaseModel):
 		"""
 
 		# Initialize and attach all watchdogs FIRST so LocalBrowserWatchdog can handle BrowserLaunchEvent
-		await self.attach_all_watchdogs()
+		with startup_profiler.phase('attach watchdogs'):
+			await self.attach_all_watchdogs()
 
 		try:
 			# If no CDP URL, launch local browser or cloud browser
@@ -635,8 +649,9 @@ class BrowserSession(BaseModel):
 						raise CloudBrowserError(f'Failed to create cloud browser: {e}')
 				elif self.is_local:
 					# Launch local browser using event-driven approach
-					launch_event = self.event_bus.dispatch(BrowserLaunchEvent())
-					await launch_event
+					with startup_profiler.phase('browser launch'):
+						launch_event = self.event_bus.dispatch(BrowserLaunchEvent())
+						await launch_event
 
 					# Get the CDP URL from LocalBrowserWatchdog handler result
 					launch_result: BrowserLaunchResult = cast(
@@ -653,7 +668,8 @@ class BrowserSession(BaseModel):
 				# Only connect if not already connected
 				if self._cdp_client_root is None:
 					# Setup browser via CDP (for both local and remote cases)
-					await self.connect(cdp_url=self.cdp_url)
+					with startup_profiler.phase('cdp connect'):
+						await self.connect(cdp_url=self.cdp_url)
 					assert self.cdp_client is not None
 
 					# Notify that browser is connected (single place)
@@ -758,6 +774,13 @@ class BrowserSession(BaseModel):
 			# Navigate to URL with proper lifecycle waiting
 			await self._navigate_and_wait(event.url, target_id)
 
+			blocking_stats = self.get_request_blocking_stats(target_id)
+			if blocking_stats and blocking_stats.blocked:
+				self.logger.debug(
+					f'🛡️ Blocked {blocking_stats.blocked} requests on {_log_pretty_url(event.url)} '
+					f'(~{blocking_stats.bytes_saved / 1024:.0f} KB saved): {blocking_stats.by_type}'
+				)
+
 			# Close any extension options pages that might have opened
 			await self._close_extension_options_pages()
 
@@ -904,7 +927,9 @@ class BrowserSession(BaseModel):
 			else:
 				# No pages open at all, create a new one (handles switching to it automatically)
 				assert self._cdp_client_root is not None, 'CDP client root not initialized - browser may not be connected yet'
-				new_target = await self._cdp_client_root.send.Target.createTarget(params={'url': 'about:blank'})
+				new_target = await self._cdp_client_root.send.Target.createTarget(
+					params=self._in_browser_context({'url': 'about:blank'})
+				)
 				target_id = new_target['targetId']
 				# Don't await, these may circularly trigger SwitchTabEvent and could deadlock, dispatch to enqueue and return
 				self.event_bus.dispatch(TabCreatedEvent(url='about:blank', target_id=target_id))
@@ -1080,7 +1105,7 @@ class BrowserSession(BaseModel):
 		"""Create a new page (tab)."""
 		from cdp_use.cdp.target.commands import CreateTargetParameters
 
-		params: CreateTargetParameters = {'url': url or 'about:blank'}
+		params: CreateTargetParameters = self._in_browser_context({'url': url or 'about:blank'})
 		result = await self.cdp_client.send.Target.createTarget(params)
 
 		target_id = result['targetId']
@@ -1160,11 +1185,14 @@ class BrowserSession(BaseModel):
 	async def cookies(self) -> list['Cookie']:
 		"""Get cookies, optionally filtered by URLs."""
 
-		result = await self.cdp_client.send.Storage.getCookies()
+		result = await self.cdp_client.send.Storage.getCookies(params=self._in_browser_context({}))
 		return result['cookies']
 
 	async def clear_cookies(self) -> None:
 		"""Clear all cookies."""
+		if self.browser_context_id:
+			await self.cdp_client.send.Storage.clearCookies(params={'browserContextId': self.browser_context_id})
+			return
 		await self.cdp_client.send.Network.clearBrowserCookies()
 
 	async def export_storage_state(self, output_path: str | Path | None = None) -> dict[str, Any]:
@@ -1555,7 +1583,8 @@ class BrowserSession(BaseModel):
 			from web_agent.browser.session_manager import SessionManager
 
 			self.session_manager = SessionManager(self)
-			await self.session_manager.start_monitoring()
+			with startup_profiler.phase('discover targets'):
+				await self.session_manager.start_monitoring()
 			self.logger.debug('Event-driven session manager started')
 
 			# Enable auto-attach so Chrome automatically notifies us when NEW targets attach/detach
@@ -1588,7 +1617,9 @@ class BrowserSession(BaseModel):
 
 			# Ensure we have at least one page
 			if not page_targets_from_manager:
-				new_target = await self._cdp_client_root.send.Target.createTarget(params={'url': 'about:blank'})
+				new_target = await self._cdp_client_root.send.Target.createTarget(
+					params=self._in_browser_context({'url': 'about:blank'})
+				)
 				target_id = new_target['targetId']
 				self.logger.debug(f'📄 Created new blank page: {target_id}')
 			else:
@@ -1607,8 +1638,8 @@ class BrowserSession(BaseModel):
 			# Note: Lifecycle monitoring is enabled automatically in SessionManager._handle_target_attached()
 			# when targets attach, so no manual enablement needed!
 
-			# Enable proxy authentication handling if configured
-			await self._setup_proxy_auth()
+			# Enable proxy authentication handling and request blocking if configured
+			await self._setup_fetch_interception()
 
 			# Verify the target is working
 			if self.agent_focus_target_id:
@@ -1657,11 +1688,12 @@ class BrowserSession(BaseModel):
 
 		return self
 
-	async def _setup_proxy_auth(self) -> None:
-		"""Enable CDP Fetch auth handling for authenticated proxy, if credentials provided.
+	async def _setup_fetch_interception(self) -> None:
+		"""Enable CDP Fetch interception for authenticated proxies and/or request blocking.
 
 		Handles HTTP proxy authentication challenges (Basic/Proxy) by providing
-		configured credentials from BrowserProfile.
+		configured credentials from BrowserProfile, and fails paused requests that match
+		the profile's request blocking rules (block_requests, request_filter_lists, block_resource_types).
 		"""
 
 		assert self._cdp_client_root
@@ -1670,14 +1702,34 @@ class BrowserSession(BaseModel):
 			proxy_cfg = self.browser_profile.proxy
 			username = proxy_cfg.username if proxy_cfg else None
 			password = proxy_cfg.password if proxy_cfg else None
-			if not username or not password:
-				self.logger.debug('Proxy credentials not provided; skipping proxy auth setup')
+			handle_auth = bool(username and password)
+
+			profile = self.browser_profile
+			blocking_enabled = bool(profile.block_requests or profile.request_filter_lists or profile.block_resource_types)
+			if blocking_enabled and self._request_blocker is None:
+				from web_agent.browser.request_blocking import build_request_blocker
+				from web_agent.config import CONFIG
+
+				self._request_blocker = await build_request_blocker(
+					use_bundled_list=profile.block_requests,
+					filter_lists=profile.request_filter_lists,
+					blocked_resource_types=profile.block_resource_types,
+					cache_dir=CONFIG.web_agent_CONFIG_DIR / 'filter_lists',
+				)
+
+			if not handle_auth and not blocking_enabled:
+				self.logger.debug('Proxy credentials and request blocking not configured; skipping Fetch setup')
 				return
 
-			# Enable Fetch domain with auth handling (do not pause all requests)
+			# Only pause at the request stage (before anything is sent), so blocked requests fail early
+			fetch_params: dict[str, Any] = {'handleAuthRequests': handle_auth}
+			if blocking_enabled:
+				fetch_params['patterns'] = [{'urlPattern': '*', 'requestStage': 'Request'}]
+
+			# Enable Fetch domain on the root client
 			try:
-				await self._cdp_client_root.send.Fetch.enable(params={'handleAuthRequests': True})
-				self.logger.debug('Fetch.enable(handleAuthRequests=True) enabled on root client')
+				await self._cdp_client_root.send.Fetch.enable(params=fetch_params)
+				self.logger.debug(f'Fetch.enable({fetch_params}) enabled on root client')
 			except Exception as e:
 				self.logger.debug(f'Fetch.enable on root failed: {type(e).__name__}: {e}')
 
@@ -1686,10 +1738,10 @@ class BrowserSession(BaseModel):
 				if self.agent_focus_target_id:
 					cdp_session = await self.get_or_create_cdp_session(self.agent_focus_target_id, focus=False)
 					await cdp_session.cdp_client.send.Fetch.enable(
-						params={'handleAuthRequests': True},
+						params=fetch_params,
 						session_id=cdp_session.session_id,
 					)
-					self.logger.debug('Fetch.enable(handleAuthRequests=True) enabled on focused session')
+					self.logger.debug('Fetch.enable enabled on focused session')
 			except Exception as e:
 				self.logger.debug(f'Fetch.enable on focused session failed: {type(e).__name__}: {e}')
 
@@ -1702,7 +1754,7 @@ class BrowserSession(BaseModel):
 				challenge = event.get('authChallenge') or event.get('auth_challenge') or {}
 				source = (challenge.get('source') or '').lower()
 				# Only respond to proxy challenges
-				if source == 'proxy' and request_id:
+				if source == 'proxy' and request_id and handle_auth:
 
 					async def _respond():
 						assert self._cdp_client_root
@@ -1743,18 +1795,28 @@ class BrowserSession(BaseModel):
 						)
 
 			def _on_request_paused(event: RequestPausedEvent, session_id: SessionID | None = None):
-				# Continue all paused requests to avoid stalling the network
+				# Fail requests matched by the blocking rules, continue everything else to avoid stalling the network
 				request_id = event.get('requestId') or event.get('request_id')
 				if not request_id:
 					return
 
+				block = False
+				if self._request_blocker is not None:
+					block = self._should_block_paused_request(event, session_id)
+
 				async def _continue():
 					assert self._cdp_client_root
 					try:
-						await self._cdp_client_root.send.Fetch.continueRequest(
-							params={'requestId': request_id},
-							session_id=session_id,
-						)
+						if block:
+							await self._cdp_client_root.send.Fetch.failRequest(
+								params={'requestId': request_id, 'errorReason': 'BlockedByClient'},
+								session_id=session_id,
+							)
+						else:
+							await self._cdp_client_root.send.Fetch.continueRequest(
+								params={'requestId': request_id},
+								session_id=session_id,
+							)
 					except Exception:
 						pass
 
@@ -1770,11 +1832,11 @@ class BrowserSession(BaseModel):
 					cdp_session = await self.get_or_create_cdp_session(self.agent_focus_target_id, focus=False)
 					cdp_session.cdp_client.register.Fetch.authRequired(_on_auth_required)
 					cdp_session.cdp_client.register.Fetch.requestPaused(_on_request_paused)
-				self.logger.debug('Registered Fetch.authRequired handlers')
+				self.logger.debug('Registered Fetch.authRequired/requestPaused handlers')
 			except Exception as e:
-				self.logger.debug(f'Failed to register authRequired handlers: {type(e).__name__}: {e}')
+				self.logger.debug(f'Failed to register Fetch handlers: {type(e).__name__}: {e}')
 
-			# Auto-enable Fetch on every newly attached target to ensure auth callbacks fire
+			# Auto-enable Fetch on every newly attached target to ensure callbacks fire
 			def _on_attached(event: AttachedToTargetEvent, session_id: SessionID | None = None):
 				sid = event.get('sessionId') or event.get('session_id') or session_id
 				if not sid:
@@ -1784,10 +1846,10 @@ class BrowserSession(BaseModel):
 					assert self._cdp_client_root
 					try:
 						await self._cdp_client_root.send.Fetch.enable(
-							params={'handleAuthRequests': True},
+							params=fetch_params,
 							session_id=sid,
 						)
-						self.logger.debug(f'Fetch.enable(handleAuthRequests=True) enabled on attached session {sid}')
+						self.logger.debug(f'Fetch.enable enabled on attached session {sid}')
 					except Exception as e:
 						self.logger.debug(f'Fetch.enable on attached session failed: {type(e).__name__}: {e}')
 
@@ -1807,13 +1869,42 @@ class BrowserSession(BaseModel):
 					# Use safe API with focus=False to avoid changing focus
 					cdp_session = await self.get_or_create_cdp_session(self.agent_focus_target_id, focus=False)
 					await cdp_session.cdp_client.send.Fetch.enable(
-						params={'handleAuthRequests': True, 'patterns': [{'urlPattern': '*'}]},
+						params={**fetch_params, 'patterns': fetch_params.get('patterns', [{'urlPattern': '*'}])},
 						session_id=cdp_session.session_id,
 					)
 			except Exception as e:
 				self.logger.debug(f'Fetch.enable on focused session failed: {type(e).__name__}: {e}')
 		except Exception as e:
-			self.logger.debug(f'Skipping proxy auth setup: {type(e).__name__}: {e}')
+			self.logger.debug(f'Skipping Fetch interception setup: {type(e).__name__}: {e}')
+
+	def _should_block_paused_request(self, event: RequestPausedEvent, session_id: SessionID | None) -> bool:
+		"""Ask the request blocker about a Fetch.requestPaused event, tracking stats per page (target)"""
+		assert self._request_blocker is not None
+		try:
+			request = event.get('request') or {}
+			resource_type = event.get('resourceType') or 'Other'
+			target_id = self.session_manager.get_target_id_from_session_id(session_id) if session_id and self.session_manager else None
+			page_id = target_id or session_id or 'browser'
+			page_url = None
+			if target_id:
+				target = self.session_manager.get_target(target_id)
+				page_url = target.url if target else None
+			return self._request_blocker.on_request(
+				page_id,
+				request.get('url', ''),
+				resource_type,
+				is_main_frame_document=resource_type == 'Document' and event.get('frameId') == target_id,
+				page_url=page_url,
+			)
+		except Exception as e:
+			self.logger.debug(f'Request blocking check failed: {type(e).__name__}: {e}')
+			return False
+
+	def get_request_blocking_stats(self, target_id: TargetID | None = None) -> 'RequestBlockingStats | None':
+		"""Blocked request count and estimated bytes saved for a page (defaults to the focused tab), None if blocking is off"""
+		if self._request_blocker is None:
+			return None
+		return self._request_blocker.stats(target_id or self.agent_focus_target_id or 'browser')
 
 	async def get_tabs(self) -> list[TabInfo]:
 		"""Get information about all open tabs using cached target data."""
@@ -2864,15 +2955,25 @@ class BrowserSession(BaseModel):
 		# Use the root CDP client to create tabs at the browser level
 		if self._cdp_client_root:
 			result = await self._cdp_client_root.send.Target.createTarget(
-				params={'url': url, 'newWindow': new_window, 'background': background}
+				params=self._in_browser_context({'url': url, 'newWindow': new_window, 'background': background})
 			)
 		else:
 			# Fallback to using cdp_client if root is not available
 			result = await self.cdp_client.send.Target.createTarget(
-				params={'url': url, 'newWindow': new_window, 'background': background}
+				params=self._in_browser_context({'url': url, 'newWindow': new_window, 'background': background})
 			)
 		return result['targetId']
 
+	def _in_browser_context(self, params: _ParamsT) -> _ParamsT:
+		"""Add browserContextId to browser-level CDP params when this session is confined to a context"""
+		if self.browser_context_id:
+			params['browserContextId'] = self.browser_context_id  # type: ignore[index]
+		return params
+
+	def owns_target(self, target_info: TargetInfo | dict) -> bool:
+		"""Whether a target belongs to this session's browser context (always True when not confined)"""
+		return not self.browser_context_id or target_info.get('browserContextId') == self.browser_context_id
+
 	async def _cdp_close_page(self, target_id: TargetID) -> None:
 		"""Close a page/tab using CDP Target.closeTarget."""
 		await self.cdp_client.send.Target.closeTarget(params={'targetId': target_id})
@@ -390,6 +390,14 @@ class SessionManager:
 			)
 			return
 
+		# Root-level auto-attach reports targets from every browser context; let go of other agents' targets
+		if not self.browser_session.owns_target(target_info):
+			try:
+				await self.browser_session._cdp_client_root.send.Target.detachFromTarget(params={'sessionId': session_id})
+			except Exception:
+				pass
+			return
+
 		# Enable auto-attach for this session's children (do this FIRST, outside lock)
 		try:
 			await self.browser_session._cdp_client_root.send.Target.setAutoAttach(
@@ -757,6 +765,8 @@ class SessionManager:
 		for target in existing_targets:
 			target_id = target['targetId']
 			target_type = target.get('type', 'unknown')
+			if not self.browser_session.owns_target(target):
+				continue  # Belongs to another agent's browser context
 
 			try:
 				# Just attach - event handler does everything
@@ -121,23 +121,13 @@ class BrowserStateHistory:
 	screenshot_path: str | None = None
 
 	def get_screenshot(self) -> str | None:
-		"""Load screenshot from disk and return as base64 string"""
+		"""Load screenshot (from the screenshot service's memory if recently used, else from disk) as base64 string"""
 		if not self.screenshot_path:
 			return None
 
-		import base64
-		from pathlib import Path
+		from web_agent.screenshots.service import load_screenshot
 
-		path_obj = Path(self.screenshot_path)
-		if not path_obj.exists():
-			return None
-
-		try:
-			with open(path_obj, 'rb') as f:
-				screenshot_data = f.read()
-			return base64.b64encode(screenshot_data).decode('utf-8')
-		except Exception:
-			return None
+		return load_screenshot(self.screenshot_path)
 
 	def to_dict(self) -> dict[str, Any]:
 		data = {}
@@ -330,6 +330,21 @@ class CrashWatchdog(BaseWatchdog):
 			except Exception:
 				pass  # psutil not available or process doesn't exist
 
+	async def check_health(self, timeout: float = 2.0) -> bool:
+		"""One-shot health probe: the browser process is alive and its CDP endpoint answers."""
+		if self.browser_session._local_browser_watchdog and (proc := self.browser_session._local_browser_watchdog._subprocess):
+			try:
+				if proc.status() in (psutil.STATUS_ZOMBIE, psutil.STATUS_DEAD):
+					return False
+			except psutil.Error:
+				return False
+		try:
+			await asyncio.wait_for(self.browser_session.cdp_client.send.Browser.getVersion(), timeout=timeout)
+			return True
+		except Exception as e:
+			self.logger.warning(f'[CrashWatchdog] Browser health probe failed: {type(e).__name__}: {e}')
+			return False
+
 	@staticmethod
 	def _is_new_tab_page(url: str) -> bool:
 		"""Check if URL is a new tab page."""
@@ -6,6 +6,7 @@ import os
 
 from cdp_use.cdp.input.commands import DispatchKeyEventParameters
 
+from web_agent.actor.text_input import dispatch_key_events_pipelined, insert_text_bulk, key_events_for_text
 from web_agent.actor.utils import get_key_info
 from web_agent.browser.events import (
 	ClickCoordinateEvent,
@@ -77,6 +78,8 @@ class DefaultActionWatchdog(BaseWatchdog):
 
 		def on_download_progress(info: dict) -> None:
 			"""Direct callback when download progress updates (called from CDP handler)."""
+			if info.get('auto_download'):
+				return  # ignore auto-downloads
 			# Match by guid if available
 			if download_info.get('guid') and info.get('guid') != download_info['guid']:
 				return  # different download
@@ -654,6 +657,215 @@ class DefaultActionWatchdog(BaseWatchdog):
 			self.logger.debug(f'Occlusion check failed: {e}, assuming not occluded')
 			return False
 
+	async def _prepare_click_point(self, backend_node_id: int, cdp_session) -> tuple[float, float, bool] | None:
+		"""Scroll the element into view and return (center_x, center_y, is_occluded) from a single injected function.
+
+		The function waits for scrollend / the next animation frame instead of a fixed sleep.
+		Returns None when this fast path can't be used (detached node, no layout boxes, or a frame
+		whose offset isn't reachable from JavaScript), so the caller can use _prepare_click_point_legacy.
+		"""
+		session_id = cdp_session.session_id
+		try:
+			resolved = await cdp_session.cdp_client.send.DOM.resolveNode(
+				params={'backendNodeId': backend_node_id}, session_id=session_id
+			)
+			object_id = resolved.get('object', {}).get('objectId')
+			if not object_id:
+				return None
+
+			result = await cdp_session.cdp_client.send.Runtime.callFunctionOn(
+				params={
+					'objectId': object_id,
+					'functionDeclaration': """
+					async function() {
+						const el = this;
+						if (!el.isConnected) return null;
+						const win = el.ownerDocument.defaultView;
+						const sleep = (ms) => new Promise(resolve => win.setTimeout(resolve, ms));
+						// rAF doesn't fire in background tabs, so never wait on it alone
+						const nextFrame = () => Promise.race([new Promise(resolve => win.requestAnimationFrame(resolve)), sleep(50)]);
+
+						// Offset of the element's frame inside the page; bail out if a cross-origin frame is in the way
+						let offsetX = 0, offsetY = 0;
+						for (let w = win; w !== w.parent; w = w.parent) {
+							const frame = w.frameElement;
+							if (!frame) return null;
+							const frameRect = frame.getBoundingClientRect();
+							const style = w.parent.getComputedStyle(frame);
+							offsetX += frameRect.left + frame.clientLeft + parseFloat(style.paddingLeft || '0');
+							offsetY += frameRect.top + frame.clientTop + parseFloat(style.paddingTop || '0');
+						}
+
+						const viewport = () => {
+							const root = el.ownerDocument.documentElement;
+							return {
+								width: Math.min(win.innerWidth, root.clientWidth || win.innerWidth),
+								height: Math.min(win.innerHeight, root.clientHeight || win.innerHeight),
+							};
+						};
+
+						// Largest box of the element inside the viewport (first box if none is visible)
+						const bestRect = () => {
+							const vp = viewport();
+							let best = null, bestArea = -1;
+							for (const r of el.getClientRects()) {
+								if (r.width <= 0 || r.height <= 0) continue;
+								const w = Math.min(vp.width, r.right) - Math.max(0, r.left);
+								const h = Math.min(vp.height, r.bottom) - Math.max(0, r.top);
+								const area = w > 0 && h > 0 ? w * h : 0;
+								if (area > bestArea) { best = r; bestArea = area; }
+							}
+							return best && { rect: best, visibleArea: bestArea, vp };
+						};
+
+						let box = bestRect();
+						if (!box) return null;
+
+						if (box.visibleArea < box.rect.width * box.rect.height - 1) {
+							let scrolled = false;
+							const onScroll = () => { scrolled = true; };
+							win.addEventListener('scroll', onScroll, { capture: true, passive: true });
+							const scrollEnded = new Promise(resolve => win.addEventListener('scrollend', resolve, { once: true, capture: true }));
+							if (el.scrollIntoViewIfNeeded) el.scrollIntoViewIfNeeded(true);
+							else el.scrollIntoView({ block: 'center', inline: 'nearest' });
+							await nextFrame();
+							if (scrolled) await Promise.race([scrollEnded, sleep(300)]);
+							win.removeEventListener('scroll', onScroll, { capture: true });
+							await nextFrame();
+							box = bestRect();
+							if (!box) return null;
+						}
+
+						const { rect, vp } = box;
+						const localX = Math.max(0, Math.min(vp.width - 1, rect.left + rect.width / 2));
+						const localY = Math.max(0, Math.min(vp.height - 1, rect.top + rect.height / 2));
+
+						const root = el.getRootNode();
+						const hit = (root.elementFromPoint ? root : el.ownerDocument).elementFromPoint(localX, localY);
+						const occluded = !(hit && (hit === el || el.contains(hit) || hit.contains(el)));
+						return {
+							x: localX + offsetX,
+							y: localY + offsetY,
+							occluded: occluded,
+							hit: hit ? hit.tagName + (hit.id ? '#' + hit.id : '') : null,
+						};
+					}
+					""",
+					'awaitPromise': True,
+					'returnByValue': True,
+				},
+				session_id=session_id,
+			)
+		except Exception as e:
+			self.logger.debug(f'Single-call click preparation failed, using step-by-step path: {type(e).__name__}: {e}')
+			return None
+
+		value = result.get('result', {}).get('value')
+		if not value:
+			return None
+		if value['occluded']:
+			self.logger.debug(f'Element is occluded at ({value["x"]:.1f}, {value["y"]:.1f}) by {value.get("hit")}')
+		return value['x'], value['y'], value['occluded']
+
+	async def _prepare_click_point_legacy(self, backend_node_id: int, cdp_session) -> tuple[float, float, bool] | None:
+		"""Step-by-step click preparation: layout metrics, scroll, geometry lookups and occlusion check as separate CDP calls.
+
+		Returns (center_x, center_y, is_occluded), or None if no element geometry could be found.
+		"""
+		session_id = cdp_session.session_id
+
+		# Get viewport dimensions for visibility checks
+		layout_metrics = await cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=session_id)
+		viewport_width = layout_metrics['layoutViewport']['clientWidth']
+		viewport_height = layout_metrics['layoutViewport']['clientHeight']
+
+		# Scroll element into view FIRST before getting coordinates
+		try:
+			await cdp_session.cdp_client.send.DOM.scrollIntoViewIfNeeded(
+				params={'backendNodeId': backend_node_id}, session_id=session_id
+			)
+			await asyncio.sleep(0.05)  # Wait for scroll to complete
+			self.logger.debug('Scrolled element into view before getting coordinates')
+		except Exception as e:
+			self.logger.debug(f'Failed to scroll element into view: {e}')
+
+		# Get element coordinates using the unified method AFTER scrolling
+		element_rect = await self.browser_session.get_element_coordinates(backend_node_id, cdp_session)
+
+		# Convert rect to quads format if we got coordinates
+		quads = []
+		if element_rect:
+			# Convert DOMRect to quad format
+			x, y, w, h = element_rect.x, element_rect.y, element_rect.width, element_rect.height
+			quads = [
+				[
+					x,
+					y,  # top-left
+					x + w,
+					y,  # top-right
+					x + w,
+					y + h,  # bottom-right
+					x,
+					y + h,  # bottom-left
+				]
+			]
+			self.logger.debug(
+				f'Got coordinates from unified method: {element_rect.x}, {element_rect.y}, {element_rect.width}x{element_rect.height}'
+			)
+
+		if not quads:
+			return None
+
+		# Find the largest visible quad within the viewport
+		best_quad = None
+		best_area = 0
+
+		for quad in quads:
+			if len(quad) < 8:
+				continue
+
+			# Calculate quad bounds
+			xs = [quad[i] for i in range(0, 8, 2)]
+			ys = [quad[i] for i in range(1, 8, 2)]
+			min_x, max_x = min(xs), max(xs)
+			min_y, max_y = min(ys), max(ys)
+
+			# Check if quad intersects with viewport
+			if max_x < 0 or max_y < 0 or min_x > viewport_width or min_y > viewport_height:
+				continue  # Quad is completely outside viewport
+
+			# Calculate visible area (intersection with viewport)
+			visible_min_x = max(0, min_x)
+			visible_max_x = min(viewport_width, max_x)
+			visible_min_y = max(0, min_y)
+			visible_max_y = min(viewport_height, max_y)
+
+			visible_width = visible_max_x - visible_min_x
+			visible_height = visible_max_y - visible_min_y
+			visible_area = visible_width * visible_height
+
+			if visible_area > best_area:
+				best_area = visible_area
+				best_quad = quad
+
+		if not best_quad:
+			# No visible quad found, use the first quad anyway
+			best_quad = quads[0]
+			self.logger.warning('No visible quad found, using first quad')
+
+		# Calculate center point of the best quad
+		center_x = sum(best_quad[i] for i in range(0, 8, 2)) / 4
+		center_y = sum(best_quad[i] for i in range(1, 8, 2)) / 4
+
+		# Ensure click point is within viewport bounds
+		center_x = max(0, min(viewport_width - 1, center_x))
+		center_y = max(0, min(viewport_height - 1, center_y))
+
+		# Check for occlusion before attempting CDP click
+		is_occluded = await self._check_element_occlusion(backend_node_id, center_x, center_y, cdp_session)
+
+		return center_x, center_y, is_occluded
+
 	async def _click_element_node_impl(self, element_node) -> dict | None:
 		"""
 		Click an element using pure CDP with multiple fallback methods for getting element geometry.
@@ -686,47 +898,13 @@ class DefaultActionWatchdog(BaseWatchdog):
 			# Get element bounds
 			backend_node_id = element_node.backend_node_id
 
-			# Get viewport dimensions for visibility checks
-			layout_metrics = await cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=session_id)
-			viewport_width = layout_metrics['layoutViewport']['clientWidth']
-			viewport_height = layout_metrics['layoutViewport']['clientHeight']
-
-			# Scroll element into view FIRST before getting coordinates
-			try:
-				await cdp_session.cdp_client.send.DOM.scrollIntoViewIfNeeded(
-					params={'backendNodeId': backend_node_id}, session_id=session_id
-				)
-				await asyncio.sleep(0.05)  # Wait for scroll to complete
-				self.logger.debug('Scrolled element into view before getting coordinates')
-			except Exception as e:
-				self.logger.debug(f'Failed to scroll element into view: {e}')
-
-			# Get element coordinates using the unified method AFTER scrolling
-			element_rect = await self.browser_session.get_element_coordinates(backend_node_id, cdp_session)
-
-			# Convert rect to quads format if we got coordinates
-			quads = []
-			if element_rect:
-				# Convert DOMRect to quad format
-				x, y, w, h = element_rect.x, element_rect.y, element_rect.width, element_rect.height
-				quads = [
-					[
-						x,
-						y,  # top-left
-						x + w,
-						y,  # top-right
-						x + w,
-						y + h,  # bottom-right
-						x,
-						y + h,  # bottom-left
-					]
-				]
-				self.logger.debug(
-					f'Got coordinates from unified method: {element_rect.x}, {element_rect.y}, {element_rect.width}x{element_rect.height}'
-				)
+			# Scroll into view, get the click point and check occlusion in one injected call when possible
+			click_point = await self._prepare_click_point(backend_node_id, cdp_session)
+			if click_point is None:
+				click_point = await self._prepare_click_point_legacy(backend_node_id, cdp_session)
 
-			# If we still don't have quads, fall back to JS click
-			if not quads:
+			# If we still don't have geometry, fall back to JS click
+			if click_point is None:
 				self.logger.warning('Could not get element geometry from any method, falling back to JavaScript click')
 				try:
 					result = await cdp_session.cdp_client.send.DOM.resolveNode(
@@ -755,53 +933,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 					else:
 						raise Exception(f'Failed to click element: {js_e}')
 
-			# Find the largest visible quad within the viewport
-			best_quad = None
-			best_area = 0
-
-			for quad in quads:
-				if len(quad) < 8:
-					continue
-
-				# Calculate quad bounds
-				xs = [quad[i] for i in range(0, 8, 2)]
-				ys = [quad[i] for i in range(1, 8, 2)]
-				min_x, max_x = min(xs), max(xs)
-				min_y, max_y = min(ys), max(ys)
-
-				# Check if quad intersects with viewport
-				if max_x < 0 or max_y < 0 or min_x > viewport_width or min_y > viewport_height:
-					continue  # Quad is completely outside viewport
-
-				# Calculate visible area (intersection with viewport)
-				visible_min_x = max(0, min_x)
-				visible_max_x = min(viewport_width, max_x)
-				visible_min_y = max(0, min_y)
-				visible_max_y = min(viewport_height, max_y)
-
-				visible_width = visible_max_x - visible_min_x
-				visible_height = visible_max_y - visible_min_y
-				visible_area = visible_width * visible_height
-
-				if visible_area > best_area:
-					best_area = visible_area
-					best_quad = quad
-
-			if not best_quad:
-				# No visible quad found, use the first quad anyway
-				best_quad = quads[0]
-				self.logger.warning('No visible quad found, using first quad')
-
-			# Calculate center point of the best quad
-			center_x = sum(best_quad[i] for i in range(0, 8, 2)) / 4
-			center_y = sum(best_quad[i] for i in range(1, 8, 2)) / 4
-
-			# Ensure click point is within viewport bounds
-			center_x = max(0, min(viewport_width - 1, center_x))
-			center_y = max(0, min(viewport_height - 1, center_y))
-
-			# Check for occlusion before attempting CDP click
-			is_occluded = await self._check_element_occlusion(backend_node_id, center_x, center_y, cdp_session)
+			center_x, center_y, is_occluded = click_point
 
 			if is_occluded:
 				self.logger.debug('🚫 Element is occluded, falling back to JavaScript click')
@@ -1040,6 +1172,21 @@ class DefaultActionWatchdog(BaseWatchdog):
 			# Get CDP client and session
 			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id=None, focus=True)
 
+			typing_mode = self.browser_session.browser_profile.typing_mode
+			if typing_mode == 'bulk' and text:
+				active = await cdp_session.cdp_client.send.Runtime.evaluate(
+					params={'expression': 'document.activeElement'}, session_id=cdp_session.session_id
+				)
+				object_id = active.get('result', {}).get('objectId')
+				if object_id and await insert_text_bulk(cdp_session.cdp_client, cdp_session.session_id, object_id, text):
+					return
+				self.logger.debug('⌨️ Bulk insert not accepted by the focused element, falling back to human typing')
+			elif typing_mode == 'fast-keys':
+				await dispatch_key_events_pipelined(
+					cdp_session.cdp_client, cdp_session.session_id, key_events_for_text(text, self._char_key_info)
+				)
+				return
+
 			# Type the text character by character to the focused element
 			for char in text:
 				# Handle newline characters as Enter key
@@ -1718,14 +1865,15 @@ class DefaultActionWatchdog(BaseWatchdog):
 				if not cleared_successfully:
 					self.logger.warning('⚠️ Text field clearing failed, typing may append to existing text')
 
-			# Step 4: Type the text character by character using proper human-like key events
-			# This emulates exactly how a human would type, which modern websites expect
+			# Step 4: Type the text with the configured typing engine mode
+			# 'human' emulates exactly how a human would type, which modern websites expect
+			typing_mode = self.browser_session.browser_profile.typing_mode
 			if is_sensitive:
 				# Note: sensitive_key_name is not passed to this low-level method,
 				# but we could extend the signature if needed for more granular logging
-				self.logger.debug('🎯 Typing <sensitive> character by character')
+				self.logger.debug(f'🎯 Typing <sensitive> ({typing_mode} mode)')
 			else:
-				self.logger.debug(f'🎯 Typing text character by character: "{text}"')
+				self.logger.debug(f'🎯 Typing text ({typing_mode} mode): "{text}"')
 
 			# Detect contenteditable elements (may have leaf-start bug where first char is dropped)
 			_attrs = element_node.attributes or {}
@@ -1735,130 +1883,24 @@ class DefaultActionWatchdog(BaseWatchdog):
 
 			# For contenteditable: after typing first char, check if dropped and retype if needed
 			_check_first_char = _is_contenteditable and len(text) > 0 and clear
-			_first_char = text[0] if _check_first_char else None
-
-			for i, char in enumerate(text):
-				# Handle newline characters as Enter key
-				if char == '\n':
-					# Send proper Enter key sequence
-					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'keyDown',
-							'key': 'Enter',
-							'code': 'Enter',
-							'windowsVirtualKeyCode': 13,
-						},
-						session_id=cdp_session.session_id,
-					)
 
-					# Small delay to emulate human typing speed
-					await asyncio.sleep(0.001)
-
-					# Send char event with carriage return
-					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'char',
-							'text': '\r',
-							'key': 'Enter',
-						},
-						session_id=cdp_session.session_id,
-					)
-
-					# Send keyUp event
-					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'keyUp',
-							'key': 'Enter',
-							'code': 'Enter',
-							'windowsVirtualKeyCode': 13,
-						},
-						session_id=cdp_session.session_id,
-					)
-				else:
-					# Handle regular characters
-					# Get proper modifiers, VK code, and base key for the character
-					modifiers, vk_code, base_key = self._get_char_modifiers_and_vk(char)
-					key_code = self._get_key_code_for_char(base_key)
-
-					# self.logger.debug(f'🎯 Typing character {i + 1}/{len(text)}: "{char}" (base_key: {base_key}, code: {key_code}, modifiers: {modifiers}, vk: {vk_code})')
-
-					# Step 1: Send keyDown event (NO text parameter)
-					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'keyDown',
-							'key': base_key,
-							'code': key_code,
-							'modifiers': modifiers,
-							'windowsVirtualKeyCode': vk_code,
-						},
-						session_id=cdp_session.session_id,
-					)
-
-					# Small delay to emulate human typing speed
-					await asyncio.sleep(0.005)
-
-					# Step 2: Send char event (WITH text parameter) - this is crucial for text input
-					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'char',
-							'text': char,
-							'key': char,
-						},
-						session_id=cdp_session.session_id,
-					)
-
-					# Step 3: Send keyUp event (NO text parameter)
-					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-						params={
-							'type': 'keyUp',
-							'key': base_key,
-							'code': key_code,
-							'modifiers': modifiers,
-							'windowsVirtualKeyCode': vk_code,
-						},
-						session_id=cdp_session.session_id,
-					)
-
-				# After first char on contenteditable: check if dropped and retype if needed
-				if i == 0 and _check_first_char and _first_char:
-					check_result = await cdp_session.cdp_client.send.Runtime.evaluate(
-						params={'expression': 'document.activeElement.textContent'},
-						session_id=cdp_session.session_id,
-					)
-					content = check_result.get('result', {}).get('value', '')
-					if _first_char not in content:
-						self.logger.debug(f'🎯 First char "{_first_char}" was dropped (leaf-start bug), retyping')
-						# Retype the first character - cursor now past leaf-start
-						modifiers, vk_code, base_key = self._get_char_modifiers_and_vk(_first_char)
-						key_code = self._get_key_code_for_char(base_key)
-						await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-							params={
-								'type': 'keyDown',
-								'key': base_key,
-								'code': key_code,
-								'modifiers': modifiers,
-								'windowsVirtualKeyCode': vk_code,
-							},
-							session_id=cdp_session.session_id,
-						)
-						await asyncio.sleep(0.005)
-						await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-							params={'type': 'char', 'text': _first_char, 'key': _first_char},
-							session_id=cdp_session.session_id,
-						)
-						await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
-							params={
-								'type': 'keyUp',
-								'key': base_key,
-								'code': key_code,
-								'modifiers': modifiers,
-								'windowsVirtualKeyCode': vk_code,
-							},
-							session_id=cdp_session.session_id,
-						)
+			typed = False
+			if typing_mode == 'bulk' and text:
+				typed = await insert_text_bulk(cdp_session.cdp_client, cdp_session.session_id, object_id, text)
+				if not typed:
+					self.logger.debug('🎯 Bulk insert rejected by the field, falling back to human typing')
+			elif typing_mode == 'fast-keys':
+				# The leaf-start check needs the first character typed (and verified) on its own
+				head = text[:1] if _check_first_char else ''
+				if head:
+					await self._type_characters(head, cdp_session, check_first_char=True)
+				await dispatch_key_events_pipelined(
+					cdp_session.cdp_client, cdp_session.session_id, key_events_for_text(text[len(head) :], self._char_key_info)
+				)
+				typed = True
 
-				# Small delay between characters to look human (realistic typing speed)
-				await asyncio.sleep(0.001)
+			if not typed:
+				await self._type_characters(text, cdp_session, check_first_char=_check_first_char)
 
 			# Step 4: Trigger framework-aware DOM events after typing completion
 			# Modern JavaScript frameworks (React, Vue, Angular) rely on these events
@@ -1945,6 +1987,138 @@ class DefaultActionWatchdog(BaseWatchdog):
 			self.logger.error(f'Failed to input text via CDP: {type(e).__name__}: {e}')
 			raise BrowserError(f'Failed to input text into element: {repr(element_node)}')
 
+	async def _type_characters(self, text: str, cdp_session, check_first_char: bool = False) -> None:
+		"""Type text into the focused element one awaited keyDown/char/keyUp sequence at a time ('human' mode)"""
+		_first_char = text[0] if check_first_char and text else None
+
+		for i, char in enumerate(text):
+			# Handle newline characters as Enter key
+			if char == '\n':
+				# Send proper Enter key sequence
+				await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
+					params={
+						'type': 'keyDown',
+						'key': 'Enter',
+						'code': 'Enter',
+						'windowsVirtualKeyCode': 13,
+					},
+					session_id=cdp_session.session_id,
+				)
+
+				# Small delay to emulate human typing speed
+				await asyncio.sleep(0.001)
+
+				# Send char event with carriage return
+				await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
+					params={
+						'type': 'char',
+						'text': '\r',
+						'key': 'Enter',
+					},
+					session_id=cdp_session.session_id,
+				)
+
+				# Send keyUp event
+				await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
+					params={
+						'type': 'keyUp',
+						'key': 'Enter',
+						'code': 'Enter',
+						'windowsVirtualKeyCode': 13,
+					},
+					session_id=cdp_session.session_id,
+				)
+			else:
+				# Handle regular characters
+				# Get proper modifiers, VK code, and base key for the character
+				modifiers, vk_code, base_key = self._get_char_modifiers_and_vk(char)
+				key_code = self._get_key_code_for_char(base_key)
+
+				# self.logger.debug(f'🎯 Typing character {i + 1}/{len(text)}: "{char}" (base_key: {base_key}, code: {key_code}, modifiers: {modifiers}, vk: {vk_code})')
+
+				# Step 1: Send keyDown event (NO text parameter)
+				await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
+					params={
+						'type': 'keyDown',
+						'key': base_key,
+						'code': key_code,
+						'modifiers': modifiers,
+						'windowsVirtualKeyCode': vk_code,
+					},
+					session_id=cdp_session.session_id,
+				)
+
+				# Small delay to emulate human typing speed
+				await asyncio.sleep(0.005)
+
+				# Step 2: Send char event (WITH text parameter) - this is crucial for text input
+				await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
+					params={
+						'type': 'char',
+						'text': char,
+						'key': char,
+					},
+					session_id=cdp_session.session_id,
+				)
+
+				# Step 3: Send keyUp event (NO text parameter)
+				await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
+					params={
+						'type': 'keyUp',
+						'key': base_key,
+						'code': key_code,
+						'modifiers': modifiers,
+						'windowsVirtualKeyCode': vk_code,
+					},
+					session_id=cdp_session.session_id,
+				)
+
+			# After first char on contenteditable: check if dropped and retype if needed
+			if i == 0 and check_first_char and _first_char:
+				check_result = await cdp_session.cdp_client.send.Runtime.evaluate(
+					params={'expression': 'document.activeElement.textContent'},
+					session_id=cdp_session.session_id,
+				)
+				content = check_result.get('result', {}).get('value', '')
+				if _first_char not in content:
+					self.logger.debug(f'🎯 First char "{_first_char}" was dropped (leaf-start bug), retyping')
+					# Retype the first character - cursor now past leaf-start
+					modifiers, vk_code, base_key = self._get_char_modifiers_and_vk(_first_char)
+					key_code = self._get_key_code_for_char(base_key)
+					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
+						params={
+							'type': 'keyDown',
+							'key': base_key,
+							'code': key_code,
+							'modifiers': modifiers,
+							'windowsVirtualKeyCode': vk_code,
+						},
+						session_id=cdp_session.session_id,
+					)
+					await asyncio.sleep(0.005)
+					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
+						params={'type': 'char', 'text': _first_char, 'key': _first_char},
+						session_id=cdp_session.session_id,
+					)
+					await cdp_session.cdp_client.send.Input.dispatchKeyEvent(
+						params={
+							'type': 'keyUp',
+							'key': base_key,
+							'code': key_code,
+							'modifiers': modifiers,
+							'windowsVirtualKeyCode': vk_code,
+						},
+						session_id=cdp_session.session_id,
+					)
+
+			# Small delay between characters to look human (realistic typing speed)
+			await asyncio.sleep(0.001)
+
+	def _char_key_info(self, char: str) -> tuple[int, int, str, str]:
+		"""(modifiers, windowsVirtualKeyCode, base_key, code) for a character"""
+		modifiers, vk_code, base_key = self._get_char_modifiers_and_vk(char)
+		return modifiers, vk_code, base_key, self._get_key_code_for_char(base_key)
+
 	async def _trigger_framework_events(self, object_id: str, cdp_session) -> None:
 		"""
 		Trigger framework-aware DOM events after text input completion.
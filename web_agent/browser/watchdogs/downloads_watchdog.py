@@ -6,16 +6,19 @@ import os
 import tempfile
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
-from urllib.parse import urlparse
+from urllib.parse import quote, urlparse
 
 import anyio
+import httpx
 from bubus import BaseEvent
 from cdp_use.cdp.browser import DownloadProgressEvent as CDPDownloadProgressEvent
 from cdp_use.cdp.browser import DownloadWillBeginEvent
 from cdp_use.cdp.network import ResponseReceivedEvent
 from cdp_use.cdp.target import SessionID, TargetID
 from pydantic import PrivateAttr
+from uuid_extensions import uuid7str
 
+from web_agent.browser.download_manager import DownloadError, DownloadManager, DownloadResult, unique_filename
 from web_agent.browser.events import (
 	BrowserLaunchEvent,
 	BrowserStateRequestEvent,
@@ -67,6 +70,8 @@ class DownloadsWatchdog(BaseWatchdog):
 	_network_monitored_targets: set[str] = PrivateAttr(default_factory=set)  # Track targets with network monitoring enabled
 	_detected_downloads: set[str] = PrivateAttr(default_factory=set)  # Track detected download URLs to avoid duplicates
 	_network_callback_registered: bool = PrivateAttr(default=False)  # Track if global network callback is registered
+	_download_manager: DownloadManager | None = PrivateAttr(default=None)  # Streams automatic downloads to disk
+	_browser_user_agent: str | None = PrivateAttr(default=None)  # Sent with automatic downloads
 
 	# Direct callback support for download waiting (bypasses event bus for synchronization)
 	_download_start_callbacks: list[Any] = PrivateAttr(default_factory=list)  # Callbacks for download start
@@ -193,6 +198,10 @@ class DownloadsWatchdog(BaseWatchdog):
 		self._network_monitored_targets.clear()
 		self._detected_downloads.clear()
 		self._network_callback_registered = False
+		if self._download_manager is not None:
+			await self._download_manager.aclose()
+			self._download_manager = None
+		self._browser_user_agent = None
 
 	async def on_NavigationCompleteEvent(self, event: NavigationCompleteEvent) -> None:
 		"""Check for PDFs after navigation completes."""
@@ -285,31 +294,7 @@ class DownloadsWatchdog(BaseWatchdog):
 			state = event.get('state', '')
 			received_bytes = int(event.get('receivedBytes', 0))
 			total_bytes = int(event.get('totalBytes', 0))
-
-			# Call direct callbacks first (for click handlers tracking progress)
-			progress_info = {
-				'guid': guid,
-				'received_bytes': received_bytes,
-				'total_bytes': total_bytes,
-				'state': state,
-			}
-			for callback in self._download_progress_callbacks:
-				try:
-					callback(progress_info)
-				except Exception as e:
-					self.logger.debug(f'[DownloadsWatchdog] Error in download progress callback: {e}')
-
-			# Emit progress event for all states so listeners can track progress
-			from web_agent.browser.events import DownloadProgressEvent as DownloadProgressEventInternal
-
-			self.event_bus.dispatch(
-				DownloadProgressEventInternal(
-					guid=guid,
-					received_bytes=received_bytes,
-					total_bytes=total_bytes,
-					state=state,
-				)
-			)
+			self._notify_download_progress(guid, received_bytes, total_bytes, state)
 
 			# Check if download is complete
 			if state == 'completed':
@@ -383,11 +368,13 @@ class DownloadsWatchdog(BaseWatchdog):
 				# Ensure path is properly expanded (~ -> absolute path)
 				expanded_downloads_path = Path(downloads_path).expanduser().resolve()
 				await cdp_client.send.Browser.setDownloadBehavior(
-					params={
-						'behavior': 'allow',
-						'downloadPath': str(expanded_downloads_path),  # Use expanded absolute path
-						'eventsEnabled': True,
-					}
+					params=self.browser_session._in_browser_context(
+						{
+							'behavior': 'allow',
+							'downloadPath': str(expanded_downloads_path),  # Use expanded absolute path
+							'eventsEnabled': True,
+						}
+					)
 				)
 
 				# Register the handlers with CDP
@@ -615,9 +602,6 @@ class DownloadsWatchdog(BaseWatchdog):
 			return existing_path
 
 		try:
-			# Get or create CDP session for this target
-			temp_session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
-
 			# Determine filename
 			if suggested_filename:
 				filename = suggested_filename
@@ -631,108 +615,195 @@ class DownloadsWatchdog(BaseWatchdog):
 					else:
 						filename = 'download'
 
-			# Ensure downloads directory exists
-			downloads_dir = str(self.browser_session.browser_profile.downloads_path)
-			os.makedirs(downloads_dir, exist_ok=True)
-
-			# Generate unique filename if file exists
-			final_filename = filename
-			existing_files = os.listdir(downloads_dir)
-			if filename in existing_files:
-				base, ext = os.path.splitext(filename)
-				counter = 1
-				while f'{base} ({counter}){ext}' in existing_files:
-					counter += 1
-				final_filename = f'{base} ({counter}){ext}'
-				self.logger.debug(f'[DownloadsWatchdog] File exists, using: {final_filename}')
-
 			self.logger.debug(f'[DownloadsWatchdog] Downloading from: {url[:100]}...')
 
-			# Download using JavaScript fetch to leverage browser cache
-			escaped_url = json.dumps(url)
+			# No CDP guid for downloads we fetch ourselves: make one to correlate start/progress/complete notifications
+			guid = f'auto-{uuid7str()}'
+			self._notify_download_start(guid, url, filename)
 
-			result = await asyncio.wait_for(
-				temp_session.cdp_client.send.Runtime.evaluate(
-					params={
-						'expression': f"""
-				(async () => {{
-					try {{
-						const response = await fetch({escaped_url}, {{
-							cache: 'force-cache'
-						}});
-						if (!response.ok) {{
-							throw new Error(`HTTP error! status: ${{response.status}}`);
-						}}
-						const blob = await response.blob();
-						const arrayBuffer = await blob.arrayBuffer();
-						const uint8Array = new Uint8Array(arrayBuffer);
-
-						return {{
-							data: Array.from(uint8Array),
-							responseSize: uint8Array.length
-						}};
-					}} catch (error) {{
-						throw new Error(`Fetch failed: ${{error.message}}`);
-					}}
-				}})()
-				""",
-						'awaitPromise': True,
-						'returnByValue': True,
-					},
-					session_id=temp_session.session_id,
-				),
-				timeout=15.0,  # 15 second timeout
-			)
+			manager = self._get_download_manager()
+			try:
+				# Stream straight to disk with the browser's cookies, resuming with Range requests if interrupted
+				result = await manager.download(
+					url,
+					filename,
+					get_headers=lambda request_url: self._get_download_headers(request_url, target_id),
+					on_progress=lambda received, total, state: self._notify_download_progress(guid, received, total, state, True),
+				)
+			except (DownloadError, httpx.HTTPError) as e:
+				# e.g. auth that isn't cookie-based: let the browser fetch it (uses its cache, buffers in memory)
+				self.logger.debug(f'[DownloadsWatchdog] Direct download failed ({e}), fetching via browser: {url[:80]}')
+				data = await self._fetch_via_browser(url, target_id)
+				if not data:
+					self.logger.warning(f'[DownloadsWatchdog] No data received when downloading from {url}')
+					self._notify_download_progress(guid, 0, 0, 'canceled', True)
+					return None
+				result = await manager.save_bytes(data, filename, url=url, mime_type=content_type)
+				self._notify_download_progress(guid, result.file_size, result.file_size, 'completed', True)
 
-			download_result = result.get('result', {}).get('value', {})
+			self.logger.debug(
+				f'[DownloadsWatchdog] File written: {result.path} ({result.file_size} bytes'
+				f'{", identical to an existing file" if result.deduplicated else ""}'
+				f'{f", resumed {result.resumed}x" if result.resumed else ""})'
+			)
+			self._on_auto_download_complete(guid, result, content_type)
+			return result.path
 
-			if download_result and download_result.get('data') and len(download_result['data']) > 0:
-				download_path = os.path.join(downloads_dir, final_filename)
+		except TimeoutError:
+			self.logger.warning(f'[DownloadsWatchdog] Download timed out: {url[:80]}...')
+			return None
+		except Exception as e:
+			self.logger.warning(f'[DownloadsWatchdog] Download failed: {type(e).__name__}: {e}')
+			return None
 
-				# Save the file asynchronously
-				async with await anyio.open_file(download_path, 'wb') as f:
-					await f.write(bytes(download_result['data']))
+	def _get_download_manager(self) -> DownloadManager:
+		"""Shared manager for automatic downloads (bounded concurrency, pooled connections)"""
+		if self._download_manager is None:
+			profile = self.browser_session.browser_profile
+			assert profile.downloads_path, 'downloads_path must be set'
+			proxy = None
+			if profile.proxy and profile.proxy.server:
+				proxy = profile.proxy.server
+				if profile.proxy.username:
+					# Same proxy as the browser, with its credentials embedded
+					scheme, _, host = proxy.partition('://') if '://' in proxy else ('http', '', proxy)
+					auth = quote(profile.proxy.username, safe='')
+					if profile.proxy.password:
+						auth += f':{quote(profile.proxy.password, safe="")}'
+					proxy = f'{scheme}://{auth}@{host}'
+			self._download_manager = DownloadManager(Path(profile.downloads_path).expanduser().resolve(), proxy=proxy)
+		return self._download_manager
+
+	async def _get_download_headers(self, url: str, target_id: TargetID) -> dict[str, str]:
+		"""Headers that make a direct request look like the browser's: its user agent and its cookies for url"""
+		cdp_session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
+		headers: dict[str, str] = {}
+		if self._browser_user_agent is None:
+			version = await cdp_session.cdp_client.send.Browser.getVersion()
+			self._browser_user_agent = version.get('userAgent', '')
+		if self._browser_user_agent:
+			headers['User-Agent'] = self._browser_user_agent
+
+		result = await cdp_session.cdp_client.send.Network.getCookies(params={'urls': [url]}, session_id=cdp_session.session_id)
+		cookies = result.get('cookies', [])
+		if cookies:
+			headers['Cookie'] = '; '.join(f'{cookie["name"]}={cookie["value"]}' for cookie in cookies)
+		return headers
+
+	async def _fetch_via_browser(self, url: str, target_id: TargetID) -> bytes | None:
+		"""Fetch url with the page's own fetch() (leverages the browser cache) and return the body"""
+		temp_session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
+		escaped_url = json.dumps(url)
+
+		result = await asyncio.wait_for(
+			temp_session.cdp_client.send.Runtime.evaluate(
+				params={
+					'expression': f"""
+			(async () => {{
+				try {{
+					const response = await fetch({escaped_url}, {{
+						cache: 'force-cache'
+					}});
+					if (!response.ok) {{
+						throw new Error(`HTTP error! status: ${{response.status}}`);
+					}}
+					const blob = await response.blob();
+					const arrayBuffer = await blob.arrayBuffer();
+					const uint8Array = new Uint8Array(arrayBuffer);
+
+					return {{
+						data: Array.from(uint8Array),
+						responseSize: uint8Array.length
+					}};
+				}} catch (error) {{
+					throw new Error(`Fetch failed: ${{error.message}}`);
+				}}
+			}})()
+			""",
+					'awaitPromise': True,
+					'returnByValue': True,
+				},
+				session_id=temp_session.session_id,
+			),
+			timeout=15.0,  # 15 second timeout
+		)
 
-				# Verify file was written successfully
-				if os.path.exists(download_path):
-					actual_size = os.path.getsize(download_path)
-					self.logger.debug(f'[DownloadsWatchdog] File written: {download_path} ({actual_size} bytes)')
+		download_result = result.get('result', {}).get('value', {})
+		if download_result and download_result.get('data'):
+			return bytes(download_result['data'])
+		return None
 
-					# Determine file type
-					file_ext = Path(final_filename).suffix.lower().lstrip('.')
-					mime_type = content_type or f'application/{file_ext}'
+	def _notify_download_start(self, guid: str, url: str, suggested_filename: str) -> None:
+		"""Tell direct callbacks and the event bus that an automatic download started"""
+		download_info = {'guid': guid, 'url': url, 'suggested_filename': suggested_filename, 'auto_download': True}
+		for callback in self._download_start_callbacks:
+			try:
+				callback(download_info)
+			except Exception as e:
+				self.logger.debug(f'[DownloadsWatchdog] Error in download start callback: {e}')
+		self.event_bus.dispatch(DownloadStartedEvent(guid=guid, url=url, suggested_filename=suggested_filename, auto_download=True))
 
-					# Store URL->path mapping for this session
-					self._session_pdf_urls[url] = download_path
+	def _notify_download_progress(
+		self, guid: str, received_bytes: int, total_bytes: int, state: str, auto_download: bool = False
+	) -> None:
+		"""Tell direct callbacks (first, for click handlers tracking progress) and the event bus about download progress"""
+		progress_info = {
+			'guid': guid,
+			'received_bytes': received_bytes,
+			'total_bytes': total_bytes,
+			'state': state,
+			'auto_download': auto_download,
+		}
+		for callback in self._download_progress_callbacks:
+			try:
+				callback(progress_info)
+			except Exception as e:
+				self.logger.debug(f'[DownloadsWatchdog] Error in download progress callback: {e}')
 
-					# Emit file downloaded event
-					self.logger.debug(f'[DownloadsWatchdog] Dispatching FileDownloadedEvent for {final_filename}')
-					self.event_bus.dispatch(
-						FileDownloadedEvent(
-							url=url,
-							path=download_path,
-							file_name=final_filename,
-							file_size=actual_size,
-							file_type=file_ext if file_ext else None,
-							mime_type=mime_type,
-							auto_download=True,
-						)
-					)
+		# Emit progress event for all states so listeners can track progress
+		self.event_bus.dispatch(
+			DownloadProgressEvent(guid=guid, received_bytes=received_bytes, total_bytes=total_bytes, state=state)
+		)
 
-					return download_path
-				else:
-					self.logger.error(f'[DownloadsWatchdog] Failed to write file: {download_path}')
-					return None
-			else:
-				self.logger.warning(f'[DownloadsWatchdog] No data received when downloading from {url}')
-				return None
+	def _on_auto_download_complete(self, guid: str, result: DownloadResult, content_type: str | None) -> None:
+		"""Record a finished automatic download and announce it"""
+		file_ext = Path(result.file_name).suffix.lower().lstrip('.')
+		mime_type = content_type or result.mime_type or f'application/{file_ext}'
+
+		# Store URL->path mapping for this session
+		self._session_pdf_urls[result.url] = result.path
+
+		complete_info = {
+			'guid': guid,
+			'url': result.url,
+			'path': result.path,
+			'file_name': result.file_name,
+			'file_size': result.file_size,
+			'file_type': file_ext if file_ext else None,
+			'mime_type': mime_type,
+			'auto_download': True,
+		}
+		for callback in self._download_complete_callbacks:
+			try:
+				callback(complete_info)
+			except Exception as e:
+				self.logger.debug(f'[DownloadsWatchdog] Error in download complete callback: {e}')
 
-		except TimeoutError:
-			self.logger.warning(f'[DownloadsWatchdog] Download timed out: {url[:80]}...')
-			return None
-		except Exception as e:
-			self.logger.warning(f'[DownloadsWatchdog] Download failed: {type(e).__name__}: {e}')
-			return None
+		# Emit file downloaded event
+		self.logger.debug(f'[DownloadsWatchdog] Dispatching FileDownloadedEvent for {result.file_name}')
+		self.event_bus.dispatch(
+			FileDownloadedEvent(
+				guid=guid,
+				url=result.url,
+				path=result.path,
+				file_name=result.file_name,
+				file_size=result.file_size,
+				file_type=file_ext if file_ext else None,
+				mime_type=mime_type,
+				from_cache=result.deduplicated,
+				auto_download=True,
+			)
+		)
 
 	def _track_download(self, file_path: str, guid: str | None = None) -> None:
 		"""Track a completed download and dispatch the appropriate event.
@@ -1417,13 +1488,7 @@ class DownloadsWatchdog(BaseWatchdog):
 	@staticmethod
 	async def _get_unique_filename(directory: str, filename: str) -> str:
 		"""Generate a unique filename for downloads by appending (1), (2), etc., if a file already exists."""
-		base, ext = os.path.splitext(filename)
-		counter = 1
-		new_filename = filename
-		while os.path.exists(os.path.join(directory, new_filename)):
-			new_filename = f'{base} ({counter}){ext}'
-			counter += 1
-		return new_filename
+		return unique_filename(directory, filename)
 
 
 # Fix Pydantic circular dependency - this will be called from session.py after BrowserSession is defined
@@ -35,7 +35,7 @@ class PermissionsWatchdog(BaseWatchdog):
 			# origin=None means grant to all origins
 			# Browser domain commands don't use session_id
 			await self.browser_session.cdp_client.send.Browser.grantPermissions(
-				params={'permissions': permissions}  # type: ignore
+				params=self.browser_session._in_browser_context({'permissions': permissions})  # type: ignore
 			)
 			self.logger.debug(f'✅ Successfully granted permissions: {permissions}')
 		except Exception as e:
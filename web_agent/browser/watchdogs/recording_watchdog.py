@@ -2,7 +2,7 @@
 
 import asyncio
 from pathlib import Path
-from typing import Any, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from bubus import BaseEvent
 from cdp_use.cdp.page.events import ScreencastFrameEvent
@@ -11,10 +11,12 @@ from uuid_extensions import uuid7str
 
 from web_agent.browser.events import AgentFocusChangedEvent, BrowserConnectedEvent, BrowserStopEvent
 from web_agent.browser.profile import ViewportSize
-from web_agent.browser.video_recorder import VideoRecorderService
 from web_agent.browser.watchdog_base import BaseWatchdog
 from web_agent.utils import create_task_with_error_handling
 
+if TYPE_CHECKING:
+	from web_agent.browser.video_recorder import VideoRecorderService
+
 
 class RecordingWatchdog(BaseWatchdog):
 	"""
@@ -24,7 +26,7 @@ class RecordingWatchdog(BaseWatchdog):
 	LISTENS_TO: ClassVar[list[type[BaseEvent]]] = [BrowserConnectedEvent, BrowserStopEvent, AgentFocusChangedEvent]
 	EMITS: ClassVar[list[type[BaseEvent]]] = []
 
-	_recorder: VideoRecorderService | None = PrivateAttr(default=None)
+	_recorder: 'VideoRecorderService | None' = PrivateAttr(default=None)
 	_current_session_id: str | None = PrivateAttr(default=None)
 	_screencast_params: dict[str, Any] | None = PrivateAttr(default=None)
 
@@ -49,6 +51,9 @@ class RecordingWatchdog(BaseWatchdog):
 		video_format = getattr(profile, 'record_video_format', 'mp4').strip('.')
 		output_path = Path(profile.record_video_dir) / f'{uuid7str()}.{video_format}'
 
+		# Imported only when recording is configured, it pulls in imageio, numpy and PIL
+		from web_agent.browser.video_recorder import VideoRecorderService
+
 		self.logger.debug(f'Initializing video recorder for format: {video_format}')
 		self._recorder = VideoRecorderService(output_path=output_path, size=size, framerate=profile.record_video_framerate)
 		self._recorder.start()
@@ -209,11 +209,8 @@ class SecurityWatchdog(BaseWatchdog):
 				host_variant, host_alt = self._get_domain_variants(host)
 				return host_variant in allowed_domains or host_alt in allowed_domains
 			else:
-				# Slow path: O(n) pattern matching for lists
-				for pattern in allowed_domains:
-					if self._is_url_match(url, host, parsed.scheme, pattern):
-						return True
-				return False
+				# Pattern lists: compiled once per distinct list (suffix trie + precompiled globs)
+				return self._matches_domain_list(allowed_domains, url, host, parsed.scheme)
 
 		# Check prohibited domains (fast path for sets, slow path for lists with patterns)
 		if self.browser_session.browser_profile.prohibited_domains:
@@ -224,16 +221,25 @@ class SecurityWatchdog(BaseWatchdog):
 				host_variant, host_alt = self._get_domain_variants(host)
 				return host_variant not in prohibited_domains and host_alt not in prohibited_domains
 			else:
-				# Slow path: O(n) pattern matching for lists
-				for pattern in prohibited_domains:
-					if self._is_url_match(url, host, parsed.scheme, pattern):
-						return False
-				return True
+				# Pattern lists: compiled once per distinct list (suffix trie + precompiled globs)
+				return not self._matches_domain_list(prohibited_domains, url, host, parsed.scheme)
 
 		return True
 
+	def _matches_domain_list(self, patterns: list[str], url: str, host: str, scheme: str) -> bool:
+		"""Check if a URL matches any pattern in the list, same rules as _is_url_match."""
+		from web_agent.domain_matcher import get_url_policy_matcher
+
+		matcher = get_url_policy_matcher(patterns)
+		if matcher.has_globs:
+			self._log_glob_warning()
+		return matcher.matches(url, host, scheme)
+
 	def _is_url_match(self, url: str, host: str, scheme: str, pattern: str) -> bool:
-		"""Check if a URL matches a pattern."""
+		"""Check if a URL matches a pattern.
+
+		Reference rules for a single pattern; list lookups use the equivalent compiled UrlPolicyMatcher.
+		"""
 
 		# Full URL for matching (scheme + host)
 		full_url_pattern = f'{scheme}://{host}'
@@ -11,6 +11,20 @@ if '--mcp' in sys.argv:
 	os.environ['web_agent_SETUP_LOGGING'] = 'false'
 	logging.disable(logging.CRITICAL)
 
+# Enable phase timing before anything heavy is imported so the import phase is measured too
+if '--profile-startup' in sys.argv:
+	import os
+
+	os.environ['web_agent_PROFILE_STARTUP'] = 'true'
+
+# Daemon mode: hand the task to a warm background process instead of importing the agent stack here
+if '--daemon' in sys.argv or '--daemon-stop' in sys.argv:
+	from web_agent.skill_cli.daemon import run_cli as run_daemon_cli
+
+	daemon_exit_code = run_daemon_cli(sys.argv[1:])
+	if daemon_exit_code is not None:
+		sys.exit(daemon_exit_code)
+
 # Special case: install command doesn't need CLI dependencies
 if len(sys.argv) > 1 and sys.argv[1] == 'install':
 	import platform
@@ -148,16 +162,13 @@ from typing import Any
 
 from dotenv import load_dotenv
 
-from web_agent.llm.anthropic.chat import ChatAnthropic
-from web_agent.llm.google.chat import ChatGoogle
-from web_agent.llm.openai.chat import ChatOpenAI
-
 load_dotenv()
 
 from web_agent import Agent, Controller
 from web_agent.agent.views import AgentSettings
 from web_agent.browser import BrowserProfile, BrowserSession
 from web_agent.logging_config import addLoggingLevel
+from web_agent.startup_profiler import startup_profiler
 from web_agent.telemetry import CLITelemetryEvent, ProductTelemetry
 from web_agent.utils import get_web_agent_version
 
@@ -188,6 +199,8 @@ os.environ['web_agent_LOGGING_LEVEL'] = 'result'
 
 from web_agent.config import CONFIG
 
+startup_profiler.mark('cli imports done')
+
 # Set USER_DATA_DIR now that CONFIG is imported
 USER_DATA_DIR = CONFIG.web_agent_PROFILES_DIR / 'cli'
 
@@ -363,16 +376,22 @@ def get_llm(config: dict[str, Any]):
 			if not api_key and not CONFIG.OPENAI_API_KEY:
 				print('⚠️  OpenAI API key not found. Please update your config or set OPENAI_API_KEY environment variable.')
 				sys.exit(1)
+			from web_agent.llm.openai.chat import ChatOpenAI
+
 			return ChatOpenAI(model=model_name, temperature=temperature, api_key=api_key or CONFIG.OPENAI_API_KEY)
 		elif model_name.startswith('claude'):
 			if not CONFIG.ANTHROPIC_API_KEY:
 				print('⚠️  Anthropic API key not found. Please update your config or set ANTHROPIC_API_KEY environment variable.')
 				sys.exit(1)
+			from web_agent.llm.anthropic.chat import ChatAnthropic
+
 			return ChatAnthropic(model=model_name, temperature=temperature)
 		elif model_name.startswith('gemini'):
 			if not CONFIG.GOOGLE_API_KEY:
 				print('⚠️  Google API key not found. Please update your config or set GOOGLE_API_KEY environment variable.')
 				sys.exit(1)
+			from web_agent.llm.google.chat import ChatGoogle
+
 			return ChatGoogle(model=model_name, temperature=temperature)
 		elif model_name.startswith('oci'):
 			# OCI models require additional configuration
@@ -381,12 +400,18 @@ def get_llm(config: dict[str, Any]):
 			)
 			sys.exit(1)
 
-	# Auto-detect based on available API keys
+	# Auto-detect based on available API keys (provider SDKs are imported only for the model actually used)
 	if api_key or CONFIG.OPENAI_API_KEY:
+		from web_agent.llm.openai.chat import ChatOpenAI
+
 		return ChatOpenAI(model='gpt-5-mini', temperature=temperature, api_key=api_key or CONFIG.OPENAI_API_KEY)
 	elif CONFIG.ANTHROPIC_API_KEY:
+		from web_agent.llm.anthropic.chat import ChatAnthropic
+
 		return ChatAnthropic(model='claude-4-sonnet', temperature=temperature)
 	elif CONFIG.GOOGLE_API_KEY:
+		from web_agent.llm.google.chat import ChatGoogle
+
 		return ChatGoogle(model='gemini-2.5-pro', temperature=temperature)
 	else:
 		print(
@@ -1502,11 +1527,13 @@ async def run_prompt_mode(prompt: str, ctx: click.Context, debug: bool = False):
 
 	try:
 		# Load config
-		config = load_user_config()
-		config = update_config_with_click_args(config, ctx)
+		with startup_profiler.phase('load config'):
+			config = load_user_config()
+			config = update_config_with_click_args(config, ctx)
 
 		# Get LLM
-		llm = get_llm(config)
+		with startup_profiler.phase('llm setup'):
+			llm = get_llm(config)
 
 		# Capture telemetry for CLI start in oneshot mode
 		telemetry.capture(
@@ -1533,15 +1560,19 @@ async def run_prompt_mode(prompt: str, ctx: click.Context, debug: bool = False):
 		)
 
 		# Create and run agent
-		agent = Agent(
-			task=prompt,
-			llm=llm,
-			browser_session=browser_session,
-			source='cli',
-			**agent_settings.model_dump(),
-		)
+		with startup_profiler.phase('agent init'):
+			agent = Agent(
+				task=prompt,
+				llm=llm,
+				browser_session=browser_session,
+				source='cli',
+				**agent_settings.model_dump(),
+			)
 
-		await agent.run()
+		if ctx.params.get('max_steps'):
+			await agent.run(max_steps=ctx.params['max_steps'])
+		else:
+			await agent.run()
 
 		# Ensure the browser session is fully stopped
 		# The agent's close() method only kills the browser if keep_alive=False,
@@ -1809,6 +1840,7 @@ async def run_auth_command():
 			},
 		)
 		await sync_service.handle_event(session_event)
+		await sync_service.flush()  # Events are uploaded in the background
 
 		# Brief delay to ensure session is created in backend before sending task
 		await asyncio.sleep(0.5)
@@ -1827,6 +1859,7 @@ async def run_auth_command():
 			gif_url=None,
 		)
 		await sync_service.handle_event(task_event)
+		await sync_service.flush()
 
 		# Longer delay to ensure task is created in backend before sending step event
 		await asyncio.sleep(1.0)
@@ -1927,6 +1960,7 @@ async def run_auth_command():
 			)
 			print('📤 Sending dummy step event...')
 			await sync_service.handle_event(step_event)
+			await sync_service.flush()
 
 			# Small delay to ensure step is processed before completion
 			await asyncio.sleep(0.5)
@@ -1942,6 +1976,7 @@ async def run_auth_command():
 				gif_url=None,
 			)
 			await sync_service.handle_event(completion_event)
+			await sync_service.close()
 
 			print('🎉 Authentication successful!')
 			print('   Future web-agent runs will now sync to the cloud.')
@@ -1957,6 +1992,7 @@ async def run_auth_command():
 				gif_url=None,
 			)
 			await sync_service.handle_event(completion_event)
+			await sync_service.close()
 
 			print('❌ Authentication failed.')
 			print('   Please try again or check your internet connection.')
@@ -1978,6 +2014,7 @@ async def run_auth_command():
 					gif_url=None,
 				)
 				await sync_service.handle_event(completion_event)
+				await sync_service.close()
 			except Exception:
 				pass  # Don't fail if we can't send the error event
 		sys.exit(1)
@@ -2007,7 +2044,11 @@ async def run_auth_command():
 @click.option('--proxy-username', type=str, help='Proxy auth username')
 @click.option('--proxy-password', type=str, help='Proxy auth password')
 @click.option('-p', '--prompt', type=str, help='Run a single task without the TUI (headless mode)')
+@click.option('--max-steps', type=int, help='With -p: maximum number of agent steps')
 @click.option('--mcp', is_flag=True, help='Run as MCP server (exposes JSON RPC via stdin/stdout)')
+@click.option('--profile-startup', is_flag=True, help='Print a per-phase breakdown of the time to the first agent step')
+@click.option('--daemon', is_flag=True, help='With -p: run the task in a warm background process (started on first use)')
+@click.option('--daemon-stop', is_flag=True, help='Stop the warm background process started by --daemon')
 @click.pass_context
 def main(ctx: click.Context, debug: bool = False, **kwargs):
 	"""web agent - AI Agent for Web Automation
@@ -0,0 +1,109 @@
+"""Cell execution for the code-use agent.
+
+Cells are compiled with top-level await allowed, so code runs directly against the
+namespace (no source rewriting) and awaits work like in IPython. Compiled code objects
+are cached by source hash and shared by every CodeAgent in the process, and stdout is
+captured through a context-local stream so concurrent agents never see each other's prints.
+"""
+
+import ast
+import hashlib
+import inspect
+import io
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import CodeType
+from typing import Any, TextIO
+
+CELL_FILENAME = '<code>'
+COMPILE_FLAGS = ast.PyCF_ALLOW_TOP_LEVEL_AWAIT
+MAX_CACHED_CELLS = 512
+
+_compiled_cells: OrderedDict[str, CodeType] = OrderedDict()
+_compiled_cells_lock = threading.Lock()
+
+_cell_output: ContextVar[io.StringIO | None] = ContextVar('web_agent_cell_output', default=None)
+
+
+def compile_cell(source: str) -> CodeType:
+	"""Compile a cell (top-level await allowed), reusing the code object for identical source"""
+	key = hashlib.sha256(source.encode()).hexdigest()
+	with _compiled_cells_lock:
+		code = _compiled_cells.get(key)
+		if code is not None:
+			_compiled_cells.move_to_end(key)
+			return code
+
+	# SyntaxErrors propagate and are not cached
+	code = compile(source, CELL_FILENAME, 'exec', flags=COMPILE_FLAGS, dont_inherit=True)
+	with _compiled_cells_lock:
+		_compiled_cells[key] = code
+		while len(_compiled_cells) > MAX_CACHED_CELLS:
+			_compiled_cells.popitem(last=False)
+	return code
+
+
+def clear_compile_cache() -> None:
+	with _compiled_cells_lock:
+		_compiled_cells.clear()
+
+
+class _ContextLocalStdout(io.TextIOBase):
+	"""sys.stdout replacement that writes to the current cell's buffer, or to the real stream outside cells"""
+
+	def __init__(self, fallback: TextIO):
+		self._fallback = fallback
+
+	def write(self, s: str) -> int:
+		buffer = _cell_output.get()
+		if buffer is not None:
+			return buffer.write(s)
+		return self._fallback.write(s)
+
+	def flush(self) -> None:
+		if _cell_output.get() is None:
+			self._fallback.flush()
+
+	def writable(self) -> bool:
+		return True
+
+	def isatty(self) -> bool:
+		return _cell_output.get() is None and self._fallback.isatty()
+
+	@property
+	def encoding(self) -> str:  # type: ignore[override]
+		return getattr(self._fallback, 'encoding', 'utf-8')
+
+	def fileno(self) -> int:
+		return self._fallback.fileno()
+
+
+def _install_stdout_router() -> None:
+	# Re-check every time: test harnesses and other tools may have swapped sys.stdout since
+	if not isinstance(sys.stdout, _ContextLocalStdout):
+		sys.stdout = _ContextLocalStdout(sys.stdout)
+
+
+@contextmanager
+def capture_cell_output() -> Iterator[io.StringIO]:
+	"""Collect everything printed in the current context (and tasks it spawns) into a fresh buffer"""
+	_install_stdout_router()
+	buffer = io.StringIO()
+	token = _cell_output.set(buffer)
+	try:
+		yield buffer
+	finally:
+		_cell_output.reset(token)
+
+
+async def run_cell(source: str, namespace: dict[str, Any]) -> Any:
+	"""Run a cell with the namespace as its globals, awaiting it if it uses top-level await"""
+	code = compile_cell(source)
+	result = eval(code, namespace)
+	if inspect.iscoroutine(result):
+		result = await result
+	return result
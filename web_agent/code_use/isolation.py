@@ -0,0 +1,630 @@
+"""Process-isolated execution backend for code-use namespaces.
+
+With ``CodeAgent(..., isolated_execution=True)`` each agent's namespace lives in a separate
+worker process, so a CPU-heavy cell (big CSV parsing, pandas work) never blocks CDP handling
+or other agents in the main event loop. Browser helpers (``navigate``, ``evaluate``, ``done``,
+``browser``, ...) are proxied back to the agent process over a socket pair; every proxied
+call must be awaited. Results that cannot be pickled (e.g. actor Elements) come back as
+handles whose methods are proxied the same way.
+
+After each cell the worker mirrors the user's top-level variables into the agent's
+namespace: picklable values up to ``max_sync_bytes`` are copied, anything else is mirrored
+as a ``RemoteValue`` summary. Values whose size is already known to be over the limit
+(arrays, DataFrames, long strings and containers) are summarized without pickling them.
+
+Each worker can be capped with a per-cell CPU time limit (time spent awaiting browser
+helpers does not count) and an address-space limit. A worker that dies (e.g. out of memory)
+is replaced on the next cell and its variables are lost. ``IsolatedWorkerPool`` keeps
+preforked workers warm so agents start without paying interpreter and import startup.
+
+This contains resource usage; it is not a security sandbox. POSIX only.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import itertools
+import logging
+import os
+import pickle
+import reprlib
+import socket
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from types import ModuleType
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SYNC_BYTES = 1_000_000
+_SIZE_CHECK_MAX_OBJECTS = 10_000  # Objects _exceeds_size() looks at before leaving the decision to pickle
+
+# Added to the task of agents with isolated execution, where helpers that are normally synchronous become awaitable
+ISOLATED_EXECUTION_PROMPT = (
+	'Your code runs in an isolated worker process: every helper (navigate, evaluate, done, file_system methods, ...) '
+	'is proxied to the agent process and returns an awaitable, even ones that are normally synchronous. '
+	'Always await helper calls and methods of objects they return, e.g. `files = await file_system.list_files()`.'
+)
+
+
+class IsolatedWorkerError(RuntimeError):
+	"""The isolated worker process exited while running a cell"""
+
+
+class CellCPULimitExceeded(TimeoutError):
+	"""The cell used more CPU time than the worker's per-cell limit"""
+
+
+@dataclass
+class RemoteValue:
+	"""Summary of a worker-side variable that was too large or not picklable to mirror"""
+
+	type_name: str
+	length: int | None
+	preview: str
+
+	def __repr__(self) -> str:
+		size = f', len={self.length}' if self.length is not None else ''
+		return f'<{self.type_name}{size} in isolated worker: {self.preview}>'
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+
+class _RemoteRef:
+	"""Worker-side stand-in for a helper, object or handle that lives in the agent process"""
+
+	__slots__ = ('_root', '_attrs')
+
+	def __init__(self, root: str | int, attrs: tuple[str, ...] = ()):
+		self._root = root
+		self._attrs = attrs
+
+	def __getattr__(self, name: str) -> '_RemoteRef':
+		if name.startswith('_'):
+			raise AttributeError(name)
+		return _RemoteRef(self._root, (*self._attrs, name))
+
+	def __call__(self, *args: Any, **kwargs: Any) -> Any:
+		assert _worker is not None, 'remote helpers can only be called inside an isolated worker'
+		return _worker.call(self._root, self._attrs, args, kwargs)
+
+	def __reduce__(self):
+		return (_RemoteRef, (self._root, self._attrs))
+
+	def __repr__(self) -> str:
+		root = self._root if isinstance(self._root, str) else f'<handle {self._root}>'
+		return '.'.join([str(root), *self._attrs])
+
+
+def _portable_exception(e: BaseException) -> BaseException:
+	try:
+		pickle.loads(pickle.dumps(e))
+		return e
+	except Exception:
+		return RuntimeError(f'{type(e).__name__}: {e}')
+
+
+def _summarize(value: Any) -> RemoteValue:
+	try:
+		length = len(value)
+	except Exception:
+		length = None
+	try:
+		preview = reprlib.repr(value)[:100]  # Bounded, unlike repr() of a large container
+	except Exception:
+		preview = '<unrepresentable>'
+	return RemoteValue(type(value).__name__, length, preview)
+
+
+def _exceeds_size(value: Any, limit: int) -> bool:
+	"""Whether value is known to pickle to more than limit bytes, decided without pickling it.
+
+	Counts a lower bound (buffer sizes, string lengths, one byte per container item) over at most
+	_SIZE_CHECK_MAX_OBJECTS objects; values it lets through are still measured after pickling.
+	"""
+	total = 0
+	stack = [value]
+	budget = _SIZE_CHECK_MAX_OBJECTS
+	while stack and budget > 0:
+		item = stack.pop()
+		budget -= 1
+		if isinstance(item, (str, bytes, bytearray)):
+			total += len(item)
+		elif isinstance(item, dict):
+			total += len(item)
+			for key, child in itertools.islice(item.items(), budget):
+				stack.append(key)
+				stack.append(child)
+		elif isinstance(item, (list, tuple, set, frozenset)):
+			total += len(item)
+			stack.extend(itertools.islice(item, budget))
+		elif hasattr(type(item), 'nbytes') or hasattr(type(item), 'memory_usage'):
+			try:
+				# numpy arrays, pandas Series and memoryviews have nbytes, pandas DataFrames memory_usage()
+				size = item.nbytes if hasattr(type(item), 'nbytes') else item.memory_usage(deep=False).sum()
+				total += int(size)
+			except Exception:
+				pass
+		if total > limit:
+			return True
+	return False
+
+
+class _Worker:
+	def __init__(self, conn: Connection, cpu_limit_seconds: float | None, max_sync_bytes: int):
+		self._conn = conn
+		self._cpu_limit_seconds = cpu_limit_seconds
+		self._max_sync_bytes = max_sync_bytes
+		self._loop: asyncio.AbstractEventLoop | None = None
+		self._inbox: asyncio.Queue[tuple] = asyncio.Queue()
+		self._pending: dict[int, asyncio.Future[Any]] = {}
+		self._call_ids = itertools.count()
+		self._digests: dict[str, bytes] = {}
+		self._synced: set[str] = set()
+
+		from web_agent.code_use.namespace import create_data_namespace
+
+		self.namespace: dict[str, Any] = create_data_namespace()
+		self._base_names = set(self.namespace)
+
+	def call(self, root: str | int, attrs: tuple[str, ...], args: tuple, kwargs: dict) -> asyncio.Future[Any]:
+		assert self._loop is not None
+		call_id = next(self._call_ids)
+		future = self._loop.create_future()
+		self._pending[call_id] = future
+		self._conn.send(('call', call_id, root, attrs, args, kwargs))
+		return future
+
+	def _read_loop(self) -> None:
+		assert self._loop is not None
+		while True:
+			try:
+				message = self._conn.recv()
+			except (EOFError, OSError):
+				message = ('stop',)
+			self._loop.call_soon_threadsafe(self._dispatch, message)
+			if message[0] == 'stop':
+				return
+
+	def _dispatch(self, message: tuple) -> None:
+		if message[0] != 'result':
+			self._inbox.put_nowait(message)
+			return
+		_, call_id, ok, payload = message
+		future = self._pending.pop(call_id, None)
+		if future is None or future.done():
+			return
+		if ok:
+			future.set_result(payload)
+		else:
+			future.set_exception(payload)
+
+	def _bind(self, names: list[str]) -> None:
+		for name in names:
+			self.namespace[name] = _RemoteRef(name)
+			self._base_names.add(name)
+
+	async def _run_cell(self, source: str, pushed: dict[str, Any]) -> tuple[bool, str, Any]:
+		from web_agent.code_use.executor import capture_cell_output, run_cell
+
+		self.namespace.update(pushed)
+		with capture_cell_output() as captured:
+			_start_cpu_budget(self._cpu_limit_seconds)
+			try:
+				await run_cell(source, self.namespace)
+				return True, captured.getvalue(), None
+			except BaseException as e:
+				if isinstance(e, (KeyboardInterrupt, SystemExit)):
+					raise
+				return False, captured.getvalue(), _portable_exception(e)
+			finally:
+				_clear_cpu_budget()
+
+	def _sync_variables(self) -> tuple[dict[str, bytes | RemoteValue], list[str]]:
+		updated: dict[str, bytes | RemoteValue] = {}
+		seen: set[str] = set()
+		for name, value in list(self.namespace.items()):
+			if name.startswith('_') or name in self._base_names or isinstance(value, ModuleType):
+				continue
+			if isinstance(value, _RemoteRef) and not isinstance(value._root, int):
+				continue  # A helper (or attribute of one) under another name
+			seen.add(name)
+			data = None
+			if not _exceeds_size(value, self._max_sync_bytes):
+				try:
+					data = pickle.dumps(value)
+				except Exception:
+					pass
+			if data is not None and len(data) <= self._max_sync_bytes:
+				digest = hashlib.blake2b(data, digest_size=16).digest()
+				if self._digests.get(name) != digest:
+					self._digests[name] = digest
+					updated[name] = data
+			else:
+				# Always refresh summaries, their contents may have changed in place
+				self._digests.pop(name, None)
+				updated[name] = _summarize(value)
+
+		removed = [name for name in self._synced if name not in seen]
+		for name in removed:
+			self._digests.pop(name, None)
+		self._synced = seen
+		return updated, removed
+
+	async def serve(self) -> None:
+		self._loop = asyncio.get_running_loop()
+		threading.Thread(target=self._read_loop, name='isolated-worker-reader', daemon=True).start()
+		self._conn.send(('ready', os.getpid()))
+
+		while True:
+			message = await self._inbox.get()
+			kind = message[0]
+			if kind == 'stop':
+				return
+			if kind == 'bind':
+				self._bind(message[1])
+			elif kind == 'exec':
+				_, cell_id, source, pushed = message
+				ok, output, error = await self._run_cell(source, pushed)
+				updated, removed = self._sync_variables()
+				self._conn.send(('done', cell_id, ok, output, error, updated, removed))
+
+
+_worker: _Worker | None = None
+
+
+def _start_cpu_budget(seconds: float | None) -> None:
+	if seconds is None:
+		return
+	import resource
+
+	usage = resource.getrusage(resource.RUSAGE_SELF)
+	soft = int(usage.ru_utime + usage.ru_stime + seconds) + 1
+	resource.setrlimit(resource.RLIMIT_CPU, (soft, resource.RLIM_INFINITY))
+
+
+def _clear_cpu_budget() -> None:
+	import resource
+
+	resource.setrlimit(resource.RLIMIT_CPU, (resource.RLIM_INFINITY, resource.RLIM_INFINITY))
+
+
+def _on_cpu_limit(signum, frame) -> None:
+	_clear_cpu_budget()
+	raise CellCPULimitExceeded('Cell exceeded the CPU time limit of the isolated worker')
+
+
+def worker_main() -> None:
+	"""Entry point of a worker process: ``worker_main <fd> <cpu_limit_seconds|-> <memory_limit_mb|-> <max_sync_bytes>``"""
+	global _worker
+	import resource
+	import signal
+
+	fd, cpu_limit, memory_limit_mb, max_sync_bytes = sys.argv[1:5]
+	if memory_limit_mb != '-':
+		limit = int(memory_limit_mb) * 1024 * 1024
+		resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+	signal.signal(signal.SIGXCPU, _on_cpu_limit)
+	signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C belongs to the agent process
+
+	conn = Connection(int(fd))
+	_worker = _Worker(conn, None if cpu_limit == '-' else float(cpu_limit), int(max_sync_bytes))
+	asyncio.run(_worker.serve())
+
+
+# ---------------------------------------------------------------------------
+# Agent side
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _WorkerProcess:
+	process: subprocess.Popen
+	conn: Connection
+
+	def terminate(self) -> None:
+		try:
+			self.conn.send(('stop',))
+		except Exception:
+			pass
+		self.conn.close()
+		try:
+			self.process.wait(timeout=2)
+		except subprocess.TimeoutExpired:
+			self.process.kill()
+
+
+class IsolatedExecutor:
+	"""Runs one CodeAgent's cells in a worker process, serving its browser helper calls"""
+
+	def __init__(self, pool: 'IsolatedWorkerPool', worker: _WorkerProcess):
+		self._pool = pool
+		self._worker: _WorkerProcess | None = worker
+		self._ready = False
+		self._bound: set[str] = set()
+		self._mirrored: set[str] = set()
+		self._handles: dict[int, Any] = {}
+		self._handle_ids = itertools.count(1)
+		self._cell_ids = itertools.count()
+		self._inbox: asyncio.Queue[tuple] | None = None
+
+	@property
+	def pid(self) -> int | None:
+		return self._worker.process.pid if self._worker else None
+
+	def _start_reader(self, worker: _WorkerProcess) -> None:
+		loop = asyncio.get_running_loop()
+		inbox: asyncio.Queue[tuple] = asyncio.Queue()
+		self._inbox = inbox
+
+		def read() -> None:
+			while True:
+				try:
+					message = worker.conn.recv()
+				except (EOFError, OSError):
+					message = ('exit',)
+				try:
+					loop.call_soon_threadsafe(inbox.put_nowait, message)
+				except RuntimeError:
+					return  # Loop already closed
+				if message[0] == 'exit':
+					return
+
+		threading.Thread(target=read, name='isolated-executor-reader', daemon=True).start()
+
+	async def _next_message(self) -> tuple:
+		assert self._inbox is not None
+		return await self._inbox.get()
+
+	async def _ensure_worker(self, namespace: dict[str, Any]) -> _WorkerProcess:
+		if self._worker is None:
+			self._worker = await self._pool._take()
+			self._ready = False
+			self._bound = set()
+		if not self._ready:
+			self._start_reader(self._worker)
+			message = await self._next_message()
+			if message[0] != 'ready':
+				worker, self._worker = self._worker, None
+				await asyncio.to_thread(worker.terminate)
+				raise IsolatedWorkerError(f'Isolated worker process failed to start (exit code {worker.process.returncode})')
+			self._ready = True
+
+		# Proxy the browser helpers and objects; plain data (code block strings, mirrored variables) is copied instead
+		skip = self._pool.base_names | self._mirrored | set(namespace.get('_code_block_vars', ()))
+		new_helpers = [name for name in namespace if not name.startswith('_') and name not in skip and name not in self._bound]
+		if new_helpers:
+			self._worker.conn.send(('bind', new_helpers))
+			self._bound.update(new_helpers)
+		return self._worker
+
+	async def run_cell(self, source: str, namespace: dict[str, Any]) -> None:
+		"""Run a cell in the worker; its output is written to the current sys.stdout and errors are re-raised"""
+		worker = await self._ensure_worker(namespace)
+		pushed = {name: namespace[name] for name in namespace.get('_code_block_vars', ()) if name in namespace}
+		cell_id = next(self._cell_ids)
+		worker.conn.send(('exec', cell_id, source, pushed))
+
+		calls: set[asyncio.Task] = set()
+		while True:
+			message = await self._next_message()
+			kind = message[0]
+			if kind == 'call':
+				# Tasks inherit this context, so prints from helpers land in the cell's captured output
+				task = asyncio.create_task(self._serve_call(worker, namespace, *message[1:]))
+				calls.add(task)
+				task.add_done_callback(calls.discard)
+			elif kind == 'done':
+				_, _, ok, output, error, updated, removed = message
+				break
+			elif kind == 'exit':
+				for task in calls:
+					task.cancel()
+				await self._handle_crash(worker, namespace)
+
+		self._apply_variables(namespace, updated, removed)
+		if output:
+			sys.stdout.write(output)
+		if not ok:
+			raise error
+
+	async def _handle_crash(self, worker: _WorkerProcess, namespace: dict[str, Any]) -> None:
+		returncode = worker.process.poll()
+		if returncode is None:
+			await asyncio.to_thread(worker.process.wait)
+			returncode = worker.process.returncode
+		worker.terminate()
+		self._worker = None
+		self._handles.clear()
+		for name in self._mirrored:
+			namespace.pop(name, None)
+		self._mirrored.clear()
+		raise IsolatedWorkerError(
+			f'Isolated worker exited with code {returncode} (likely over its memory limit); '
+			'its variables were lost and the next cell starts in a fresh worker'
+		)
+
+	def _apply_variables(self, namespace: dict[str, Any], updated: dict[str, bytes | RemoteValue], removed: list[str]) -> None:
+		for name, value in updated.items():
+			if isinstance(value, bytes):
+				try:
+					value = pickle.loads(value)
+				except Exception as e:
+					# e.g. instances of classes defined inside a cell
+					value = RemoteValue('unknown', None, f'could not be loaded in the agent process: {type(e).__name__}')
+			if isinstance(value, _RemoteRef):
+				value = self._resolve(value, namespace)  # Handle to an object that lives here anyway
+			namespace[name] = value
+			self._mirrored.add(name)
+		for name in removed:
+			if name in self._mirrored:
+				namespace.pop(name, None)
+				self._mirrored.discard(name)
+
+	def _resolve(self, value: Any, namespace: dict[str, Any]) -> Any:
+		"""Turn references sent by the worker back into the agent-side objects they stand for"""
+		if isinstance(value, _RemoteRef):
+			target = self._handles[value._root] if isinstance(value._root, int) else namespace[value._root]
+			for attr in value._attrs:
+				target = getattr(target, attr)
+			return target
+		if isinstance(value, list):
+			return [self._resolve(item, namespace) for item in value]
+		if isinstance(value, tuple):
+			return tuple(self._resolve(item, namespace) for item in value)
+		if isinstance(value, dict):
+			return {key: self._resolve(item, namespace) for key, item in value.items()}
+		return value
+
+	def _to_wire(self, value: Any) -> Any:
+		"""Replace whatever cannot be pickled with handles the worker can call methods on"""
+		if isinstance(value, (list, tuple)):
+			items = [self._to_wire(item) for item in value]
+			return items if isinstance(value, list) else tuple(items)
+		if isinstance(value, dict):
+			return {key: self._to_wire(item) for key, item in value.items()}
+		try:
+			pickle.dumps(value)
+			return value
+		except Exception:
+			handle_id = next(self._handle_ids)
+			self._handles[handle_id] = value
+			return _RemoteRef(handle_id)
+
+	async def _serve_call(
+		self, worker: _WorkerProcess, namespace: dict[str, Any], call_id: int, root: str | int, attrs: tuple, args: tuple, kwargs: dict
+	) -> None:
+		try:
+			function = self._resolve(_RemoteRef(root, attrs), namespace)
+			result = function(*self._resolve(args, namespace), **self._resolve(kwargs, namespace))
+			if inspect.isawaitable(result):
+				result = await result
+			reply = ('result', call_id, True, result)
+			try:
+				worker.conn.send(reply)
+			except Exception:
+				worker.conn.send(('result', call_id, True, self._to_wire(result)))
+		except asyncio.CancelledError:
+			raise
+		except Exception as e:
+			try:
+				worker.conn.send(('result', call_id, False, _portable_exception(e)))
+			except Exception:
+				pass  # Worker is gone; run_cell reports it
+
+	async def close(self) -> None:
+		"""Stop the worker; it is not returned to the pool since its namespace is dirty"""
+		worker, self._worker = self._worker, None
+		self._handles.clear()
+		if worker is not None:
+			await asyncio.to_thread(worker.terminate)
+
+
+class IsolatedWorkerPool:
+	"""Keeps preforked worker processes warm for isolated CodeAgent namespaces.
+
+	Args:
+		size: Number of idle workers kept ready
+		cpu_limit_seconds: CPU time allowed per cell (None for no limit)
+		memory_limit_mb: Address-space limit for each worker (None for no limit)
+		max_sync_bytes: Largest pickled variable mirrored back into the agent's namespace
+	"""
+
+	def __init__(
+		self,
+		size: int = 2,
+		cpu_limit_seconds: float | None = 60,
+		memory_limit_mb: int | None = None,
+		max_sync_bytes: int = DEFAULT_MAX_SYNC_BYTES,
+	):
+		if os.name != 'posix':
+			raise RuntimeError('Isolated code execution is only supported on POSIX systems')
+		self.size = size
+		self.cpu_limit_seconds = cpu_limit_seconds
+		self.memory_limit_mb = memory_limit_mb
+		self.max_sync_bytes = max_sync_bytes
+		self._idle: list[_WorkerProcess] = []
+		self._base_names: frozenset[str] | None = None
+		self._refill_lock = threading.Lock()
+		self._closed = False
+
+	@property
+	def base_names(self) -> frozenset[str]:
+		"""Names the worker provides itself, so they are never proxied"""
+		if self._base_names is None:
+			from web_agent.code_use.namespace import create_data_namespace
+
+			self._base_names = frozenset(create_data_namespace())
+		return self._base_names
+
+	def _spawn(self) -> _WorkerProcess:
+		parent_sock, child_sock = socket.socketpair()
+		args = [
+			str(child_sock.fileno()),
+			'-' if self.cpu_limit_seconds is None else str(self.cpu_limit_seconds),
+			'-' if self.memory_limit_mb is None else str(self.memory_limit_mb),
+			str(self.max_sync_bytes),
+		]
+		env = {**os.environ, 'PYTHONPATH': os.pathsep.join(path for path in sys.path if path)}
+		process = subprocess.Popen(
+			[sys.executable, '-c', 'from web_agent.code_use.isolation import worker_main; worker_main()', *args],
+			pass_fds=(child_sock.fileno(),),
+			env=env,
+			stdin=subprocess.DEVNULL,
+		)
+		child_sock.close()
+		return _WorkerProcess(process=process, conn=Connection(parent_sock.detach()))
+
+	async def start(self) -> None:
+		"""Prefork workers up to the pool size"""
+		missing = self.size - len(self._idle)
+		if missing > 0:
+			spawned = await asyncio.gather(*(asyncio.to_thread(self._spawn) for _ in range(missing)))
+			self._idle.extend(spawned)
+
+	async def _take(self) -> _WorkerProcess:
+		while self._idle:
+			worker = self._idle.pop(0)
+			if worker.process.poll() is None:
+				break
+			worker.conn.close()
+		else:
+			worker = await asyncio.to_thread(self._spawn)
+		# Refill in the background so the next agent also gets a warm worker
+		asyncio.get_running_loop().run_in_executor(None, self._refill)
+		return worker
+
+	def _refill(self) -> None:
+		with self._refill_lock:
+			while not self._closed and len(self._idle) < self.size:
+				worker = self._spawn()
+				if self._closed:
+					worker.terminate()
+					return
+				self._idle.append(worker)
+
+	async def acquire(self) -> IsolatedExecutor:
+		"""Get an executor backed by a warm worker"""
+		return IsolatedExecutor(self, await self._take())
+
+	async def close(self) -> None:
+		self._closed = True
+		idle, self._idle = self._idle, []
+		await asyncio.gather(*(asyncio.to_thread(worker.terminate) for worker in idle))
+
+
+_shared_pool: IsolatedWorkerPool | None = None
+
+
+def get_shared_worker_pool() -> IsolatedWorkerPool:
+	"""Process-wide pool used by CodeAgents created with isolated_execution=True"""
+	global _shared_pool
+	if _shared_pool is None:
+		_shared_pool = IsolatedWorkerPool()
+	return _shared_pool
@@ -253,6 +253,39 @@ async def evaluate(code: str, browser_session: BrowserSession) -> Any:
 		raise EvaluateError(f'Failed to execute JavaScript: {type(e).__name__}: {e}') from e
 
 
+def create_data_namespace() -> dict[str, Any]:
+	"""Standard library modules and the optional data libraries that are installed, without any browser helpers."""
+	namespace: dict[str, Any] = {
+		'json': json,
+		'asyncio': asyncio,
+		'Path': Path,
+		'csv': csv,
+		're': re,
+		'datetime': datetime,
+		'requests': requests,
+	}
+
+	# Add optional data science libraries if available
+	if NUMPY_AVAILABLE:
+		namespace['np'] = np
+		namespace['numpy'] = np
+	if PANDAS_AVAILABLE:
+		namespace['pd'] = pd
+		namespace['pandas'] = pd
+	if MATPLOTLIB_AVAILABLE:
+		namespace['plt'] = plt
+		namespace['matplotlib'] = plt
+	if BS4_AVAILABLE:
+		namespace['BeautifulSoup'] = BeautifulSoup
+		namespace['bs4'] = BeautifulSoup
+	if PYPDF_AVAILABLE:
+		namespace['PdfReader'] = PdfReader
+		namespace['pypdf'] = PdfReader
+	if TABULATE_AVAILABLE:
+		namespace['tabulate'] = tabulate
+	return namespace
+
+
 def create_namespace(
 	browser_session: BrowserSession,
 	tools: Tools | None = None,
@@ -296,35 +329,9 @@ def create_namespace(
 		# Core objects
 		'browser': browser_session,
 		'file_system': file_system,
-		# Standard library modules (always available)
-		'json': json,
-		'asyncio': asyncio,
-		'Path': Path,
-		'csv': csv,
-		're': re,
-		'datetime': datetime,
-		'requests': requests,
+		**create_data_namespace(),
 	}
 
-	# Add optional data science libraries if available
-	if NUMPY_AVAILABLE:
-		namespace['np'] = np
-		namespace['numpy'] = np
-	if PANDAS_AVAILABLE:
-		namespace['pd'] = pd
-		namespace['pandas'] = pd
-	if MATPLOTLIB_AVAILABLE:
-		namespace['plt'] = plt
-		namespace['matplotlib'] = plt
-	if BS4_AVAILABLE:
-		namespace['BeautifulSoup'] = BeautifulSoup
-		namespace['bs4'] = BeautifulSoup
-	if PYPDF_AVAILABLE:
-		namespace['PdfReader'] = PdfReader
-		namespace['pypdf'] = PdfReader
-	if TABULATE_AVAILABLE:
-		namespace['tabulate'] = tabulate
-
 	# Track failed evaluate() calls to detect repeated failed approaches
 	if '_evaluate_failures' not in namespace:
 		namespace['_evaluate_failures'] = []
@@ -521,6 +528,31 @@ def create_namespace(
 
 	namespace['get_selector_from_index'] = get_selector_from_index_wrapper
 
+	# Bulk element lookup for code_use mode
+	async def get_elements_wrapper(selector: str) -> list:
+		"""
+		Get all elements matching a CSS selector on the current page as Element objects.
+
+		All matches are resolved in a constant number of browser round trips, so this is
+		cheap even for hundreds of rows. Each Element supports click(), fill(text),
+		get_attribute(name), get_basic_info(), evaluate(js) and more.
+
+		Args:
+			selector: CSS selector, e.g. 'table#results tr'
+
+		Returns:
+			list[Element]: matching elements in document order
+
+		Example:
+			rows = await get_elements('table#results tbody tr')
+			print(f'Found {len(rows)} rows')
+			first_href = await rows[0].get_attribute('data-href')
+		"""
+		page = await browser_session.must_get_current_page()
+		return await page.get_elements_by_css_selector(selector)
+
+	namespace['get_elements'] = get_elements_wrapper
+
 	# Inject all tools as functions into the namespace
 	# Skip 'evaluate' since we have a custom implementation above
 	for action_name, action in tools.registry.registry.actions.items():
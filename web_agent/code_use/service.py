@@ -33,7 +33,9 @@ from web_agent.tokens.views import UsageSummary
 from web_agent.tools.service import CodeAgentTools, Tools
 from web_agent.utils import get_web_agent_version
 
+from .executor import capture_cell_output, run_cell
 from .formatting import format_browser_state_for_llm
+from .isolation import ISOLATED_EXECUTION_PROMPT, IsolatedExecutor, IsolatedWorkerPool, get_shared_worker_pool
 from .namespace import EvaluateError, create_namespace
 from .utils import detect_token_limit_issue, extract_code_blocks, extract_url_from_task, truncate_message_content
 from .views import (
@@ -79,6 +81,7 @@ class CodeAgent:
 		use_vision: bool = True,
 		calculate_cost: bool = False,
 		demo_mode: bool | None = None,
+		isolated_execution: bool | IsolatedWorkerPool = False,
 		**kwargs,
 	):
 		"""
@@ -100,6 +103,8 @@ class CodeAgent:
 			use_vision: Whether to include screenshots in LLM messages (default: True)
 			calculate_cost: Whether to calculate token costs (default: False)
 			demo_mode: Enable the in-browser demo panel for live logging (default: False)
+			isolated_execution: Run cells in a worker process from the shared (True) or given pool, so CPU-heavy
+				cells don't block the browser side (default: False)
 			llm: Optional Chatwebagent LLM instance (will create default if not provided)
 			**kwargs: Additional keyword arguments for compatibility (ignored)
 		"""
@@ -160,6 +165,10 @@ class CodeAgent:
 
 		self.session = NotebookSession()
 		self.namespace: dict[str, Any] = {}
+		if isolated_execution is True:
+			isolated_execution = get_shared_worker_pool()
+		self._isolation_pool: IsolatedWorkerPool | None = isolated_execution or None
+		self._isolated_executor: IsolatedExecutor | None = None
 		self._llm_messages: list[BaseMessage] = []  # Internal LLM conversation history
 		self.complete_history: list[CodeAgentHistory] = []  # Type-safe history with model_output and result
 		self.dom_service: DomService | None = None
@@ -241,9 +250,14 @@ class CodeAgent:
 			available_file_paths=self.available_file_paths,
 			sensitive_data=self.sensitive_data,
 		)
+		if self._isolation_pool is not None:
+			self._isolated_executor = await self._isolation_pool.acquire()
 
 		# Initialize conversation with task
-		self._llm_messages.append(UserMessage(content=f'Task: {self.task}'))
+		task_message = f'Task: {self.task}'
+		if self._isolated_executor is not None:
+			task_message += f'\n\n{ISOLATED_EXECUTION_PROMPT}'
+		self._llm_messages.append(UserMessage(content=task_message))
 
 		# Track agent run error for telemetry
 		agent_run_error: str | None = None
@@ -825,15 +839,7 @@ class CodeAgent:
 		browser_state = None
 
 		try:
-			# Capture output
-			import ast
-			import io
-			import sys
-
-			old_stdout = sys.stdout
-			sys.stdout = io.StringIO()
-
-			try:
+			with capture_cell_output() as captured:
 				# Add asyncio to namespace if not already there
 				if 'asyncio' not in self.namespace:
 					self.namespace['asyncio'] = asyncio
@@ -843,114 +849,19 @@ class CodeAgent:
 				# Store consecutive errors count for done() validation
 				self.namespace['_consecutive_errors'] = self._consecutive_errors
 
-				# Check if code contains await expressions - if so, wrap in async function
-				# This mimics how Jupyter/IPython handles top-level await
-				try:
-					tree = ast.parse(code, mode='exec')
-					has_await = any(isinstance(node, (ast.Await, ast.AsyncWith, ast.AsyncFor)) for node in ast.walk(tree))
-				except SyntaxError:
-					# If parse fails, let exec handle the error
-					has_await = False
-
-				if has_await:
-					# When code has await, we must wrap in async function
-					# To make variables persist naturally (like Jupyter without needing 'global'):
-					# 1. Extract all assigned variable names from the code
-					# 2. Inject 'global' declarations for variables that already exist in namespace
-					# 3. Extract user's explicit global declarations and pre-define those vars
-					# 4. Return locals() so we can update namespace with new variables
-
-					# Find all variable names being assigned + user's explicit globals
-					try:
-						assigned_names = set()
-						user_global_names = set()
-
-						for node in ast.walk(tree):
-							if isinstance(node, ast.Assign):
-								for target in node.targets:
-									if isinstance(target, ast.Name):
-										assigned_names.add(target.id)
-							elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
-								assigned_names.add(node.target.id)
-							elif isinstance(node, (ast.AnnAssign, ast.NamedExpr)):
-								if hasattr(node, 'target') and isinstance(node.target, ast.Name):
-									assigned_names.add(node.target.id)
-							elif isinstance(node, ast.Global):
-								# Track user's explicit global declarations
-								user_global_names.update(node.names)
-
-						# Pre-define any user-declared globals that don't exist yet
-						# This prevents NameError when user writes "global foo" before "foo = ..."
-						for name in user_global_names:
-							if name not in self.namespace:
-								self.namespace[name] = None
-
-						# Filter to only existing namespace vars (like Jupyter does)
-						# Include both: assigned vars that exist + user's explicit globals
-						existing_vars = {name for name in (assigned_names | user_global_names) if name in self.namespace}
-					except Exception as e:
-						existing_vars = set()
-
-					# Build global declaration if needed
-					global_decl = ''
-					has_global_decl = False
-					if existing_vars:
-						vars_str = ', '.join(sorted(existing_vars))
-						global_decl = f'    global {vars_str}\n'
-						has_global_decl = True
-
-					indented_code = '\n'.join('    ' + line if line.strip() else line for line in code.split('\n'))
-					wrapped_code = f"""async def __code_exec__():
-{global_decl}{indented_code}
-    # Return locals so we can update the namespace
-    return locals()
-
-__code_exec_coro__ = __code_exec__()
-"""
-					# Store whether we added a global declaration (needed for error line mapping)
-					self.namespace['_has_global_decl'] = has_global_decl
-
-					# Compile and execute wrapper at module level
-					compiled_code = compile(wrapped_code, '<code>', 'exec')
-					exec(compiled_code, self.namespace, self.namespace)
-
-					# Get and await the coroutine, then update namespace with new/modified variables
-					coro = self.namespace.get('__code_exec_coro__')
-					if coro:
-						result_locals = await coro
-						# Update namespace with all variables from the function's locals
-						# This makes variable assignments persist across cells
-						if result_locals:
-							for key, value in result_locals.items():
-								if not key.startswith('_'):
-									self.namespace[key] = value
-									# Variable info is tracked in "Available" section, no need for verbose inline output
-
-						# Clean up temporary variables
-						self.namespace.pop('__code_exec_coro__', None)
-						self.namespace.pop('__code_exec__', None)
+				if self._isolated_executor is not None:
+					# Runs in the worker process; its output is written into this cell's capture
+					await self._isolated_executor.run_cell(code, self.namespace)
 				else:
-					# No await - execute directly at module level for natural variable scoping
-					# This means x = x + 10 will work without needing 'global x'
-
-					# Track variables before execution
-					vars_before = set(self.namespace.keys())
-
-					compiled_code = compile(code, '<code>', 'exec')
-					exec(compiled_code, self.namespace, self.namespace)
-
-					# Track newly created/modified variables (info shown in "Available" section)
-					vars_after = set(self.namespace.keys())
-					new_vars = vars_after - vars_before
+					# Top-level await is compiled in directly (like IPython), so assignments land in the
+					# namespace without rewriting the cell into an async wrapper
+					await run_cell(code, self.namespace)
 
 				# Get output
-				output_value = sys.stdout.getvalue()
+				output_value = captured.getvalue()
 				if output_value:
 					output = output_value
 
-			finally:
-				sys.stdout = old_stdout
-
 			# Wait 2 seconds for page to stabilize after code execution
 			await asyncio.sleep(0.5)
 
@@ -1420,6 +1331,9 @@ __code_exec_coro__ = __code_exec__()
 
 	async def close(self) -> None:
 		"""Close the browser session."""
+		if self._isolated_executor is not None:
+			await self._isolated_executor.close()
+			self._isolated_executor = None
 		if self.browser_session:
 			# Check if we should close the browser based on keep_alive setting
 			if not self.browser_session.browser_profile.keep_alive:
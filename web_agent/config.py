@@ -3,6 +3,7 @@
 import json
 import logging
 import os
+import time
 from datetime import datetime
 from functools import cache
 from pathlib import Path
@@ -349,54 +350,113 @@ def load_and_migrate_config(config_path: Path) -> DBStyleConfigJSON:
 		return new_config
 
 
+def _file_stamp(path: Path) -> tuple[int, int, int] | None:
+	"""(inode, mtime, size) of a file, or None if it doesn't exist"""
+	try:
+		stat = os.stat(path)
+	except OSError:
+		return None
+	return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+_DOTENV_PATH = Path('.env')  # Read by FlatEnvConfig, relative to the working directory
+_DOTENV_CHECK_INTERVAL = 1.0  # Seconds a stat of ./.env is trusted before it is checked again
+_OLD_CONFIG_ATTRS = frozenset(name for name, value in vars(OldConfig).items() if isinstance(value, property))
+_CONFIG_DIR_ENV_DEPS = ('web_agent_CONFIG_DIR', 'XDG_CONFIG_HOME', 'HOME')  # HOME: `~` expansion
+# Env vars an OldConfig property reads besides the one named like it
+_EXTRA_ENV_DEPS: dict[str, tuple[str, ...]] = {
+	'web_agent_CLOUD_SYNC': ('ANONYMIZED_TELEMETRY',),
+	'XDG_CACHE_HOME': ('HOME',),
+	'XDG_CONFIG_HOME': ('HOME',),
+	'web_agent_CONFIG_DIR': ('XDG_CONFIG_HOME', 'HOME'),
+	'web_agent_CONFIG_FILE': _CONFIG_DIR_ENV_DEPS,
+	'web_agent_PROFILES_DIR': _CONFIG_DIR_ENV_DEPS,
+	'web_agent_DEFAULT_USER_DATA_DIR': _CONFIG_DIR_ENV_DEPS,
+	'web_agent_EXTENSIONS_DIR': _CONFIG_DIR_ENV_DEPS,
+}
+# Env vars FlatEnvConfig reads (case-sensitive)
+_FLAT_ENV_KEYS = tuple(FlatEnvConfig.model_fields)
+_CONFIG_METHODS = ('get_default_profile', 'get_default_llm', 'get_default_agent', 'load_config')
+
+
 class Config:
 	"""Backward-compatible configuration class that merges all config sources.
 
-	Re-reads environment variables on every access to maintain compatibility.
+	Each attribute is cached together with the values of the env vars it was derived from (plus ./.env for
+	FlatEnvConfig attributes), so a read is a dict lookup and a couple of os.environ lookups, while env changes are
+	still picked up on the next access. ./.env is stat'ed at most once per _DOTENV_CHECK_INTERVAL, so edits to it
+	show up within that interval. config.json is re-parsed only when its mtime/size changes. Call invalidate()
+	to drop everything (including the ./.env stamp).
 	"""
 
 	def __init__(self):
 		# Cache for directory creation tracking only
 		self._dirs_created = False
+		self._values: dict[str, tuple[tuple, Any]] = {}
+		self._env_config: tuple[tuple, FlatEnvConfig] | None = None
+		self._db_config: tuple[Path, tuple[int, int, int] | None, DBStyleConfigJSON] | None = None
+		self._dotenv_stamp: tuple[int, int, int] | None = None
+		self._dotenv_checked_at = float('-inf')
+
+	def invalidate(self) -> None:
+		"""Drop cached env values and config.json contents"""
+		self._values.clear()
+		self._env_config = None
+		self._db_config = None
+		self._dotenv_checked_at = float('-inf')
+
+	def _get_dotenv_stamp(self) -> tuple[int, int, int] | None:
+		"""Stamp of ./.env, stat'ed again only after _DOTENV_CHECK_INTERVAL or invalidate()"""
+		now = time.monotonic()
+		if now - self._dotenv_checked_at >= _DOTENV_CHECK_INTERVAL:
+			self._dotenv_stamp = _file_stamp(_DOTENV_PATH)
+			self._dotenv_checked_at = now
+		return self._dotenv_stamp
+
+	def _get_env_config(self) -> FlatEnvConfig:
+		"""FlatEnvConfig for the current environment, rebuilt only when one of its env vars or ./.env changes"""
+		environ = os.environ
+		fingerprint = (self._get_dotenv_stamp(), *(environ.get(key) for key in _FLAT_ENV_KEYS))
+		if self._env_config is None or self._env_config[0] != fingerprint:
+			self._env_config = (fingerprint, FlatEnvConfig())
+		return self._env_config[1]
 
 	def __getattr__(self, name: str) -> Any:
-		"""Dynamically proxy all attributes to fresh instances.
-
-		This ensures env vars are re-read on every access.
-		"""
+		"""Proxy attributes to the env-derived config classes, cached per env var values."""
 		# Special handling for internal attributes
 		if name.startswith('_'):
 			raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
-		# Create fresh instances on every access
-		old_config = OldConfig()
+		# Handle special methods
+		if name in _CONFIG_METHODS:
+			return getattr(self, f'_{name}')
+
+		environ = os.environ
+		if name in _OLD_CONFIG_ATTRS:
+			stamp = (environ.get(name), *(environ.get(key) for key in _EXTRA_ENV_DEPS.get(name, ())))
+		else:
+			stamp = (environ.get(name), self._get_dotenv_stamp())
 
-		# Always use old config for all attributes (it handles env vars with proper transformations)
-		if hasattr(old_config, name):
-			return getattr(old_config, name)
+		cached = self._values.get(name)
+		if cached is not None and cached[0] == stamp:
+			return cached[1]
 
-		# For new MCP-specific attributes not in old config
-		env_config = FlatEnvConfig()
-		if hasattr(env_config, name):
-			return getattr(env_config, name)
+		# Always use old config when it has the attribute (it handles env vars with proper transformations)
+		if name in _OLD_CONFIG_ATTRS:
+			value = getattr(OldConfig(), name)
+		else:
+			# For new MCP-specific attributes not in old config
+			env_config = self._get_env_config()
+			if not hasattr(env_config, name):
+				raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+			value = getattr(env_config, name)
 
-		# Handle special methods
-		if name == 'get_default_profile':
-			return lambda: self._get_default_profile()
-		elif name == 'get_default_llm':
-			return lambda: self._get_default_llm()
-		elif name == 'get_default_agent':
-			return lambda: self._get_default_agent()
-		elif name == 'load_config':
-			return lambda: self._load_config()
-		elif name == '_ensure_dirs':
-			return lambda: old_config._ensure_dirs()
-
-		raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+		self._values[name] = (stamp, value)
+		return value
 
 	def _get_config_path(self) -> Path:
-		"""Get config path from fresh env config."""
-		env_config = FlatEnvConfig()
+		"""Get config path from the current env config."""
+		env_config = self._get_env_config()
 		if env_config.web_agent_CONFIG_PATH:
 			return Path(env_config.web_agent_CONFIG_PATH).expanduser()
 		elif env_config.web_agent_CONFIG_DIR:
@@ -406,9 +466,16 @@ class Config:
 			return xdg_config / 'webagent' / 'config.json'
 
 	def _get_db_config(self) -> DBStyleConfigJSON:
-		"""Load and migrate config.json."""
+		"""Load and migrate config.json, reusing the parsed file while it is unchanged on disk."""
 		config_path = self._get_config_path()
-		return load_and_migrate_config(config_path)
+		cached = self._db_config
+		if cached is not None and cached[0] == config_path and cached[1] is not None and cached[1] == _file_stamp(config_path):
+			return cached[2]
+
+		db_config = load_and_migrate_config(config_path)
+		# Stamp after loading: migration may have (re)written the file
+		self._db_config = (config_path, _file_stamp(config_path), db_config)
+		return db_config
 
 	def _get_default_profile(self) -> dict[str, Any]:
 		"""Get the default browser profile configuration."""
@@ -457,8 +524,8 @@ class Config:
 			'agent': self._get_default_agent(),
 		}
 
-		# Fresh env config for overrides
-		env_config = FlatEnvConfig()
+		# Env config for overrides
+		env_config = self._get_env_config()
 
 		# Apply MCP-specific env var overrides
 		if env_config.web_agent_HEADLESS is not None:
@@ -0,0 +1,304 @@
+"""Compiled domain-pattern matchers for allowlists, sensitive-data scoping and action `domains` filters.
+
+Matching a URL against a list of patterns one `fnmatch` at a time is O(patterns) per check, which adds up with
+allowlists of thousands of entries. The matchers here are compiled once per pattern list:
+
+- exact hosts go into a set
+- `*.domain` patterns go into a suffix trie keyed by reversed host labels (lookup is O(label count))
+- full-URL prefixes are indexed by prefix length
+- any remaining globs are precompiled into a single regex
+
+Each matcher gives the same answers as the per-pattern function it replaces:
+`DomainPatternSet` ⇔ `utils.match_url_with_domain_pattern`, `UrlPolicyMatcher` ⇔ the `SecurityWatchdog` list rules.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from typing import Generic, TypeVar
+from urllib.parse import urlparse
+
+from web_agent.utils import is_new_tab_page, match_url_with_domain_pattern
+
+logger = logging.getLogger(__name__)
+
+_GLOB_CHARS = ('*', '?', '[')
+
+T = TypeVar('T')
+
+
+def _compile_globs(patterns: Iterable[str]) -> re.Pattern[str] | None:
+	"""One regex equivalent to `any(fnmatch.fnmatch(s, p) for p in patterns)` (apply os.path.normcase to s)"""
+	parts = [f'(?:{fnmatch.translate(os.path.normcase(pattern))})' for pattern in patterns]
+	return re.compile('|'.join(parts)) if parts else None
+
+
+class DomainSuffixTrie(Generic[T]):
+	"""Trie over reversed host labels: finds every `domain` such that host == domain or host ends with `.domain`"""
+
+	_END = '\x00end'  # Not a valid host label, so it can't collide with a child key
+
+	def __init__(self) -> None:
+		self._root: dict = {}
+
+	def add(self, domain: str, value: T) -> None:
+		node = self._root
+		for label in reversed(domain.split('.')):
+			node = node.setdefault(label, {})
+		node.setdefault(self._END, []).append(value)
+
+	def matches(self, host: str) -> list[T]:
+		"""Values of all domains that host is equal to or a subdomain of, shortest domain first"""
+		found: list[T] = []
+		node = self._root
+		for label in reversed(host.split('.')):
+			node = node.get(label)
+			if node is None:
+				break
+			found.extend(node.get(self._END, ()))
+		return found
+
+	def __bool__(self) -> bool:
+		return bool(self._root)
+
+
+class DomainPatternSet:
+	"""Compiled equivalent of calling `match_url_with_domain_pattern(url, pattern)` for each pattern in a list.
+
+	Patterns are grouped by their scheme pattern (https by default); within a group, exact hosts, `*` and `*.domain`
+	are answered from a set and a suffix trie. Rarer glob shapes (and those the function rejects as unsafe) keep using
+	`match_url_with_domain_pattern` itself so their answers can't drift.
+	"""
+
+	def __init__(self, patterns: Iterable[str], log_warnings: bool = False):
+		self.patterns = tuple(dict.fromkeys(patterns))
+		self.log_warnings = log_warnings
+		# scheme pattern -> (exact hosts -> patterns, any-host patterns, suffix trie)
+		self._by_scheme: dict[str, tuple[dict[str, list[str]], list[str], DomainSuffixTrie[str]]] = {}
+		self._scheme_globs: dict[str, re.Pattern[str]] = {}
+		self._fallback: list[str] = []
+
+		for pattern in self.patterns:
+			if not self._add(pattern):
+				self._fallback.append(pattern)
+
+	def _add(self, pattern: str) -> bool:
+		"""Index a pattern; returns False if it needs the per-pattern fallback"""
+		domain_pattern = pattern.lower()
+		if '://' in domain_pattern:
+			scheme_pattern, host_pattern = domain_pattern.split('://', 1)
+		else:
+			scheme_pattern, host_pattern = 'https', domain_pattern
+
+		# Ports are ignored, only the hostname is compared
+		if ':' in host_pattern and not host_pattern.startswith(':'):
+			host_pattern = host_pattern.split(':', 1)[0]
+
+		if host_pattern == '*':
+			kind = 'any'
+		elif '*' not in host_pattern:
+			kind = 'exact'  # Without a `*` only an exact host comparison can succeed
+		elif (
+			host_pattern.startswith('*.')
+			and host_pattern.count('*') == 1
+			and not host_pattern.endswith('.*')
+			and not any(char in host_pattern for char in '?[')
+		):
+			kind = 'suffix'
+		else:
+			return False
+
+		if any(char in scheme_pattern for char in _GLOB_CHARS):
+			self._scheme_globs.setdefault(scheme_pattern, re.compile(fnmatch.translate(os.path.normcase(scheme_pattern))))
+		exact, any_host, suffixes = self._by_scheme.setdefault(scheme_pattern, ({}, [], DomainSuffixTrie[str]()))
+		if kind == 'any':
+			any_host.append(pattern)
+		elif kind == 'exact':
+			exact.setdefault(host_pattern, []).append(pattern)
+		else:
+			suffixes.add(host_pattern[2:], pattern)
+		return True
+
+	def _scheme_matches(self, scheme: str, scheme_pattern: str) -> bool:
+		glob = self._scheme_globs.get(scheme_pattern)
+		if glob is None:
+			return os.path.normcase(scheme) == os.path.normcase(scheme_pattern)
+		return glob.match(os.path.normcase(scheme)) is not None
+
+	def matching_patterns(self, url: str) -> set[str]:
+		"""All patterns (as given) that match url"""
+		if is_new_tab_page(url):
+			return set()
+		try:
+			parsed_url = urlparse(url)
+			scheme = parsed_url.scheme.lower() if parsed_url.scheme else ''
+			domain = parsed_url.hostname.lower() if parsed_url.hostname else ''
+		except Exception as e:
+			logger.error(f'⛔️ Error matching URL {url} with domain patterns: {type(e).__name__}: {e}')
+			return set()
+		if not scheme or not domain:
+			return set()
+
+		matched: set[str] = set()
+		for scheme_pattern, (exact, any_host, suffixes) in self._by_scheme.items():
+			if not self._scheme_matches(scheme, scheme_pattern):
+				continue
+			matched.update(any_host)
+			matched.update(exact.get(domain, ()))
+			if suffixes:
+				matched.update(suffixes.matches(domain))
+
+		for pattern in self._fallback:
+			if match_url_with_domain_pattern(url, pattern, self.log_warnings):
+				matched.add(pattern)
+		return matched
+
+	def matches(self, url: str) -> bool:
+		"""True if url matches any pattern"""
+		return bool(self.matching_patterns(url))
+
+
+@lru_cache(maxsize=256)
+def compile_domain_patterns(patterns: tuple[str, ...], log_warnings: bool = False) -> DomainPatternSet:
+	"""Cached DomainPatternSet for a tuple of patterns (e.g. an action's `domains` or sensitive_data's domain keys)"""
+	return DomainPatternSet(patterns, log_warnings=log_warnings)
+
+
+class UrlPolicyMatcher:
+	"""Compiled form of SecurityWatchdog's allowed_domains / prohibited_domains list rules.
+
+	Per pattern (case-sensitive unless noted, as before):
+	- `*.example.com` matches example.com and any subdomain, for http/https only
+	- patterns ending in `/*` are globbed against the full URL
+	- other globs are matched against `scheme://host` if they contain `://`, else against the host
+	- `scheme://...` without a glob is a prefix of the URL
+	- a bare host matches case-insensitively, and a root domain (`example.com`) also matches `www.example.com`
+	"""
+
+	def __init__(self, patterns: Iterable[str]):
+		self.patterns = tuple(patterns)
+		self._hosts: set[str] = set()
+		self._subdomains: DomainSuffixTrie[str] = DomainSuffixTrie()
+		self._prefixes: dict[int, set[str]] = {}
+		url_globs: list[str] = []
+		origin_globs: list[str] = []
+		host_globs: list[str] = []
+
+		for pattern in self.patterns:
+			if '*' in pattern:
+				if pattern.startswith('*.'):
+					self._subdomains.add(pattern[2:], pattern)
+				elif pattern.endswith('/*'):
+					url_globs.append(pattern)
+				elif '://' in pattern:
+					origin_globs.append(pattern)
+				else:
+					host_globs.append(pattern)
+			elif '://' in pattern:
+				self._prefixes.setdefault(len(pattern), set()).add(pattern)
+			else:
+				self._hosts.add(pattern.lower())
+				if pattern.count('.') == 1:
+					self._hosts.add(f'www.{pattern.lower()}')
+
+		self.has_globs = any('*' in pattern for pattern in self.patterns)
+		self._url_glob = _compile_globs(url_globs)
+		self._origin_glob = _compile_globs(origin_globs)
+		self._host_glob = _compile_globs(host_globs)
+
+	def matches(self, url: str, host: str, scheme: str) -> bool:
+		"""True if any pattern matches; host and scheme are urlparse(url).hostname and .scheme"""
+		if host.lower() in self._hosts:
+			return True
+		if scheme in ('http', 'https') and self._subdomains.matches(host):
+			return True
+		for length, prefixes in self._prefixes.items():
+			if url[:length] in prefixes:
+				return True
+		if self._url_glob and self._url_glob.match(os.path.normcase(url)):
+			return True
+		if self._origin_glob and self._origin_glob.match(os.path.normcase(f'{scheme}://{host}')):
+			return True
+		if self._host_glob and self._host_glob.match(os.path.normcase(host)):
+			return True
+		return False
+
+
+class DomainPatternList(list[str]):
+	"""Domain list of a BrowserProfile, carrying its UrlPolicyMatcher.
+
+	The matcher is compiled on first use and dropped by any in-place edit, so URL checks never re-read the whole list.
+	"""
+
+	_matcher: UrlPolicyMatcher | None = None
+
+	@property
+	def matcher(self) -> UrlPolicyMatcher:
+		if self._matcher is None:
+			self._matcher = UrlPolicyMatcher(tuple(self))
+		return self._matcher
+
+	def __reduce__(self):
+		# Copies and pickles get a fresh list, the matcher is recompiled lazily
+		return (type(self), (list(self),))
+
+	def _edited(self) -> None:
+		self._matcher = None
+
+
+def _invalidating(name: str):
+	method = getattr(list, name)
+
+	def edit(self: DomainPatternList, *args):
+		self._edited()
+		return method(self, *args)
+
+	edit.__name__ = name
+	return edit
+
+
+for _name in (
+	'__setitem__',
+	'__delitem__',
+	'__iadd__',
+	'__imul__',
+	'append',
+	'extend',
+	'insert',
+	'pop',
+	'remove',
+	'clear',
+	'sort',
+	'reverse',
+):
+	setattr(DomainPatternList, _name, _invalidating(_name))
+del _name
+
+_POLICY_CACHE_SIZE = 64
+_policy_cache: OrderedDict[tuple[str, ...], UrlPolicyMatcher] = OrderedDict()
+
+
+def get_url_policy_matcher(patterns: Sequence[str]) -> UrlPolicyMatcher:
+	"""UrlPolicyMatcher for a profile's domain list.
+
+	A DomainPatternList (what BrowserProfile stores) carries its own matcher. Other sequences are compiled once per
+	distinct list of patterns, keyed by the patterns themselves.
+	"""
+	if isinstance(patterns, DomainPatternList):
+		return patterns.matcher
+
+	key = tuple(patterns)
+	matcher = _policy_cache.get(key)
+	if matcher is not None:
+		_policy_cache.move_to_end(key)
+		return matcher
+
+	matcher = UrlPolicyMatcher(key)
+	_policy_cache[key] = matcher
+	if len(_policy_cache) > _POLICY_CACHE_SIZE:
+		_policy_cache.popitem(last=False)
+	return matcher
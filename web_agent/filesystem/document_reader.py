@@ -0,0 +1,217 @@
+"""Page-by-page text extraction for external documents (PDF, DOCX) with an on-disk cache.
+
+Extraction runs in a worker thread and writes every page to the cache as soon as it is extracted, so a long
+document neither blocks the event loop nor has to be held in memory as a whole. Cache entries are keyed by
+the SHA-256 of the file, so reading the same document again (even under another name) only reads the cache,
+and the cached text supports random access by page or by character offset.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+DOCX_SEGMENT_CHARS = 4000  # DOCX has no pages: paragraphs are grouped into segments of about this size
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class ExtractedDocument:
+	"""Extracted text of a document, stored in the cache and read lazily.
+
+	Segments are pages for PDFs and blocks of paragraphs for DOCX; concatenated they form the document text
+	(for DOCX exactly the paragraphs joined by newlines). Segment i spans chars [char_offsets[i], char_offsets[i + 1]).
+	"""
+
+	source: str
+	sha256: str
+	kind: str  # 'pages' (PDF) or 'paragraphs' (DOCX)
+	text_path: Path
+	char_offsets: list[int]
+	byte_offsets: list[int]
+
+	@property
+	def num_segments(self) -> int:
+		return len(self.char_offsets) - 1
+
+	@property
+	def total_chars(self) -> int:
+		return self.char_offsets[-1]
+
+	def segment(self, index: int) -> str:
+		"""Text of segment index (0-based), e.g. segment(0) is page 1 of a PDF"""
+		if not 0 <= index < self.num_segments:
+			raise IndexError(f'{self.source} has {self.num_segments} segments, no segment {index}')
+		return self._read_bytes(self.byte_offsets[index], self.byte_offsets[index + 1])
+
+	def iter_segments(self, start: int = 0, stop: int | None = None) -> Iterator[str]:
+		"""Segments start..stop-1, read one at a time"""
+		stop = self.num_segments if stop is None else min(stop, self.num_segments)
+		with open(self.text_path, 'rb') as f:
+			f.seek(self.byte_offsets[start])
+			for index in range(start, stop):
+				yield f.read(self.byte_offsets[index + 1] - self.byte_offsets[index]).decode('utf-8')
+
+	def read(self, offset: int = 0, length: int | None = None) -> str:
+		"""length chars of the document text starting at char offset (only the segments involved are read)"""
+		end = self.total_chars if length is None else min(self.total_chars, offset + length)
+		if offset >= end:
+			return ''
+		first = bisect.bisect_right(self.char_offsets, offset) - 1
+		last = bisect.bisect_left(self.char_offsets, end) - 1
+		text = self._read_bytes(self.byte_offsets[first], self.byte_offsets[last + 1])
+		base = self.char_offsets[first]
+		return text[offset - base : end - base]
+
+	def _read_bytes(self, start: int, end: int) -> str:
+		with open(self.text_path, 'rb') as f:
+			f.seek(start)
+			return f.read(end - start).decode('utf-8')
+
+
+def _iter_pdf_pages(path: str) -> Iterator[str]:
+	import pypdf
+
+	reader = pypdf.PdfReader(path)
+	for page in reader.pages:
+		yield page.extract_text() or ''
+
+
+def _iter_docx_blocks(path: str) -> Iterator[str]:
+	from docx import Document
+
+	block: list[str] = []
+	size = 0
+	for index, para in enumerate(Document(path).paragraphs):
+		# Every paragraph but the first starts with the newline that separates it from the previous one
+		text = para.text if index == 0 else '\n' + para.text
+		block.append(text)
+		size += len(text)
+		if size >= DOCX_SEGMENT_CHARS:
+			yield ''.join(block)
+			block, size = [], 0
+	if block:
+		yield ''.join(block)
+
+
+_EXTRACTORS = {
+	'.pdf': ('pages', _iter_pdf_pages),
+	'.docx': ('paragraphs', _iter_docx_blocks),
+}
+
+
+class DocumentReader:
+	"""Extracts documents into a content-addressed cache under cache_dir (default: the config dir's document_cache)"""
+
+	def __init__(self, cache_dir: str | Path | None = None, max_cache_entries: int = 256):
+		self._cache_dir = Path(cache_dir) if cache_dir is not None else None
+		self.max_cache_entries = max_cache_entries
+		self._hashes: dict[str, tuple[int, int, str]] = {}  # path -> (size, mtime_ns, sha256)
+		self._inflight: dict[str, asyncio.Task[ExtractedDocument]] = {}
+
+	@property
+	def cache_dir(self) -> Path:
+		if self._cache_dir is None:
+			from web_agent.config import CONFIG
+
+			return CONFIG.web_agent_CONFIG_DIR / 'document_cache'
+		return self._cache_dir
+
+	@staticmethod
+	def supports(path: str | Path) -> bool:
+		return Path(path).suffix.lower() in _EXTRACTORS
+
+	async def open(self, path: str | Path) -> ExtractedDocument:
+		"""Extracted text of path, from the cache or extracted in a worker thread (one extraction per path at a time)"""
+		key = os.path.abspath(path)
+		task = self._inflight.get(key)
+		if task is None:
+			task = asyncio.create_task(asyncio.to_thread(self.open_sync, key), name=f'extract {os.path.basename(key)}')
+			self._inflight[key] = task
+			task.add_done_callback(lambda _: self._inflight.pop(key, None))
+		return await asyncio.shield(task)
+
+	def open_sync(self, path: str | Path) -> ExtractedDocument:
+		"""Blocking version of open()"""
+		path = os.path.abspath(path)
+		extension = Path(path).suffix.lower()
+		if extension not in _EXTRACTORS:
+			raise ValueError(f'Cannot extract text from {extension} files')
+		kind, extract = _EXTRACTORS[extension]
+
+		sha256 = self._file_hash(path)
+		cache_dir = self.cache_dir
+		text_path = cache_dir / f'{sha256}.txt'
+		index_path = cache_dir / f'{sha256}.json'
+		document = self._load_index(path, sha256, text_path, index_path)
+		if document is not None:
+			return document
+
+		# Written to temporary files and renamed into place, index last: a present index means a complete entry
+		cache_dir.mkdir(parents=True, exist_ok=True)
+		tmp_suffix = f'.{os.getpid()}.tmp'
+		tmp_text_path = text_path.with_name(text_path.name + tmp_suffix)
+		char_offsets = [0]
+		byte_offsets = [0]
+		try:
+			with open(tmp_text_path, 'wb') as f:
+				for segment in extract(path):
+					data = segment.encode('utf-8', errors='replace')
+					f.write(data)
+					char_offsets.append(char_offsets[-1] + len(data.decode('utf-8')))
+					byte_offsets.append(byte_offsets[-1] + len(data))
+			os.replace(tmp_text_path, text_path)
+		finally:
+			tmp_text_path.unlink(missing_ok=True)
+		tmp_index_path = index_path.with_name(index_path.name + tmp_suffix)
+		tmp_index_path.write_text(
+			json.dumps({'version': CACHE_VERSION, 'kind': kind, 'char_offsets': char_offsets, 'byte_offsets': byte_offsets})
+		)
+		os.replace(tmp_index_path, index_path)
+		logger.debug(f'Extracted {len(char_offsets) - 1} {kind} ({char_offsets[-1]:,} chars) from {path}')
+
+		self._prune_cache(keep=sha256)
+		return ExtractedDocument(path, sha256, kind, text_path, char_offsets, byte_offsets)
+
+	def _file_hash(self, path: str) -> str:
+		stat = os.stat(path)
+		cached = self._hashes.get(path)
+		if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+			return cached[2]
+		hasher = hashlib.sha256()
+		with open(path, 'rb') as f:
+			while chunk := f.read(_HASH_CHUNK_SIZE):
+				hasher.update(chunk)
+		self._hashes[path] = (stat.st_size, stat.st_mtime_ns, hasher.hexdigest())
+		return self._hashes[path][2]
+
+	@staticmethod
+	def _load_index(path: str, sha256: str, text_path: Path, index_path: Path) -> ExtractedDocument | None:
+		try:
+			index = json.loads(index_path.read_text())
+			if index.get('version') != CACHE_VERSION or text_path.stat().st_size != index['byte_offsets'][-1]:
+				return None
+			os.utime(index_path)  # Recently used entries survive pruning
+		except (OSError, ValueError, KeyError, IndexError):
+			return None
+		return ExtractedDocument(path, sha256, index['kind'], text_path, index['char_offsets'], index['byte_offsets'])
+
+	def _prune_cache(self, keep: str) -> None:
+		"""Drop the least recently used entries beyond max_cache_entries"""
+		try:
+			indexes = sorted(self.cache_dir.glob('*.json'), key=lambda p: p.stat().st_mtime, reverse=True)
+		except OSError:
+			return
+		for index_path in indexes[self.max_cache_entries :]:
+			if index_path.stem == keep:
+				continue
+			index_path.unlink(missing_ok=True)
+			index_path.with_suffix('.txt').unlink(missing_ok=True)
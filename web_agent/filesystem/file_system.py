@@ -1,14 +1,20 @@
 import asyncio
 import base64
+import logging
+import math
 import os
 import re
 import shutil
+import time
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from web_agent.filesystem.document_reader import DocumentReader, ExtractedDocument
+
+logger = logging.getLogger(__name__)
 
 UNSUPPORTED_BINARY_EXTENSIONS = {
 	'png',
@@ -108,12 +114,25 @@ class BaseFile(BaseModel, ABC):
 
 	def sync_to_disk_sync(self, path: Path) -> None:
 		file_path = path / self.full_name
-		file_path.write_text(self.content)
+		file_path.write_text(self.content, newline='')  # newline='': the file holds exactly self.content (e.g. CRLF in CSVs)
 
 	async def sync_to_disk(self, path: Path) -> None:
 		file_path = path / self.full_name
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: file_path.write_text(self.content))
+		content = self.content
+		await asyncio.to_thread(file_path.write_text, content, newline='')
+
+	async def append_to_disk(self, content: str, path: Path) -> None:
+		"""Write only the appended content (the file on disk mirrors self.content for text formats)"""
+
+		def _append() -> None:
+			with open(path / self.full_name, 'a', newline='') as f:
+				f.write(content)
+
+		await asyncio.to_thread(_append)
+
+	async def flush(self, path: Path) -> None:
+		"""Wait for deferred disk writes of this file (text formats are always written immediately)"""
+		pass
 
 	async def write(self, content: str, path: Path) -> None:
 		self.write_file_content(content)
@@ -121,7 +140,12 @@ class BaseFile(BaseModel, ABC):
 
 	async def append(self, content: str, path: Path) -> None:
 		self.append_file_content(content)
-		await self.sync_to_disk(path)
+		await self.append_to_disk(content, path)
+
+	@property
+	def stored_on_disk(self) -> bool:
+		"""Whether the file on disk holds exactly self.content, so state can reference it instead of embedding it"""
+		return True
 
 	def read(self) -> str:
 		return self.content
@@ -179,7 +203,70 @@ class JsonlFile(BaseFile):
 		return 'jsonl'
 
 
-class PdfFile(BaseFile):
+class RenderedFile(BaseFile):
+	"""Base for formats whose whole document is re-rendered on every sync (PDF, DOCX).
+
+	Renders are throttled: a sync renders right away unless the file was rendered less than
+	`render_interval` seconds ago, in which case one trailing render picks up all changes made meanwhile.
+	Call flush() (or FileSystem.flush()) before handing the file on disk to anyone.
+	"""
+
+	render_interval: ClassVar[float] = 2.0
+
+	_version: int = PrivateAttr(default=0)
+	_last_render: float = PrivateAttr(default=0.0)
+	_render_task: asyncio.Task[None] | None = PrivateAttr(default=None)
+	_render_error: FileSystemError | None = PrivateAttr(default=None)
+
+	@property
+	def stored_on_disk(self) -> bool:
+		return False
+
+	def update_content(self, content: str) -> None:
+		super().update_content(content)
+		self._version += 1
+
+	async def sync_to_disk(self, path: Path) -> None:
+		if self._render_task is not None and not self._render_task.done():
+			return  # The pending render will pick up this change
+		wait = self._last_render + self.render_interval - time.monotonic()
+		if wait <= 0:
+			await self._render(path)
+		else:
+			self._render_task = asyncio.create_task(self._render_later(path, wait), name=f'render {self.full_name}')
+
+	async def append_to_disk(self, content: str, path: Path) -> None:
+		await self.sync_to_disk(path)
+
+	async def flush(self, path: Path) -> None:
+		if self._render_task is not None:
+			await self._render_task
+			self._render_task = None
+		if self._render_error is not None:
+			error, self._render_error = self._render_error, None
+			raise error
+
+	async def _render(self, path: Path) -> None:
+		self._last_render = time.monotonic()
+		await asyncio.to_thread(self.sync_to_disk_sync, path)
+
+	async def _render_later(self, path: Path, wait: float) -> None:
+		await asyncio.sleep(wait)
+		while True:
+			version = self._version
+			try:
+				await self._render(path)
+				self._render_error = None
+			except FileSystemError as e:
+				logger.warning(str(e))
+				self._render_error = e
+			if self._version == version:
+				return
+			# Changed while rendering: render again once the interval has passed
+			await asyncio.sleep(self.render_interval)
+
+
+class PdfFile(RenderedFile):
 	"""PDF file implementation"""
 
 	@property
@@ -223,12 +310,8 @@ class PdfFile(BaseFile):
 		except Exception as e:
 			raise FileSystemError(f"Error: Could not write to file '{self.full_name}'. {str(e)}")
 
-	async def sync_to_disk(self, path: Path) -> None:
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: self.sync_to_disk_sync(path))
-
 
-class DocxFile(BaseFile):
+class DocxFile(RenderedFile):
 	"""DOCX file implementation"""
 
 	@property
@@ -263,10 +346,6 @@ class DocxFile(BaseFile):
 		except Exception as e:
 			raise FileSystemError(f"Error: Could not write to file '{self.full_name}'. {str(e)}")
 
-	async def sync_to_disk(self, path: Path) -> None:
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: self.sync_to_disk_sync(path))
-
 
 class HtmlFile(BaseFile):
 	"""HTML file implementation"""
@@ -284,6 +363,49 @@ class XmlFile(BaseFile):
 		return 'xml'
 
 
+def _rank_pages_by_distinctiveness(document: ExtractedDocument) -> list[int]:
+	"""Page numbers ordered by how distinctive their words are (IDF score), page 1 first, then every other page"""
+	num_pages = document.num_segments
+
+	# Extract words from each page and count which pages they appear on
+	word_to_pages: dict[str, set[int]] = {}
+	page_words: dict[int, set[str]] = {}
+
+	for page_num, text in enumerate(document.iter_segments(), 1):
+		# Extract words (lowercase, 4+ chars to filter noise)
+		words = set(re.findall(r'\b[a-zA-Z]{4,}\b', text.lower()))
+		page_words[page_num] = words
+		for word in words:
+			if word not in word_to_pages:
+				word_to_pages[word] = set()
+			word_to_pages[word].add(page_num)
+
+	# Score pages using inverse document frequency (IDF)
+	# words appearing on fewer pages get higher weight
+	page_scores: dict[int, float] = {}
+	for page_num, words in page_words.items():
+		score = 0.0
+		for word in words:
+			pages_with_word = len(word_to_pages[word])
+			# IDF: log(total_pages / pages_with_word) - higher for rarer words
+			score += math.log(num_pages / pages_with_word)
+		page_scores[page_num] = score
+
+	# Sort pages by score (highest first), always include page 1
+	sorted_pages = sorted(page_scores.items(), key=lambda x: -x[1])
+	priority_pages = [1]
+	for page_num, _ in sorted_pages:
+		if page_num not in priority_pages:
+			priority_pages.append(page_num)
+
+	# Add remaining pages in order (for pages with no distinctive content)
+	for page_num in range(1, num_pages + 1):
+		if page_num not in priority_pages:
+			priority_pages.append(page_num)
+
+	return priority_pages
+
+
 class FileSystemState(BaseModel):
 	"""Serializable state of the file system"""
 
@@ -295,7 +417,12 @@ class FileSystemState(BaseModel):
 class FileSystem:
 	"""Enhanced file system with in-memory storage and multiple file type support"""
 
-	def __init__(self, base_dir: str | Path, create_default_files: bool = True):
+	def __init__(
+		self,
+		base_dir: str | Path,
+		create_default_files: bool = True,
+		max_inline_state_chars: int | None = None,
+	):
 		# Handle the Path conversion before calling super().__init__
 		self.base_dir = Path(base_dir) if isinstance(base_dir, str) else base_dir
 		self.base_dir.mkdir(parents=True, exist_ok=True)
@@ -325,6 +452,9 @@ class FileSystem:
 			self._create_default_files()
 
 		self.extracted_content_count = 0
+		# Opt-in: text files larger than this (in chars) are referenced from FileSystemState instead of embedded in it
+		self.max_inline_state_chars = max_inline_state_chars
+		self.document_reader = DocumentReader()
 
 	def get_allowed_extensions(self) -> list[str]:
 		"""Get allowed extensions"""
@@ -478,32 +608,24 @@ class FileSystem:
 						return result
 
 				elif extension == 'docx':
-					from docx import Document
-
-					doc = Document(full_filename)
-					content = '\n'.join([para.text for para in doc.paragraphs])
+					# Extracted in a worker thread and cached by content hash
+					document = await self.document_reader.open(full_filename)
+					content = await asyncio.to_thread(document.read)
 					result['message'] = f'Read from file {full_filename}.\n<content>\n{content}\n</content>'
 					return result
 
 				elif extension == 'pdf':
-					import pypdf
-
-					reader = pypdf.PdfReader(full_filename)
-					num_pages = len(reader.pages)
+					# Pages are extracted in a worker thread into a cache keyed by content hash, then read lazily
+					document = await self.document_reader.open(full_filename)
+					num_pages = document.num_segments
+					total_chars = document.total_chars
 					MAX_CHARS = 60000  # character-based limit
 
-					# Extract text from all pages with page markers
-					page_texts: list[tuple[int, str]] = []
-					total_chars = 0
-					for i, page in enumerate(reader.pages, 1):
-						text = page.extract_text() or ''
-						page_texts.append((i, text))
-						total_chars += len(text)
-
 					# If small enough, return everything
 					if total_chars <= MAX_CHARS:
+						page_texts = await asyncio.to_thread(lambda: list(document.iter_segments()))
 						content_parts = []
-						for page_num, text in page_texts:
+						for page_num, text in enumerate(page_texts, 1):
 							if text.strip():
 								content_parts.append(f'--- Page {page_num} ---\n{text}')
 						extracted_text = '\n\n'.join(content_parts)
@@ -514,53 +636,16 @@ class FileSystem:
 						return result
 
 					# Large PDF - use search to prioritize pages with distinctive content
-					import math
-					import re
-
-					# Extract words from each page and count which pages they appear on
-					word_to_pages: dict[str, set[int]] = {}
-					page_words: dict[int, set[str]] = {}
-
-					for page_num, text in page_texts:
-						# Extract words (lowercase, 4+ chars to filter noise)
-						words = set(re.findall(r'\b[a-zA-Z]{4,}\b', text.lower()))
-						page_words[page_num] = words
-						for word in words:
-							if word not in word_to_pages:
-								word_to_pages[word] = set()
-							word_to_pages[word].add(page_num)
-
-					# Score pages using inverse document frequency (IDF)
-					# words appearing on fewer pages get higher weight
-					page_scores: dict[int, float] = {}
-					for page_num, words in page_words.items():
-						score = 0.0
-						for word in words:
-							pages_with_word = len(word_to_pages[word])
-							# IDF: log(total_pages / pages_with_word) - higher for rarer words
-							score += math.log(num_pages / pages_with_word)
-						page_scores[page_num] = score
-
-					# Sort pages by score (highest first), always include page 1
-					sorted_pages = sorted(page_scores.items(), key=lambda x: -x[1])
-					priority_pages = [1]
-					for page_num, _ in sorted_pages:
-						if page_num not in priority_pages:
-							priority_pages.append(page_num)
-
-					# Add remaining pages in order (for pages with no distinctive content)
-					for page_num, _ in page_texts:
-						if page_num not in priority_pages:
-							priority_pages.append(page_num)
+					priority_pages = await asyncio.to_thread(_rank_pages_by_distinctiveness, document)
 
 					# Build content from prioritized pages, respecting char limit
 					content_parts = []
 					chars_used = 0
 					pages_included = []
 
-					# First pass: add pages in priority order
+					# First pass: add pages in priority order (only these pages are read back from the cache)
 					for page_num in priority_pages:
-						text = page_texts[page_num - 1][1]
+						text = document.segment(page_num - 1)
 						if not text.strip():
 							continue
 						page_header = f'--- Page {page_num} ---\n'
@@ -831,11 +916,35 @@ class FileSystem:
 		todo_file = self.get_file('todo.md')
 		return todo_file.read() if todo_file else ''
 
+	async def flush(self) -> None:
+		"""Wait for deferred renders (PDF, DOCX) so every file on disk matches its content; failures are logged"""
+		for file_obj in self.files.values():
+			try:
+				await file_obj.flush(self.data_dir)
+			except FileSystemError as e:
+				logger.warning(str(e))
+
 	def get_state(self) -> FileSystemState:
-		"""Get serializable state of the file system"""
+		"""Get serializable state of the file system
+
+		With max_inline_state_chars set, larger text files are not embedded: their entry only points at the file on
+		disk ('on_disk') with its size.
+		"""
 		files_data = {}
 		for full_filename, file_obj in self.files.items():
-			files_data[full_filename] = {'type': file_obj.__class__.__name__, 'data': file_obj.model_dump()}
+			if (
+				self.max_inline_state_chars is not None
+				and file_obj.stored_on_disk
+				and len(file_obj.content) > self.max_inline_state_chars
+			):
+				files_data[full_filename] = {
+					'type': file_obj.__class__.__name__,
+					'data': file_obj.model_dump(exclude={'content'}),
+					'on_disk': True,
+					'size': len(file_obj.content),
+				}
+			else:
+				files_data[full_filename] = {'type': file_obj.__class__.__name__, 'data': file_obj.model_dump()}
 
 		return FileSystemState(
 			files=files_data, base_dir=str(self.base_dir), extracted_content_count=self.extracted_content_count
@@ -843,11 +952,35 @@ class FileSystem:
 
 	def nuke(self) -> None:
 		"""Delete the file system directory"""
+		for file_obj in self.files.values():
+			if isinstance(file_obj, RenderedFile) and file_obj._render_task is not None:
+				file_obj._render_task.cancel()
 		shutil.rmtree(self.data_dir)
 
 	@classmethod
 	def from_state(cls, state: FileSystemState) -> 'FileSystem':
 		"""Restore file system from serializable state at the exact same location"""
+		# Read files kept on disk before the data directory is recreated
+		on_disk_contents: dict[str, str] = {}
+		for full_filename, file_data in state.files.items():
+			if not file_data.get('on_disk'):
+				continue
+			file_path = Path(state.base_dir) / DEFAULT_FILE_SYSTEM_PATH / full_filename
+			try:
+				# newline='': keep CRLF as written, the saved size counts the original chars
+				with open(file_path, newline='') as f:
+					content = f.read()
+			except OSError as e:
+				raise FileSystemError(f"Error: Could not restore file '{full_filename}' from {file_path}. {str(e)}")
+			size = file_data.get('size', 0)
+			if len(content) < size:
+				raise FileSystemError(
+					f"Error: Could not restore file '{full_filename}': {file_path} has {len(content)} chars, "
+					f'state expects {size}.'
+				)
+			# Files are only appended to after a snapshot: an older state restores the first `size` chars
+			on_disk_contents[full_filename] = content[:size]
+
 		# Create file system without default files
 		fs = cls(base_dir=Path(state.base_dir), create_default_files=False)
 		fs.extracted_content_count = state.extracted_content_count
@@ -875,6 +1008,8 @@ class FileSystem:
 				# Skip unknown file types
 				continue
 			file_obj = file_class(**file_info)
+			if full_filename in on_disk_contents:
+				file_obj.update_content(on_disk_contents[full_filename])
 
 			# Add to files dict and sync to disk
 			fs.files[full_filename] = file_obj
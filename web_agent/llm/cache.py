@@ -0,0 +1,297 @@
+"""
+Content-addressed response cache for chat models.
+
+Used for the auxiliary LLM calls (page extraction, judge) that often see the exact same
+input more than once, e.g. when several agents extract from the same page or a step is retried.
+Responses are keyed by a hash of the serialized messages, the model and the output schema,
+kept in a memory LRU and optionally on disk, and identical in-flight requests are coalesced
+into a single provider call.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar, overload
+
+import anyio
+from pydantic import BaseModel
+
+from web_agent.llm.base import BaseChatModel
+from web_agent.llm.messages import BaseMessage
+from web_agent.llm.views import ChatInvokeCompletion
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T', bound=BaseModel)
+
+# kwargs that only identify the caller and never change the response
+_IGNORED_KWARGS = frozenset({'session_id'})
+
+
+def _default_disk_dir() -> Path:
+	from web_agent.config import CONFIG
+
+	return CONFIG.XDG_CACHE_HOME / 'web_agent' / 'llm_responses'
+
+
+@dataclass
+class LLMCacheStats:
+	hits: int = 0
+	disk_hits: int = 0
+	misses: int = 0
+	coalesced: int = 0
+	bypassed: int = 0
+
+
+@dataclass
+class LLMResponseCache:
+	"""Two-tier (memory + disk) response store with in-flight request coalescing.
+
+	Entries are plain JSON payloads so the same cache can be shared by several agents
+	and survives process restarts when a disk directory is configured.
+	"""
+
+	max_entries: int = 256
+	ttl_seconds: float = 3600.0
+	disk_dir: Path | None = None
+	max_disk_bytes: int = 200 * 1024 * 1024
+	prune_every_n_writes: int = 50
+	stats: LLMCacheStats = field(default_factory=LLMCacheStats)
+
+	def __post_init__(self) -> None:
+		self._memory: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+		self._in_flight: dict[str, asyncio.Future[dict[str, Any]]] = {}
+		self._writes_since_prune = 0
+
+	@classmethod
+	def with_disk(cls, disk_dir: Path | str | None = None, **kwargs: Any) -> 'LLMResponseCache':
+		"""Cache that also persists entries under disk_dir (defaults to the XDG cache dir)"""
+		return cls(disk_dir=Path(disk_dir).expanduser() if disk_dir else _default_disk_dir(), **kwargs)
+
+	@staticmethod
+	def make_key(
+		llm: BaseChatModel,
+		messages: list[BaseMessage],
+		output_format: type[BaseModel] | None = None,
+		**kwargs: Any,
+	) -> str:
+		"""Hash of everything that determines the response: messages, provider/model and output schema"""
+		payload = {
+			'provider': llm.provider,
+			'model': llm.model,
+			'messages': [message.model_dump(mode='json') for message in messages],
+			'schema': output_format.model_json_schema() if output_format is not None else None,
+			'kwargs': {k: repr(v) for k, v in sorted(kwargs.items()) if k not in _IGNORED_KWARGS},
+		}
+		encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+		return hashlib.sha256(encoded.encode('utf-8', errors='replace')).hexdigest()
+
+	def _is_fresh(self, created_at: float) -> bool:
+		return time.time() - created_at < self.ttl_seconds
+
+	def _disk_path(self, key: str) -> Path:
+		assert self.disk_dir is not None
+		return self.disk_dir / key[:2] / f'{key}.json'
+
+	async def get(self, key: str) -> dict[str, Any] | None:
+		entry = self._memory.get(key)
+		if entry is not None:
+			if self._is_fresh(entry[0]):
+				self._memory.move_to_end(key)
+				return entry[1]
+			del self._memory[key]
+
+		if self.disk_dir is None:
+			return None
+
+		path = self._disk_path(key)
+		try:
+			raw = await anyio.Path(path).read_text()
+			stored = json.loads(raw)
+		except FileNotFoundError:
+			return None
+		except Exception as e:
+			logger.debug(f'Ignoring unreadable LLM cache entry {path}: {type(e).__name__}: {e}')
+			return None
+
+		if not self._is_fresh(stored.get('created_at', 0)):
+			await anyio.to_thread.run_sync(lambda: path.unlink(missing_ok=True))
+			return None
+
+		self.stats.disk_hits += 1
+		self._remember(key, stored['created_at'], stored['payload'])
+		return stored['payload']
+
+	async def set(self, key: str, payload: dict[str, Any]) -> None:
+		created_at = time.time()
+		self._remember(key, created_at, payload)
+
+		if self.disk_dir is None:
+			return
+
+		path = self._disk_path(key)
+		try:
+			data = json.dumps({'created_at': created_at, 'payload': payload}, ensure_ascii=False)
+			await anyio.Path(path.parent).mkdir(parents=True, exist_ok=True)
+			await anyio.Path(path).write_text(data)
+		except Exception as e:
+			logger.debug(f'Failed to write LLM cache entry {path}: {type(e).__name__}: {e}')
+			return
+
+		self._writes_since_prune += 1
+		if self._writes_since_prune >= self.prune_every_n_writes:
+			self._writes_since_prune = 0
+			await anyio.to_thread.run_sync(self.prune_disk)
+
+	def _remember(self, key: str, created_at: float, payload: dict[str, Any]) -> None:
+		self._memory[key] = (created_at, payload)
+		self._memory.move_to_end(key)
+		while len(self._memory) > self.max_entries:
+			self._memory.popitem(last=False)
+
+	def prune_disk(self) -> None:
+		"""Drop expired entries, then the oldest ones until the disk tier fits in max_disk_bytes"""
+		if self.disk_dir is None or not self.disk_dir.exists():
+			return
+
+		now = time.time()
+		files: list[tuple[float, int, Path]] = []
+		for path in self.disk_dir.glob('*/*.json'):
+			try:
+				stat = path.stat()
+			except OSError:
+				continue
+			if now - stat.st_mtime >= self.ttl_seconds:
+				path.unlink(missing_ok=True)
+				continue
+			files.append((stat.st_mtime, stat.st_size, path))
+
+		total_bytes = sum(size for _, size, _ in files)
+		for _, size, path in sorted(files):
+			if total_bytes <= self.max_disk_bytes:
+				break
+			path.unlink(missing_ok=True)
+			total_bytes -= size
+
+	def clear(self) -> None:
+		self._memory.clear()
+
+	async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[dict[str, Any]]]) -> tuple[dict[str, Any], bool]:
+		"""Return (payload, from_cache), sharing a single compute() between concurrent callers of the same key"""
+		cached = await self.get(key)
+		if cached is not None:
+			self.stats.hits += 1
+			return cached, True
+
+		in_flight = self._in_flight.get(key)
+		if in_flight is not None:
+			self.stats.coalesced += 1
+			return await asyncio.shield(in_flight), True
+
+		self.stats.misses += 1
+		future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+		self._in_flight[key] = future
+		try:
+			payload = await compute()
+		except BaseException as e:
+			if isinstance(e, asyncio.CancelledError):
+				future.cancel()
+			else:
+				future.set_exception(e)
+				future.exception()  # mark retrieved so an unawaited future does not log
+			raise
+		finally:
+			self._in_flight.pop(key, None)
+
+		future.set_result(payload)
+		await self.set(key, payload)
+		return payload, False
+
+
+class CachedChatModel:
+	"""BaseChatModel wrapper that serves repeated deterministic requests from an LLMResponseCache.
+
+	Requests are only cached when the wrapped model samples deterministically
+	(temperature set and <= max_temperature); everything else passes straight through.
+	Cache hits return usage=None, so token accounting only counts real provider calls.
+	"""
+
+	_verified_api_keys: bool = False
+
+	def __init__(self, llm: BaseChatModel, cache: LLMResponseCache | None = None, max_temperature: float = 0.0):
+		self.llm = llm
+		self.cache = cache or LLMResponseCache()
+		self.max_temperature = max_temperature
+
+	@property
+	def model(self) -> str:
+		return self.llm.model
+
+	@property
+	def provider(self) -> str:
+		return self.llm.provider
+
+	@property
+	def name(self) -> str:
+		return self.llm.name
+
+	@property
+	def model_name(self) -> str:
+		return self.llm.model
+
+	def __getattr__(self, name: str) -> Any:
+		# Only called for attributes not found on the wrapper (temperature, timeouts, ...)
+		if name == 'llm':
+			raise AttributeError(name)
+		return getattr(self.llm, name)
+
+	@property
+	def is_deterministic(self) -> bool:
+		temperature = getattr(self.llm, 'temperature', None)
+		return isinstance(temperature, (int, float)) and temperature <= self.max_temperature
+
+	@overload
+	async def ainvoke(
+		self, messages: list[BaseMessage], output_format: None = None, **kwargs: Any
+	) -> ChatInvokeCompletion[str]: ...
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: type[T], **kwargs: Any) -> ChatInvokeCompletion[T]: ...
+
+	async def ainvoke(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None, **kwargs: Any
+	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+		if not self.is_deterministic:
+			self.cache.stats.bypassed += 1
+			return await self.llm.ainvoke(messages, output_format, **kwargs)
+
+		key = LLMResponseCache.make_key(self.llm, messages, output_format, **kwargs)
+		response: ChatInvokeCompletion | None = None
+
+		async def compute() -> dict[str, Any]:
+			nonlocal response
+			response = await self.llm.ainvoke(messages, output_format, **kwargs)
+			completion = response.completion
+			return {
+				'completion': completion.model_dump(mode='json') if isinstance(completion, BaseModel) else completion,
+				'thinking': response.thinking,
+				'stop_reason': response.stop_reason,
+			}
+
+		payload, from_cache = await self.cache.get_or_compute(key, compute)
+		if not from_cache and response is not None:
+			return response
+
+		completion = output_format.model_validate(payload['completion']) if output_format is not None else payload['completion']
+		return ChatInvokeCompletion(
+			completion=completion,
+			thinking=payload.get('thinking'),
+			stop_reason=payload.get('stop_reason'),
+			usage=None,
+		)
@@ -0,0 +1,432 @@
+"""
+Rate-limit-aware scheduler for LLM calls.
+
+Many agents in one process tend to hit the same provider at the same time and only react
+after a 429. The scheduler sits in front of the chat models and, per provider/model:
+
+- queues calls by priority (agent step > extraction > judge)
+- adapts the number of concurrent calls with AIMD (additive increase on success,
+  multiplicative decrease on rate limits)
+- keeps a sliding token-per-minute budget, learned from rate-limit headers or configured
+- pauses dispatch until the provider's retry-after / reset time
+- records queue-wait metrics
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import re
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Any, TypeVar, overload
+
+from pydantic import BaseModel
+
+from web_agent.llm.base import BaseChatModel
+from web_agent.llm.exceptions import ModelProviderError, ModelRateLimitError
+from web_agent.llm.messages import BaseMessage, ContentPartImageParam
+from web_agent.llm.views import ChatInvokeCompletion
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T', bound=BaseModel)
+R = TypeVar('R')
+
+TOKEN_WINDOW_SECONDS = 60.0
+IMAGE_TOKEN_ESTIMATE = 1000
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+class LLMPriority(IntEnum):
+	"""Lower value is dispatched first"""
+
+	AGENT_STEP = 0
+	EXTRACTION = 1
+	JUDGE = 2
+
+
+def estimate_tokens(messages: list[BaseMessage]) -> int:
+	"""Rough prompt size (~4 chars per token) used to reserve token budget before the call"""
+	chars = 0
+	images = 0
+	for message in messages:
+		content = getattr(message, 'content', None)
+		if isinstance(content, list):
+			images += sum(1 for part in content if isinstance(part, ContentPartImageParam))
+		chars += len(getattr(message, 'text', '') or '')
+	return chars // 4 + images * IMAGE_TOKEN_ESTIMATE
+
+
+def _parse_reset(value: str) -> float | None:
+	"""Seconds until reset from '6m0s' / '20ms' / '1.5' (OpenAI) or an RFC 3339 timestamp (Anthropic)"""
+	value = value.strip()
+	try:
+		return max(0.0, float(value))
+	except ValueError:
+		pass
+	parts = _DURATION_PART.findall(value)
+	if parts and ''.join(f'{number}{unit}' for number, unit in parts) == value:
+		return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+	try:
+		reset_at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+	except ValueError:
+		try:
+			reset_at = parsedate_to_datetime(value)
+		except (TypeError, ValueError):
+			return None
+	if reset_at.tzinfo is None:
+		reset_at = reset_at.replace(tzinfo=timezone.utc)
+	return max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _parse_int(value: str | None) -> int | None:
+	if value is None:
+		return None
+	try:
+		return int(float(value))
+	except ValueError:
+		return None
+
+
+def _error_headers(error: BaseException) -> Mapping[str, str] | None:
+	"""Find the HTTP response headers of the SDK error wrapped by a ModelProviderError"""
+	seen: set[int] = set()
+	current: BaseException | None = error
+	while current is not None and id(current) not in seen:
+		seen.add(id(current))
+		headers = getattr(getattr(current, 'response', None), 'headers', None)
+		if headers is not None:
+			return headers
+		current = current.__cause__ or current.__context__
+	return None
+
+
+@dataclass
+class LLMSchedulerStats:
+	requests: int = 0
+	rate_limited: int = 0
+	queued: int = 0  # requests that had to wait for a slot
+	total_wait_seconds: float = 0.0
+	max_wait_seconds: float = 0.0
+	wait_seconds_by_priority: dict[str, float] = field(default_factory=dict)
+
+	@property
+	def avg_wait_seconds(self) -> float:
+		return self.total_wait_seconds / self.requests if self.requests else 0.0
+
+
+@dataclass
+class _ProviderState:
+	key: str
+	limit: float
+	tokens_per_minute: int | None = None
+	tokens_per_minute_configured: bool = False
+	in_flight: int = 0
+	blocked_until: float = 0.0
+	last_decrease: float = 0.0
+	waiters: list[tuple[int, int, int, asyncio.Future[list[float]]]] = field(default_factory=list)
+	token_window: deque[list[float]] = field(default_factory=deque)
+	wake_handle: asyncio.TimerHandle | None = None
+	stats: LLMSchedulerStats = field(default_factory=LLMSchedulerStats)
+
+
+class LLMScheduler:
+	"""Shared priority queue and AIMD concurrency controller for LLM calls, keyed by provider/model"""
+
+	def __init__(
+		self,
+		initial_concurrency: int = 4,
+		min_concurrency: int = 1,
+		max_concurrency: int = 64,
+		increase_step: float = 1.0,
+		decrease_factor: float = 0.5,
+		decrease_cooldown: float = 1.0,
+		default_backoff: float = 1.0,
+		tokens_per_minute: Mapping[str, int] | None = None,
+		slow_wait_log_threshold: float = 5.0,
+	):
+		self.initial_concurrency = initial_concurrency
+		self.min_concurrency = min_concurrency
+		self.max_concurrency = max_concurrency
+		self.increase_step = increase_step
+		self.decrease_factor = decrease_factor
+		self.decrease_cooldown = decrease_cooldown
+		self.default_backoff = default_backoff
+		# TPM budgets keyed by 'provider/model' or just 'model'
+		self.tokens_per_minute = dict(tokens_per_minute or {})
+		self.slow_wait_log_threshold = slow_wait_log_threshold
+		self._states: dict[str, _ProviderState] = {}
+		self._sequence = itertools.count()
+
+	def _state(self, provider: str, model: str) -> _ProviderState:
+		key = f'{provider}/{model}'
+		state = self._states.get(key)
+		if state is None:
+			budget = self.tokens_per_minute.get(key, self.tokens_per_minute.get(model))
+			state = _ProviderState(
+				key=key,
+				limit=float(self.initial_concurrency),
+				tokens_per_minute=budget,
+				tokens_per_minute_configured=budget is not None,
+			)
+			self._states[key] = state
+		return state
+
+	async def submit(
+		self,
+		llm: BaseChatModel,
+		call: Callable[[], Awaitable[R]],
+		priority: LLMPriority = LLMPriority.AGENT_STEP,
+		estimated_tokens: int = 0,
+	) -> R:
+		"""Run call() once a slot for llm's provider/model is free, feeding the outcome back into the limits"""
+		state = self._state(llm.provider, llm.model)
+		reservation = await self._acquire(state, priority, estimated_tokens)
+		try:
+			result = await call()
+		except ModelProviderError as e:
+			if isinstance(e, ModelRateLimitError) or e.status_code == 429:
+				self._on_rate_limit(state, e)
+			raise
+		finally:
+			state.in_flight -= 1
+			self._dispatch(state)
+
+		self._on_success(state)
+		usage = getattr(result, 'usage', None)
+		if usage is not None:
+			reservation[1] = float(usage.total_tokens)
+		return result
+
+	async def _acquire(self, state: _ProviderState, priority: LLMPriority, estimated_tokens: int) -> list[float]:
+		loop = asyncio.get_running_loop()
+		started = loop.time()
+		state.stats.requests += 1
+
+		if not state.waiters and self._start_delay(state, estimated_tokens, time.monotonic()) == 0:
+			return self._start(state, estimated_tokens, time.monotonic())
+
+		future: asyncio.Future[list[float]] = loop.create_future()
+		heapq.heappush(state.waiters, (int(priority), next(self._sequence), estimated_tokens, future))
+		self._dispatch(state)
+		try:
+			reservation = await future
+		except asyncio.CancelledError:
+			if future.done() and not future.cancelled():
+				# Slot was granted just before we got cancelled, hand it to the next waiter
+				state.in_flight -= 1
+				self._dispatch(state)
+			raise
+
+		waited = loop.time() - started
+		if waited > 0:
+			stats = state.stats
+			stats.queued += 1
+			stats.total_wait_seconds += waited
+			stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+			stats.wait_seconds_by_priority[priority.name] = stats.wait_seconds_by_priority.get(priority.name, 0.0) + waited
+			if waited >= self.slow_wait_log_threshold:
+				logger.info(
+					f'⏳ {priority.name.lower()} LLM call waited {waited:.1f}s for {state.key} '
+					f'(concurrency {int(state.limit)}, queue {len(state.waiters)})'
+				)
+		return reservation
+
+	def _start(self, state: _ProviderState, estimated_tokens: int, now: float) -> list[float]:
+		"""Take a slot and reserve estimated tokens in the budget window; returns the mutable [time, tokens] entry"""
+		state.in_flight += 1
+		reservation = [now, float(estimated_tokens)]
+		state.token_window.append(reservation)
+		return reservation
+
+	def _start_delay(self, state: _ProviderState, estimated_tokens: int, now: float) -> float | None:
+		"""0 if a call can start now, seconds to wait for a time-based limit, None if all slots are busy"""
+		if state.in_flight >= max(self.min_concurrency, int(state.limit)):
+			return None
+		if state.blocked_until > now:
+			return state.blocked_until - now
+
+		window = state.token_window
+		while window and now - window[0][0] >= TOKEN_WINDOW_SECONDS:
+			window.popleft()
+		if state.tokens_per_minute and window:
+			used = sum(tokens for _, tokens in window)
+			if used + estimated_tokens > state.tokens_per_minute:
+				return window[0][0] + TOKEN_WINDOW_SECONDS - now
+		return 0.0
+
+	def _dispatch(self, state: _ProviderState) -> None:
+		"""Hand free slots to the highest-priority waiters, or schedule a wake-up for time-based limits"""
+		now = time.monotonic()
+		while state.waiters:
+			_, _, estimated_tokens, future = state.waiters[0]
+			if future.done():
+				heapq.heappop(state.waiters)
+				continue
+			delay = self._start_delay(state, estimated_tokens, now)
+			if delay is None:
+				return  # a finishing call will dispatch again
+			if delay > 0:
+				self._schedule_wake(state, delay)
+				return
+			heapq.heappop(state.waiters)
+			future.set_result(self._start(state, estimated_tokens, now))
+
+	def _schedule_wake(self, state: _ProviderState, delay: float) -> None:
+		loop = asyncio.get_running_loop()
+		when = loop.time() + delay
+		if state.wake_handle is not None and not state.wake_handle.cancelled():
+			if state.wake_handle.when() <= when:
+				return
+			state.wake_handle.cancel()
+		state.wake_handle = loop.call_at(when, self._wake, state)
+
+	def _wake(self, state: _ProviderState) -> None:
+		state.wake_handle = None
+		self._dispatch(state)
+
+	def _on_success(self, state: _ProviderState) -> None:
+		# Additive increase: roughly +increase_step per window of `limit` successful calls
+		state.limit = min(float(self.max_concurrency), state.limit + self.increase_step / state.limit)
+
+	def _on_rate_limit(self, state: _ProviderState, error: ModelProviderError) -> None:
+		state.stats.rate_limited += 1
+		now = time.monotonic()
+		# Multiplicative decrease, once per cooldown so a burst of 429s does not collapse the limit to the floor
+		if now - state.last_decrease >= self.decrease_cooldown:
+			state.limit = max(float(self.min_concurrency), state.limit * self.decrease_factor)
+			state.last_decrease = now
+
+		headers = _error_headers(error)
+		if headers is None or not self._apply_headers(state, headers, now):
+			state.blocked_until = max(state.blocked_until, now + self.default_backoff)
+		logger.debug(f'Rate limited on {state.key}, concurrency now {int(state.limit)}')
+
+	def observe_headers(self, provider: str, model: str, headers: Mapping[str, str]) -> None:
+		"""Feed rate-limit headers from any provider response into the limits"""
+		self._apply_headers(self._state(provider, model), headers, time.monotonic())
+
+	def _apply_headers(self, state: _ProviderState, headers: Mapping[str, str], now: float) -> bool:
+		"""Update the TPM budget and pause window from OpenAI/Anthropic style headers, True if a pause was set"""
+		h = {str(k).lower(): str(v) for k, v in headers.items()}
+
+		token_limit = _parse_int(
+			h.get('x-ratelimit-limit-tokens')
+			or h.get('anthropic-ratelimit-tokens-limit')
+			or h.get('anthropic-ratelimit-input-tokens-limit')
+		)
+		if token_limit and not state.tokens_per_minute_configured:
+			state.tokens_per_minute = token_limit
+
+		pause: float | None = None
+		if 'retry-after-ms' in h:
+			retry_after_ms = _parse_int(h['retry-after-ms'])
+			pause = retry_after_ms / 1000 if retry_after_ms is not None else None
+		elif 'retry-after' in h:
+			pause = _parse_reset(h['retry-after'])
+
+		for remaining_key, reset_key in (
+			('x-ratelimit-remaining-requests', 'x-ratelimit-reset-requests'),
+			('x-ratelimit-remaining-tokens', 'x-ratelimit-reset-tokens'),
+			('anthropic-ratelimit-requests-remaining', 'anthropic-ratelimit-requests-reset'),
+			('anthropic-ratelimit-tokens-remaining', 'anthropic-ratelimit-tokens-reset'),
+		):
+			if _parse_int(h.get(remaining_key)) == 0 and reset_key in h:
+				reset = _parse_reset(h[reset_key])
+				if reset is not None:
+					pause = max(pause or 0.0, reset)
+
+		if pause is None:
+			return False
+		state.blocked_until = max(state.blocked_until, now + pause)
+		return True
+
+	def stats(self) -> dict[str, LLMSchedulerStats]:
+		return {key: state.stats for key, state in self._states.items()}
+
+	def summary(self) -> dict[str, dict[str, Any]]:
+		"""Queue-wait metrics and current limits per provider/model"""
+		return {
+			key: {
+				'requests': state.stats.requests,
+				'queued': state.stats.queued,
+				'rate_limited': state.stats.rate_limited,
+				'avg_wait_seconds': state.stats.avg_wait_seconds,
+				'max_wait_seconds': state.stats.max_wait_seconds,
+				'wait_seconds_by_priority': dict(state.stats.wait_seconds_by_priority),
+				'concurrency_limit': int(state.limit),
+				'in_flight': state.in_flight,
+				'queue_depth': len(state.waiters),
+				'tokens_per_minute': state.tokens_per_minute,
+			}
+			for key, state in self._states.items()
+		}
+
+
+_shared_scheduler: LLMScheduler | None = None
+
+
+def get_shared_scheduler() -> LLMScheduler:
+	"""Process-wide scheduler so that all agents in the process share one view of each provider's limits"""
+	global _shared_scheduler
+	if _shared_scheduler is None:
+		_shared_scheduler = LLMScheduler()
+	return _shared_scheduler
+
+
+class ScheduledChatModel:
+	"""BaseChatModel wrapper that routes every call through an LLMScheduler with a fixed priority"""
+
+	_verified_api_keys: bool = False
+
+	def __init__(self, llm: BaseChatModel, scheduler: LLMScheduler | None = None, priority: LLMPriority = LLMPriority.EXTRACTION):
+		self.llm = llm
+		self.scheduler = scheduler or get_shared_scheduler()
+		self.priority = priority
+
+	@property
+	def model(self) -> str:
+		return self.llm.model
+
+	@property
+	def provider(self) -> str:
+		return self.llm.provider
+
+	@property
+	def name(self) -> str:
+		return self.llm.name
+
+	@property
+	def model_name(self) -> str:
+		return self.llm.model
+
+	def __getattr__(self, name: str) -> Any:
+		if name == 'llm':
+			raise AttributeError(name)
+		return getattr(self.llm, name)
+
+	@overload
+	async def ainvoke(
+		self, messages: list[BaseMessage], output_format: None = None, **kwargs: Any
+	) -> ChatInvokeCompletion[str]: ...
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: type[T], **kwargs: Any) -> ChatInvokeCompletion[T]: ...
+
+	async def ainvoke(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None, **kwargs: Any
+	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+		return await self.scheduler.submit(
+			self.llm,
+			lambda: self.llm.ainvoke(messages, output_format, **kwargs),
+			priority=self.priority,
+			estimated_tokens=estimate_tokens(messages),
+		)
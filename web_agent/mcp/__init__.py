@@ -3,16 +3,38 @@
 This module provides integration with MCP servers and clients for browser automation.
 """
 
-from web_agent.mcp.client import MCPClient
-from web_agent.mcp.controller import MCPToolWrapper
+from typing import TYPE_CHECKING
 
-__all__ = ['MCPClient', 'MCPToolWrapper', 'webagentServer']  # type: ignore
+# Type stubs for lazy imports
+if TYPE_CHECKING:
+	from web_agent.mcp.client import MCPClient
+	from web_agent.mcp.controller import MCPToolWrapper
+	from web_agent.mcp.server import webagentServer
 
+# Lazy imports mapping - the MCP SDK is only loaded when one of these is accessed
+_LAZY_IMPORTS = {
+	'MCPClient': ('web_agent.mcp.client', 'MCPClient'),
+	'MCPToolWrapper': ('web_agent.mcp.controller', 'MCPToolWrapper'),
+	'webagentServer': ('web_agent.mcp.server', 'webagentServer'),
+}
 
-def __getattr__(name):
-	"""Lazy import to avoid importing server module when only client is needed."""
-	if name == 'webagentServer':
-		from web_agent.mcp.server import webagentServer
 
-		return webagentServer
+def __getattr__(name: str):
+	"""Lazy import mechanism for MCP components."""
+	if name in _LAZY_IMPORTS:
+		module_path, attr_name = _LAZY_IMPORTS[name]
+		try:
+			from importlib import import_module
+
+			module = import_module(module_path)
+			attr = getattr(module, attr_name)
+			# Cache the imported attribute in the module's globals
+			globals()[name] = attr
+			return attr
+		except ImportError as e:
+			raise ImportError(f'Failed to import {name} from {module_path}: {e}') from e
+
 	raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+__all__ = ['MCPClient', 'MCPToolWrapper', 'webagentServer']
@@ -1,19 +1,67 @@
 """
 Screenshot storage service for web-agent agents.
+
+Every screenshot is written to disk; only the most recently used `keep_in_memory` are also kept in memory
+(as base64), the rest are loaded back lazily from disk when history, GIF generation or the judge need them.
 """
 
 import base64
+import os
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 
 import anyio
 
 from web_agent.observability import observe_debug
 
+DEFAULT_SCREENSHOTS_IN_MEMORY = 5
+
+# screenshots dir (absolute) -> live service, so paths stored in history resolve through the service's memory cache
+_services: 'weakref.WeakValueDictionary[str, ScreenshotService]' = weakref.WeakValueDictionary()
+
+
+@dataclass
+class ScreenshotMemoryStats:
+	"""Screenshot storage and memory use of one ScreenshotService (i.e. one agent run)"""
+
+	stored: int = 0  # Screenshots written to disk
+	stored_bytes: int = 0  # PNG bytes written to disk
+	resident: int = 0  # Screenshots currently kept in memory
+	resident_bytes: int = 0  # Size of the base64 strings currently kept in memory
+	peak_resident_bytes: int = 0
+	memory_hits: int = 0  # Lookups served from memory
+	disk_loads: int = 0  # Lookups that had to read the file back from disk
+
+	def summary(self) -> str:
+		return (
+			f'{self.stored} screenshots stored ({self.stored_bytes / 1024 / 1024:.1f} MB on disk), '
+			f'{self.resident} in memory ({self.resident_bytes / 1024:.0f} KB, peak {self.peak_resident_bytes / 1024:.0f} KB), '
+			f'{self.memory_hits} memory hits, {self.disk_loads} disk loads'
+		)
+
+
+def _read_screenshot_file(screenshot_path: str) -> str | None:
+	try:
+		with open(screenshot_path, 'rb') as f:
+			return base64.b64encode(f.read()).decode('utf-8')
+	except OSError:
+		return None
+
+
+def load_screenshot(screenshot_path: str) -> str | None:
+	"""Screenshot at screenshot_path as base64, from its ScreenshotService's memory if it is still live, else from disk"""
+	service = _services.get(os.path.dirname(os.path.abspath(screenshot_path)))
+	if service is not None:
+		return service.get_screenshot_sync(screenshot_path)
+	return _read_screenshot_file(screenshot_path)
+
 
 class ScreenshotService:
-	"""Simple screenshot storage service that saves screenshots to disk"""
+	"""Screenshot storage service: saves screenshots to disk, keeps the last few in memory (LRU)"""
 
-	def __init__(self, agent_directory: str | Path):
+	def __init__(self, agent_directory: str | Path, keep_in_memory: int = DEFAULT_SCREENSHOTS_IN_MEMORY):
 		"""Initialize with agent directory path"""
 		self.agent_directory = Path(agent_directory) if isinstance(agent_directory, str) else agent_directory
 
@@ -21,6 +69,11 @@ class ScreenshotService:
 		self.screenshots_dir = self.agent_directory / 'screenshots'
 		self.screenshots_dir.mkdir(parents=True, exist_ok=True)
 
+		self.keep_in_memory = keep_in_memory
+		self.stats = ScreenshotMemoryStats()
+		self._memory: OrderedDict[str, str] = OrderedDict()  # absolute path -> base64, least recently used first
+		_services[os.path.abspath(self.screenshots_dir)] = self
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='store_screenshot')
 	async def store_screenshot(self, screenshot_b64: str, step_number: int) -> str:
 		"""Store screenshot to disk and return the full path as string"""
@@ -33,14 +86,21 @@ class ScreenshotService:
 		async with await anyio.open_file(screenshot_path, 'wb') as f:
 			await f.write(screenshot_data)
 
+		self.stats.stored += 1
+		self.stats.stored_bytes += len(screenshot_data)
+		self._remember(str(screenshot_path), screenshot_b64)
 		return str(screenshot_path)
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_screenshot_from_disk')
 	async def get_screenshot(self, screenshot_path: str) -> str | None:
-		"""Load screenshot from disk path and return as base64"""
+		"""Load screenshot from memory or disk path and return as base64"""
 		if not screenshot_path:
 			return None
 
+		cached = self._recall(screenshot_path)
+		if cached is not None:
+			return cached
+
 		path = Path(screenshot_path)
 		if not path.exists():
 			return None
@@ -49,4 +109,54 @@ class ScreenshotService:
 		async with await anyio.open_file(path, 'rb') as f:
 			screenshot_data = await f.read()
 
-		return base64.b64encode(screenshot_data).decode('utf-8')
+		screenshot_b64 = base64.b64encode(screenshot_data).decode('utf-8')
+		self.stats.disk_loads += 1
+		self._remember(screenshot_path, screenshot_b64)
+		return screenshot_b64
+
+	def get_screenshot_sync(self, screenshot_path: str) -> str | None:
+		"""Blocking version of get_screenshot() for synchronous callers (history, GIF generation, judge)"""
+		if not screenshot_path:
+			return None
+
+		cached = self._recall(screenshot_path)
+		if cached is not None:
+			return cached
+
+		screenshot_b64 = _read_screenshot_file(screenshot_path)
+		if screenshot_b64 is not None:
+			self.stats.disk_loads += 1
+			self._remember(screenshot_path, screenshot_b64)
+		return screenshot_b64
+
+	def clear_memory(self) -> None:
+		"""Drop every screenshot kept in memory (they all remain on disk)"""
+		self._memory.clear()
+		self.stats.resident = 0
+		self.stats.resident_bytes = 0
+
+	def _recall(self, screenshot_path: str) -> str | None:
+		key = os.path.abspath(screenshot_path)
+		screenshot_b64 = self._memory.get(key)
+		if screenshot_b64 is not None:
+			self._memory.move_to_end(key)
+			self.stats.memory_hits += 1
+		return screenshot_b64
+
+	def _remember(self, screenshot_path: str, screenshot_b64: str) -> None:
+		key = os.path.abspath(screenshot_path)
+		previous = self._memory.pop(key, None)
+		if previous is not None:
+			self.stats.resident_bytes -= len(previous)
+		if self.keep_in_memory <= 0:
+			self.stats.resident = len(self._memory)
+			return
+		self._memory[key] = screenshot_b64
+		self.stats.resident_bytes += len(screenshot_b64)
+
+		# Older screenshots are already on disk: just forget them
+		while len(self._memory) > self.keep_in_memory:
+			_, evicted = self._memory.popitem(last=False)
+			self.stats.resident_bytes -= len(evicted)
+		self.stats.resident = len(self._memory)
+		self.stats.peak_resident_bytes = max(self.stats.peak_resident_bytes, self.stats.resident_bytes)
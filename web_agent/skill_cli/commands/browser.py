@@ -33,6 +33,15 @@ COMMANDS = {
 	'get',
 }
 
+# Queries that don't change page state; the server runs these without waiting for the session lock,
+# so e.g. `state` or `screenshot` can be answered while a long `run` is in progress
+READ_ONLY_COMMANDS = {
+	'screenshot',
+	'state',
+	'get',
+	'wait',
+}
+
 
 async def _execute_js(session: SessionInfo, js: str) -> Any:
 	"""Execute JavaScript in the browser via CDP."""
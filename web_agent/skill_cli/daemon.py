@@ -0,0 +1,466 @@
+"""Warm agent daemon - keeps an interpreter ready to run agent tasks.
+
+`web-agent -p "task"` normally pays for imports, config loading, LLM client setup and a browser
+launch on every invocation. With `--daemon` the CLI becomes a thin client: the first call starts
+this daemon in the background, every call sends the task as a newline-delimited JSON Request
+(see protocol.py) over the daemon's socket and prints the Response. The daemon keeps web_agent
+imported, LiteLLM pricing loaded, one LLM instance per model (sharing a pooled HTTP client) and a
+browser already running, so repeated tasks start executing in milliseconds.
+
+	web-agent -p "Find the cheapest flight to Rome" --daemon
+	web-agent -p "Log in to the dashboard" --daemon --user-data-dir ~/chrome-profile --max-steps 20
+	web-agent --daemon-stop
+
+Browser options given with --daemon (--headless, --window-*, --user-data-dir, --profile-directory,
+--cdp-url, --proxy-*) are sent with the task; when they differ from those of the warm browser, the
+daemon relaunches it with the new settings before running the task.
+
+The client half only uses the stdlib plus the protocol and path helpers, so it stays fast; the heavy
+imports happen inside AgentDaemon.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import IO, Any
+
+from web_agent.skill_cli.protocol import Request, Response
+from web_agent.skill_cli.utils import cleanup_session_files, get_lock_path, get_log_path, get_pid_path, get_socket_path
+
+logger = logging.getLogger('web_agent.skill_cli.daemon')
+
+DAEMON_SESSION = 'agent-daemon'
+DEFAULT_IDLE_TIMEOUT = 30 * 60  # Seconds without requests before the daemon exits
+
+
+class AgentDaemon:
+	"""Long-lived process that runs agent tasks on a warm interpreter, LLM clients and browser."""
+
+	def __init__(self, headed: bool = False, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+		self.headed = headed
+		self.idle_timeout = idle_timeout
+		self.tasks_run = 0
+		self._started_at = time.monotonic()
+		self._last_activity = time.monotonic()
+		self._run_lock = asyncio.Lock()  # One warm browser, so tasks run one at a time
+		self._warm = asyncio.Event()
+		self._llms: dict[str, Any] = {}
+		self._http_client: Any = None
+		self._browser_session: Any = None
+		self._browser_settings: dict[str, Any] = {}  # CLI browser options the warm browser was launched with
+		self._server: asyncio.Server | None = None
+		self._shutdown_event = asyncio.Event()
+		self._shutdown_task: asyncio.Task | None = None
+		self._lock_file: IO | None = None
+
+	async def warm_up(self) -> None:
+		"""Import the agent stack, load pricing data and launch the browser before the first request arrives"""
+		try:
+			started = time.perf_counter()
+			import httpx
+
+			from web_agent.agent.service import Agent  # noqa: F401
+			from web_agent.tokens.service import TokenCost
+
+			self._http_client = httpx.AsyncClient(timeout=httpx.Timeout(120.0, connect=10.0))
+			await TokenCost(include_cost=True).initialize()
+			await self._get_browser_session()
+			logger.info(f'Daemon warm after {time.perf_counter() - started:.2f}s')
+		except Exception as e:
+			logger.exception(f'Warm-up failed, resources are created on first use instead: {e}')
+		finally:
+			self._warm.set()
+
+	async def _get_browser_session(self, settings: dict[str, Any] | None = None) -> Any:
+		"""Return the warm browser, relaunching it if it crashed or was closed or if settings differ from its own"""
+		settings = settings or {}
+		if self._browser_session is not None and settings != self._browser_settings:
+			logger.info('Browser options changed, relaunching the browser')
+		elif self._browser_session is not None and self._browser_session._cdp_client_root is not None:
+			return self._browser_session
+
+		from web_agent.browser import BrowserProfile, BrowserSession
+		from web_agent.config import CONFIG
+
+		if self._browser_session is not None:
+			try:
+				await self._browser_session.kill()
+			except Exception:
+				pass
+		self._browser_session = None
+		profile = BrowserProfile(
+			**{
+				'headless': not self.headed,
+				'user_data_dir': CONFIG.web_agent_PROFILES_DIR / 'daemon',
+				**settings,
+				'keep_alive': True,  # Agent.close() must not kill the shared browser
+			}
+		)
+		self._browser_session = BrowserSession(browser_profile=profile)
+		self._browser_settings = settings
+		await self._browser_session.start()
+		return self._browser_session
+
+	def _get_llm(self, model: str | None) -> Any:
+		"""Reuse one LLM instance per model so its HTTP connection pool stays warm between tasks"""
+		key = model or ''
+		if key not in self._llms:
+			from web_agent.skill_cli.commands.agent import get_llm
+
+			llm = get_llm(model=model)
+			if llm is None:
+				raise ValueError(
+					f'Could not initialize model "{model}"'
+					if model
+					else 'No LLM configured. Set web_agent_API_KEY, OPENAI_API_KEY, ANTHROPIC_API_KEY, or GOOGLE_API_KEY'
+				)
+			if self._http_client is not None and getattr(llm, 'http_client', False) is None:
+				llm.http_client = self._http_client
+			self._llms[key] = llm
+		return self._llms[key]
+
+	async def _run_task(self, params: dict[str, Any]) -> dict[str, Any]:
+		task = params.get('task')
+		if not task:
+			raise ValueError('No task provided')
+
+		await self._warm.wait()
+		async with self._run_lock:
+			from web_agent.agent.service import Agent
+
+			llm = self._get_llm(params.get('model'))
+			browser_session = await self._get_browser_session(params.get('browser'))
+			started = time.perf_counter()
+			agent = Agent(task=task, llm=llm, browser_session=browser_session, source='cli-daemon')
+			history = await agent.run(max_steps=params.get('max_steps') or 100)
+			self.tasks_run += 1
+
+		return {
+			'task': task,
+			'result': history.final_result(),
+			'done': history.is_done(),
+			'successful': history.is_successful(),
+			'steps': history.number_of_steps(),
+			'errors': [error for error in history.errors() if error],
+			'duration_seconds': round(time.perf_counter() - started, 3),
+		}
+
+	async def dispatch(self, request: Request) -> Response:
+		"""Run a single request; errors are returned in the Response rather than raised"""
+		self._last_activity = time.monotonic()
+		logger.info(f'Dispatch: {request.action} (id={request.id})')
+		try:
+			if request.action == 'ping':
+				data: Any = {
+					'pid': os.getpid(),
+					'warm': self._warm.is_set(),
+					'tasks_run': self.tasks_run,
+					'headed': self.headed,
+					'uptime_seconds': round(time.monotonic() - self._started_at, 1),
+				}
+			elif request.action == 'run':
+				data = await self._run_task(request.params)
+			elif request.action == 'shutdown':
+				self.request_shutdown()
+				data = {'shutdown': True}
+			else:
+				return Response(id=request.id, success=False, error=f'Unknown action: {request.action}')
+			return Response(id=request.id, success=True, data=data)
+		except Exception as e:
+			logger.exception(f'Error dispatching {request.action}: {e}')
+			return Response(id=request.id, success=False, error=f'{type(e).__name__}: {e}')
+		finally:
+			self._last_activity = time.monotonic()
+
+	async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		"""Serve newline-delimited JSON requests until the client disconnects"""
+		try:
+			while line := await reader.readline():
+				try:
+					response = await self.dispatch(Request.from_json(line.decode()))
+				except (ValueError, KeyError) as e:
+					response = Response(id='', success=False, error=f'Invalid request: {e}')
+				writer.write((response.to_json() + '\n').encode())
+				await writer.drain()
+		except (ConnectionError, asyncio.IncompleteReadError):
+			pass
+		finally:
+			writer.close()
+
+	async def _exit_when_idle(self) -> None:
+		while not self._shutdown_event.is_set():
+			await asyncio.sleep(min(30.0, self.idle_timeout))
+			if not self._run_lock.locked() and time.monotonic() - self._last_activity > self.idle_timeout:
+				logger.info(f'Idle for {self.idle_timeout:.0f}s, shutting down')
+				self.request_shutdown()
+				return
+
+	def request_shutdown(self) -> None:
+		if self._shutdown_task is None:
+			self._shutdown_task = asyncio.create_task(self.shutdown())
+
+	async def shutdown(self) -> None:
+		logger.info('Shutting down daemon...')
+		if self._server:
+			self._server.close()
+		if self._browser_session is not None:
+			try:
+				await self._browser_session.kill()
+			except Exception as e:
+				logger.debug(f'Error killing browser: {e}')
+		if self._http_client is not None:
+			await self._http_client.aclose()
+		cleanup_session_files(DAEMON_SESSION)
+		self._shutdown_event.set()
+
+	async def run(self) -> None:
+		import portalocker
+
+		lock_path = get_lock_path(DAEMON_SESSION)
+		lock_path.parent.mkdir(parents=True, exist_ok=True)
+		lock_path.touch(exist_ok=True)
+		self._lock_file = open(lock_path, 'r+')  # noqa: ASYNC230 - blocking ok at startup
+		try:
+			portalocker.lock(self._lock_file, portalocker.LOCK_EX | portalocker.LOCK_NB)
+		except portalocker.LockException:
+			logger.error('Another agent daemon is already running')
+			self._lock_file.close()
+			sys.exit(1)
+		get_pid_path(DAEMON_SESSION).write_text(str(os.getpid()))
+
+		loop = asyncio.get_running_loop()
+		for sig in (signal.SIGINT, signal.SIGTERM):
+			try:
+				loop.add_signal_handler(sig, self.request_shutdown)
+			except NotImplementedError:
+				pass  # Windows
+
+		# Listen before warming up so clients can connect (and queue their task) right away
+		sock_path = get_socket_path(DAEMON_SESSION)
+		if sock_path.startswith('tcp://'):
+			host, port = sock_path.split('://', 1)[1].split(':')
+			self._server = await asyncio.start_server(self.handle_connection, host, int(port), reuse_address=True)
+		else:
+			Path(sock_path).unlink(missing_ok=True)
+			self._server = await asyncio.start_unix_server(self.handle_connection, sock_path)
+		logger.info(f'Agent daemon listening on {sock_path}')
+
+		background = [asyncio.create_task(self.warm_up()), asyncio.create_task(self._exit_when_idle())]
+		try:
+			await self._shutdown_event.wait()
+		finally:
+			for task in background:
+				task.cancel()
+			try:
+				portalocker.unlock(self._lock_file)
+				self._lock_file.close()
+			except Exception:
+				pass
+			logger.info('Daemon stopped')
+
+
+# =============================================================================
+# Thin client
+# =============================================================================
+
+
+def _connect(timeout: float | None) -> socket.socket:
+	sock_path = get_socket_path(DAEMON_SESSION)
+	if sock_path.startswith('tcp://'):
+		host, port = sock_path.split('://', 1)[1].split(':')
+		sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		sock.settimeout(timeout)
+		sock.connect((host, int(port)))
+	else:
+		sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		sock.settimeout(timeout)
+		sock.connect(sock_path)
+	return sock
+
+
+def send_request(action: str, params: dict[str, Any] | None = None, timeout: float | None = None) -> Response:
+	"""Send one request to the daemon and wait for its response (timeout=None waits for long agent runs)"""
+	request = Request(id=f'r{time.time_ns() % 10**9}', action=action, session=DAEMON_SESSION, params=params or {})
+	with _connect(timeout) as sock:
+		sock.sendall((request.to_json() + '\n').encode())
+		data = b''
+		while not data.endswith(b'\n'):
+			chunk = sock.recv(65536)
+			if not chunk:
+				break
+			data += chunk
+	if not data:
+		return Response(id=request.id, success=False, error='No response from daemon')
+	return Response.from_json(data.decode())
+
+
+def is_daemon_running() -> bool:
+	try:
+		_connect(timeout=0.5).close()
+		return True
+	except OSError:
+		return False
+
+
+def ensure_daemon(headed: bool = False, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, wait: float = 15.0) -> bool:
+	"""Start the daemon in the background unless it is already accepting connections. Returns True if started."""
+	if is_daemon_running():
+		return False
+
+	cmd = [sys.executable, '-m', 'web_agent.skill_cli.daemon', '--idle-timeout', str(idle_timeout)]
+	if headed:
+		cmd.append('--headed')
+	log_file = open(get_log_path(DAEMON_SESSION), 'ab')
+	if sys.platform == 'win32':
+		subprocess.Popen(
+			cmd,
+			creationflags=subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.CREATE_NO_WINDOW,
+			stdout=log_file,
+			stderr=log_file,
+		)
+	else:
+		subprocess.Popen(cmd, start_new_session=True, stdout=log_file, stderr=log_file)
+	log_file.close()
+
+	deadline = time.monotonic() + wait
+	while time.monotonic() < deadline:
+		if is_daemon_running():
+			return True
+		time.sleep(0.05)
+	raise RuntimeError(f'Agent daemon did not start, see {get_log_path(DAEMON_SESSION)}')
+
+
+def run_task_via_daemon(
+	task: str,
+	model: str | None = None,
+	max_steps: int | None = None,
+	headed: bool = False,
+	browser: dict[str, Any] | None = None,
+) -> int:
+	"""Run a task on the daemon (starting it if needed), print the result and return a process exit code.
+
+	headed only applies when the daemon is started by this call; browser holds BrowserProfile options for this
+	task (see browser_settings_from_cli), the daemon relaunches its browser when they differ from the current ones.
+	"""
+	try:
+		if ensure_daemon(headed=headed):
+			print('🔥 Started warm agent daemon (stop it with: web-agent --daemon-stop)', file=sys.stderr)
+		response = send_request('run', {'task': task, 'model': model, 'max_steps': max_steps, 'browser': browser or {}})
+	except (OSError, RuntimeError) as e:
+		print(f'Error: {e}', file=sys.stderr)
+		return 1
+
+	if not response.success:
+		print(f'Error: {response.error}', file=sys.stderr)
+		return 1
+	data = response.data or {}
+	if data.get('result'):
+		print(data['result'])
+	for error in data.get('errors', []):
+		print(f'⚠️  {error}', file=sys.stderr)
+	return 0 if data.get('done') else 1
+
+
+def stop_daemon() -> int:
+	if not is_daemon_running():
+		print('Agent daemon is not running')
+		return 0
+	response = send_request('shutdown', timeout=10)
+	print('Agent daemon stopped' if response.success else f'Error: {response.error}')
+	return 0 if response.success else 1
+
+
+def browser_settings_from_cli(params: dict[str, Any]) -> dict[str, Any]:
+	"""BrowserProfile options given on the web-agent command line, mapped like update_config_with_click_args() in cli.py"""
+	settings: dict[str, Any] = {}
+	for key in ('headless', 'window_width', 'window_height', 'user_data_dir', 'profile_directory', 'cdp_url'):
+		if params.get(key) is not None:
+			settings[key] = params[key]
+
+	proxy: dict[str, str] = {}
+	if params.get('proxy_url'):
+		proxy['server'] = params['proxy_url']
+	if params.get('no_proxy'):
+		proxy['bypass'] = ','.join([p.strip() for p in params['no_proxy'].split(',') if p.strip()])
+	if params.get('proxy_username'):
+		proxy['username'] = params['proxy_username']
+	if params.get('proxy_password'):
+		proxy['password'] = params['proxy_password']
+	if proxy:
+		settings['proxy'] = proxy
+	return settings
+
+
+def _cli_command() -> Any:
+	"""Parser for the options of the web-agent command that the thin client uses (others are ignored)"""
+	import click
+
+	@click.command(context_settings={'ignore_unknown_options': True, 'allow_extra_args': True, 'help_option_names': []})
+	@click.option('-p', '--prompt', type=str)
+	@click.option('--model', type=str)
+	@click.option('--max-steps', type=int)
+	@click.option('--headless', is_flag=True, default=None)
+	@click.option('--window-width', type=int)
+	@click.option('--window-height', type=int)
+	@click.option('--user-data-dir', type=str)
+	@click.option('--profile-directory', type=str)
+	@click.option('--cdp-url', type=str)
+	@click.option('--proxy-url', type=str)
+	@click.option('--no-proxy', type=str)
+	@click.option('--proxy-username', type=str)
+	@click.option('--proxy-password', type=str)
+	@click.option('--daemon', is_flag=True)
+	@click.option('--daemon-stop', is_flag=True)
+	def command(**kwargs: Any) -> None:
+		pass
+
+	return command
+
+
+def run_cli(args: list[str]) -> int | None:
+	"""Handle --daemon / --daemon-stop in the web-agent arguments. Returns an exit code, or None if neither was given."""
+	import click
+
+	try:
+		params = _cli_command().make_context('web-agent', list(args)).params
+	except click.ClickException as e:
+		e.show()
+		return e.exit_code
+
+	if params['daemon_stop']:
+		return stop_daemon()
+	if not params['daemon']:
+		return None
+	if not params['prompt']:
+		print('Error: --daemon requires a task, e.g. web-agent -p "task" --daemon', file=sys.stderr)
+		return 1
+	return run_task_via_daemon(
+		params['prompt'],
+		model=params['model'],
+		max_steps=params['max_steps'],
+		browser=browser_settings_from_cli(params),
+	)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description='web-agent warm agent daemon')
+	parser.add_argument('--headed', action='store_true', help='Show the browser window')
+	parser.add_argument('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT, help='Exit after this many idle seconds')
+	args = parser.parse_args()
+
+	logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+	try:
+		asyncio.run(AgentDaemon(headed=args.headed, idle_timeout=args.idle_timeout).run())
+	except KeyboardInterrupt:
+		logger.info('Interrupted')
+
+
+if __name__ == '__main__':
+	main()
@@ -337,13 +337,14 @@ def send_command(session: str, action: str, params: dict) -> dict:
 		# Send request
 		sock.sendall((json.dumps(request) + '\n').encode())
 
-		# Read response
-		data = b''
-		while not data.endswith(b'\n'):
-			chunk = sock.recv(4096)
+		# Read response (screenshots can be megabytes of base64, so read in large chunks without re-copying)
+		chunks: list[bytes] = []
+		while not chunks or not chunks[-1].endswith(b'\n'):
+			chunk = sock.recv(65536)
 			if not chunk:
 				break
-			data += chunk
+			chunks.append(chunk)
+		data = b''.join(chunks)
 
 		if not data:
 			return {'id': request['id'], 'success': False, 'error': 'No response from server'}
@@ -1,12 +1,35 @@
 """Wire protocol for CLI↔Server communication.
 
 Uses JSON over Unix sockets (or TCP on Windows) with newline-delimited messages.
+Every request carries an `id` that is echoed in its response, so a client may send several
+requests on one connection and match responses that arrive out of order.
 """
 
 import json
 from dataclasses import asdict, dataclass, field
 from typing import Any
 
+try:
+	import orjson
+
+	ORJSON_AVAILABLE = True
+except ImportError:
+	ORJSON_AVAILABLE = False
+
+
+def encode_message(message: dict[str, Any]) -> bytes:
+	"""Serialize a message to one newline-terminated line (orjson when installed)"""
+	if ORJSON_AVAILABLE:
+		return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+	return (json.dumps(message) + '\n').encode()
+
+
+def decode_message(line: bytes | str) -> dict[str, Any]:
+	"""Parse one line; raises ValueError (json.JSONDecodeError is a subclass) on malformed input"""
+	if ORJSON_AVAILABLE:
+		return orjson.loads(line)
+	return json.loads(line)
+
 
 @dataclass
 class Request:
@@ -18,11 +41,11 @@ class Request:
 	params: dict[str, Any] = field(default_factory=dict)
 
 	def to_json(self) -> str:
-		return json.dumps(asdict(self))
+		return encode_message(asdict(self)).decode().rstrip('\n')
 
 	@classmethod
-	def from_json(cls, data: str) -> 'Request':
-		d = json.loads(data)
+	def from_json(cls, data: str | bytes) -> 'Request':
+		d = decode_message(data)
 		return cls(
 			id=d['id'],
 			action=d['action'],
@@ -41,11 +64,11 @@ class Response:
 	error: str | None = None
 
 	def to_json(self) -> str:
-		return json.dumps(asdict(self))
+		return encode_message(asdict(self)).decode().rstrip('\n')
 
 	@classmethod
-	def from_json(cls, data: str) -> 'Response':
-		d = json.loads(data)
+	def from_json(cls, data: str | bytes) -> 'Response':
+		d = decode_message(data)
 		return cls(
 			id=d['id'],
 			success=d['success'],
@@ -7,16 +7,18 @@ for IPC communication.
 
 import argparse
 import asyncio
-import json
 import logging
 import os
 import signal
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 from typing import IO
 
 import portalocker
 
+from web_agent.skill_cli.protocol import decode_message, encode_message
+
 # Configure logging before imports
 logging.basicConfig(
 	level=logging.INFO,
@@ -44,6 +46,7 @@ class SessionServer:
 		self._server: asyncio.Server | None = None
 		self._shutdown_event: asyncio.Event | None = None
 		self._lock_file: IO | None = None
+		self._commands: SimpleNamespace | None = None
 
 		# Lazy import to avoid loading everything at startup
 		from web_agent.skill_cli.sessions import SessionRegistry
@@ -55,14 +58,45 @@ class SessionServer:
 		reader: asyncio.StreamReader,
 		writer: asyncio.StreamWriter,
 	) -> None:
-		"""Handle a client connection."""
+		"""Handle a client connection.
+
+		Each request runs in its own task and its response is written as soon as it is ready,
+		tagged with the request id, so a client can pipeline commands on one connection
+		(e.g. `state` while a `run` is still in progress).
+		"""
 		addr = writer.get_extra_info('peername')
 		logger.debug(f'Connection from {addr}')
 
+		write_lock = asyncio.Lock()
+		in_flight: set[asyncio.Task] = set()
+
+		async def respond(line: bytes) -> None:
+			request: dict = {}
+			try:
+				request = decode_message(line)
+				response = await self.dispatch(request)
+			except ValueError as e:
+				response = {'id': '', 'success': False, 'error': f'Invalid JSON: {e}'}
+			except Exception as e:
+				logger.exception(f'Error handling request: {e}')
+				response = {'id': request.get('id', ''), 'success': False, 'error': str(e)}
+
+			try:
+				async with write_lock:
+					writer.write(encode_message(response))
+					await writer.drain()
+			except ConnectionError:
+				logger.debug(f'Client {addr} went away before response {response.get("id")} was sent')
+
+			# Check for shutdown command (as a separate task: shutdown waits for open connections to close)
+			if request.get('action') == 'shutdown':
+				asyncio.create_task(self.shutdown())
+
 		try:
 			while self.running:
 				try:
-					line = await asyncio.wait_for(reader.readline(), timeout=300)  # 5 min timeout
+					# Only time out idle connections, not ones waiting on long-running commands
+					line = await asyncio.wait_for(reader.readline(), timeout=None if in_flight else 300)  # 5 min timeout
 				except TimeoutError:
 					logger.debug(f'Connection timeout from {addr}')
 					break
@@ -70,35 +104,39 @@ class SessionServer:
 				if not line:
 					break
 
-				request = {}
-				try:
-					request = json.loads(line.decode())
-					response = await self.dispatch(request)
-				except json.JSONDecodeError as e:
-					response = {'id': '', 'success': False, 'error': f'Invalid JSON: {e}'}
-				except Exception as e:
-					logger.exception(f'Error handling request: {e}')
-					response = {'id': '', 'success': False, 'error': str(e)}
-
-				writer.write((json.dumps(response) + '\n').encode())
-				await writer.drain()
-
-				# Check for shutdown command
-				if request.get('action') == 'shutdown':
-					await self.shutdown()
-					break
+				task = asyncio.create_task(respond(line))
+				in_flight.add(task)
+				task.add_done_callback(in_flight.discard)
+
+			# Client closed its write side (or server is stopping): finish what it already sent
+			if in_flight:
+				await asyncio.gather(*in_flight, return_exceptions=True)
 
 		except Exception as e:
 			logger.exception(f'Connection error: {e}')
 		finally:
+			for task in in_flight:
+				task.cancel()
 			writer.close()
 			try:
 				await writer.wait_closed()
 			except Exception:
 				pass
 
+	def _get_commands(self) -> SimpleNamespace:
+		"""Command handler modules, imported on first use instead of on every dispatch"""
+		if self._commands is None:
+			from web_agent.skill_cli.commands import agent, browser, python_exec, session
+
+			self._commands = SimpleNamespace(agent=agent, browser=browser, python_exec=python_exec, session=session)
+		return self._commands
+
 	async def dispatch(self, request: dict) -> dict:
-		"""Dispatch command to appropriate handler."""
+		"""Dispatch command to appropriate handler.
+
+		Commands that change page state hold the session's lock so they run one at a time,
+		while read-only queries (browser.READ_ONLY_COMMANDS) run alongside them.
+		"""
 		action = request.get('action', '')
 		params = request.get('params', {})
 		req_id = request.get('id', '')
@@ -106,21 +144,23 @@ class SessionServer:
 		logger.info(f'Dispatch: {action} (id={req_id})')
 
 		try:
-			# Import command handlers
-			from web_agent.skill_cli.commands import agent, browser, python_exec, session
+			commands = self._get_commands()
 
 			# Handle shutdown
 			if action == 'shutdown':
 				return {'id': req_id, 'success': True, 'data': {'shutdown': True}}
 
 			# Session commands don't need a browser session
-			if action in session.COMMANDS:
-				result = await session.handle(action, self.session_name, self.registry, params)
+			if action in commands.session.COMMANDS:
+				result = await commands.session.handle(action, self.session_name, self.registry, params)
 				# Check if command wants to shutdown server
 				if result.get('_shutdown'):
 					asyncio.create_task(self.shutdown())
 				return {'id': req_id, 'success': True, 'data': result}
 
+			if action not in commands.browser.COMMANDS and action not in ('python', 'run'):
+				return {'id': req_id, 'success': False, 'error': f'Unknown action: {action}'}
+
 			# Get or create session for browser commands
 			session_info = await self.registry.get_or_create(
 				self.session_name,
@@ -129,15 +169,17 @@ class SessionServer:
 				self.profile,
 			)
 
-			# Dispatch to handler
-			if action in browser.COMMANDS:
-				result = await browser.handle(action, session_info, params)
-			elif action == 'python':
-				result = await python_exec.handle(session_info, params)
-			elif action == 'run':
-				result = await agent.handle(session_info, params)
+			if action in commands.browser.READ_ONLY_COMMANDS:
+				result = await commands.browser.handle(action, session_info, params)
 			else:
-				return {'id': req_id, 'success': False, 'error': f'Unknown action: {action}'}
+				async with session_info.lock:
+					# Dispatch to handler
+					if action in commands.browser.COMMANDS:
+						result = await commands.browser.handle(action, session_info, params)
+					elif action == 'python':
+						result = await commands.python_exec.handle(session_info, params)
+					else:
+						result = await commands.agent.handle(session_info, params)
 
 			return {'id': req_id, 'success': True, 'data': result}
 
@@ -1,5 +1,6 @@
 """Session registry - manages BrowserSession instances."""
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from typing import Any
@@ -20,6 +21,8 @@ class SessionInfo:
 	profile: str | None
 	browser_session: BrowserSession
 	python_session: PythonSession = field(default_factory=PythonSession)
+	# Held by commands that change page state so they don't interleave; read-only queries skip it
+	lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
 
 class SessionRegistry:
@@ -31,6 +34,7 @@ class SessionRegistry:
 
 	def __init__(self) -> None:
 		self._sessions: dict[str, SessionInfo] = {}
+		self._create_locks: dict[str, asyncio.Lock] = {}
 
 	async def get_or_create(
 		self,
@@ -39,10 +43,25 @@ class SessionRegistry:
 		headed: bool,
 		profile: str | None,
 	) -> SessionInfo:
-		"""Get existing session or create new one."""
+		"""Get existing session or create new one.
+
+		Concurrent callers for the same name wait for a single browser to start instead of each launching one.
+		"""
 		if name in self._sessions:
 			return self._sessions[name]
 
+		async with self._create_locks.setdefault(name, asyncio.Lock()):
+			if name in self._sessions:
+				return self._sessions[name]
+			return await self._create(name, browser_mode, headed, profile)
+
+	async def _create(
+		self,
+		name: str,
+		browser_mode: str,
+		headed: bool,
+		profile: str | None,
+	) -> SessionInfo:
 		logger.info(f'Creating new session: {name} (mode={browser_mode}, headed={headed})')
 
 		browser_session = await create_browser_session(browser_mode, headed, profile)
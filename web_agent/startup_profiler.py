@@ -0,0 +1,81 @@
+"""Phase timing for cold starts (imports, config, LLM setup, browser launch, CDP connect, first step).
+
+Enabled with ``web-agent --profile-startup`` or ``web_agent_PROFILE_STARTUP=true``. Offsets are measured from
+interpreter start, so the first phase includes Python startup and module imports. The table is printed to stderr
+once, when the agent is about to run its first step. Kept free of heavy imports so it can be loaded before anything else.
+"""
+
+import os
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+
+def _process_started_at() -> float:
+	try:
+		import psutil
+
+		return psutil.Process().create_time()
+	except Exception:
+		return time.time()
+
+
+@dataclass
+class StartupPhase:
+	name: str
+	started: float  # Seconds since interpreter start
+	duration: float  # 0 for milestones
+
+
+class StartupProfiler:
+	"""Records named phases and milestones relative to interpreter start; a no-op unless enabled."""
+
+	def __init__(self, enabled: bool = False):
+		self.enabled = enabled
+		self.phases: list[StartupPhase] = []
+		self._origin = _process_started_at()
+		self._reported = False
+
+	def enable(self) -> None:
+		self.enabled = True
+
+	def _elapsed(self) -> float:
+		return time.time() - self._origin
+
+	@contextmanager
+	def phase(self, name: str) -> Iterator[None]:
+		"""``with startup_profiler.phase('cdp connect'):`` time a block of startup work"""
+		if not self.enabled or self._reported:
+			yield
+			return
+		started = self._elapsed()
+		try:
+			yield
+		finally:
+			self.phases.append(StartupPhase(name=name, started=started, duration=self._elapsed() - started))
+
+	def mark(self, name: str) -> None:
+		"""Record a milestone, e.g. 'imports done' or 'first step'"""
+		if self.enabled and not self._reported:
+			self.phases.append(StartupPhase(name=name, started=self._elapsed(), duration=0.0))
+
+	def report(self) -> str:
+		lines = ['⏱️  Startup profile (seconds since interpreter start):']
+		for phase in sorted(self.phases, key=lambda phase: phase.started):
+			if phase.duration:
+				lines.append(f'  {phase.started:7.3f}s  {phase.name:<28} {phase.duration * 1000:8.1f} ms')
+			else:
+				lines.append(f'  {phase.started:7.3f}s  ▸ {phase.name}')
+		return '\n'.join(lines)
+
+	def log_report(self) -> None:
+		"""Print the table to stderr once (log levels are often raised in CLI mode); later phases are ignored"""
+		if not self.enabled or self._reported:
+			return
+		self._reported = True
+		print(self.report(), file=sys.stderr)
+
+
+startup_profiler = StartupProfiler(enabled=os.getenv('web_agent_PROFILE_STARTUP', 'false').lower() in ('true', '1', 'yes'))
@@ -1,6 +1,38 @@
 """Cloud sync module for web agent."""
 
-from web_agent.sync.auth import CloudAuthConfig, DeviceAuthClient
-from web_agent.sync.service import CloudSync
+from typing import TYPE_CHECKING
 
-__all__ = ['CloudAuthConfig', 'DeviceAuthClient', 'CloudSync']
+# Type stubs for lazy imports
+if TYPE_CHECKING:
+	from web_agent.sync.auth import CloudAuthConfig, DeviceAuthClient
+	from web_agent.sync.service import CloudSync
+	from web_agent.sync.uploader import EventUploader
+
+# Lazy imports mapping
+_LAZY_IMPORTS = {
+	'CloudAuthConfig': ('web_agent.sync.auth', 'CloudAuthConfig'),
+	'DeviceAuthClient': ('web_agent.sync.auth', 'DeviceAuthClient'),
+	'CloudSync': ('web_agent.sync.service', 'CloudSync'),
+	'EventUploader': ('web_agent.sync.uploader', 'EventUploader'),
+}
+
+
+def __getattr__(name: str):
+	"""Lazy import mechanism for cloud sync components."""
+	if name in _LAZY_IMPORTS:
+		module_path, attr_name = _LAZY_IMPORTS[name]
+		try:
+			from importlib import import_module
+
+			module = import_module(module_path)
+			attr = getattr(module, attr_name)
+			# Cache the imported attribute in the module's globals
+			globals()[name] = attr
+			return attr
+		except ImportError as e:
+			raise ImportError(f'Failed to import {name} from {module_path}: {e}') from e
+
+	raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+__all__ = ['CloudAuthConfig', 'DeviceAuthClient', 'CloudSync', 'EventUploader']
@@ -4,11 +4,11 @@ Cloud sync service for sending events to the web agent cloud.
 
 import logging
 
-import httpx
 from bubus import BaseEvent
 
 from web_agent.config import CONFIG
 from web_agent.sync.auth import TEMP_USER_ID, DeviceAuthClient
+from web_agent.sync.uploader import EventUploader
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +25,12 @@ class CloudSync:
 		self.auth_flow_active = False  # Flag to indicate auth flow is running
 		# Check if cloud sync is actually enabled - if not, we should remain silent
 		self.enabled = CONFIG.web_agent_CLOUD_SYNC
+		# Events are uploaded in batches from a background task; undeliverable ones are spooled to disk
+		self.uploader = EventUploader(
+			endpoint=f'{self.base_url.rstrip("/")}/api/v1/events',
+			get_headers=lambda: self.auth_client.get_headers() if self.auth_client else {},
+			spool_path=CONFIG.web_agent_CONFIG_DIR / 'events' / 'cloud_sync_spool.jsonl' if self.enabled else None,
+		)
 
 	async def handle_event(self, event: BaseEvent) -> None:
 		"""Handle an event by sending it to the cloud"""
@@ -55,10 +61,8 @@ class CloudSync:
 			logger.error(f'Failed to handle {event.event_type} event: {type(e).__name__}: {e}', exc_info=True)
 
 	async def _send_event(self, event: BaseEvent) -> None:
-		"""Send event to cloud API"""
+		"""Queue event for upload to the cloud API (never waits on the network)"""
 		try:
-			headers = {}
-
 			# Override user_id only if it's not already set to a specific value
 			# This allows CLI and other code to explicitly set temp user_id when needed
 			if self.auth_client and self.auth_client.is_authenticated:
@@ -71,38 +75,22 @@ class CloudSync:
 				if not hasattr(event, 'user_id') or not getattr(event, 'user_id', None):
 					setattr(event, 'user_id', TEMP_USER_ID)
 
-			# Add auth headers if available
-			if self.auth_client:
-				headers.update(self.auth_client.get_headers())
-
-			# Send event (batch format with direct BaseEvent serialization)
-			async with httpx.AsyncClient() as client:
-				# Serialize event and add device_id to all events
-				event_data = event.model_dump(mode='json')
-				if self.auth_client and self.auth_client.device_id:
-					event_data['device_id'] = self.auth_client.device_id
-
-				response = await client.post(
-					f'{self.base_url.rstrip("/")}/api/v1/events',
-					json={'events': [event_data]},
-					headers=headers,
-					timeout=10.0,
-				)
-
-				if response.status_code >= 400:
-					# Log error but don't raise - we want to fail silently
-					logger.debug(
-						f'Failed to send sync event: POST {response.request.url} {response.status_code} - {response.text}'
-					)
-		except httpx.TimeoutException:
-			logger.debug(f'Event send timed out after 10 seconds: {event}')
-		except httpx.ConnectError as e:
-			# logger.warning(f'⚠️ Failed to connect to cloud service at {self.base_url}: {e}')
-			pass
-		except httpx.HTTPError as e:
-			logger.debug(f'HTTP error sending event {event}: {type(e).__name__}: {e}')
+			# Serialize event now (it may be mutated later) and add device_id to all events
+			event_data = event.model_dump(mode='json')
+			if self.auth_client and self.auth_client.device_id:
+				event_data['device_id'] = self.auth_client.device_id
+
+			self.uploader.submit(event_data)
 		except Exception as e:
-			logger.debug(f'Unexpected error sending event {event}: {type(e).__name__}: {e}')
+			logger.debug(f'Unexpected error queueing event {event}: {type(e).__name__}: {e}')
+
+	async def flush(self, timeout: float | None = 10.0) -> None:
+		"""Wait until all handled events have been uploaded (or spooled for later)"""
+		await self.uploader.flush(timeout)
+
+	async def close(self, timeout: float | None = 10.0) -> None:
+		"""Flush pending events and stop the background uploader"""
+		await self.uploader.close(timeout)
 
 	# async def _update_wal_user_ids(self, session_id: str) -> None:
 	# 	"""Update user IDs in WAL file after authentication"""
@@ -0,0 +1,346 @@
+"""
+Background, batched uploader for cloud sync events.
+
+Events are queued without awaiting the network and a single worker task POSTs them in batches (bounded by event
+count, payload bytes and time) over one pooled, gzip-compressing HTTP client. Batches that can't be delivered because
+the endpoint is down are appended to a local JSONL spool file and re-sent once the endpoint is reachable again.
+
+Every process appends to its own spool file next to `spool_path` (`<stem>.<pid><suffix>`), so concurrent agents never
+interleave writes; replays pick up this process's file and those left behind by processes that have exited, claiming
+each one with an atomic rename. Spool file I/O runs in worker threads, never on the event loop.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import httpx
+import psutil
+
+logger = logging.getLogger(__name__)
+
+_FLUSH = object()  # Queue sentinel: send whatever has been collected so far
+
+
+class EventUploader:
+	"""Batches event dicts and POSTs them as `{"events": [...]}` to an endpoint from a background task.
+
+	`submit()` never awaits: it enqueues the event (or spools it if the queue is full) and starts the worker on first
+	use. Call `flush()` to wait until everything submitted so far has been sent or spooled, and `close()` when done.
+	"""
+
+	def __init__(
+		self,
+		endpoint: str,
+		get_headers: Callable[[], dict[str, str]] | None = None,
+		spool_path: Path | None = None,
+		max_batch_events: int = 50,
+		max_batch_bytes: int = 2 * 1024 * 1024,
+		flush_interval: float = 1.0,
+		max_queue_size: int = 1000,
+		max_spool_bytes: int = 50 * 1024 * 1024,
+		retry_interval: float = 30.0,
+		compress: bool = True,
+		timeout: float = 10.0,
+	):
+		self.endpoint = endpoint
+		self.get_headers = get_headers
+		self.spool_path = spool_path
+		self.max_batch_events = max_batch_events
+		self.max_batch_bytes = max_batch_bytes
+		self.flush_interval = flush_interval
+		self.max_spool_bytes = max_spool_bytes
+		self.retry_interval = retry_interval
+		self.compress = compress
+		self.timeout = timeout
+
+		self.events_sent = 0
+		self.events_spooled = 0
+		self.events_dropped = 0
+		self.requests_sent = 0
+
+		self._max_queue_size = max_queue_size
+		self._queue: asyncio.Queue[Any] | None = None
+		self._worker: asyncio.Task | None = None
+		self._client: httpx.AsyncClient | None = None
+		self._carry: bytes | None = None  # Event that didn't fit into the previous batch
+		self._retry_at = 0.0  # Skip POSTs (spool directly) until this time after a failed delivery
+		self._spool_lock = asyncio.Lock()  # Orders appends to this process's spool file with replays claiming it
+		self._spool_tasks: set[asyncio.Task] = set()  # Spool writes from submit() still in progress
+		self._spool_pending = False  # This process spooled events since its last replay
+
+	def submit(self, event_data: dict[str, Any]) -> None:
+		"""Queue an event for upload without waiting on the network"""
+		self._ensure_worker()
+		assert self._queue is not None
+		try:
+			self._queue.put_nowait(event_data)
+		except asyncio.QueueFull:
+			# The worker can't keep up: write the event to the spool instead of growing memory
+			task = asyncio.get_running_loop().create_task(self._spool([self._serialize(event_data)]))
+			self._spool_tasks.add(task)
+			task.add_done_callback(self._spool_tasks.discard)
+
+	async def flush(self, timeout: float | None = 10.0) -> None:
+		"""Wait until every event submitted so far has been delivered or spooled"""
+		if self._spool_tasks:
+			await asyncio.wait(set(self._spool_tasks), timeout=timeout)
+		if self._queue is None or self._worker is None or self._worker.done():
+			return
+		try:
+			self._queue.put_nowait(_FLUSH)
+		except asyncio.QueueFull:
+			pass  # A full queue produces full batches anyway
+		try:
+			await asyncio.wait_for(self._queue.join(), timeout)
+		except TimeoutError:
+			logger.debug(f'Cloud sync flush timed out after {timeout}s with {self._queue.qsize()} events queued')
+
+	async def close(self, timeout: float | None = 10.0) -> None:
+		"""Flush pending events, then stop the worker and close the HTTP client"""
+		await self.flush(timeout)
+		if self._worker is not None and not self._worker.done():
+			self._worker.cancel()
+			try:
+				await self._worker
+			except asyncio.CancelledError:
+				pass
+		self._worker = None
+		self._queue = None
+
+	def _ensure_worker(self) -> None:
+		if self._worker is not None and not self._worker.done():
+			return
+		if self._queue is None:
+			self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+		self._worker = asyncio.get_running_loop().create_task(self._run(), name='cloud_sync_uploader')
+
+	async def _run(self) -> None:
+		assert self._queue is not None
+		self._client = httpx.AsyncClient(
+			timeout=self.timeout,
+			limits=httpx.Limits(max_connections=2, max_keepalive_connections=2),
+		)
+		try:
+			# Re-send anything left over from earlier runs while the endpoint was down
+			await self._replay_spool()
+			while True:
+				batch, consumed = await self._next_batch()
+				try:
+					if batch:
+						await self._deliver(batch)
+				except Exception as e:
+					logger.debug(f'Unexpected error uploading sync events: {type(e).__name__}: {e}')
+				finally:
+					for _ in range(consumed):
+						self._queue.task_done()
+		finally:
+			await self._client.aclose()
+			self._client = None
+
+	async def _next_batch(self) -> tuple[list[bytes], int]:
+		"""Collect serialized events until the count, byte or time limit is hit (or a flush is requested).
+
+		Returns the batch and the number of queue items it accounts for (for task_done).
+		"""
+		assert self._queue is not None
+		loop = asyncio.get_running_loop()
+		batch: list[bytes] = []
+		size = 0
+		consumed = 0
+		if self._carry is not None:
+			batch.append(self._carry)
+			size = len(self._carry)
+			consumed = 1
+			self._carry = None
+
+		deadline = None
+		while len(batch) < self.max_batch_events:
+			if not batch:
+				item = await self._queue.get()
+			else:
+				if deadline is None:
+					deadline = loop.time() + self.flush_interval
+				remaining = deadline - loop.time()
+				if remaining <= 0:
+					break
+				try:
+					item = await asyncio.wait_for(self._queue.get(), remaining)
+				except TimeoutError:
+					break
+
+			if item is _FLUSH:
+				self._queue.task_done()
+				if batch:
+					break
+				continue
+
+			data = self._serialize(item)
+			if batch and size + len(data) > self.max_batch_bytes:
+				# Sent with the next batch; its task_done is owed by that batch
+				self._carry = data
+				break
+			batch.append(data)
+			size += len(data)
+			consumed += 1
+		return batch, consumed
+
+	@staticmethod
+	def _serialize(event_data: dict[str, Any]) -> bytes:
+		return json.dumps(event_data, separators=(',', ':'), ensure_ascii=False).encode()
+
+	async def _deliver(self, batch: list[bytes]) -> None:
+		if time.monotonic() < self._retry_at or not await self._post(batch):
+			await self._spool(batch)
+			return
+		# The endpoint is reachable again: re-send what was spooled while it wasn't
+		if self._spool_pending:
+			await self._replay_spool()
+
+	async def _post(self, batch: list[bytes]) -> bool:
+		"""POST one batch; False if it should be retried later (endpoint unreachable or overloaded)"""
+		assert self._client is not None
+		body = b'{"events":[' + b','.join(batch) + b']}'
+		headers = {'Content-Type': 'application/json'}
+		if self.get_headers is not None:
+			headers.update(self.get_headers())
+		if self.compress:
+			body = gzip.compress(body, compresslevel=5)
+			headers['Content-Encoding'] = 'gzip'
+
+		try:
+			response = await self._client.post(self.endpoint, content=body, headers=headers)
+		except (httpx.TimeoutException, httpx.TransportError) as e:
+			logger.debug(f'Cloud sync endpoint unreachable, spooling {len(batch)} events: {type(e).__name__}: {e}')
+			self._retry_at = time.monotonic() + self.retry_interval
+			return False
+
+		self.requests_sent += 1
+		if response.status_code == 429 or response.status_code >= 500:
+			logger.debug(f'Cloud sync endpoint busy, spooling {len(batch)} events: POST {self.endpoint} {response.status_code}')
+			self._retry_at = time.monotonic() + self.retry_interval
+			return False
+		if response.status_code >= 400:
+			# Log error but don't retry - the payload itself was rejected
+			logger.debug(f'Failed to send sync events: POST {self.endpoint} {response.status_code} - {response.text}')
+			self.events_dropped += len(batch)
+			return True
+
+		self._retry_at = 0.0
+		self.events_sent += len(batch)
+		return True
+
+	@property
+	def _own_spool_path(self) -> Path | None:
+		"""Spool file of this process: processes sharing spool_path never append to the same file"""
+		if self.spool_path is None:
+			return None
+		return self.spool_path.with_name(f'{self.spool_path.stem}.{os.getpid()}{self.spool_path.suffix}')
+
+	async def _spool(self, batch: list[bytes]) -> None:
+		"""Append serialized events to the JSONL spool file (or drop them if spooling is off or the spool is full)"""
+		if self.spool_path is None:
+			self.events_dropped += len(batch)
+			return
+		async with self._spool_lock:
+			spooled = await asyncio.to_thread(self._append_to_spool, batch)
+		if spooled:
+			self.events_spooled += len(batch)
+			self._spool_pending = True
+		else:
+			self.events_dropped += len(batch)
+
+	def _append_to_spool(self, batch: list[bytes], check_size: bool = True) -> bool:
+		"""Blocking part of _spool(), run in a worker thread; False if the events had to be dropped"""
+		path = self._own_spool_path
+		assert path is not None
+		try:
+			path.parent.mkdir(parents=True, exist_ok=True)
+			with open(path, 'ab') as f:
+				if check_size and f.tell() >= self.max_spool_bytes:
+					logger.debug(f'Cloud sync spool {path} is full, dropping {len(batch)} events')
+					return False
+				f.write(b''.join(data + b'\n' for data in batch))
+			return True
+		except OSError as e:
+			logger.debug(f'Failed to spool sync events to {path}: {type(e).__name__}: {e}')
+			return False
+
+	def _claim_spool_files(self) -> tuple[list[Path], list[bytes]]:
+		"""Rename the spool files no live process appends to (ours included) out of the way and read their events.
+
+		Blocking, run in a worker thread. The rename is atomic, so when several processes replay at once every
+		file is claimed (and re-sent) by exactly one of them. Returns the claimed paths and the spooled lines.
+		"""
+		assert self.spool_path is not None
+		stem, suffix, pid = self.spool_path.stem, self.spool_path.suffix, os.getpid()
+		claimed: list[Path] = []
+		lines: list[bytes] = []
+		try:
+			candidates = [self.spool_path, *self.spool_path.parent.glob(f'{stem}.*{suffix}')]
+		except OSError:
+			return claimed, lines
+		for index, path in enumerate(candidates):
+			# <stem>.<pid><suffix> while written, <stem>.<pid>.replay<n><suffix> while claimed, <stem><suffix> (legacy)
+			owner = path.name[len(stem) + 1 : len(path.name) - len(suffix)].split('.')[0]
+			if owner.isdigit() and int(owner) != pid and psutil.pid_exists(int(owner)):
+				continue
+			claim_path = path.with_name(f'{stem}.{pid}.replay{index}{suffix}')
+			try:
+				os.replace(path, claim_path)
+				data = claim_path.read_bytes()
+			except FileNotFoundError:
+				continue  # Claimed by another process first
+			except OSError as e:
+				logger.debug(f'Failed to read sync spool {path}: {type(e).__name__}: {e}')
+				continue
+			claimed.append(claim_path)
+			lines.extend(line for line in data.splitlines() if line.strip())
+		return claimed, lines
+
+	def _release_spool_files(self, claimed: list[Path], remaining: list[bytes]) -> None:
+		"""Blocking, run in a worker thread: keep undelivered events in our own spool, then drop the claimed files"""
+		if remaining and not self._append_to_spool(remaining, check_size=False):
+			return  # Keep the claimed files rather than lose their events; the next replay picks them up
+		for path in claimed:
+			try:
+				path.unlink()
+			except OSError as e:
+				logger.debug(f'Failed to remove sync spool {path}: {type(e).__name__}: {e}')
+
+	async def _replay_spool(self) -> None:
+		"""Re-send spooled events in batches, keeping whatever couldn't be delivered"""
+		if self.spool_path is None:
+			return
+		async with self._spool_lock:
+			claimed, lines = await asyncio.to_thread(self._claim_spool_files)
+			self._spool_pending = False
+		if not claimed:
+			return
+
+		done = 0
+		while done < len(lines):
+			batch: list[bytes] = []
+			size = 0
+			for line in lines[done:]:
+				if batch and (len(batch) >= self.max_batch_events or size + len(line) > self.max_batch_bytes):
+					break
+				batch.append(line)
+				size += len(line)
+			if not await self._post(batch):
+				break
+			done += len(batch)
+		if done:
+			logger.debug(f'Re-sent {done} spooled cloud sync events')
+
+		remaining = lines[done:]
+		async with self._spool_lock:
+			await asyncio.to_thread(self._release_spool_files, claimed, remaining)
+			if remaining:
+				self._spool_pending = True
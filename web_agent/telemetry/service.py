@@ -2,7 +2,6 @@ import logging
 import os
 
 from dotenv import load_dotenv
-from posthog import Posthog
 from uuid_extensions import uuid7str
 
 from web_agent.telemetry.views import BaseTelemetryEvent
@@ -43,6 +42,9 @@ class ProductTelemetry:
 			self._posthog_client = None
 		else:
 			logger.info('Using anonymized telemetry, see https://docs.web-agent.com/development/telemetry.')
+			# Imported here so runs with telemetry disabled never load the posthog client
+			from posthog import Posthog
+
 			self._posthog_client = Posthog(
 				project_api_key=self.PROJECT_API_KEY,
 				host=self.HOST,
@@ -3,13 +3,18 @@ Token cost service that tracks LLM token usage and costs.
 
 Fetches pricing data from LiteLLM repository and caches it for 1 day.
 Automatically tracks token usage when LLMs are registered and invoked.
+Usage is aggregated per model as it arrives, so summaries are O(number of models);
+only the most recent raw entries are kept in a bounded ring buffer.
 """
 
+import asyncio
 import logging
 import os
+from collections import deque
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 import anyio
 import httpx
@@ -22,6 +27,7 @@ from web_agent.tokens.mappings import MODEL_TO_LITELLM
 from web_agent.tokens.views import (
 	CachedPricingData,
 	ModelPricing,
+	ModelUsageAggregate,
 	ModelUsageStats,
 	ModelUsageTokens,
 	TokenCostCalculated,
@@ -45,6 +51,39 @@ def xdg_cache_home() -> Path:
 	return default
 
 
+# id(llm) -> service recording that LLM's usage in the current context, set by TokenCost.register_llm()
+_context_token_costs: ContextVar[dict[int, 'TokenCost']] = ContextVar('token_costs', default={})
+
+
+class _TrackedAinvoke:
+	"""Replacement for llm.ainvoke that records the usage of every call in the TokenCost of the calling context"""
+
+	def __init__(self, llm: BaseChatModel, token_cost: 'TokenCost'):
+		self.llm = llm
+		self.original_ainvoke = llm.ainvoke
+		# Last service to register the LLM, for calls from a context in which no service registered it
+		self.token_cost = token_cost
+
+	async def __call__(self, messages, output_format=None, **kwargs):
+		# Call the original method, passing through any additional kwargs
+		result = await self.original_ainvoke(messages, output_format, **kwargs)
+
+		# Track usage if available (no await needed since add_usage is now sync)
+		# Use llm.model instead of llm.name for consistency with get_usage_tokens_for_model()
+		if result.usage:
+			model = self.llm.model
+			token_cost_service = _context_token_costs.get().get(id(self.llm), self.token_cost)
+			usage = token_cost_service.add_usage(model, result.usage)
+
+			logger.debug(f'Token cost service: {usage}')
+
+			create_task_with_error_handling(
+				token_cost_service._log_usage(model, usage), name='log_token_usage', suppress_exceptions=True
+			)
+
+		return result
+
+
 class TokenCost:
 	"""Service for tracking token usage and calculating costs"""
 
@@ -52,34 +91,93 @@ class TokenCost:
 	CACHE_DURATION = timedelta(days=1)
 	PRICING_URL = 'https://raw.githubusercontent.com/BerriAI/litellm/main/model_prices_and_context_window.json'
 
-	def __init__(self, include_cost: bool = False):
+	# Pricing loaded by any instance in this process (loaded_at, data, index), reused by later agents in long-lived processes
+	_process_pricing: ClassVar[tuple[datetime, dict[str, Any], dict[str, str]] | None] = None
+
+	MAX_USAGE_HISTORY = 10_000
+
+	def __init__(self, include_cost: bool = False, max_usage_history: int = MAX_USAGE_HISTORY):
 		self.include_cost = include_cost or os.getenv('web_agent_CALCULATE_COST', 'false').lower() == 'true'
 
-		self.usage_history: list[TokenUsageEntry] = []
+		# Ring buffer of the most recent raw entries, running totals live in _model_aggregates
+		self.usage_history: deque[TokenUsageEntry] = deque(maxlen=max_usage_history)
 		self.registered_llms: dict[str, BaseChatModel] = {}
+		self._model_aggregates: dict[str, ModelUsageAggregate] = {}
+		# Entries recorded before pricing data was available, costed once it is loaded
+		self._uncosted_entries: list[TokenUsageEntry] = []
 		self._pricing_data: dict[str, Any] | None = None
+		self._pricing_index: dict[str, str] = {}  # normalized model name -> LiteLLM key
+		self._pricing_lookup_cache: dict[str, ModelPricing | None] = {}
 		self._initialized = False
+		self._init_task: asyncio.Task[None] | None = None
 		self._cache_dir = xdg_cache_home() / self.CACHE_DIR_NAME
 
 	async def initialize(self) -> None:
-		"""Initialize the service by loading pricing data"""
-		if not self._initialized:
-			if self.include_cost:
-				await self._load_pricing_data()
-			self._initialized = True
+		"""Initialize the service by loading pricing data (concurrent callers share one load)"""
+		if self._initialized:
+			return
+		loop = asyncio.get_running_loop()
+		# Start a fresh load if none is running on this loop (a finished task here means the last load failed)
+		if self._init_task is None or self._init_task.done() or self._init_task.get_loop() is not loop:
+			self._init_task = loop.create_task(self._initialize(), name='token_cost_initialize')
+		await asyncio.shield(self._init_task)
+
+	async def _initialize(self) -> None:
+		if self.include_cost:
+			await self._load_pricing_data()
+		self._initialized = True
+
+	def _start_background_initialize(self) -> None:
+		"""Start loading pricing data in the background so the first LLM call does not wait for it"""
+		if self._initialized or self._init_task is not None or not self.include_cost:
+			return
+		try:
+			asyncio.get_running_loop()
+		except RuntimeError:
+			return  # No running loop (e.g. registered from sync code), initialize() loads lazily instead
+		create_task_with_error_handling(self.initialize(), name='token_cost_preload', suppress_exceptions=True)
 
 	async def _load_pricing_data(self) -> None:
-		"""Load pricing data from cache or fetch from GitHub"""
+		"""Load pricing data from this process, the cache or fetch from GitHub"""
+		shared = TokenCost._process_pricing
+		if shared and datetime.now() - shared[0] < self.CACHE_DURATION:
+			_, self._pricing_data, self._pricing_index = shared
+			self._pricing_lookup_cache.clear()
+			return
+
 		# Try to find a valid cache file
-		cache_file = await self._find_valid_cache()
+		cached = await self._find_valid_cache()
 
-		if cache_file:
-			await self._load_from_cache(cache_file)
+		if cached:
+			self._set_pricing_data(cached.data)
+			loaded_at = cached.timestamp
 		else:
 			await self._fetch_and_cache_pricing_data()
-
-	async def _find_valid_cache(self) -> Path | None:
-		"""Find the most recent valid cache file"""
+			loaded_at = datetime.now()
+
+		if self._pricing_data:
+			TokenCost._process_pricing = (loaded_at, self._pricing_data, self._pricing_index)
+
+	@staticmethod
+	def _normalize_model_name(model_name: str) -> str:
+		return model_name.strip().lower()
+
+	def _set_pricing_data(self, data: dict[str, Any]) -> None:
+		"""Store pricing data and precompute the normalized model name index"""
+		self._pricing_data = data
+		self._pricing_lookup_cache.clear()
+
+		index: dict[str, str] = {}
+		# Unprefixed keys win over provider-prefixed ones (e.g. 'gpt-4o' over 'openai/gpt-4o')
+		for key in data:
+			index.setdefault(self._normalize_model_name(key), key)
+		for key in data:
+			if '/' in key:
+				index.setdefault(self._normalize_model_name(key.rsplit('/', 1)[1]), key)
+		self._pricing_index = index
+
+	async def _find_valid_cache(self) -> CachedPricingData | None:
+		"""Find and parse the most recent valid cache file"""
 		try:
 			# Ensure cache directory exists
 			self._cache_dir.mkdir(parents=True, exist_ok=True)
@@ -95,8 +193,9 @@ class TokenCost:
 
 			# Check each file until we find a valid one
 			for cache_file in cache_files:
-				if await self._is_cache_valid(cache_file):
-					return cache_file
+				cached = await self._read_cache(cache_file)
+				if cached and datetime.now() - cached.timestamp < self.CACHE_DURATION:
+					return cached
 				else:
 					# Clean up old cache files
 					try:
@@ -108,28 +207,28 @@ class TokenCost:
 		except Exception:
 			return None
 
-	async def _is_cache_valid(self, cache_file: Path) -> bool:
-		"""Check if a specific cache file is valid and not expired"""
+	async def _read_cache(self, cache_file: Path) -> CachedPricingData | None:
+		"""Read and validate a cache file, parsing the (large) JSON off the event loop"""
 		try:
 			if not cache_file.exists():
-				return False
-
-			# Read the cached data
-			cached = CachedPricingData.model_validate_json(await anyio.Path(cache_file).read_text())
+				return None
+			content = await anyio.Path(cache_file).read_text()
+			return await anyio.to_thread.run_sync(CachedPricingData.model_validate_json, content)
+		except Exception as e:
+			logger.debug(f'Error loading cached pricing data from {cache_file}: {e}')
+			return None
 
-			# Check if cache is still valid
-			return datetime.now() - cached.timestamp < self.CACHE_DURATION
-		except Exception:
-			return False
+	async def _is_cache_valid(self, cache_file: Path) -> bool:
+		"""Check if a specific cache file is valid and not expired"""
+		cached = await self._read_cache(cache_file)
+		return cached is not None and datetime.now() - cached.timestamp < self.CACHE_DURATION
 
 	async def _load_from_cache(self, cache_file: Path) -> None:
 		"""Load pricing data from a specific cache file"""
-		try:
-			content = await anyio.Path(cache_file).read_text()
-			cached = CachedPricingData.model_validate_json(content)
-			self._pricing_data = cached.data
-		except Exception as e:
-			logger.debug(f'Error loading cached pricing data from {cache_file}: {e}')
+		cached = await self._read_cache(cache_file)
+		if cached:
+			self._set_pricing_data(cached.data)
+		else:
 			# Fall back to fetching
 			await self._fetch_and_cache_pricing_data()
 
@@ -140,7 +239,7 @@ class TokenCost:
 				response = await client.get(self.PRICING_URL, timeout=30)
 				response.raise_for_status()
 
-				self._pricing_data = response.json()
+				self._set_pricing_data(response.json())
 
 			# Create cache object with timestamp
 			cached = CachedPricingData(timestamp=datetime.now(), data=self._pricing_data or {})
@@ -152,11 +251,12 @@ class TokenCost:
 			timestamp_str = datetime.now().strftime('%Y%m%d_%H%M%S')
 			cache_file = self._cache_dir / f'pricing_{timestamp_str}.json'
 
-			await anyio.Path(cache_file).write_text(cached.model_dump_json(indent=2))
+			await anyio.Path(cache_file).write_text(await anyio.to_thread.run_sync(cached.model_dump_json))
 		except Exception as e:
 			logger.debug(f'Error fetching pricing data: {e}')
 			# Fall back to empty pricing data
-			self._pricing_data = {}
+			if self._pricing_data is None:
+				self._set_pricing_data({})
 
 	async def get_model_pricing(self, model_name: str) -> ModelPricing | None:
 		"""Get pricing information for a specific model"""
@@ -164,27 +264,32 @@ class TokenCost:
 		if not self._initialized:
 			await self.initialize()
 
-		# Check custom pricing first
-		if model_name in CUSTOM_MODEL_PRICING:
-			data = CUSTOM_MODEL_PRICING[model_name]
-			return ModelPricing(
-				model=model_name,
-				input_cost_per_token=data.get('input_cost_per_token'),
-				output_cost_per_token=data.get('output_cost_per_token'),
-				max_tokens=data.get('max_tokens'),
-				max_input_tokens=data.get('max_input_tokens'),
-				max_output_tokens=data.get('max_output_tokens'),
-				cache_read_input_token_cost=data.get('cache_read_input_token_cost'),
-				cache_creation_input_token_cost=data.get('cache_creation_input_token_cost'),
-			)
-
-		# Map model name to LiteLLM model name if needed
-		litellm_model_name = MODEL_TO_LITELLM.get(model_name, model_name)
+		return self._lookup_model_pricing(model_name)
 
-		if not self._pricing_data or litellm_model_name not in self._pricing_data:
-			return None
+	def _lookup_model_pricing(self, model_name: str) -> ModelPricing | None:
+		"""Resolve pricing from loaded data, memoized per requested model name"""
+		if model_name in self._pricing_lookup_cache:
+			return self._pricing_lookup_cache[model_name]
 
-		data = self._pricing_data[litellm_model_name]
+		pricing: ModelPricing | None = None
+		# Check custom pricing first
+		if model_name in CUSTOM_MODEL_PRICING:
+			pricing = self._build_model_pricing(model_name, CUSTOM_MODEL_PRICING[model_name])
+		elif self._pricing_data:
+			# Map model name to LiteLLM model name if needed
+			litellm_model_name = MODEL_TO_LITELLM.get(model_name, model_name)
+			if litellm_model_name not in self._pricing_data:
+				litellm_model_name = self._pricing_index.get(self._normalize_model_name(litellm_model_name), '')
+			if litellm_model_name in self._pricing_data:
+				pricing = self._build_model_pricing(model_name, self._pricing_data[litellm_model_name])
+
+		# Only memoize once pricing data is loaded, misses before that may resolve later
+		if self._pricing_data is not None or pricing is not None:
+			self._pricing_lookup_cache[model_name] = pricing
+		return pricing
+
+	@staticmethod
+	def _build_model_pricing(model_name: str, data: dict[str, Any]) -> ModelPricing:
 		return ModelPricing(
 			model=model_name,
 			input_cost_per_token=data.get('input_cost_per_token'),
@@ -201,6 +306,10 @@ class TokenCost:
 			return None
 
 		data = await self.get_model_pricing(model)
+		return self._calculate_cost_with_pricing(data, usage)
+
+	@staticmethod
+	def _calculate_cost_with_pricing(data: ModelPricing | None, usage: ChatInvokeUsage) -> TokenCostCalculated | None:
 		if data is None:
 			return None
 
@@ -225,7 +334,7 @@ class TokenCost:
 		)
 
 	def add_usage(self, model: str, usage: ChatInvokeUsage) -> TokenUsageEntry:
-		"""Add token usage entry to history (without calculating cost)"""
+		"""Add token usage entry to history and the per-model running totals"""
 		entry = TokenUsageEntry(
 			model=model,
 			timestamp=datetime.now(),
@@ -234,8 +343,43 @@ class TokenCost:
 
 		self.usage_history.append(entry)
 
+		aggregate = self._model_aggregates.get(model)
+		if aggregate is None:
+			aggregate = self._model_aggregates[model] = ModelUsageAggregate(model=model)
+		aggregate.prompt_tokens += usage.prompt_tokens
+		aggregate.prompt_cached_tokens += usage.prompt_cached_tokens or 0
+		aggregate.completion_tokens += usage.completion_tokens
+		aggregate.invocations += 1
+
+		if self.include_cost:
+			if self._initialized:
+				self._add_entry_cost(entry)
+			else:
+				self._uncosted_entries.append(entry)
+				self._start_background_initialize()
+
 		return entry
 
+	def _add_entry_cost(self, entry: TokenUsageEntry) -> None:
+		cost = self._calculate_cost_with_pricing(self._lookup_model_pricing(entry.model), entry.usage)
+		if cost is None:
+			return
+		aggregate = self._model_aggregates[entry.model]
+		aggregate.cost += cost.total_cost
+		aggregate.prompt_cost += cost.prompt_cost
+		aggregate.completion_cost += cost.completion_cost
+		aggregate.prompt_cached_cost += cost.prompt_read_cached_cost or 0
+
+	async def _ensure_costs_up_to_date(self) -> None:
+		"""Cost any entries that were recorded before pricing data finished loading"""
+		if not self.include_cost:
+			return
+		if not self._initialized:
+			await self.initialize()
+		pending, self._uncosted_entries = self._uncosted_entries, []
+		for entry in pending:
+			self._add_entry_cost(entry)
+
 	# async def _log_non_usage_llm(self, llm: BaseChatModel) -> None:
 	# 	"""Log non-usage to the logger"""
 	# 	C_CYAN = '\033[96m'
@@ -318,10 +462,21 @@ class TokenCost:
 		"""
 		Register an LLM to automatically track its token usage
 
-		@dev Guarantees that the same instance is not registered multiple times
+		@dev ainvoke is wrapped only once per LLM instance, however many services register it: each call is recorded
+		by the service that registered the LLM in the calling context (e.g. the agent whose task makes the call),
+		so agents sharing an LLM, concurrently or one after another, each count only their own calls
 		"""
 		# Use instance ID as key to avoid collisions between multiple instances
 		instance_id = str(id(llm))
+		_context_token_costs.set({**_context_token_costs.get(), id(llm): self})
+
+		tracked_ainvoke = llm.ainvoke
+		if isinstance(tracked_ainvoke, _TrackedAinvoke):
+			tracked_ainvoke.token_cost = self
+		else:
+			# Replace the method with our tracked version
+			# Using setattr to avoid type checking issues with overloaded methods
+			setattr(llm, 'ainvoke', _TrackedAinvoke(llm, self))
 
 		# Check if this exact instance is already registered
 		if instance_id in self.registered_llms:
@@ -329,80 +484,105 @@ class TokenCost:
 			return llm
 
 		self.registered_llms[instance_id] = llm
+		self._start_background_initialize()
+		return llm
 
-		# Store the original method
-		original_ainvoke = llm.ainvoke
-		# Store reference to self for use in the closure
-		token_cost_service = self
+	def activate(self) -> None:
+		"""Record usage of the registered LLMs in this service for calls made from the current context"""
+		for llm in self.registered_llms.values():
+			self.register_llm(llm)
 
-		# Create a wrapped version that tracks usage
-		async def tracked_ainvoke(messages, output_format=None, **kwargs):
-			# Call the original method, passing through any additional kwargs
-			result = await original_ainvoke(messages, output_format, **kwargs)
+	def get_usage_tokens_for_model(self, model: str) -> ModelUsageTokens:
+		"""Get usage tokens for a specific model"""
+		aggregate = self._model_aggregates.get(model) or ModelUsageAggregate(model=model)
 
-			# Track usage if available (no await needed since add_usage is now sync)
-			# Use llm.model instead of llm.name for consistency with get_usage_tokens_for_model()
-			if result.usage:
-				usage = token_cost_service.add_usage(llm.model, result.usage)
+		return ModelUsageTokens(
+			model=model,
+			prompt_tokens=aggregate.prompt_tokens,
+			prompt_cached_tokens=aggregate.prompt_cached_tokens,
+			completion_tokens=aggregate.completion_tokens,
+			total_tokens=aggregate.total_tokens,
+		)
 
-				logger.debug(f'Token cost service: {usage}')
+	async def get_usage_summary(self, model: str | None = None, since: datetime | None = None) -> UsageSummary:
+		"""Get summary of token usage and costs from the running per-model totals
 
-				create_task_with_error_handling(
-					token_cost_service._log_usage(llm.model, usage), name='log_token_usage', suppress_exceptions=True
-				)
+		Filtering by `since` needs raw entries and therefore only covers the entries still
+		held in the usage_history ring buffer.
+		"""
+		if since:
+			return await self._get_usage_summary_from_entries(model, since)
 
-			# else:
-			# 	await token_cost_service._log_non_usage_llm(llm)
+		await self._ensure_costs_up_to_date()
 
-			return result
+		aggregates = list(self._model_aggregates.values())
+		if model:
+			aggregates = [a for a in aggregates if a.model == model]
 
-		# Replace the method with our tracked version
-		# Using setattr to avoid type checking issues with overloaded methods
-		setattr(llm, 'ainvoke', tracked_ainvoke)
+		entry_count = sum(a.invocations for a in aggregates)
+		if not entry_count:
+			return self._empty_usage_summary()
 
-		return llm
+		model_stats: dict[str, ModelUsageStats] = {}
+		for aggregate in aggregates:
+			model_stats[aggregate.model] = ModelUsageStats(
+				model=aggregate.model,
+				prompt_tokens=aggregate.prompt_tokens,
+				completion_tokens=aggregate.completion_tokens,
+				total_tokens=aggregate.total_tokens,
+				cost=aggregate.cost,
+				invocations=aggregate.invocations,
+				average_tokens_per_invocation=aggregate.total_tokens / aggregate.invocations if aggregate.invocations else 0.0,
+			)
 
-	def get_usage_tokens_for_model(self, model: str) -> ModelUsageTokens:
-		"""Get usage tokens for a specific model"""
-		filtered_usage = [u for u in self.usage_history if u.model == model]
+		total_prompt = sum(a.prompt_tokens for a in aggregates)
+		total_completion = sum(a.completion_tokens for a in aggregates)
+		total_prompt_cost = sum(a.prompt_cost for a in aggregates)
+		total_completion_cost = sum(a.completion_cost for a in aggregates)
+		total_prompt_cached_cost = sum(a.prompt_cached_cost for a in aggregates)
 
-		return ModelUsageTokens(
-			model=model,
-			prompt_tokens=sum(u.usage.prompt_tokens for u in filtered_usage),
-			prompt_cached_tokens=sum(u.usage.prompt_cached_tokens or 0 for u in filtered_usage),
-			completion_tokens=sum(u.usage.completion_tokens for u in filtered_usage),
-			total_tokens=sum(u.usage.prompt_tokens + u.usage.completion_tokens for u in filtered_usage),
+		return UsageSummary(
+			total_prompt_tokens=total_prompt,
+			total_prompt_cost=total_prompt_cost,
+			total_prompt_cached_tokens=sum(a.prompt_cached_tokens for a in aggregates),
+			total_prompt_cached_cost=total_prompt_cached_cost,
+			total_completion_tokens=total_completion,
+			total_completion_cost=total_completion_cost,
+			total_tokens=total_prompt + total_completion,
+			total_cost=total_prompt_cost + total_completion_cost + total_prompt_cached_cost,
+			entry_count=entry_count,
+			by_model=model_stats,
 		)
 
-	async def get_usage_summary(self, model: str | None = None, since: datetime | None = None) -> UsageSummary:
-		"""Get summary of token usage and costs (costs calculated on-the-fly)"""
-		filtered_usage = self.usage_history
-
-		if model:
-			filtered_usage = [u for u in filtered_usage if u.model == model]
+	@staticmethod
+	def _empty_usage_summary() -> UsageSummary:
+		return UsageSummary(
+			total_prompt_tokens=0,
+			total_prompt_cost=0.0,
+			total_prompt_cached_tokens=0,
+			total_prompt_cached_cost=0.0,
+			total_completion_tokens=0,
+			total_completion_cost=0.0,
+			total_tokens=0,
+			total_cost=0.0,
+			entry_count=0,
+		)
 
-		if since:
-			filtered_usage = [u for u in filtered_usage if u.timestamp >= since]
+	async def _get_usage_summary_from_entries(self, model: str | None, since: datetime) -> UsageSummary:
+		"""Summarize the raw entries in the ring buffer (used for time-windowed summaries)"""
+		filtered_usage = [u for u in self.usage_history if u.timestamp >= since and (not model or u.model == model)]
 
 		if not filtered_usage:
-			return UsageSummary(
-				total_prompt_tokens=0,
-				total_prompt_cost=0.0,
-				total_prompt_cached_tokens=0,
-				total_prompt_cached_cost=0.0,
-				total_completion_tokens=0,
-				total_completion_cost=0.0,
-				total_tokens=0,
-				total_cost=0.0,
-				entry_count=0,
-			)
+			return self._empty_usage_summary()
+
+		if self.include_cost and not self._initialized:
+			await self.initialize()
 
 		# Calculate totals
 		total_prompt = sum(u.usage.prompt_tokens for u in filtered_usage)
 		total_completion = sum(u.usage.completion_tokens for u in filtered_usage)
 		total_tokens = total_prompt + total_completion
 		total_prompt_cached = sum(u.usage.prompt_cached_tokens or 0 for u in filtered_usage)
-		models = list({u.model for u in filtered_usage})
 
 		# Calculate per-model stats with record-by-record cost calculation
 		model_stats: dict[str, ModelUsageStats] = {}
@@ -421,8 +601,7 @@ class TokenCost:
 			stats.invocations += 1
 
 			if self.include_cost:
-				# Calculate cost record by record using the updated calculate_cost function
-				cost = await self.calculate_cost(entry.model, entry.usage)
+				cost = self._calculate_cost_with_pricing(self._lookup_model_pricing(entry.model), entry.usage)
 				if cost:
 					stats.cost += cost.total_cost
 					total_prompt_cost += cost.prompt_cost
@@ -459,7 +638,7 @@ class TokenCost:
 
 	async def log_usage_summary(self) -> None:
 		"""Log a comprehensive usage summary per model with colors and nice formatting"""
-		if not self.usage_history:
+		if not self._model_aggregates:
 			return
 
 		summary = await self.get_usage_summary()
@@ -506,18 +685,10 @@ class TokenCost:
 
 			# Format cost display (only if cost tracking is enabled)
 			if self.include_cost:
-				# Calculate per-model costs on-the-fly
-				total_model_cost = 0.0
-				model_prompt_cost = 0.0
-				model_completion_cost = 0.0
-
-				# Calculate costs for this model
-				for entry in self.usage_history:
-					if entry.model == model:
-						cost = await self.calculate_cost(entry.model, entry.usage)
-						if cost:
-							model_prompt_cost += cost.prompt_cost
-							model_completion_cost += cost.completion_cost
+				# Per-model costs come from the running totals
+				aggregate = self._model_aggregates[model]
+				model_prompt_cost = aggregate.prompt_cost
+				model_completion_cost = aggregate.completion_cost
 
 				total_model_cost = model_prompt_cost + model_completion_cost
 
@@ -546,8 +717,10 @@ class TokenCost:
 		return summary.by_model
 
 	def clear_history(self) -> None:
-		"""Clear usage history"""
-		self.usage_history = []
+		"""Clear usage history and running totals"""
+		self.usage_history.clear()
+		self._model_aggregates.clear()
+		self._uncosted_entries.clear()
 
 	async def refresh_pricing_data(self) -> None:
 		"""Force refresh of pricing data from GitHub"""
@@ -80,6 +80,26 @@ class ModelUsageStats(BaseModel):
 	average_tokens_per_invocation: float = 0.0
 
 
+class ModelUsageAggregate(BaseModel):
+	"""Running usage and cost totals for a single model, updated on every add_usage call"""
+
+	model: str
+	prompt_tokens: int = 0
+	prompt_cached_tokens: int = 0
+	completion_tokens: int = 0
+	invocations: int = 0
+
+	# Cost totals only include entries whose pricing was known when they were costed
+	prompt_cost: float = 0.0
+	prompt_cached_cost: float = 0.0
+	completion_cost: float = 0.0
+	cost: float = 0.0
+
+	@property
+	def total_tokens(self) -> int:
+		return self.prompt_tokens + self.completion_tokens
+
+
 class ModelUsageTokens(BaseModel):
 	"""Usage tokens for a single model"""
 
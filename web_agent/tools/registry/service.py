@@ -12,6 +12,7 @@ import pyotp
 from pydantic import BaseModel, Field, RootModel, create_model
 
 from web_agent.browser import BrowserSession
+from web_agent.domain_matcher import compile_domain_patterns
 from web_agent.filesystem.file_system import FileSystem
 from web_agent.llm.base import BaseChatModel
 from web_agent.observability import observe_debug
@@ -22,7 +23,7 @@ from web_agent.tools.registry.views import (
 	RegisteredAction,
 	SpecialActionParameters,
 )
-from web_agent.utils import is_new_tab_page, match_url_with_domain_pattern, time_execution_async
+from web_agent.utils import is_new_tab_page, time_execution_async
 
 Context = TypeVar('Context')
 
@@ -439,14 +440,19 @@ class Registry(Generic[Context]):
 		# Process sensitive data based on format and current URL
 		applicable_secrets = {}
 
+		# Domain patterns that match the current URL, from a compiled matcher cached per set of domain keys
+		matching_domains: set[str] = set()
+		if current_url and not is_new_tab_page(current_url):
+			# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
+			domain_keys = tuple(key for key, content in sensitive_data.items() if isinstance(content, dict))
+			matching_domains = compile_domain_patterns(domain_keys).matching_patterns(current_url)
+
 		for domain_or_key, content in sensitive_data.items():
 			if isinstance(content, dict):
 				# New format: {domain_pattern: {key: value}}
 				# Only include secrets for domains that match the current URL
-				if current_url and not is_new_tab_page(current_url):
-					# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
-					if match_url_with_domain_pattern(current_url, domain_or_key):
-						applicable_secrets.update(content)
+				if domain_or_key in matching_domains:
+					applicable_secrets.update(content)
 			else:
 				# Old format: {key: value}, expose to all domains (only allowed for legacy reasons)
 				applicable_secrets[domain_or_key] = content
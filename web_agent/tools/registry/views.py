@@ -109,13 +109,10 @@ class ActionRegistry(BaseModel):
 		if domains is None or not url:
 			return True
 
-		# Use the centralized URL matching logic from utils
-		from web_agent.utils import match_url_with_domain_pattern
+		# Same rules as utils.match_url_with_domain_pattern, compiled once per domains list
+		from web_agent.domain_matcher import compile_domain_patterns
 
-		for domain_pattern in domains:
-			if match_url_with_domain_pattern(url, domain_pattern):
-				return True
-		return False
+		return compile_domain_patterns(tuple(domains)).matches(url)
 
 	def get_prompt_description(self, page_url: str | None = None) -> str:
 		"""Get a description of all actions for the prompt
@@ -30,6 +30,7 @@ from web_agent.browser.events import (
 )
 from web_agent.browser.views import BrowserError
 from web_agent.dom.service import EnhancedDOMTreeNode
+from web_agent.filesystem.document_reader import DocumentReader
 from web_agent.filesystem.file_system import FileSystem
 from web_agent.llm.base import BaseChatModel
 from web_agent.llm.messages import SystemMessage, UserMessage
@@ -351,6 +352,7 @@ class Tools(Generic[Context]):
 	):
 		self.registry = Registry[Context](exclude_actions if exclude_actions is not None else [])
 		self.display_files_in_done_text = display_files_in_done_text
+		self.document_reader = DocumentReader()
 		self._output_model: type[BaseModel] | None = output_model
 		self._coordinate_clicking_enabled: bool = False
 
@@ -737,7 +739,8 @@ class Tools(Generic[Context]):
 						# The path should be just the filename for FileSystem files
 						file_obj = file_system.get_file(params.path)
 						if file_obj:
-							# File is managed by FileSystem, construct the full path
+							# File is managed by FileSystem, construct the full path (after any deferred PDF/DOCX render)
+							await file_system.flush()
 							file_system_path = str(file_system.get_dir() / params.path)
 							params = UploadFileAction(index=params.index, path=file_system_path)
 						else:
@@ -1680,22 +1683,14 @@ Context: {context}"""
 					source_name = os.path.basename(file_path)
 
 					if ext == '.pdf':
-						# Read PDF directly using pypdf
-						import pypdf
-
-						reader = pypdf.PdfReader(file_path)
-						num_pages = len(reader.pages)
-
-						# Extract all page text
-						page_texts: list[str] = []
-						total_chars = 0
-						for page in reader.pages:
-							text = page.extract_text() or ''
-							page_texts.append(text)
-							total_chars += len(text)
+						# Pages are extracted in a worker thread into a cache keyed by content hash, then read lazily
+						document = await self.document_reader.open(file_path)
+						num_pages = document.num_segments
+						total_chars = document.total_chars
 
 						# If PDF is small enough, return it all
 						if total_chars <= max_chars:
+							page_texts = await asyncio.to_thread(lambda: list(document.iter_segments()))
 							content_parts = []
 							for i, text in enumerate(page_texts, 1):
 								if text.strip():
@@ -1716,16 +1711,18 @@ Context: {context}"""
 						# Extract search terms from goal
 						search_terms = await extract_search_terms(goal, context)
 
-						# Search and score pages by relevance
-						page_scores: dict[int, int] = {}  # 1-indexed page -> score
-						for term in search_terms:
-							try:
-								term_pattern = re.compile(re.escape(term), re.IGNORECASE)
-							except re.error:
-								continue
-							for i, text in enumerate(page_texts, 1):
-								if term_pattern.search(text):
-									page_scores[i] = page_scores.get(i, 0) + 1
+						# Search and score pages by relevance, streaming pages from the cache
+						term_patterns = [re.compile(re.escape(term), re.IGNORECASE) for term in search_terms]
+
+						def score_pages() -> dict[int, int]:
+							page_scores: dict[int, int] = {}  # 1-indexed page -> score
+							for i, text in enumerate(document.iter_segments(), 1):
+								for term_pattern in term_patterns:
+									if term_pattern.search(text):
+										page_scores[i] = page_scores.get(i, 0) + 1
+							return page_scores
+
+						page_scores = await asyncio.to_thread(score_pages)
 
 						# Select pages: always include page 1, then most relevant
 						pages_to_read = [1]
@@ -1739,7 +1736,7 @@ Context: {context}"""
 						chars_used = 0
 						pages_included = []
 						for page_num in sorted(set(pages_to_read)):
-							text = page_texts[page_num - 1]
+							text = document.segment(page_num - 1)
 							page_header = f'--- Page {page_num} ---\n'
 							remaining = max_chars - chars_used
 							if remaining < len(page_header) + 50:
@@ -1760,6 +1757,10 @@ Context: {context}"""
 							include_extracted_content_only_once=True,
 						)
 
+					elif ext == '.docx':
+						document = await self.document_reader.open(file_path)
+						content = await asyncio.to_thread(document.read)
+
 					else:
 						# Text file
 						async with await anyio.open_file(file_path, 'r', encoding='utf-8', errors='ignore') as f:
@@ -1782,17 +1783,16 @@ Context: {context}"""
 				search_terms = await extract_search_terms(goal, context)
 
 				# Search for each term and score chunks
-				chunks = chunk_content(content, chunk_size=2000)
+				chunk_size = 2000
+				chunks = chunk_content(content, chunk_size=chunk_size)
 				chunk_scores: dict[int, int] = {}  # chunk index -> relevance score
 
 				for term in search_terms:
 					matches = search_text(content, term)
 					for match in matches:
-						# Find which chunk this match belongs to
-						for i, chunk in enumerate(chunks):
-							if chunk['start'] <= match['position'] < chunk['end']:
-								chunk_scores[i] = chunk_scores.get(i, 0) + 1
-								break
+						# Chunks are fixed-size, so the match position gives its chunk directly
+						i = match['position'] // chunk_size
+						chunk_scores[i] = chunk_scores.get(i, 0) + 1
 
 				if not chunk_scores:
 					# No matches - return first max_chars
@@ -2069,6 +2069,8 @@ Validated Code (after quote fixing):
 							if file_content:
 								attachments.append(file_name)
 
+				if attachments:
+					await file_system.flush()
 				attachments = [str(file_system.get_dir() / file_name) for file_name in attachments]
 
 				return ActionResult(
@@ -2394,6 +2396,9 @@ class CodeAgentTools(Tools[Context]):
 						elif os.path.exists(file_name):
 							attachments.append(file_name)
 
+			if attachments:
+				await file_system.flush()
+
 			# Convert relative paths to absolute paths - handle both FileSystem-managed and regular files
 			resolved_attachments = []
 			for file_name in attachments: